@@ -0,0 +1,3 @@
+"""
+HU19: Suite de benchmarks de rendimiento del compresor paralelo
+"""
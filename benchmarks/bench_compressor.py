@@ -0,0 +1,373 @@
+"""
+HU19: Benchmarks de throughput y escalabilidad de ParallelCompressor
+
+Recorre combinaciones de hilos, tamaño de bloque, códec, backend, modo y tipo
+de entrada (texto, aleatorio, ceros, mixto), comprimiendo y descomprimiendo
+cada una. Reporta MB/s, speedup respecto a 1 hilo, ratio de compresión, pico
+de memoria (RSS) y tiempos por fase. Cada medición se ejecuta en un proceso
+nuevo para que el pico de RSS corresponda solo a esa operación.
+
+Uso:
+    python -m benchmarks.bench_compressor --size-mb 16 --threads 1,2,4 --json resultados.json
+    python -m benchmarks.bench_compressor --compare resultados.json --tolerance 10
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compression.parallel_compressor import ParallelCompressor
+from compression.executor_backend import ExecutorBackend
+from compression.temporary_storage import CompressionAlgorithm
+
+
+INPUT_KINDS = ('text', 'random', 'zeros', 'mixed')
+MODES = ('direct', 'streaming', 'temp')
+
+# Campos que identifican un caso al comparar contra una línea base
+CASE_KEY = ('operation', 'input', 'codec', 'block_size', 'threads', 'backend', 'mode')
+
+MB = 1024 * 1024
+
+
+def generate_input(kind: str, size: int, seed: int = 0) -> bytes:
+    """
+    Genera datos de prueba reproducibles
+
+    Args:
+        kind: 'text', 'random', 'zeros' o 'mixed'
+        size: Tamaño en bytes
+        seed: Semilla del generador
+    """
+    rng = random.Random(seed)
+
+    if kind == 'zeros':
+        return bytes(size)
+
+    if kind == 'random':
+        return rng.randbytes(size)
+
+    if kind == 'text':
+        words = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(2, 9)))
+                 for _ in range(500)]
+        lines = [' '.join(rng.choices(words, k=rng.randint(5, 15))) + '\n' for _ in range(2000)]
+        average = sum(len(line) for line in lines) // len(lines)
+        text = ''.join(rng.choices(lines, k=size // average + 1)).encode('ascii')
+        return text[:size]
+
+    if kind == 'mixed':
+        # Segmentos de 256KB alternando texto, aleatorio y ceros
+        segment = 256 * 1024
+        parts = []
+        for i in range(0, size, segment):
+            part_kind = ('text', 'random', 'zeros')[(i // segment) % 3]
+            parts.append(generate_input(part_kind, min(segment, size - i), seed + i))
+        return b''.join(parts)
+
+    raise ValueError(f"Tipo de entrada no soportado: {kind}")
+
+
+def parse_size(value: str) -> int:
+    """Convierte '64K', '1M' o '65536' a bytes"""
+    value = value.strip().upper()
+    multipliers = {'K': 1024, 'M': MB, 'G': 1024 * MB}
+    if value and value[-1] in multipliers:
+        return int(float(value[:-1]) * multipliers[value[-1]])
+    return int(value)
+
+
+def _peak_rss() -> Dict[str, Optional[int]]:
+    """
+    Pico de memoria residente del proceso actual y de sus hijos, en bytes
+
+    Devuelve None donde el sistema no expone el dato (Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return {'peak_rss_bytes': None, 'peak_children_rss_bytes': None}
+
+    # ru_maxrss está en KB en Linux y en bytes en macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return {
+        'peak_rss_bytes': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+        'peak_children_rss_bytes': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale
+    }
+
+
+def _configure(case: Dict[str, Any]) -> ParallelCompressor:
+    """Crea un compresor con la configuración del caso"""
+    compressor = ParallelCompressor(block_size=case['block_size'])
+    compressor.set_compression_algorithm(case['codec'])
+    compressor.set_executor_backend(case['backend'])
+    compressor.set_streaming_mode(case['mode'] == 'streaming')
+    compressor.set_direct_output(case['mode'] != 'temp')
+    return compressor
+
+
+def run_operation(case: Dict[str, Any], source: str, target: str, repeat: int = 1) -> Dict[str, Any]:
+    """
+    Ejecuta una compresión o descompresión y mide su rendimiento
+
+    Se conserva la repetición más rápida.
+
+    Args:
+        case: Configuración del caso (incluye 'operation')
+        source: Archivo de entrada
+        target: Archivo de salida
+        repeat: Número de repeticiones
+    """
+    best = None
+
+    for _ in range(max(1, repeat)):
+        compressor = _configure(case)
+        started = time.perf_counter()
+        if case['operation'] == 'compress':
+            ok = compressor.compress_file_with_threads(source, target, case['threads'])
+            stats = compressor.get_compression_statistics()
+        else:
+            ok = compressor.decompress_file_with_threads(source, target, case['threads'])
+            stats = compressor.get_decompression_statistics()
+        seconds = time.perf_counter() - started
+
+        if not ok:
+            raise RuntimeError(f"La operación falló: {case}")
+
+        if best is None or seconds < best['seconds']:
+            best = {'seconds': seconds, 'phase_times': dict(stats.get('phase_times', {}))}
+
+    original_size = case['original_size']
+    result = dict(case)
+    result.update(best)
+    result['mb_per_s'] = original_size / MB / best['seconds'] if best['seconds'] > 0 else None
+    result['compressed_size'] = os.path.getsize(target if case['operation'] == 'compress' else source)
+    result['compression_ratio'] = result['compressed_size'] / original_size * 100 if original_size else None
+    result.update(_peak_rss())
+    return result
+
+
+def _run_isolated(case: Dict[str, Any], source: str, target: str, repeat: int) -> Dict[str, Any]:
+    """Ejecuta run_operation en un proceso nuevo"""
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(run_operation, case, source, target, repeat).result()
+
+
+def build_cases(args) -> List[Dict[str, Any]]:
+    """Producto de todas las dimensiones configuradas"""
+    cases = []
+    for kind in args.inputs:
+        for codec in args.codecs:
+            for block_size in args.block_sizes:
+                for backend in args.backends:
+                    for mode in args.modes:
+                        for threads in args.threads:
+                            cases.append({
+                                'input': kind,
+                                'codec': codec,
+                                'block_size': block_size,
+                                'threads': threads,
+                                'backend': backend,
+                                'mode': mode
+                            })
+    return cases
+
+
+def add_speedups(results: List[Dict[str, Any]]) -> None:
+    """
+    Calcula el speedup de cada resultado respecto al mismo caso con 1 hilo
+    """
+    single = {}
+    for result in results:
+        if result['threads'] == 1:
+            key = tuple(result[field] for field in CASE_KEY if field != 'threads')
+            single[key] = result['seconds']
+
+    for result in results:
+        key = tuple(result[field] for field in CASE_KEY if field != 'threads')
+        reference = single.get(key)
+        result['speedup'] = reference / result['seconds'] if reference and result['seconds'] > 0 else None
+
+
+def run_suite(args, progress=print) -> Dict[str, Any]:
+    """
+    Ejecuta todos los casos y devuelve el reporte completo
+    """
+    work_dir = tempfile.mkdtemp(prefix="parcomp_bench_")
+    results = []
+
+    try:
+        inputs = {}
+        for kind in args.inputs:
+            path = os.path.join(work_dir, f"{kind}.bin")
+            with open(path, 'wb') as f:
+                f.write(generate_input(kind, args.size))
+            inputs[kind] = path
+
+        cases = build_cases(args)
+        for number, case in enumerate(cases, 1):
+            compressed = os.path.join(work_dir, "salida.pz")
+            restored = os.path.join(work_dir, "salida.bin")
+            case = dict(case, original_size=args.size)
+
+            for operation, source, target in (('compress', inputs[case['input']], compressed),
+                                              ('decompress', compressed, restored)):
+                operation_case = dict(case, operation=operation)
+                if args.isolate:
+                    result = _run_isolated(operation_case, source, target, args.repeat)
+                else:
+                    result = run_operation(operation_case, source, target, args.repeat)
+                results.append(result)
+                progress(f"[{number}/{len(cases)}] {format_result(result)}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    add_speedups(results)
+
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'input_size': args.size,
+            'repeat': args.repeat,
+            'isolated': args.isolate
+        },
+        'results': results
+    }
+
+
+def format_result(result: Dict[str, Any]) -> str:
+    """Una línea legible por resultado"""
+    rss = result.get('peak_rss_bytes')
+    speedup = result.get('speedup')
+    return (f"{result['operation']:<10} {result['input']:<6} {result['codec']:<4} "
+            f"bloque={result['block_size'] // 1024}K hilos={result['threads']} "
+            f"{result['backend']}/{result['mode']}: "
+            f"{result['mb_per_s']:.1f} MB/s"
+            + (f", speedup {speedup:.2f}x" if speedup else "")
+            + f", ratio {result['compression_ratio']:.1f}%"
+            + (f", RSS {rss / MB:.0f} MB" if rss else ""))
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any],
+                    tolerance: float = 10.0) -> List[Dict[str, Any]]:
+    """
+    Compara el throughput de cada caso contra una línea base
+
+    Args:
+        current: Reporte actual
+        baseline: Reporte guardado previamente
+        tolerance: Caída porcentual de MB/s tolerada antes de marcar regresión
+
+    Returns:
+        Una fila por caso presente en ambos reportes, con 'change_pct' y 'regression'
+    """
+    reference = {
+        tuple(result[field] for field in CASE_KEY): result
+        for result in baseline['results']
+    }
+
+    rows = []
+    for result in current['results']:
+        key = tuple(result[field] for field in CASE_KEY)
+        if key not in reference or not reference[key]['mb_per_s']:
+            continue
+        change = (result['mb_per_s'] / reference[key]['mb_per_s'] - 1) * 100
+        rows.append({
+            'case': dict(zip(CASE_KEY, key)),
+            'baseline_mb_per_s': reference[key]['mb_per_s'],
+            'current_mb_per_s': result['mb_per_s'],
+            'change_pct': change,
+            'regression': change < -tolerance
+        })
+    return rows
+
+
+def _csv(value: str) -> List[str]:
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def parse_args(argv=None):
+    """Argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Benchmarks de ParallelCompressor (HU19)")
+    parser.add_argument('--size-mb', type=float, default=16, help="Tamaño de cada entrada en MB")
+    parser.add_argument('--threads', default=f"1,2,4,{os.cpu_count() or 1}", help="Lista de hilos")
+    parser.add_argument('--block-sizes', default="256K,1M", help="Lista de tamaños de bloque (p. ej. 64K,1M)")
+    parser.add_argument('--codecs', default=f"{CompressionAlgorithm.ZLIB},{CompressionAlgorithm.RLE}")
+    parser.add_argument('--inputs', default=','.join(INPUT_KINDS))
+    parser.add_argument('--backends', default=ExecutorBackend.THREADS, help="threads y/o processes")
+    parser.add_argument('--modes', default='direct', help="direct, streaming y/o temp")
+    parser.add_argument('--repeat', type=int, default=1, help="Repeticiones por caso (se usa la más rápida)")
+    parser.add_argument('--no-isolate', dest='isolate', action='store_false',
+                        help="Ejecutar en el mismo proceso (el pico de RSS deja de ser por caso)")
+    parser.add_argument('--json', dest='json_path', help="Guardar el reporte en este archivo JSON")
+    parser.add_argument('--compare', dest='baseline_path', help="Reporte JSON de referencia")
+    parser.add_argument('--tolerance', type=float, default=10.0, help="Caída de MB/s tolerada (%%)")
+    args = parser.parse_args(argv)
+
+    args.size = int(args.size_mb * MB)
+    args.threads = sorted({int(value) for value in _csv(args.threads)})
+    args.block_sizes = [parse_size(value) for value in _csv(args.block_sizes)]
+    args.codecs = _csv(args.codecs)
+    args.inputs = _csv(args.inputs)
+    args.backends = [ExecutorBackend.validate(value) for value in _csv(args.backends)]
+    args.modes = _csv(args.modes)
+
+    for kind in args.inputs:
+        if kind not in INPUT_KINDS:
+            parser.error(f"Tipo de entrada no soportado: {kind}")
+    for mode in args.modes:
+        if mode not in MODES:
+            parser.error(f"Modo no soportado: {mode}")
+
+    return args
+
+
+def main(argv=None) -> int:
+    """Punto de entrada; devuelve 1 si hay regresiones respecto a la línea base"""
+    args = parse_args(argv)
+    report = run_suite(args)
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Reporte guardado en {args.json_path}")
+
+    if args.baseline_path:
+        with open(args.baseline_path, 'r') as f:
+            baseline = json.load(f)
+
+        rows = compare_results(report, baseline, args.tolerance)
+        regressions = [row for row in rows if row['regression']]
+        print(f"\nComparación con {args.baseline_path} (tolerancia {args.tolerance:.0f}%):")
+        for row in rows:
+            case = row['case']
+            mark = "REGRESIÓN" if row['regression'] else "ok"
+            print(f"  {case['operation']:<10} {case['input']:<6} {case['codec']:<4} "
+                  f"bloque={case['block_size'] // 1024}K hilos={case['threads']} "
+                  f"{case['backend']}/{case['mode']}: "
+                  f"{row['baseline_mb_per_s']:.1f} -> {row['current_mb_per_s']:.1f} MB/s "
+                  f"({row['change_pct']:+.1f}%) {mark}")
+        if regressions:
+            print(f"{len(regressions)} casos con regresión")
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
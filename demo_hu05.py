@@ -152,7 +152,6 @@ def verify_compressed_file_structure(compressed_file, algorithm_name):
                     print(f"📋 {algorithm_name} - Formato: {header_info.get('format', 'N/A')}")
                     print(f"📋 {algorithm_name} - Total de bloques: {header_info.get('total_blocks', 'N/A')}")
                     print(f"📋 {algorithm_name} - Algoritmo: {header_info.get('compression_algorithm', 'N/A')}")
-                    print(f"📋 {algorithm_name} - Orden de bloques: {header_info.get('block_order', [])[:5]}{'...' if len(header_info.get('block_order', [])) > 5 else ''}")
                 else:
                     print(f"⚠️ {algorithm_name} - No se pudo leer el encabezado")
             else:
@@ -0,0 +1,11 @@
+"""
+HU20: Permite ejecutar la CLI con python -m src.compression
+"""
+
+import sys
+
+from .cli import main
+
+
+if __name__ == '__main__':
+    sys.exit(main())
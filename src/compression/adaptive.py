@@ -0,0 +1,160 @@
+"""
+HU22: Selección adaptativa de códec y nivel por bloque
+
+Antes de comprimir un bloque se comprime una muestra pequeña (algunas
+porciones repartidas a lo largo del bloque) con el nivel más rápido del
+códec. El ratio de la muestra decide la estrategia del bloque:
+
+    - store: la muestra casi no se reduce (JPEG, video, zips embebidos);
+      el bloque se guarda sin comprimir y se ahorra toda la compresión.
+    - rle: la muestra son corridas largas de un mismo byte (solo con NumPy;
+      la versión en Python puro de RLE es más lenta que zlib).
+    - high: la muestra se reduce mucho; vale la pena el nivel máximo.
+    - fast: el resto; un nivel alto apenas mejora el ratio.
+"""
+
+import time
+from typing import Any, Dict
+
+from .codecs import get_codec
+from .temporary_storage import CompressionAlgorithm, RLECompressor
+
+
+class BlockStrategy:
+    """
+    HU22: Enumeración de estrategias por bloque
+    """
+    STORE = "store"
+    FAST = "fast"
+    HIGH = "high"
+    RLE = "rle"
+
+    ALL = (STORE, FAST, HIGH, RLE)
+
+
+class AdaptiveCodecSelector:
+    """
+    HU22: Elige estrategia, códec y nivel de cada bloque a partir de una muestra
+
+    Los umbrales son ratios en porcentaje (tamaño comprimido / original),
+    como compression_ratio en el resto del paquete. El selector no guarda
+    estado mutable, así que puede compartirse entre hilos y enviarse a un
+    pool de procesos.
+    """
+
+    # Porciones de la muestra y tamaño de cada una
+    SAMPLE_SLICES = 4
+    SLICE_SIZE = 4 * 1024
+
+    def __init__(self, store_threshold: float = 95.0, high_threshold: float = 40.0,
+                 rle_threshold: float = 2.0, use_rle: bool = None):
+        """
+        Args:
+            store_threshold: Ratio de la muestra a partir del cual el bloque se guarda sin comprimir
+            high_threshold: Ratio de la muestra por debajo del cual se usa el nivel máximo
+            rle_threshold: Ratio RLE de la muestra por debajo del cual se usa RLE
+            use_rle: Permitir la estrategia RLE (por defecto solo si RLE usa NumPy)
+        """
+        if not 0 < rle_threshold <= high_threshold <= store_threshold <= 100:
+            raise ValueError("Los umbrales deben cumplir 0 < rle <= high <= store <= 100")
+        self.store_threshold = store_threshold
+        self.high_threshold = high_threshold
+        self.rle_threshold = rle_threshold
+        self.use_rle = RLECompressor.is_vectorized() if use_rle is None else use_rle
+
+    def sample(self, data) -> bytes:
+        """
+        Toma SAMPLE_SLICES porciones repartidas uniformemente a lo largo del bloque
+        """
+        sample_size = self.SAMPLE_SLICES * self.SLICE_SIZE
+        if len(data) <= sample_size:
+            return bytes(data)
+
+        step = (len(data) - self.SLICE_SIZE) // (self.SAMPLE_SLICES - 1)
+        return b''.join(
+            bytes(data[i * step:i * step + self.SLICE_SIZE]) for i in range(self.SAMPLE_SLICES)
+        )
+
+    def probe(self, data, algorithm: str = CompressionAlgorithm.ZLIB) -> Dict[str, Any]:
+        """
+        HU23: Detecta de antemano si un bloque es incompresible
+
+        Returns:
+            dict: strategy (STORE o None), codec, level, sample_ratio (%),
+            sample_seconds y estimated_seconds (tiempo estimado de comprimir el
+            bloque completo con el nivel rápido, extrapolado desde la muestra)
+        """
+        return self._probe(data, algorithm)[0]
+
+    def _probe(self, data, algorithm: str):
+        """Comprime la muestra con el nivel rápido; devuelve (decisión, muestra)"""
+        started = time.perf_counter()
+        codec = get_codec(algorithm)
+        fast_level = codec.resolve_level(1)
+
+        sample = self.sample(data)
+        sample_ratio = len(codec.compress(sample, fast_level)) / len(sample) * 100 if sample else 100.0
+        sample_seconds = time.perf_counter() - started
+
+        return {
+            'strategy': BlockStrategy.STORE if sample_ratio >= self.store_threshold else None,
+            'codec': codec.name,
+            'level': None,
+            'sample_ratio': sample_ratio,
+            'sample_seconds': sample_seconds,
+            'estimated_seconds': sample_seconds * len(data) / len(sample) if sample else 0.0
+        }, sample
+
+    def choose(self, data, algorithm: str = CompressionAlgorithm.ZLIB) -> Dict[str, Any]:
+        """
+        Decide cómo comprimir un bloque
+
+        Args:
+            data: Datos del bloque (bytes o memoryview)
+            algorithm: Códec configurado, usado para las estrategias fast y high
+
+        Returns:
+            dict: Los campos de probe con strategy, codec y level decididos
+        """
+        started = time.perf_counter()
+        decision, sample = self._probe(data, algorithm)
+        codec = get_codec(algorithm)
+
+        if decision['strategy'] == BlockStrategy.STORE:
+            pass
+        elif (self.use_rle and decision['sample_ratio'] <= self.rle_threshold
+              and len(RLECompressor.compress(sample)) / len(sample) * 100 <= self.rle_threshold):
+            decision.update(strategy=BlockStrategy.RLE, codec=CompressionAlgorithm.RLE)
+        elif decision['sample_ratio'] <= self.high_threshold:
+            decision.update(strategy=BlockStrategy.HIGH, level=codec.max_level)
+        else:
+            decision.update(strategy=BlockStrategy.FAST, level=codec.resolve_level(1))
+
+        decision['sample_seconds'] = time.perf_counter() - started
+        return decision
+
+    @staticmethod
+    def new_statistics() -> Dict[str, Any]:
+        """Estructura de compression_stats['adaptive'] antes del primer bloque"""
+        return {
+            'decisions': {strategy: 0 for strategy in BlockStrategy.ALL},
+            'bytes': {strategy: 0 for strategy in BlockStrategy.ALL},
+            'sampling_seconds': 0.0,
+            'estimated_seconds_saved': 0.0,
+            'net_seconds_saved': 0.0
+        }
+
+    @staticmethod
+    def record(stats: Dict[str, Any], decision: Dict[str, Any], block_size: int) -> None:
+        """
+        Acumula una decisión en las estadísticas (el llamador sincroniza)
+
+        Solo los bloques guardados sin comprimir cuentan como tiempo ahorrado:
+        su compresión completa (estimada con la muestra) no se ejecutó.
+        """
+        stats['decisions'][decision['strategy']] += 1
+        stats['bytes'][decision['strategy']] += block_size
+        stats['sampling_seconds'] += decision['sample_seconds']
+        if decision['strategy'] == BlockStrategy.STORE:
+            stats['estimated_seconds_saved'] += decision['estimated_seconds']
+        stats['net_seconds_saved'] = stats['estimated_seconds_saved'] - stats['sampling_seconds']
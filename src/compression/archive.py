@@ -0,0 +1,267 @@
+"""
+HU31: Archivos .pz con varios miembros (compresión de directorios)
+
+Un .pz de directorio es un PARZIP_V2 común cuyo contenido original es la
+concatenación de todos los archivos del directorio seguida de la tabla de
+miembros (JSON). El encabezado indica dónde está la tabla dentro del
+contenido original ('members': offset y tamaño); cada miembro de la tabla
+guarda su nombre relativo, su offset, su tamaño, su fecha de modificación
+y sus permisos. Extraer un miembro es leer su rango con el índice de
+bloques: solo se descomprimen los bloques que lo cubren.
+
+Los bloques se planifican sobre todos los archivos a la vez:
+- los archivos más chicos que un bloque se empaquetan juntos en bloques
+  compartidos hasta completar el tamaño de bloque;
+- un archivo de al menos un bloque empieza un bloque nuevo y se divide en
+  bloques propios, así extraerlo no descomprime datos de sus vecinos.
+Cada bloque describe sus partes (ruta, offset, tamaño) en 'pieces' y los
+trabajadores las leen al comprimirlo, de modo que nunca está todo el
+directorio en memoria.
+
+Un lector que ignore 'members' descomprime el contenido concatenado.
+"""
+
+import json
+import os
+import stat
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .executor_backend import read_file_range
+from .pz_format import PzArchive
+
+
+MEMBERS_VERSION = 1
+
+
+def scan_directory(root: str, exclude: Iterable[str] = ()) -> List[Dict[str, Any]]:
+    """
+    Recorre el directorio y lista sus archivos regulares en orden estable
+
+    Los enlaces simbólicos y los archivos especiales se omiten.
+
+    Args:
+        root: Directorio a recorrer
+        exclude: Rutas a omitir (p. ej. el .pz de salida dentro del directorio)
+
+    Returns:
+        Miembros con 'name' (ruta relativa con '/'), 'path', 'size', 'mtime' y 'mode'
+    """
+    excluded = {os.path.abspath(path) for path in exclude}
+    members = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            path = os.path.join(dirpath, filename)
+            if os.path.abspath(path) in excluded:
+                continue
+            info = os.lstat(path)
+            if not stat.S_ISREG(info.st_mode):
+                continue
+            members.append({
+                'name': os.path.relpath(path, root).replace(os.sep, '/'),
+                'path': path,
+                'size': info.st_size,
+                'mtime': info.st_mtime,
+                'mode': stat.S_IMODE(info.st_mode)
+            })
+    return members
+
+
+def read_file_pieces(pieces: List[Tuple[str, int, int]]) -> bytes:
+    """
+    Lee y concatena las partes (ruta, offset, tamaño) de un bloque
+
+    Raises:
+        IOError: Si un archivo tiene menos datos de los planificados
+    """
+    return b''.join(read_file_range(path, offset, size) for path, offset, size in pieces)
+
+
+def _new_block(blocks: list, start_offset: int, size: int, **content) -> None:
+    blocks.append({
+        'id': len(blocks),
+        'start_offset': start_offset,
+        'end_offset': start_offset + size - 1,
+        'size': size,
+        'checksum': None,
+        **content
+    })
+
+
+def plan_member_blocks(members: List[Dict[str, Any]], block_size: int) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Asigna a cada miembro su offset y planifica los bloques de todo el directorio
+
+    Los bloques de datos llevan 'pieces'; los de la tabla de miembros, al
+    final, llevan sus datos en 'data'.
+
+    Returns:
+        tuple: (bloques, entrada 'members' del encabezado)
+    """
+    if block_size <= 0:
+        raise ValueError("El tamaño de bloque debe ser positivo")
+
+    blocks = []
+    pieces, packed_start, packed_size = [], 0, 0
+    offset = 0
+    for member in members:
+        member['offset'] = offset
+        size = member['size']
+        if size >= block_size or packed_size + size > block_size:
+            if packed_size:
+                _new_block(blocks, packed_start, packed_size, pieces=pieces)
+            pieces, packed_start, packed_size = [], offset, 0
+        if size >= block_size:
+            for start in range(0, size, block_size):
+                part = min(block_size, size - start)
+                _new_block(blocks, offset + start, part, pieces=[(member['path'], start, part)])
+            packed_start = offset + size
+        elif size:
+            pieces.append((member['path'], 0, size))
+            packed_size += size
+        offset += size
+    if packed_size:
+        _new_block(blocks, packed_start, packed_size, pieces=pieces)
+
+    table = encode_member_table(members)
+    for start in range(0, len(table), block_size):
+        part = table[start:start + block_size]
+        _new_block(blocks, offset + start, len(part), data=part)
+
+    return blocks, {
+        'version': MEMBERS_VERSION,
+        'count': len(members),
+        'table_offset': offset,
+        'table_size': len(table)
+    }
+
+
+def encode_member_table(members: List[Dict[str, Any]]) -> bytes:
+    """Tabla de miembros en JSON (sin las rutas de origen)"""
+    return json.dumps([
+        {key: member[key] for key in ('name', 'offset', 'size', 'mtime', 'mode')}
+        for member in members
+    ]).encode('utf-8')
+
+
+def is_member_archive(header: Dict[str, Any]) -> bool:
+    """Indica si el encabezado corresponde a un .pz de varios miembros"""
+    return bool(header.get('members'))
+
+
+def _safe_member_path(output_dir: str, name: str) -> str:
+    """
+    Ruta de extracción de un miembro, que no puede salir de output_dir
+
+    Raises:
+        ValueError: Si el nombre es absoluto o contiene '..'
+    """
+    parts = name.split('/')
+    if not name or name.startswith('/') or any(part in ('', '.', '..') for part in parts) or ':' in parts[0]:
+        raise ValueError(f"Nombre de miembro inválido: {name!r}")
+    return os.path.join(output_dir, *parts)
+
+
+class MemberArchive:
+    """
+    HU31: Lector de un .pz de varios miembros
+
+    Carga la tabla de miembros al abrir; cada miembro se lee descomprimiendo
+    solo los bloques que lo cubren.
+    """
+
+    def __init__(self, file_path: str):
+        """
+        Raises:
+            ValueError: Si el archivo no es un .pz de varios miembros o su tabla es inválida
+        """
+        self.archive = PzArchive(file_path)
+        try:
+            info = self.archive.header.get('members')
+            if not info:
+                raise ValueError(f"{file_path} no es un archivo .pz de varios miembros")
+            if info.get('version') != MEMBERS_VERSION:
+                raise ValueError(f"Versión de tabla de miembros no soportada: {info.get('version')}")
+            table = self.archive.read_range(info['table_offset'], info['table_size'])
+            if len(table) != info['table_size']:
+                raise ValueError("Archivo comprimido inválido: tabla de miembros truncada")
+            try:
+                self.members: List[Dict[str, Any]] = json.loads(table.decode('utf-8'))
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                raise ValueError(f"Archivo comprimido inválido: tabla de miembros corrupta - {e}")
+        except Exception:
+            self.archive.close()
+            raise
+        self._by_name = {member['name']: member for member in self.members}
+        # Último bloque leído: los miembros chicos que comparten bloque no lo descomprimen de nuevo
+        self._last_block: Tuple[Optional[int], bytes] = (None, b'')
+
+    def close(self) -> None:
+        """Cierra el archivo subyacente"""
+        self.archive.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def list_members(self) -> List[Dict[str, Any]]:
+        """Miembros del archivo en el orden en que se comprimieron"""
+        return [dict(member) for member in self.members]
+
+    def get_member(self, name: str) -> Dict[str, Any]:
+        """
+        Raises:
+            KeyError: Si el archivo no tiene ese miembro
+        """
+        try:
+            return self._by_name[name]
+        except KeyError:
+            raise KeyError(f"El archivo no contiene el miembro {name!r}")
+
+    def iter_member(self, name: str) -> Iterator[bytes]:
+        """Entrega el contenido de un miembro bloque a bloque"""
+        member = self.get_member(name)
+        offset, end = member['offset'], member['offset'] + member['size']
+        for block in self.archive.find_blocks(offset, member['size']):
+            data = self._read_block(block['id'])
+            start = max(offset - block['original_offset'], 0)
+            stop = min(end - block['original_offset'], block['original_size'])
+            yield data[start:stop]
+
+    def _read_block(self, block_id: int) -> bytes:
+        if self._last_block[0] != block_id:
+            self._last_block = (block_id, self.archive.read_block(block_id))
+        return self._last_block[1]
+
+    def read_member(self, name: str) -> bytes:
+        """Contenido completo de un miembro"""
+        return b''.join(self.iter_member(name))
+
+    def extract_member(self, name: str, output_dir: str) -> str:
+        """
+        Extrae un miembro dentro de output_dir, con su fecha y sus permisos
+
+        Returns:
+            Ruta del archivo extraído
+        """
+        member = self.get_member(name)
+        path = _safe_member_path(output_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            for data in self.iter_member(name):
+                f.write(data)
+        os.chmod(path, member['mode'])
+        os.utime(path, (member['mtime'], member['mtime']))
+        return path
+
+    def extract_all(self, output_dir: str, names: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Extrae todos los miembros (o solo names) dentro de output_dir
+
+        Returns:
+            Rutas de los archivos extraídos
+        """
+        selected = self.members if names is None else [self.get_member(name) for name in names]
+        return [self.extract_member(member['name'], output_dir) for member in selected]
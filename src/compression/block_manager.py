@@ -1,12 +1,16 @@
 """
 HU04: División de archivos en bloques de tamaño fijo
 Módulo especializado para partición y gestión de bloques
+HU27: Opcionalmente, bloques de tamaño variable definidos por el contenido
 """
 
 import os
 import math
+import mmap
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, Iterator, Tuple
+
+from .chunking import ChunkingStrategy, ContentDefinedChunker
 
 
 class FileBlockManager:
@@ -20,17 +24,28 @@ class FileBlockManager:
     MIN_BLOCK_SIZE = 64 * 1024        # 64KB mínimo
     MAX_BLOCK_SIZE = 16 * 1024 * 1024 # 16MB máximo
     
-    def __init__(self, block_size: int = None):
+    def __init__(self, block_size: int = None, use_mmap: bool = False,
+                 chunking: str = ChunkingStrategy.FIXED):
         """
         Inicializa el administrador de bloques
         
         Args:
             block_size: Tamaño de bloque en bytes (por defecto 1MB)
+            use_mmap: HU13: Si True, los bloques son vistas (memoryview) de
+                un mapeo en memoria del archivo en lugar de copias
+            chunking: HU27: ChunkingStrategy; con CONTENT_DEFINED block_size
+                es el tamaño promedio de bloque
         """
         self.block_size = self._validate_block_size(block_size or self.DEFAULT_BLOCK_SIZE)
         self.blocks_info = []
         self.total_blocks = 0
         self.total_file_size = 0
+        # HU13: Mapeo en memoria del archivo actual
+        self.use_mmap = use_mmap
+        self._mapping = None
+        # HU27: Estrategia de división y límites calculados del último archivo
+        self.chunking = ChunkingStrategy.validate(chunking)
+        self._content_ranges = None
         
     def _validate_block_size(self, size: int) -> int:
         """
@@ -75,29 +90,65 @@ class FileBlockManager:
         if self.total_file_size == 0:
             raise ValueError("El archivo está vacío")
         
-        # Calcular número de bloques necesarios
-        self.total_blocks = math.ceil(self.total_file_size / self.block_size)
-        
-        # Calcular tamaño del último bloque
-        last_block_size = self.total_file_size % self.block_size
-        if last_block_size == 0:
-            last_block_size = self.block_size
+        if self.chunking == ChunkingStrategy.CONTENT_DEFINED:
+            # HU27: Los límites salen de recorrer el contenido
+            ranges = self._content_defined_ranges(file_path, file_stat)
+            self.total_blocks = len(ranges)
+            last_block_size = ranges[-1][1]
+            max_block_size = max(size for _, size in ranges)
+        else:
+            # Calcular número de bloques necesarios
+            self.total_blocks = math.ceil(self.total_file_size / self.block_size)
+            
+            # Calcular tamaño del último bloque
+            last_block_size = self.total_file_size % self.block_size
+            if last_block_size == 0:
+                last_block_size = self.block_size
+            max_block_size = self.block_size
             
         analysis = {
             'file_path': file_path,
             'file_size': self.total_file_size,
             'block_size': self.block_size,
+            'chunking': self.chunking,
             'total_blocks': self.total_blocks,
             'last_block_size': last_block_size,
+            'max_block_size': max_block_size,
             'efficiency': (self.total_file_size / (self.total_blocks * self.block_size)) * 100,
             'estimated_memory_usage': self.total_blocks * self.block_size
         }
         
         return analysis
     
+    def _content_defined_ranges(self, file_path: str, file_stat: os.stat_result) -> List[Tuple[int, int]]:
+        """
+        HU27: Límites (offset, tamaño) definidos por el contenido
+        
+        Se calculan una vez por archivo: analyze_file se llama varias veces
+        durante una compresión.
+        """
+        key = (os.path.abspath(file_path), file_stat.st_size, file_stat.st_mtime_ns, self.block_size)
+        if self._content_ranges is None or self._content_ranges[0] != key:
+            chunker = ContentDefinedChunker.for_block_size(self.block_size, self.MIN_BLOCK_SIZE, self.MAX_BLOCK_SIZE)
+            self._content_ranges = (key, chunker.boundaries(file_path))
+        return self._content_ranges[1]
+    
+    def _block_ranges(self, file_path: str, analysis: Dict[str, Any]) -> List[Tuple[int, int]]:
+        """
+        HU27: (offset, tamaño) de cada bloque según la estrategia de división
+        """
+        if self.chunking == ChunkingStrategy.CONTENT_DEFINED:
+            return self._content_defined_ranges(file_path, os.stat(file_path))
+        return [
+            (block_id * self.block_size,
+             analysis['last_block_size'] if block_id == self.total_blocks - 1 else self.block_size)
+            for block_id in range(self.total_blocks)
+        ]
+    
     def split_file_into_blocks(self, file_path: str, progress_callback: Optional[Callable] = None) -> List[Dict[str, Any]]:
         """
         Divide un archivo en bloques de tamaño fijo
+        HU27: o de tamaño variable, según la estrategia de división
         
         Args:
             file_path: Ruta al archivo a dividir
@@ -112,19 +163,17 @@ class FileBlockManager:
         if progress_callback:
             progress_callback(f"Iniciando división en {self.total_blocks} bloques", 0, "🔪 División")
         
+        # HU13: Con mmap no se copia ningún dato durante la división
+        if self.use_mmap:
+            return self._split_file_mmap(file_path, analysis, progress_callback)
+        
         blocks = []
         bytes_read = 0
         
         try:
             with open(file_path, 'rb') as file:
-                for block_id in range(self.total_blocks):
-                    # Determinar tamaño del bloque actual
-                    if block_id == self.total_blocks - 1:
-                        # Último bloque puede ser más pequeño
-                        current_block_size = analysis['last_block_size']
-                    else:
-                        current_block_size = self.block_size
-                    
+                # El último bloque puede ser más pequeño
+                for block_id, (_, current_block_size) in enumerate(self._block_ranges(file_path, analysis)):
                     # Leer datos del bloque
                     data = file.read(current_block_size)
                     
@@ -145,7 +194,7 @@ class FileBlockManager:
                         'start_offset': bytes_read,
                         'end_offset': bytes_read + len(data) - 1,
                         'is_last_block': block_id == self.total_blocks - 1,
-                        'checksum': self._calculate_checksum(data)
+                        'checksum': None  # HU18: Lo calcula el hilo que comprime el bloque
                     }
                     
                     blocks.append(block_info)
@@ -174,19 +223,156 @@ class FileBlockManager:
             progress_callback(f"División completada: {len(blocks)} bloques", 100, "✅ División completa")
         
         return blocks
+
+    def _split_file_mmap(self, file_path: str, analysis: Dict[str, Any],
+                         progress_callback: Optional[Callable] = None) -> List[Dict[str, Any]]:
+        """
+        HU13: División sin copias usando un mapeo en memoria del archivo
+        
+        Cada bloque es una vista (memoryview) del mapeo: el sistema operativo
+        carga las páginas bajo demanda cuando el compresor las lee. El checksum
+        se deja en None para que lo calcule el hilo que comprime el bloque.
+        """
+        view = self._map_file(file_path)
+        blocks = []
+        
+        for block_id, (start_offset, size) in enumerate(self._block_ranges(file_path, analysis)):
+            blocks.append({
+                'id': block_id,
+                'data': view[start_offset:start_offset + size],
+                'size': size,
+                'start_offset': start_offset,
+                'end_offset': start_offset + size - 1,
+                'is_last_block': block_id == self.total_blocks - 1,
+                'checksum': None
+            })
+        view.release()
+        
+        self._validate_block_integrity(blocks, analysis)
+        self.blocks_info = blocks
+        
+        if progress_callback:
+            progress_callback(f"División completada: {len(blocks)} bloques", 100, "✅ División completa")
+        
+        return blocks
     
-    def _calculate_checksum(self, data: bytes) -> int:
+    def _map_file(self, file_path: str) -> memoryview:
         """
-        Calcula un checksum simple para un bloque de datos
+        HU13: Mapea el archivo en memoria de solo lectura
         
-        Args:
-            data: Datos del bloque
-            
         Returns:
-            Checksum del bloque
+            Vista sobre todo el archivo mapeado
         """
-        return hash(data) & 0xFFFFFFFF  # Usar solo 32 bits
+        self.release_mapping()
+        with open(file_path, 'rb') as file:
+            self._mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self._mapping)
     
+    def release_mapping(self) -> None:
+        """
+        HU13: Libera las vistas de los bloques y cierra el mapeo del archivo
+        
+        Si alguna vista sigue en uso fuera del administrador, el mapeo se
+        cierra cuando esa vista se libera.
+        """
+        if self._mapping is None:
+            return
+        
+        for block in self.blocks_info:
+            if isinstance(block.get('data'), memoryview):
+                block['data'].release()
+        self.blocks_info = []
+        
+        try:
+            self._mapping.close()
+        except BufferError:
+            pass
+        self._mapping = None
+    
+    def iter_file_blocks(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """
+        HU09: Lee el archivo bloque a bloque sin retener los datos en memoria
+
+        A diferencia de split_file_into_blocks, los bloques se entregan uno a uno
+        y no se guardan en blocks_info, de modo que el consumidor controla cuántos
+        bloques permanecen vivos a la vez.
+
+        Args:
+            file_path: Ruta al archivo a dividir
+
+        Yields:
+            Bloques con la misma estructura que split_file_into_blocks
+        """
+        analysis = self.analyze_file(file_path)
+        bytes_read = 0
+
+        # HU13: Con mmap cada bloque es una vista del archivo mapeado
+        if self.use_mmap:
+            view = self._map_file(file_path)
+            try:
+                for block_id, (start_offset, size) in enumerate(self._block_ranges(file_path, analysis)):
+                    yield {
+                        'id': block_id,
+                        'data': view[start_offset:start_offset + size],
+                        'size': size,
+                        'start_offset': start_offset,
+                        'end_offset': start_offset + size - 1,
+                        'is_last_block': block_id == self.total_blocks - 1,
+                        'checksum': None
+                    }
+            finally:
+                view.release()
+            return
+
+        with open(file_path, 'rb') as file:
+            for block_id, (_, current_block_size) in enumerate(self._block_ranges(file_path, analysis)):
+                data = file.read(current_block_size)
+                if len(data) != current_block_size:
+                    raise IOError(f"Error de lectura en bloque {block_id}: esperado {current_block_size} bytes, leído {len(data)} bytes")
+
+                yield {
+                    'id': block_id,
+                    'data': data,
+                    'size': len(data),
+                    'start_offset': bytes_read,
+                    'end_offset': bytes_read + len(data) - 1,
+                    'is_last_block': block_id == self.total_blocks - 1,
+                    'checksum': None  # HU18: Lo calcula el hilo que comprime el bloque
+                }
+                bytes_read += len(data)
+
+    def plan_blocks(self, file_path: str) -> List[Dict[str, Any]]:
+        """
+        HU10: Calcula los rangos de cada bloque sin leer el contenido
+
+        Útil cuando los datos los lee otro proceso: cada bloque solo lleva
+        la ruta del archivo, su posición y su tamaño.
+
+        Args:
+            file_path: Ruta al archivo a dividir
+
+        Returns:
+            Lista de bloques sin el campo 'data'
+        """
+        analysis = self.analyze_file(file_path)
+        blocks = []
+
+        for block_id, (start_offset, size) in enumerate(self._block_ranges(file_path, analysis)):
+            blocks.append({
+                'id': block_id,
+                'file_path': file_path,
+                'size': size,
+                'start_offset': start_offset,
+                'end_offset': start_offset + size - 1,
+                'is_last_block': block_id == self.total_blocks - 1,
+                'checksum': None
+            })
+
+        self._validate_block_integrity(blocks, analysis)
+        self.blocks_info = blocks
+
+        return blocks
+
     def _validate_block_integrity(self, blocks: List[Dict[str, Any]], analysis: Dict[str, Any]) -> None:
         """
         Valida que la división en bloques sea correcta
@@ -305,6 +491,7 @@ class FileBlockManager:
             'total_blocks': len(self.blocks_info),
             'total_size': sum(sizes),
             'block_size_configured': self.block_size,
+            'chunking': self.chunking,
             'average_block_size': sum(sizes) / len(sizes),
             'min_block_size': min(sizes),
             'max_block_size': max(sizes),
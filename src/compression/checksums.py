@@ -0,0 +1,108 @@
+"""
+HU18: Checksums de bloque intercambiables
+Todos los checksums son deterministas (a diferencia de hash()), de modo que
+pueden calcularse en cualquier hilo o proceso, guardarse en el archivo .pz
+y verificarse al descomprimir.
+"""
+
+import hashlib
+import zlib
+
+
+class ChecksumAlgorithm:
+    """
+    HU18: Enumeración de algoritmos de checksum disponibles
+
+    El valor de un checksum siempre es un entero sin signo: 32 bits para
+    CRC32 y Adler-32, 256 bits para SHA-256.
+    """
+    CRC32 = "crc32"
+    ADLER32 = "adler32"
+    SHA256 = "sha256"
+
+    # Bytes que ocupa cada checksum en el archivo .pz
+    DIGEST_SIZES = {
+        CRC32: 4,
+        ADLER32: 4,
+        SHA256: 32
+    }
+
+    @staticmethod
+    def validate(algorithm: str) -> str:
+        """
+        Valida el nombre del algoritmo
+
+        Raises:
+            ValueError: Si el algoritmo no está soportado
+        """
+        if algorithm not in ChecksumAlgorithm.DIGEST_SIZES:
+            raise ValueError(f"Algoritmo de checksum no soportado: {algorithm}")
+        return algorithm
+
+    @staticmethod
+    def digest_size(algorithm: str) -> int:
+        """Bytes necesarios para guardar un checksum del algoritmo"""
+        return ChecksumAlgorithm.DIGEST_SIZES[ChecksumAlgorithm.validate(algorithm)]
+
+    @staticmethod
+    def compute(data: bytes, algorithm: str = CRC32) -> int:
+        """
+        Calcula el checksum de un bloque
+
+        Args:
+            data: Datos del bloque (bytes o memoryview)
+            algorithm: Algoritmo a usar
+
+        Returns:
+            int: Checksum como entero sin signo
+        """
+        if algorithm == ChecksumAlgorithm.CRC32:
+            return zlib.crc32(data) & 0xFFFFFFFF
+        elif algorithm == ChecksumAlgorithm.ADLER32:
+            return zlib.adler32(data) & 0xFFFFFFFF
+        elif algorithm == ChecksumAlgorithm.SHA256:
+            return int.from_bytes(hashlib.sha256(data).digest(), byteorder='big')
+        else:
+            raise ValueError(f"Algoritmo de checksum no soportado: {algorithm}")
+
+    @staticmethod
+    def verify(data: bytes, expected: int, algorithm: str = CRC32) -> bool:
+        """
+        Verifica un bloque contra su checksum guardado
+
+        Un checksum ausente (archivos PARZIP_V1) se considera válido.
+        """
+        return expected is None or ChecksumAlgorithm.compute(data, algorithm) == expected
+
+
+class VerificationPolicy:
+    """
+    HU24: Enumeración de políticas de verificación al comprimir
+
+    - full: cada bloque comprimido se descomprime y se compara con el original.
+    - sampled: igual que full, solo para uno de cada N bloques o un porcentaje
+      aleatorio de ellos.
+    - checksum: sin ida y vuelta en los trabajadores; la integridad queda
+      garantizada por el checksum del bloque original guardado en el índice,
+      que se verifica cada vez que el bloque se descomprime.
+    - off: ni ida y vuelta ni checksum (el índice marca los bloques sin
+      checksum); solo para archivos intermedios o desechables.
+    """
+    OFF = "off"
+    SAMPLED = "sampled"
+    CHECKSUM = "checksum"
+    FULL = "full"
+
+    ALL = (OFF, SAMPLED, CHECKSUM, FULL)
+
+    @staticmethod
+    def validate(policy: str) -> str:
+        """
+        Valida el nombre de la política
+
+        Raises:
+            ValueError: Si la política no existe
+        """
+        if policy not in VerificationPolicy.ALL:
+            raise ValueError(f"Política de verificación no soportada: {policy}")
+        return policy
@@ -0,0 +1,244 @@
+"""
+HU27: División en bloques definida por el contenido
+
+Con bloques de tamaño fijo, un solo byte insertado desplaza todos los
+límites posteriores y ningún bloque vuelve a coincidir con los de la
+versión anterior, lo que anula la deduplicación (HU26) y las
+actualizaciones incrementales. Con la división por contenido cada límite
+depende solo de los bytes que lo rodean, así que tras una inserción los
+límites se resincronizan en el bloque siguiente.
+
+Hash rodante en dos etapas, sin recorrer el archivo byte a byte en Python:
+1. window_hash calcula en cada posición un valor de 8 bits que depende de
+   los últimos WINDOW_BYTES bytes (un buzhash: cada byte se traduce con una
+   tabla aleatoria y se multiplica en GF(2^8) según su distancia). Se
+   evalúa duplicando la ventana en cada paso, así que cuesta
+   log2(WINDOW_BYTES) pasadas en C: con NumPy sobre arreglos y sin NumPy
+   con bytes.translate y XOR de enteros grandes (mismo resultado).
+   Cada valor se reduce a un bit y se buscan las posiciones donde los
+   últimos PATTERN_BITS bits forman un patrón dado (bytes.find). El hash
+   solo se calcula a partir de min_size de cada bloque, por tramos.
+2. Si el tamaño promedio pide más bits, cada candidato se confirma con el
+   CRC32 de los HASH_WINDOW bytes anteriores.
+Como cada bit depende de una ventana completa y no de un solo byte, texto
+con pocos caracteres distintos (código fuente, sangrías, registros
+repetitivos) sigue encontrando cortes. Solo un contenido que se repite con
+un período menor que el tamaño promedio (p. ej. un archivo de ceros) no
+tiene cortes y se divide en bloques de max_size.
+"""
+
+import random
+import zlib
+from typing import Iterator, List, Tuple
+
+# HU11: NumPy es opcional, acelera el hash de ventana pero no es requerido
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class ChunkingStrategy:
+    """
+    HU27: Enumeración de estrategias de división en bloques
+    """
+    FIXED = "fixed"
+    CONTENT_DEFINED = "content"
+
+    ALL = (FIXED, CONTENT_DEFINED)
+
+    @staticmethod
+    def validate(strategy: str) -> str:
+        """
+        Valida el nombre de la estrategia
+
+        Raises:
+            ValueError: Si la estrategia no está soportada
+        """
+        if strategy not in ChunkingStrategy.ALL:
+            raise ValueError(f"Estrategia de división no soportada: {strategy}")
+        return strategy
+
+
+# Tablas byte -> valor de la ventana y valor -> bit. Son parte del formato en
+# la práctica: cambiarlas mueve todos los límites y los .pz anteriores dejan
+# de compartir bloques
+_BYTE_TABLE = bytes(random.Random(0x27).choices(range(256), k=256))
+_BIT_TABLE = bytes(random.Random(0x5A).choices((0, 1), k=256))
+
+# Bytes que cubre window_hash (potencia de 2)
+WINDOW_BYTES = 16
+
+# Bits de la primera etapa (bytes.find) y ventana del CRC32 de la segunda
+PATTERN_BITS = 14
+HASH_WINDOW = 32
+
+
+def _gf_double(value: int) -> int:
+    """Multiplica por 2 en GF(2^8) (polinomio 0x11D, donde 2 es primitivo)"""
+    value <<= 1
+    return value ^ 0x11D if value & 0x100 else value
+
+
+def _lag_table(lag: int) -> bytes:
+    """Tabla que multiplica por 2^lag en GF(2^8); es lineal respecto de XOR"""
+    table = []
+    for value in range(256):
+        for _ in range(lag):
+            value = _gf_double(value)
+        table.append(value)
+    return bytes(table)
+
+
+# Una tabla por paso de duplicación de la ventana: 1, 2, 4, ... WINDOW_BYTES/2
+_LAG_TABLES = [(lag, _lag_table(lag)) for lag in (1 << step for step in range(WINDOW_BYTES.bit_length() - 1))]
+
+
+def window_hash(data: bytes, context: bytes = b'') -> bytes:
+    """
+    Valor de 8 bits de la ventana que termina en cada posición de data
+
+    El valor en la posición i es el XOR, para cada distancia k menor que
+    WINDOW_BYTES, de _BYTE_TABLE[byte i-k] multiplicado por 2^k en GF(2^8).
+    Como la multiplicación es lineal respecto de XOR, la ventana de 2w bytes
+    se obtiene de la de w bytes: h2w(i) = hw(i) ^ 2^w·hw(i-w).
+
+    Args:
+        data: Bytes a recorrer
+        context: Bytes anteriores a data en el archivo (los últimos
+            WINDOW_BYTES - 1 bastan); al inicio del archivo, vacío
+
+    Returns:
+        Un byte por cada byte de data
+    """
+    context = context[-(WINDOW_BYTES - 1):]
+    if np is not None:
+        return _window_hash_numpy(context + data)[len(context):]
+    return _window_hash_python(context + data)[len(context):]
+
+
+def _window_hash_numpy(data: bytes) -> bytes:
+    """window_hash vectorizado con NumPy"""
+    hashed = np.frombuffer(data.translate(_BYTE_TABLE), dtype=np.uint8).copy()
+    for lag, table in _LAG_TABLES:
+        hashed[lag:] ^= np.take(np.frombuffer(table, dtype=np.uint8), hashed[:-lag])
+    return hashed.tobytes()
+
+
+def _window_hash_python(data: bytes) -> bytes:
+    """window_hash sin NumPy: cada paso es un translate y un XOR de enteros grandes"""
+    hashed = data.translate(_BYTE_TABLE)
+    value = int.from_bytes(hashed, 'little')
+    for lag, table in _LAG_TABLES:
+        # Los bytes que suben más allá del final no afectan a las posiciones válidas
+        value ^= int.from_bytes(hashed.translate(table), 'little') << (8 * lag)
+        hashed = value.to_bytes(len(data) + WINDOW_BYTES, 'little')
+    return hashed[:len(data)]
+
+
+# Bytes leídos por vez al buscar límites
+READ_SIZE = 4 * 1024 * 1024
+
+
+def _cut_pattern(bits: int) -> bytes:
+    """Patrón de corte de bits bytes, con tantos unos como ceros"""
+    pattern = [1] * (bits // 2) + [0] * (bits - bits // 2)
+    random.Random(bits).shuffle(pattern)
+    return bytes(pattern)
+
+
+class ContentDefinedChunker:
+    """
+    HU27: Calcula límites de bloque a partir del contenido
+
+    Ningún bloque es menor que min_size ni mayor que max_size (salvo el
+    último, que puede ser menor). Tras min_size, la probabilidad de corte
+    en cada posición es 2^-N, con N elegido para que el tamaño promedio se
+    acerque a avg_size.
+    """
+
+    def __init__(self, min_size: int, avg_size: int, max_size: int):
+        if not 0 < min_size <= avg_size <= max_size:
+            raise ValueError("Los tamaños deben cumplir 0 < mínimo <= promedio <= máximo")
+        self.min_size = min_size
+        self.avg_size = avg_size
+        self.max_size = max_size
+
+        # Distancia esperada desde min_size hasta el corte: 2^bits
+        gap = max(avg_size - min_size, avg_size // 4, 2)
+        bits = gap.bit_length() - 1
+        self.pattern = _cut_pattern(min(bits, PATTERN_BITS))
+        self.hash_mask = (1 << max(bits - PATTERN_BITS, 0)) - 1
+        # El hash se calcula solo desde min_size, por tramos del doble de la distancia esperada
+        self.search_step = max(2 << bits, 4096)
+
+    @classmethod
+    def for_block_size(cls, block_size: int, min_block_size: int, max_block_size: int) -> 'ContentDefinedChunker':
+        """
+        Chunker con promedio block_size, mínimo block_size/2 y máximo
+        4×block_size, acotados por los límites de FileBlockManager
+        """
+        return cls(max(min_block_size, block_size // 2), block_size, min(max_block_size, block_size * 4))
+
+    def iter_boundaries(self, file_path: str) -> Iterator[Tuple[int, int]]:
+        """
+        Recorre el archivo y entrega (offset, tamaño) de cada bloque
+
+        La memoria usada es del orden de 2 × max(max_size, READ_SIZE).
+        """
+        # Leer al menos max_size por vez: cada byte se copia una vez al rellenar
+        read_size = max(READ_SIZE, self.max_size)
+        data = b''
+        position = 0  # Inicio del bloque actual dentro de data
+        offset = 0    # Offset en el archivo del inicio del bloque actual
+        eof = False
+
+        with open(file_path, 'rb') as f:
+            while True:
+                if len(data) - position < self.max_size and not eof:
+                    chunk = f.read(read_size)
+                    if chunk:
+                        # Se conservan los bytes anteriores que pueden caer en una ventana
+                        keep = min(position, HASH_WINDOW)
+                        data = data[position - keep:] + chunk
+                        position = keep
+                        continue
+                    eof = True
+
+                remaining = len(data) - position
+                if remaining == 0:
+                    return
+                if remaining <= self.min_size:
+                    yield offset, remaining
+                    return
+
+                size = self._find_cut(data, position) or min(self.max_size, remaining)
+                yield offset, size
+                offset += size
+                position += size
+
+    def _find_cut(self, data: bytes, position: int) -> int:
+        """
+        Tamaño del bloque que empieza en position, o 0 si no hay corte antes de max_size
+        """
+        pattern = self.pattern
+        start = position + max(self.min_size - len(pattern), 0)
+        stop = min(position + self.max_size, len(data))
+        while start + len(pattern) <= stop:
+            end = min(start + self.search_step, stop)
+            bits = window_hash(data[start:end], data[max(start - WINDOW_BYTES, 0):start]).translate(_BIT_TABLE)
+            found = bits.find(pattern)
+            while found != -1:
+                cut = start + found + len(pattern)
+                if not zlib.crc32(data[max(cut - HASH_WINDOW, 0):cut]) & self.hash_mask:
+                    return cut - position
+                found = bits.find(pattern, found + 1)
+            # El tramo siguiente se superpone para no perder un patrón partido
+            start = end - len(pattern) + 1
+            if end == stop:
+                return 0
+        return 0
+
+    def boundaries(self, file_path: str) -> List[Tuple[int, int]]:
+        """Lista de (offset, tamaño) de todos los bloques del archivo"""
+        return list(self.iter_boundaries(file_path))
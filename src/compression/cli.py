@@ -0,0 +1,361 @@
+"""
+HU20: Interfaz de línea de comandos sin GUI
+
+Permite comprimir, descomprimir, verificar e inspeccionar archivos .pz en
+servidores sin pantalla. Solo importa el paquete de compresión, nunca
+tkinter.
+
+Uso (desde la raíz del proyecto):
+    python -m src.compression compress datos.bin -o datos.pz --threads 8 --block-size 1M
+    python -m src.compression decompress datos.pz -o datos.bin
+    python -m src.compression verify datos.pz
+    python -m src.compression inspect datos.pz --json
+    python -m src.compression compress fotos/ -o fotos.pz
+    python -m src.compression extract fotos.pz 2024/enero.jpg -o restaurado/
+
+Códigos de salida: 0 éxito, 1 fallo de la operación, 2 argumentos inválidos.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .archive import MemberArchive
+from .checksums import ChecksumAlgorithm, VerificationPolicy
+from .chunking import ChunkingStrategy
+from .codecs import BLOCK_FLAG_DUPLICATE, available_codecs
+from .dictionary import DEFAULT_DICTIONARY_SIZE
+from .executor_backend import ExecutorBackend, decompress_file_range
+from .parallel_compressor import ParallelCompressor
+from .pz_format import PzArchive
+from .temporary_storage import CompressionAlgorithm
+
+
+def parse_size(value: str) -> int:
+    """Convierte '64K', '1M' o '65536' a bytes"""
+    text = value.strip().upper()
+    multipliers = {'K': 1024, 'M': 1024 * 1024, 'G': 1024 * 1024 * 1024}
+    try:
+        if text and text[-1] in multipliers:
+            return int(float(text[:-1]) * multipliers[text[-1]])
+        return int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Tamaño inválido: {value}")
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError("Debe ser un entero positivo")
+    return number
+
+
+def _progress_printer(enabled: bool):
+    """Callback de progreso que escribe en stderr (o no hace nada)"""
+    def callback(message, progress, phase=None):
+        if enabled:
+            print(f"[{progress:5.1f}%] {message}", file=sys.stderr)
+        return True
+    return callback
+
+
+def _default_output(input_file: str, command: str) -> str:
+    if command == 'compress':
+        return os.path.normpath(input_file) + '.pz'
+    if input_file.endswith('.pz'):
+        return input_file[:-3]
+    return input_file + '.out'
+
+
+def _check_output(args) -> int:
+    """Evita sobrescribir salvo con --force; devuelve 0 si se puede continuar"""
+    if os.path.exists(args.output) and not args.force:
+        print(f"Error: {args.output} ya existe (use --force para sobrescribir)", file=sys.stderr)
+        return 1
+    return 0
+
+
+def _create_compressor(args) -> ParallelCompressor:
+    compressor = ParallelCompressor(block_size=getattr(args, 'block_size', None))
+    compressor.set_executor_backend(args.backend)
+    compressor.set_streaming_mode(args.streaming)
+    return compressor
+
+
+def cmd_compress(args) -> int:
+    """Comprime un archivo en formato .pz"""
+    args.output = args.output or _default_output(args.input, 'compress')
+    if _check_output(args):
+        return 1
+
+    try:
+        compressor = _create_compressor(args)
+        compressor.set_compression_algorithm(args.codec)
+        compressor.set_compression_level(args.level)
+        compressor.set_checksum_algorithm(args.checksum)
+        compressor.set_adaptive_mode(args.adaptive)
+        compressor.set_verification_policy(args.verification, args.verify_every, args.verify_rate)
+        compressor.set_shared_dictionary(args.dictionary is not None, args.dictionary or DEFAULT_DICTIONARY_SIZE)
+        compressor.set_deduplication(args.dedup)
+        compressor.set_chunking_strategy(args.chunking)
+        compressor.set_incremental_base(args.incremental)
+        compressor.set_checkpoint_dir(args.checkpoint)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    try:
+        success = compressor.compress_file_with_threads(args.input, args.output, args.threads,
+                                                        _progress_printer(args.verbose))
+    except (OSError, ValueError) as e:
+        # HU28: .pz anterior inválido o con otro algoritmo de checksum; salida o entrada inaccesibles
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if not success:
+        print(f"Error: no se pudo comprimir {args.input}", file=sys.stderr)
+        return 1
+
+    if not args.quiet:
+        # HU31: Un directorio se resume con la cantidad de archivos y el total de sus tamaños
+        members = compressor.get_compression_statistics().get('members')
+        if members:
+            print(f"{args.input} ({members['files']} archivos) -> {args.output}: {members['bytes']} -> "
+                  f"{os.path.getsize(args.output)} bytes en {time.perf_counter() - started:.2f}s")
+        else:
+            print(f"{args.input} -> {args.output}: {os.path.getsize(args.input)} -> "
+                  f"{os.path.getsize(args.output)} bytes en {time.perf_counter() - started:.2f}s")
+        incremental = compressor.get_compression_statistics().get('incremental')
+        if incremental:
+            print(f"Reutilizados de {incremental['base_file']}: {incremental['reused_blocks']} bloques "
+                  f"({incremental['reused_bytes']} bytes)")
+    return 0
+
+
+def cmd_decompress(args) -> int:
+    """Descomprime un archivo .pz"""
+    args.output = args.output or _default_output(args.input, 'decompress')
+    if _check_output(args):
+        return 1
+
+    compressor = _create_compressor(args)
+    started = time.perf_counter()
+    try:
+        success = compressor.decompress_file_with_threads(args.input, args.output, args.threads,
+                                                          _progress_printer(args.verbose))
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if not success:
+        print(f"Error: no se pudo descomprimir {args.input}", file=sys.stderr)
+        return 1
+
+    if not args.quiet:
+        print(f"{args.input} -> {args.output}: {os.path.getsize(args.output)} bytes "
+              f"en {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+def cmd_extract(args) -> int:
+    """HU31: Lista o extrae miembros de un .pz de directorio"""
+    try:
+        with MemberArchive(args.input) as archive:
+            if args.list:
+                for member in archive.list_members():
+                    print(f"{member['size']:>12}  {member['name']}")
+                return 0
+            output = args.output or _default_output(args.input, 'decompress')
+            paths = archive.extract_all(output, args.members or None)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if not args.quiet:
+        print(f"{args.input} -> {output}: {len(paths)} archivos")
+    return 0
+
+
+def verify_archive(file_path: str, num_threads: int = None):
+    """
+    HU20: Descomprime y verifica todos los bloques en paralelo sin escribir nada
+
+    Returns:
+        list: Errores encontrados como (id_de_bloque, mensaje); vacía si es válido
+    """
+    with PzArchive(file_path) as archive:
+        blocks = archive.blocks
+        checksum_algorithm = archive.checksum_algorithm
+        dictionary = archive.dictionary
+
+    def check(block):
+        try:
+            decompress_file_range(file_path, block['data_offset'], block['compressed_size'],
+                                  block['original_size'], block['id'], block['checksum'],
+                                  checksum_algorithm, block['codec_id'], block['flags'], dictionary)
+            return None
+        except Exception as e:
+            return (block['id'], str(e))
+
+    with ThreadPoolExecutor(max_workers=num_threads or os.cpu_count() or 1) as executor:
+        return [error for error in executor.map(check, blocks) if error]
+
+
+def cmd_verify(args) -> int:
+    """Verifica la integridad de un archivo .pz"""
+    try:
+        errors = verify_archive(args.input, args.threads)
+    except (OSError, ValueError) as e:
+        print(f"Error: {args.input} no es un archivo .pz válido: {e}", file=sys.stderr)
+        return 1
+
+    for block_id, message in errors:
+        print(f"Bloque {block_id}: {message}", file=sys.stderr)
+    if errors:
+        print(f"{args.input}: {len(errors)} bloques corruptos", file=sys.stderr)
+        return 1
+
+    if not args.quiet:
+        print(f"{args.input}: OK")
+    return 0
+
+
+def describe_archive(file_path: str, include_blocks: bool = False) -> dict:
+    """
+    HU20: Resume encabezado e índice de un archivo .pz sin descomprimirlo
+    """
+    with PzArchive(file_path) as archive:
+        header = archive.header
+        compressed_size = os.path.getsize(file_path)
+        info = {
+            'file': file_path,
+            'format': header.get('format'),
+            'original_filename': header.get('original_filename'),
+            'original_size': archive.original_size,
+            'compressed_size': compressed_size,
+            'compression_ratio': compressed_size / archive.original_size * 100 if archive.original_size else 0.0,
+            'compression_algorithm': header.get('compression_algorithm'),
+            'checksum_algorithm': archive.checksum_algorithm,
+            'dictionary_size': len(archive.dictionary) if archive.dictionary else 0,
+            'block_count': len(archive.blocks),
+            'duplicate_blocks': sum(1 for block in archive.blocks if block['flags'] & BLOCK_FLAG_DUPLICATE),
+            'member_count': header['members']['count'] if header.get('members') else 0  # HU31
+        }
+        if include_blocks:
+            info['blocks'] = [dict(block) for block in archive.blocks]
+    return info
+
+
+def cmd_inspect(args) -> int:
+    """Muestra los metadatos de un archivo .pz"""
+    try:
+        info = describe_archive(args.input, args.blocks)
+    except (OSError, ValueError) as e:
+        print(f"Error: {args.input} no es un archivo .pz válido: {e}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps(info, indent=2))
+        return 0
+
+    for key in ('file', 'format', 'original_filename', 'original_size', 'compressed_size',
+                'compression_algorithm', 'checksum_algorithm', 'dictionary_size', 'block_count',
+                'duplicate_blocks', 'member_count'):
+        print(f"{key:<22} {info[key]}")
+    print(f"{'compression_ratio':<22} {info['compression_ratio']:.1f}%")
+    for block in info.get('blocks', []):
+        print(f"  bloque {block['id']:>6}: offset {block['original_offset']:>12} "
+              f"{block['original_size']:>10} -> {block['compressed_size']:>10} bytes")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Construye el parser con los subcomandos"""
+    parser = argparse.ArgumentParser(prog="python -m src.compression",
+                                     description="Compresor de archivos paralelo (sin GUI)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def add_common(sub, output=True):
+        sub.add_argument('input', help="Archivo de entrada")
+        if output:
+            sub.add_argument('-o', '--output', help="Archivo de salida")
+            sub.add_argument('-f', '--force', action='store_true', help="Sobrescribir la salida si existe")
+            sub.add_argument('--backend', choices=(ExecutorBackend.THREADS, ExecutorBackend.PROCESSES), default=ExecutorBackend.THREADS,
+                             help="Ejecutar los códecs en hilos o procesos")
+            sub.add_argument('--streaming', action='store_true',
+                             help="Pipeline en streaming con memoria acotada")
+            sub.add_argument('-v', '--verbose', action='store_true', help="Mostrar el progreso en stderr")
+        sub.add_argument('-t', '--threads', type=_positive_int, default=os.cpu_count() or 1,
+                         help="Número de hilos o procesos (por defecto: núcleos de CPU)")
+        sub.add_argument('-q', '--quiet', action='store_true', help="No mostrar el resumen")
+
+    compress = subparsers.add_parser('compress', help="Comprimir un archivo o un directorio a .pz")
+    add_common(compress)
+    compress.add_argument('-b', '--block-size', type=parse_size, default=None,
+                          help="Tamaño de bloque, p. ej. 256K o 1M (por defecto: automático)")
+    compress.add_argument('--chunking', choices=ChunkingStrategy.ALL, default=ChunkingStrategy.FIXED,
+                          help="Bloques de tamaño fijo o definidos por el contenido (el tamaño es el promedio)")
+    compress.add_argument('-c', '--codec', choices=available_codecs(), default=CompressionAlgorithm.ZLIB)
+    compress.add_argument('-l', '--level', type=int, default=None,
+                          help="Nivel de compresión 0-9 (por defecto: el del códec)")
+    compress.add_argument('--adaptive', action='store_true',
+                          help="Elegir por bloque entre guardar sin comprimir, RLE o nivel rápido/alto")
+    compress.add_argument('--dictionary', type=parse_size, nargs='?', const=DEFAULT_DICTIONARY_SIZE, default=None,
+                          metavar='SIZE',
+                          help="Comprimir todos los bloques con un diccionario compartido (zlib, hasta 32K)")
+    compress.add_argument('--dedup', action='store_true',
+                          help="Guardar una sola vez los bloques idénticos")
+    compress.add_argument('--incremental', metavar='BASE.pz', default=None,
+                          help="Copiar de un .pz anterior los bloques sin cambios y comprimir solo el resto "
+                               "(requiere --checksum sha256)")
+    compress.add_argument('--checkpoint', metavar='DIR', default=None,
+                          help="Guardar los bloques en DIR; si el trabajo se interrumpe, repetir el comando lo reanuda")
+    compress.add_argument('--checksum', choices=tuple(ChecksumAlgorithm.DIGEST_SIZES),
+                          default=ChecksumAlgorithm.CRC32)
+    compress.add_argument('--verification', choices=VerificationPolicy.ALL, default=VerificationPolicy.CHECKSUM,
+                          help="Verificar cada bloque descomprimiéndolo (full), solo algunos (sampled), "
+                               "solo con el checksum al descomprimir (checksum) o nada (off)")
+    compress.add_argument('--verify-every', type=_positive_int, default=None,
+                          help="Con --verification sampled, verificar uno de cada N bloques")
+    compress.add_argument('--verify-rate', type=float, default=None,
+                          help="Con --verification sampled, fracción de bloques verificados al azar (0 a 1)")
+    compress.set_defaults(handler=cmd_compress)
+
+    decompress = subparsers.add_parser('decompress', help="Descomprimir un archivo .pz")
+    add_common(decompress)
+    decompress.set_defaults(handler=cmd_decompress)
+
+    verify = subparsers.add_parser('verify', help="Verificar los checksums de un archivo .pz")
+    add_common(verify, output=False)
+    verify.set_defaults(handler=cmd_verify)
+
+    extract = subparsers.add_parser('extract', help="Extraer archivos de un .pz de directorio")
+    extract.add_argument('input', help="Archivo .pz")
+    extract.add_argument('members', nargs='*', metavar='MIEMBRO',
+                         help="Rutas relativas a extraer (por defecto: todas)")
+    extract.add_argument('-o', '--output', help="Directorio de destino")
+    extract.add_argument('-l', '--list', action='store_true', help="Solo listar los miembros")
+    extract.add_argument('-q', '--quiet', action='store_true', help="No mostrar el resumen")
+    extract.set_defaults(handler=cmd_extract)
+
+    inspect = subparsers.add_parser('inspect', help="Mostrar encabezado e índice de un archivo .pz")
+    inspect.add_argument('input', help="Archivo .pz")
+    inspect.add_argument('--json', action='store_true', help="Salida en JSON")
+    inspect.add_argument('--blocks', action='store_true', help="Incluir la tabla de bloques")
+    inspect.set_defaults(handler=cmd_inspect)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    """Punto de entrada; devuelve el código de salida"""
+    args = build_parser().parse_args(argv)
+
+    # HU31: compress también acepta un directorio
+    if not (os.path.isfile(args.input) or (args.command == 'compress' and os.path.isdir(args.input))):
+        print(f"Error: el archivo no existe: {args.input}", file=sys.stderr)
+        return 1
+
+    return args.handler(args)
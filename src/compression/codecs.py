@@ -0,0 +1,239 @@
+"""
+HU21: Registro de códecs de compresión
+
+Cada códec tiene un nombre (el que se configura en ParallelCompressor y se
+guarda en el encabezado del .pz) y un ID numérico que se guarda en la
+entrada del índice de cada bloque. Así la descompresión elige el códec
+directamente, sin probar zlib y luego RLE, y distintos bloques de un mismo
+archivo pueden usar códecs distintos.
+
+Los IDs son parte del formato: no deben reutilizarse. El ID 0 indica un
+bloque escrito antes de HU21, cuyo códec se deduce como antes.
+
+Los códecs registrados en tiempo de ejecución con register_codec solo son
+visibles en procesos trabajadores creados por fork; los de este módulo
+están disponibles en todos.
+"""
+
+import bz2
+import gzip
+import lzma
+import zlib
+from typing import Dict, List, Optional
+
+from .temporary_storage import RLECompressor
+
+
+# HU21: ID reservado para bloques sin códec registrado (archivos anteriores)
+LEGACY_CODEC_ID = 0
+
+# HU23: Bit de 'flags' en el índice del .pz: el bloque se guardó sin comprimir
+BLOCK_FLAG_STORED = 0x01
+# HU24: Bit de 'flags': el bloque no tiene checksum (VerificationPolicy.OFF)
+BLOCK_FLAG_NO_CHECKSUM = 0x02
+# HU25: Bit de 'flags': el bloque se comprimió con el diccionario del encabezado
+BLOCK_FLAG_DICTIONARY = 0x04
+# HU26: Bit de 'flags': el bloque repite otro; su entrada apunta a los datos del original
+BLOCK_FLAG_DUPLICATE = 0x08
+
+
+class Codec:
+    """
+    HU21: Códec de bloque
+
+    Las subclases definen name, codec_id, el rango de niveles y los métodos
+    _compress/decompress. Un códec sin niveles usa min_level == max_level.
+    HU25: Los códecs con supports_dictionary también implementan
+    _compress_with_dictionary/decompress_with_dictionary.
+    """
+    name = None
+    codec_id = None
+    min_level = 0
+    max_level = 0
+    default_level = 0
+    supports_dictionary = False
+
+    def resolve_level(self, level: Optional[int] = None) -> int:
+        """
+        Obtiene el nivel efectivo: el por defecto si es None y, si está fuera
+        del rango del códec, el más cercano dentro del rango
+        """
+        if level is None:
+            return self.default_level
+        return max(self.min_level, min(self.max_level, level))
+
+    def compress(self, data: bytes, level: Optional[int] = None) -> bytes:
+        """Comprime un bloque con el nivel indicado"""
+        return self._compress(data, self.resolve_level(level))
+
+    def _compress(self, data: bytes, level: int) -> bytes:
+        raise NotImplementedError
+
+    def decompress(self, data: bytes) -> bytes:
+        """Descomprime un bloque"""
+        raise NotImplementedError
+
+    def compress_with_dictionary(self, data: bytes, dictionary: bytes, level: Optional[int] = None) -> bytes:
+        """
+        HU25: Comprime un bloque con un diccionario predefinido
+
+        Raises:
+            ValueError: Si el códec no admite diccionarios
+        """
+        if not self.supports_dictionary:
+            raise ValueError(f"El códec {self.name} no admite diccionario")
+        return self._compress_with_dictionary(data, dictionary, self.resolve_level(level))
+
+    def _compress_with_dictionary(self, data: bytes, dictionary: bytes, level: int) -> bytes:
+        raise NotImplementedError
+
+    def decompress_with_dictionary(self, data: bytes, dictionary: bytes) -> bytes:
+        """
+        HU25: Descomprime un bloque comprimido con un diccionario predefinido
+
+        Raises:
+            ValueError: Si el códec no admite diccionarios
+        """
+        raise ValueError(f"El códec {self.name} no admite diccionario")
+
+
+class ZlibCodec(Codec):
+    """zlib (deflate), el códec por defecto; HU25: admite diccionario (zdict)"""
+    name = "zlib"
+    codec_id = 1
+    min_level = 0
+    max_level = 9
+    default_level = 6
+    supports_dictionary = True
+
+    def _compress(self, data: bytes, level: int) -> bytes:
+        return zlib.compress(data, level)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zlib.decompress(data)
+
+    def _compress_with_dictionary(self, data: bytes, dictionary: bytes, level: int) -> bytes:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS, zdict=dictionary)
+        return compressor.compress(data) + compressor.flush()
+
+    def decompress_with_dictionary(self, data: bytes, dictionary: bytes) -> bytes:
+        decompressor = zlib.decompressobj(zlib.MAX_WBITS, zdict=dictionary)
+        result = decompressor.decompress(data) + decompressor.flush()
+        if not decompressor.eof:
+            raise zlib.error("Flujo zlib incompleto")
+        return result
+
+
+class RLECodec(Codec):
+    """HU05/HU11: Run-Length Encoding (sin niveles)"""
+    name = "rle"
+    codec_id = 2
+
+    def _compress(self, data: bytes, level: int) -> bytes:
+        return RLECompressor.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return RLECompressor.decompress(data)
+
+
+class Bz2Codec(Codec):
+    """bzip2: más lento que zlib, mejor ratio en texto"""
+    name = "bz2"
+    codec_id = 3
+    min_level = 1
+    max_level = 9
+    default_level = 9
+
+    def _compress(self, data: bytes, level: int) -> bytes:
+        return bz2.compress(data, level)
+
+    def decompress(self, data: bytes) -> bytes:
+        return bz2.decompress(data)
+
+
+class LzmaCodec(Codec):
+    """LZMA (xz): el mejor ratio y el más lento; el nivel es el preset"""
+    name = "lzma"
+    codec_id = 4
+    min_level = 0
+    max_level = 9
+    default_level = 6
+
+    def _compress(self, data: bytes, level: int) -> bytes:
+        return lzma.compress(data, preset=level)
+
+    def decompress(self, data: bytes) -> bytes:
+        return lzma.decompress(data)
+
+
+class GzipCodec(Codec):
+    """gzip: deflate con encabezado gzip (mtime fijo para salidas reproducibles)"""
+    name = "gzip"
+    codec_id = 5
+    min_level = 0
+    max_level = 9
+    default_level = 6
+
+    def _compress(self, data: bytes, level: int) -> bytes:
+        return gzip.compress(data, compresslevel=level, mtime=0)
+
+    def decompress(self, data: bytes) -> bytes:
+        return gzip.decompress(data)
+
+
+_CODECS_BY_NAME: Dict[str, Codec] = {}
+_CODECS_BY_ID: Dict[int, Codec] = {}
+
+
+def register_codec(codec: Codec) -> Codec:
+    """
+    HU21: Registra un códec
+
+    Raises:
+        ValueError: Si el nombre o el ID ya están registrados o el ID es inválido
+    """
+    if not isinstance(codec.codec_id, int) or not 0 < codec.codec_id <= 255:
+        raise ValueError(f"ID de códec inválido: {codec.codec_id}")
+    if codec.name in _CODECS_BY_NAME:
+        raise ValueError(f"Ya existe un códec llamado {codec.name}")
+    if codec.codec_id in _CODECS_BY_ID:
+        raise ValueError(f"El ID de códec {codec.codec_id} ya está en uso")
+
+    _CODECS_BY_NAME[codec.name] = codec
+    _CODECS_BY_ID[codec.codec_id] = codec
+    return codec
+
+
+def get_codec(name: str) -> Codec:
+    """
+    HU21: Obtiene un códec por nombre
+
+    Raises:
+        ValueError: Si el códec no está registrado
+    """
+    try:
+        return _CODECS_BY_NAME[name]
+    except (KeyError, TypeError):
+        raise ValueError(f"Algoritmo de compresión no soportado: {name}")
+
+
+def get_codec_by_id(codec_id: int) -> Codec:
+    """
+    HU21: Obtiene un códec por el ID guardado en el índice del .pz
+
+    Raises:
+        ValueError: Si el ID no corresponde a ningún códec registrado
+    """
+    try:
+        return _CODECS_BY_ID[codec_id]
+    except KeyError:
+        raise ValueError(f"ID de códec desconocido: {codec_id}")
+
+
+def available_codecs() -> List[str]:
+    """HU21: Nombres de los códecs registrados, en orden de ID"""
+    return [_CODECS_BY_ID[codec_id].name for codec_id in sorted(_CODECS_BY_ID)]
+
+
+for _codec_class in (ZlibCodec, RLECodec, Bz2Codec, LzmaCodec, GzipCodec):
+    register_codec(_codec_class())
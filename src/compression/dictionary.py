@@ -0,0 +1,73 @@
+"""
+HU25: Diccionario compartido entre bloques
+
+Cada bloque del .pz se comprime por separado, así que empieza con la
+ventana de zlib vacía y pierde las repeticiones que comparte con el resto
+del archivo. Con un diccionario predefinido (zdict), armado con porciones
+de todo el archivo, cada bloque arranca con esa ventana ya cargada y
+recupera buena parte del ratio perdido, sin dejar de ser descomprimible
+por separado y en paralelo.
+
+El diccionario se guarda una sola vez, en el encabezado del .pz
+('dictionary', comprimido con zlib y en base64); los bloques que lo usan
+llevan BLOCK_FLAG_DICTIONARY en el índice.
+"""
+
+import base64
+import os
+import zlib
+from typing import Any, Dict, Optional
+
+from .executor_backend import read_file_range
+
+
+# zlib solo aprovecha los últimos 32KB del diccionario (el tamaño de su ventana)
+MAX_DICTIONARY_SIZE = 32 * 1024
+DEFAULT_DICTIONARY_SIZE = MAX_DICTIONARY_SIZE
+
+# Porciones repartidas a lo largo del archivo que forman el diccionario
+DICTIONARY_SLICES = 8
+
+
+def build_dictionary(file_path: str, size: int = DEFAULT_DICTIONARY_SIZE) -> Optional[bytes]:
+    """
+    Arma un diccionario con DICTIONARY_SLICES porciones repartidas uniformemente
+
+    Returns:
+        bytes: El diccionario, o None si el archivo está vacío
+    """
+    if not 0 < size <= MAX_DICTIONARY_SIZE:
+        raise ValueError(f"El tamaño del diccionario debe estar entre 1 y {MAX_DICTIONARY_SIZE} bytes")
+
+    file_size = os.path.getsize(file_path)
+    if file_size == 0:
+        return None
+    if file_size <= size:
+        return read_file_range(file_path, 0, file_size)
+
+    slice_size = size // DICTIONARY_SLICES
+    step = (file_size - slice_size) // (DICTIONARY_SLICES - 1)
+    return b''.join(
+        read_file_range(file_path, i * step, slice_size) for i in range(DICTIONARY_SLICES)
+    )
+
+
+def dictionary_to_header(dictionary: bytes) -> str:
+    """Codifica el diccionario para el encabezado JSON"""
+    return base64.b64encode(zlib.compress(dictionary, 9)).decode('ascii')
+
+
+def dictionary_from_header(header: Dict[str, Any]) -> Optional[bytes]:
+    """
+    Obtiene el diccionario del encabezado de un .pz (None si no tiene)
+
+    Raises:
+        ValueError: Si el diccionario está corrupto
+    """
+    encoded = header.get('dictionary')
+    if not encoded:
+        return None
+    try:
+        return zlib.decompress(base64.b64decode(encoded, validate=True))
+    except (ValueError, TypeError, zlib.error) as e:
+        raise ValueError(f"Archivo comprimido inválido: diccionario corrupto - {e}")
@@ -0,0 +1,28 @@
+"""
+HU07: Tipos y severidades de error compartidos
+HU20: Viven en el paquete de compresión para que éste pueda importarse sin
+cargar la GUI (tkinter); gui.error_handler los reexporta.
+"""
+
+from enum import Enum
+
+
+class ErrorType(Enum):
+    """Tipos de errores que puede manejar la aplicación"""
+    FILE_READ = "Lectura de archivo"
+    FILE_WRITE = "Escritura de archivo"
+    COMPRESSION = "Compresión"
+    DECOMPRESSION = "Descompresión"
+    PERMISSION = "Permisos"
+    VALIDATION = "Validación"
+    NETWORK = "Red"
+    MEMORY = "Memoria"
+    UNKNOWN = "Error desconocido"
+
+
+class ErrorSeverity(Enum):
+    """Niveles de severidad de errores"""
+    INFO = "info"
+    WARNING = "warning"
+    ERROR = "error"
+    CRITICAL = "critical"
@@ -0,0 +1,211 @@
+"""
+HU10: Backend de ejecución seleccionable (hilos o procesos)
+Funciones de trabajo a nivel de módulo para que puedan enviarse a un
+pool de procesos. Los bloques se describen por (ruta, offset, tamaño):
+cada proceso lee su propio bloque del disco, así que el proceso principal
+no tiene que serializar los datos originales hacia los trabajadores.
+"""
+
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from .adaptive import AdaptiveCodecSelector, BlockStrategy
+from .checksums import ChecksumAlgorithm
+from .codecs import BLOCK_FLAG_DICTIONARY, BLOCK_FLAG_STORED, LEGACY_CODEC_ID, get_codec, get_codec_by_id
+from .temporary_storage import CompressionAlgorithm
+
+
+class ExecutorBackend:
+    """
+    HU10: Enumeración de backends de ejecución disponibles
+    """
+    THREADS = "threads"
+    PROCESSES = "processes"
+
+    @staticmethod
+    def validate(backend: str) -> str:
+        """
+        Valida el nombre del backend
+
+        Raises:
+            ValueError: Si el backend no está soportado
+        """
+        if backend not in (ExecutorBackend.THREADS, ExecutorBackend.PROCESSES):
+            raise ValueError(f"Backend de ejecución no soportado: {backend}")
+        return backend
+
+
+def create_process_pool(num_workers: int) -> ProcessPoolExecutor:
+    """
+    HU10: Crea un pool de procesos con el número de trabajadores indicado
+    """
+    return ProcessPoolExecutor(max_workers=max(1, num_workers))
+
+
+def read_file_range(file_path: str, offset: int, size: int) -> bytes:
+    """
+    Lee size bytes del archivo a partir de offset
+
+    Raises:
+        IOError: Si el archivo tiene menos datos de los esperados
+    """
+    with open(file_path, 'rb') as f:
+        f.seek(offset)
+        data = f.read(size)
+
+    if len(data) != size:
+        raise IOError(f"Lectura incompleta en offset {offset}: esperado {size} bytes, leído {len(data)} bytes")
+
+    return data
+
+
+def encode_block(data: bytes, algorithm: str, level: int = None,
+                 selector: AdaptiveCodecSelector = None, adaptive: bool = False,
+                 verify: bool = True, dictionary: bytes = None) -> Dict[str, Any]:
+    """
+    HU23: Codifica un bloque y decide si se guarda comprimido o tal cual
+
+    Con un selector, una muestra detecta de antemano los bloques
+    incompresibles, que se guardan sin el ciclo de compresión y verificación.
+    HU22: Con adaptive=True el selector además elige códec y nivel.
+    HU24: Con verify=True el bloque comprimido se descomprime y se compara
+    con el original. Los bloques que no se reducen o no pasan la
+    verificación de integridad se guardan sin comprimir.
+    HU25: Si el códec lo admite, el bloque se comprime con el diccionario
+    compartido.
+
+    Returns:
+        dict: data, compression_ratio, codec, stored (bool), verified (bool),
+        dictionary (bool: se usó el diccionario) y decision (la decisión del
+        selector en modo adaptativo, si no None)
+    """
+    decision = None
+    if selector is not None:
+        decision = selector.choose(data, algorithm) if adaptive else selector.probe(data, algorithm)
+        if decision['strategy'] == BlockStrategy.STORE:
+            return _stored_block(data, algorithm, decision if adaptive else None)
+        if adaptive:
+            algorithm, level = decision['codec'], decision['level']
+        else:
+            decision = None
+
+    if dictionary is not None and not get_codec(algorithm).supports_dictionary:
+        dictionary = None
+
+    try:
+        compressed_data = CompressionAlgorithm.compress(data, algorithm, level, dictionary)
+        if len(compressed_data) >= len(data):
+            return _stored_block(data, algorithm, decision)
+        if verify and CompressionAlgorithm.decompress(compressed_data, algorithm, dictionary) != data:
+            raise ValueError("Error de integridad en compresión")
+    except Exception:
+        return _stored_block(data, algorithm, decision)
+
+    return {
+        'data': compressed_data,
+        'compression_ratio': (len(compressed_data) / len(data)) * 100,
+        'codec': algorithm,
+        'stored': False,
+        'verified': verify,
+        'dictionary': dictionary is not None,
+        'decision': decision
+    }
+
+
+def _stored_block(data: bytes, algorithm: str, decision: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """HU23: Resultado de encode_block para un bloque guardado sin comprimir"""
+    return {
+        'data': bytes(data),
+        'compression_ratio': 100.0,
+        'codec': algorithm,
+        'stored': True,
+        'verified': False,
+        'dictionary': False,
+        'decision': decision
+    }
+
+
+def decompress_payload(compressed_data: bytes, original_size: int,
+                       codec_id: int = LEGACY_CODEC_ID, flags: int = 0,
+                       dictionary: bytes = None) -> bytes:
+    """
+    Descomprime un bloque de un archivo .pz
+
+    HU23: Los bloques con BLOCK_FLAG_STORED se devuelven tal cual, sin copia.
+    HU21: El resto se descomprime con el códec indicado en el índice.
+    HU25: Los bloques con BLOCK_FLAG_DICTIONARY necesitan el diccionario
+    del encabezado.
+    Solo los bloques de archivos anteriores (sin códec registrado) deducen
+    el formato: si ocupan lo mismo que el original se guardaron sin
+    comprimir; si no, se prueba zlib y luego RLE.
+    """
+    if flags & BLOCK_FLAG_STORED:
+        return compressed_data
+
+    if flags & BLOCK_FLAG_DICTIONARY:
+        if dictionary is None:
+            raise ValueError("El bloque requiere el diccionario del encabezado")
+        return get_codec_by_id(codec_id).decompress_with_dictionary(compressed_data, dictionary)
+
+    if codec_id != LEGACY_CODEC_ID:
+        return get_codec_by_id(codec_id).decompress(compressed_data)
+
+    if len(compressed_data) == original_size:
+        return compressed_data
+
+    try:
+        return zlib.decompress(compressed_data)
+    except zlib.error:
+        return CompressionAlgorithm.decompress(compressed_data, CompressionAlgorithm.RLE)
+
+
+def encode_file_range(file_path: str, offset: int, size: int, algorithm: str, level: int = None,
+                      checksum_algorithm: Optional[str] = ChecksumAlgorithm.CRC32,
+                      selector: AdaptiveCodecSelector = None, adaptive: bool = False,
+                      verify: bool = True, dictionary: bytes = None) -> Dict[str, Any]:
+    """
+    HU10/HU23: Trabajo de compresión de un proceso con el resultado de encode_block
+
+    Returns:
+        dict: Los campos de encode_block más checksum (del bloque original;
+        None si checksum_algorithm es None) y worker_id (pid del trabajador)
+    """
+    data = read_file_range(file_path, offset, size)
+    encoded = encode_block(data, algorithm, level, selector, adaptive, verify, dictionary)
+    encoded['checksum'] = ChecksumAlgorithm.compute(data, checksum_algorithm) if checksum_algorithm else None
+    encoded['worker_id'] = os.getpid()
+    return encoded
+
+
+def verify_block(data: bytes, block_id: int, original_size: int, checksum: Optional[int],
+                 checksum_algorithm: str = ChecksumAlgorithm.CRC32) -> bytes:
+    """
+    HU18: Verifica tamaño y checksum de un bloque descomprimido
+
+    Raises:
+        ValueError: Si el bloque no coincide con lo registrado en el índice
+    """
+    if len(data) != original_size:
+        raise ValueError(f"Tamaño descomprimido incorrecto para bloque {block_id}")
+    if not ChecksumAlgorithm.verify(data, checksum, checksum_algorithm):
+        raise ValueError(f"Checksum incorrecto en bloque {block_id}")
+    return data
+
+
+def decompress_file_range(file_path: str, offset: int, compressed_size: int,
+                          original_size: int, block_id: int = 0, checksum: Optional[int] = None,
+                          checksum_algorithm: str = ChecksumAlgorithm.CRC32,
+                          codec_id: int = LEGACY_CODEC_ID, flags: int = 0,
+                          dictionary: bytes = None) -> Tuple[bytes, int]:
+    """
+    HU10: Trabajo de descompresión ejecutado dentro de un proceso
+    HU18: El bloque se verifica dentro del proceso, en paralelo con los demás
+
+    Returns:
+        tuple: (datos_descomprimidos, pid_del_trabajador)
+    """
+    compressed_data = read_file_range(file_path, offset, compressed_size)
+    data = decompress_payload(compressed_data, original_size, codec_id, flags, dictionary)
+    return verify_block(data, block_id, original_size, checksum, checksum_algorithm), os.getpid()
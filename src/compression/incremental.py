@@ -0,0 +1,115 @@
+"""
+HU28: Recompresión incremental contra un .pz anterior
+
+Al volver a comprimir una versión nueva de un archivo, la mayoría de sus
+bloques suele ser igual a la de la versión anterior. El índice del .pz
+anterior guarda el tamaño y el checksum de los datos originales de cada
+bloque: si un bloque nuevo coincide en ambos, sus datos comprimidos se
+copian tal cual del .pz anterior y solo se comprimen los bloques que
+cambiaron. El costo pasa a ser proporcional a los datos modificados (más
+calcular un checksum por bloque).
+
+El checksum es la única prueba de que el bloque no cambió. Con CRC32 o
+Adler-32 dos bloques distintos del mismo tamaño pueden coincidir, y el
+bloque copiado pasaría la verificación porque su checksum guardado es el
+del contenido equivocado; con decenas de miles de bloques por respaldo
+eso es un riesgo real. Por eso este modo exige SHA-256
+(INCREMENTAL_CHECKSUMS) en ambas compresiones.
+
+Con bloques de tamaño fijo una inserción desplaza todos los bloques
+posteriores; con la división por contenido (HU27) los límites se
+resincronizan y casi todos los bloques se reutilizan.
+"""
+
+import threading
+from typing import Dict, Optional, Tuple
+
+from .checksums import ChecksumAlgorithm
+from .codecs import BLOCK_FLAG_DICTIONARY, BLOCK_FLAG_DUPLICATE, BLOCK_FLAG_NO_CHECKSUM, LEGACY_CODEC_ID
+from .executor_backend import read_file_range
+from .pz_format import PzArchive
+
+
+# Algoritmos con los que una coincidencia de checksum prueba que el bloque no cambió
+INCREMENTAL_CHECKSUMS = (ChecksumAlgorithm.SHA256,)
+
+def checksum_file_range(file_path: str, offset: int, size: int, algorithm: str) -> int:
+    """
+    Trabajo para el pool de procesos: lee un rango del archivo y devuelve su checksum
+    """
+    return ChecksumAlgorithm.compute(read_file_range(file_path, offset, size), algorithm)
+
+
+class IncrementalBase:
+    """
+    HU28: Bloques de un .pz anterior indexados por (tamaño original, checksum)
+
+    Es segura para usar desde varios hilos. No se indexan los bloques sin
+    checksum, los de códec desconocido (archivos anteriores a HU21) ni, si
+    el diccionario de la compresión nueva es otro, los comprimidos con el
+    diccionario del .pz anterior.
+    """
+
+    def __init__(self, file_path: str):
+        """
+        Abre el .pz anterior y carga su índice
+
+        Raises:
+            ValueError, IOError: Si el archivo no es un .pz válido
+        """
+        self.file_path = file_path
+        self._archive = PzArchive(file_path)
+        self.checksum_algorithm = self._archive.checksum_algorithm
+        self.dictionary = self._archive.dictionary
+        self._entries: Dict[Tuple[int, int], dict] = {}
+        self._lock = threading.Lock()
+        self.reused_blocks = 0
+        self.reused_bytes = 0
+        self.use_dictionary(None)
+
+    def use_dictionary(self, dictionary: Optional[bytes]) -> None:
+        """
+        Indica el diccionario de la compresión nueva; los bloques del .pz
+        anterior comprimidos con otro diccionario dejan de ser reutilizables
+        """
+        entries = {}
+        for block in self._archive.blocks:
+            if block['checksum'] is None or block['flags'] & BLOCK_FLAG_NO_CHECKSUM:
+                continue
+            if block['codec_id'] == LEGACY_CODEC_ID:
+                continue
+            if block['flags'] & BLOCK_FLAG_DICTIONARY and (dictionary is None or dictionary != self.dictionary):
+                continue
+            entries.setdefault((block['original_size'], block['checksum']), block)
+        self._entries = entries
+
+    def reuse(self, size: int, checksum: int) -> Optional[Tuple[bytes, dict]]:
+        """
+        Busca un bloque del .pz anterior con el mismo tamaño y checksum
+
+        Returns:
+            tuple: (datos comprimidos, entrada del índice anterior sin
+            BLOCK_FLAG_DUPLICATE), o None si el bloque cambió
+        """
+        block = self._entries.get((size, checksum))
+        if block is None:
+            return None
+
+        compressed_data = self._archive.read_compressed(block['id'])
+        with self._lock:
+            self.reused_blocks += 1
+            self.reused_bytes += size
+        return compressed_data, dict(block, flags=block['flags'] & ~BLOCK_FLAG_DUPLICATE)
+
+    def get_statistics(self) -> dict:
+        """Bloques reutilizados del .pz anterior y bytes que no se comprimieron"""
+        with self._lock:
+            return {
+                'base_file': self.file_path,
+                'reused_blocks': self.reused_blocks,
+                'reused_bytes': self.reused_bytes
+            }
+
+    def close(self) -> None:
+        """Cierra el .pz anterior"""
+        self._archive.close()
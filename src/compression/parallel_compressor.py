@@ -8,29 +8,50 @@ HU07: Manejo centralizado de errores
 
 import threading
 import time
-import zlib
 import os
-import json
+import random
+from contextlib import contextmanager
 from pathlib import Path
-from queue import Queue
+from queue import Queue, Empty, Full
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from .block_manager import FileBlockManager
-from .temporary_storage import TemporaryBlockStorage, CompressionAlgorithm
-
-# Import error handler with fallback for compatibility
-try:
-    from gui.error_handler import ErrorHandler, ErrorType, ErrorSeverity
-except ImportError:
-    # Fallback cuando se ejecuta desde tests
-    import sys
-    import os
-    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-    from gui.error_handler import ErrorHandler, ErrorType, ErrorSeverity
+from .chunking import ChunkingStrategy
+from .temporary_storage import TemporaryBlockStorage, CompressionAlgorithm, JournalSyncPolicy, RLECompressor
+from .executor_backend import (
+    ExecutorBackend, create_process_pool, read_file_range,
+    encode_block, encode_file_range, decompress_payload, decompress_file_range, verify_block
+)
+from .adaptive import AdaptiveCodecSelector
+from .archive import plan_member_blocks, read_file_pieces, scan_directory
+from .scheduler import DynamicBlockScheduler
+from .checksums import ChecksumAlgorithm, VerificationPolicy
+from .codecs import (
+    BLOCK_FLAG_DICTIONARY, BLOCK_FLAG_DUPLICATE, BLOCK_FLAG_NO_CHECKSUM, BLOCK_FLAG_STORED, LEGACY_CODEC_ID,
+    get_codec, get_codec_by_id
+)
+from .dedup import DedupTable, content_digest, hash_file_range
+from .incremental import INCREMENTAL_CHECKSUMS, IncrementalBase, checksum_file_range
+from .worker_pool import WorkerPool
+from .dictionary import (
+    DEFAULT_DICTIONARY_SIZE, MAX_DICTIONARY_SIZE, build_dictionary, dictionary_from_header, dictionary_to_header
+)
+from .pz_format import (
+    FORMAT_V2, PzArchive, PzBlockWriter, block_checksum, write_header, read_header, write_index, read_index,
+    resolve_duplicate_entries
+)
+# HU20: Sin dependencias de la GUI; el ErrorHandler (tkinter) es opcional y lo inyecta quien lo use
+from .errors import ErrorType, ErrorSeverity
 
 
 class ParallelCompressor:
     """Clase para manejar la compresión paralela de archivos"""
     
-    def __init__(self, block_size: int = None, error_handler: ErrorHandler = None):
+    # HU09: Profundidad por defecto de las colas del pipeline en streaming
+    DEFAULT_STREAM_QUEUE_DEPTH = 4
+    # HU24: Con la política 'sampled', se verifica uno de cada N bloques
+    DEFAULT_VERIFICATION_INTERVAL = 16
+    
+    def __init__(self, block_size: int = None, error_handler=None):
         self.is_compressing = False
         self.compression_results = []
         self.cancel_requested = False
@@ -39,28 +60,92 @@ class ParallelCompressor:
         self.compression_stats = {}
         # HU05: Almacenamiento temporal para bloques comprimidos
         self.temp_storage = None
+        # HU29: Directorio de checkpoint para reanudar compresiones interrumpidas (None = temporal)
+        self.checkpoint_dir = None
+        self.checkpoint_sync_policy = JournalSyncPolicy.BATCH
+        # HU16: Escritura directa al archivo final (sin archivos temporales)
+        self.direct_output = True
+        self._block_writer = None
         self.compression_algorithm = CompressionAlgorithm.ZLIB
+        # HU20/HU21: Nivel de compresión (None = el por defecto de cada códec)
+        self.compression_level = None
+        # HU22: Selección adaptativa de códec y nivel por bloque (None = desactivada)
+        self.adaptive_selector = None
+        # HU23: Detección previa de bloques incompresibles (se guardan sin comprimir)
+        self.incompressible_selector = AdaptiveCodecSelector()
+        self._stats_lock = threading.Lock()
+        # HU18: Checksum de cada bloque guardado en el índice del .pz
+        self.checksum_algorithm = ChecksumAlgorithm.CRC32
+        # HU24: Verificación de ida y vuelta al comprimir (por defecto solo checksums)
+        self.verification_policy = VerificationPolicy.CHECKSUM
+        self.verification_interval = self.DEFAULT_VERIFICATION_INTERVAL
+        self.verification_rate = None
+        self._verification_random = random.Random()
+        # HU25: Diccionario compartido entre bloques (tamaño; None = desactivado)
+        self.shared_dictionary_size = None
+        self._dictionary = None
+        # HU26: Deduplicación de bloques idénticos (tabla nueva en cada compresión)
+        self.dedup_enabled = False
+        self._dedup_table = None
+        # HU28: .pz anterior cuyos bloques sin cambios se reutilizan (None = desactivado)
+        self.incremental_base = None
+        self._incremental_base = None
         # HU07: Manejo centralizado de errores
         self.error_handler = error_handler
         # HU08: Estado de descompresión
         self.is_decompressing = False
+        # HU14: Estadísticas de la última descompresión
+        self.decompression_stats = {}
+        # HU09: Pipeline en streaming con memoria acotada
+        self.streaming_enabled = False
+        self.stream_queue_depth = self.DEFAULT_STREAM_QUEUE_DEPTH
+        # HU13: Lectura de bloques mediante mmap (sin copias)
+        self.use_mmap = False
+        # HU10: Backend de ejecución (hilos o procesos)
+        self.executor_backend = ExecutorBackend.THREADS
+        self._process_pool = None
+        # HU30: Pool de trabajadores compartido entre trabajos (None = trabajadores propios)
+        self.worker_pool = None
+        # HU31: Error de lectura de un bloque de directorio que aborta el trabajo
+        self._worker_error = None
     
     def set_block_size(self, block_size: int):
         """
         Configura el tamaño de bloque para la división
         HU04: El tamaño de bloque debe ser configurable
         """
-        self.block_manager = FileBlockManager(block_size)
+        self.block_manager = FileBlockManager(block_size, use_mmap=self.use_mmap,
+                                              chunking=self.block_manager.chunking)
     
     def get_block_size(self) -> int:
         """Obtiene el tamaño de bloque actual"""
         return self.block_manager.block_size
     
+    def set_chunking_strategy(self, strategy: str):
+        """
+        HU27: Configura cómo se divide el archivo en bloques (ChunkingStrategy)
+        
+        Con ChunkingStrategy.CONTENT_DEFINED los límites se eligen con un hash
+        rodante sobre el contenido: los bloques miden en promedio el tamaño de
+        bloque configurado (entre la mitad y 4 veces, dentro de los límites de
+        FileBlockManager) y una inserción o eliminación solo cambia los
+        bloques que la rodean, de modo que la deduplicación sigue encontrando
+        el resto.
+        """
+        self.block_manager.chunking = ChunkingStrategy.validate(strategy)
+    
+    def get_chunking_strategy(self) -> str:
+        """
+        HU27: Obtiene la estrategia de división actual
+        """
+        return self.block_manager.chunking
+    
     def set_compression_algorithm(self, algorithm: CompressionAlgorithm):
         """
-        HU05: Configura el algoritmo de compresión (zlib o RLE)
+        HU05: Configura el algoritmo de compresión
+        HU21: Acepta cualquier códec registrado (zlib, rle, bz2, lzma, gzip)
         """
-        self.compression_algorithm = algorithm
+        self.compression_algorithm = CompressionAlgorithm.validate(algorithm)
     
     def get_compression_algorithm(self) -> CompressionAlgorithm:
         """
@@ -68,6 +153,328 @@ class ParallelCompressor:
         """
         return self.compression_algorithm
     
+    def set_compression_level(self, level: int = None):
+        """
+        HU20: Configura el nivel de compresión (0 = mínimo, 9 = máximo)
+        HU21: None usa el nivel por defecto del códec; cada códec ajusta el
+        nivel a su propio rango (bz2 empieza en 1, RLE no tiene niveles)
+        """
+        if level is not None and (not isinstance(level, int) or not 0 <= level <= 9):
+            raise ValueError("El nivel de compresión debe ser un entero entre 0 y 9")
+        self.compression_level = level
+    
+    def get_compression_level(self) -> int:
+        """
+        HU20: Obtiene el nivel de compresión actual
+        """
+        return self.compression_level
+    
+    def set_adaptive_mode(self, enabled: bool = True, selector: AdaptiveCodecSelector = None):
+        """
+        HU22: Activa la selección adaptativa por bloque
+        
+        Cada bloque se muestrea y se guarda sin comprimir, con RLE, o con el
+        códec configurado en su nivel más rápido o más alto, según cuánto se
+        reduce la muestra. Las decisiones quedan en compression_stats['adaptive'].
+        
+        Args:
+            enabled: True para activar el modo adaptativo
+            selector: Selector con umbrales propios (por defecto AdaptiveCodecSelector())
+        """
+        self.adaptive_selector = (selector or AdaptiveCodecSelector()) if enabled else None
+    
+    def set_incompressible_detection(self, enabled: bool = True, selector: AdaptiveCodecSelector = None):
+        """
+        HU23: Activa la detección previa de bloques incompresibles
+        
+        Antes de comprimir un bloque se comprime una muestra; si casi no se
+        reduce (JPEG, video, archivos ya comprimidos) el bloque se guarda sin
+        comprimir, sin el ciclo de compresión y verificación, y se marca con
+        BLOCK_FLAG_STORED en el índice. El modo adaptativo ya incluye esta
+        detección con los umbrales de su propio selector.
+        
+        Args:
+            enabled: True para activar la detección (activada por defecto)
+            selector: Selector con un store_threshold propio
+        """
+        self.incompressible_selector = (selector or AdaptiveCodecSelector()) if enabled else None
+    
+    def set_checksum_algorithm(self, algorithm: str):
+        """
+        HU18: Configura el checksum de bloque (ChecksumAlgorithm)
+        
+        CRC32 y Adler-32 son rápidos y ocupan 4 bytes por bloque; SHA-256
+        detecta también modificaciones intencionales a costa de más CPU.
+        """
+        self.checksum_algorithm = ChecksumAlgorithm.validate(algorithm)
+    
+    def set_verification_policy(self, policy: str, interval: int = None, rate: float = None):
+        """
+        HU24: Configura la verificación de los bloques al comprimir (VerificationPolicy)
+        
+        Con 'full' cada bloque comprimido se descomprime y se compara con el
+        original, lo que casi duplica el costo de CPU. Con 'sampled' solo se
+        verifica uno de cada interval bloques o, si se indica rate, una
+        fracción aleatoria de ellos. Con 'checksum' (por defecto) no hay ida y
+        vuelta: el checksum guardado en el índice se verifica al descomprimir.
+        Con 'off' tampoco se calculan checksums.
+        
+        Args:
+            policy: Política de verificación
+            interval: Con 'sampled', verificar uno de cada interval bloques
+            rate: Con 'sampled', fracción de bloques verificados al azar (0 a 1)
+        
+        Raises:
+            ValueError: Si la política o sus parámetros no son válidos
+        """
+        policy = VerificationPolicy.validate(policy)
+        if interval is not None and (not isinstance(interval, int) or interval <= 0):
+            raise ValueError("El intervalo de verificación debe ser un entero positivo")
+        if rate is not None and not 0 <= rate <= 1:
+            raise ValueError("La fracción de verificación debe estar entre 0 y 1")
+        
+        self.verification_policy = policy
+        self.verification_interval = interval or self.DEFAULT_VERIFICATION_INTERVAL
+        self.verification_rate = rate
+    
+    def get_verification_policy(self) -> str:
+        """
+        HU24: Obtiene la política de verificación actual
+        """
+        return self.verification_policy
+    
+    def set_shared_dictionary(self, enabled: bool = True, size: int = DEFAULT_DICTIONARY_SIZE):
+        """
+        HU25: Activa el diccionario compartido entre bloques
+        
+        Antes de comprimir se arma un diccionario con porciones de todo el
+        archivo, que se guarda una vez en el encabezado del .pz. Cada bloque
+        se comprime con ese diccionario, de modo que no empieza con la ventana
+        vacía y recupera parte del ratio perdido al dividir en bloques. Los
+        bloques siguen siendo independientes. Solo aplica a códecs que admiten
+        diccionario (zlib); con los demás se ignora.
+        
+        Args:
+            enabled: True para activar el diccionario
+            size: Tamaño del diccionario en bytes (máximo 32KB)
+        """
+        if enabled and not 0 < size <= MAX_DICTIONARY_SIZE:
+            raise ValueError(f"El tamaño del diccionario debe estar entre 1 y {MAX_DICTIONARY_SIZE} bytes")
+        self.shared_dictionary_size = size if enabled else None
+    
+    def set_deduplication(self, enabled: bool = True):
+        """
+        HU26: Activa la deduplicación de bloques
+        
+        Cada bloque se identifica por un hash de su contenido. Solo la primera
+        aparición de un contenido se comprime y se escribe; los bloques
+        idénticos quedan en el índice del .pz como referencias a ella
+        (BLOCK_FLAG_DUPLICATE). Los aciertos y los bytes ahorrados quedan en
+        compression_stats['dedup'].
+        """
+        self.dedup_enabled = enabled
+    
+    def set_incremental_base(self, base_file: str = None):
+        """
+        HU28: Configura el .pz anterior contra el que se recomprime
+        
+        Cada bloque cuyo tamaño y checksum coinciden con un bloque del .pz
+        anterior no se comprime: sus datos comprimidos se copian de ese
+        archivo. Solo los bloques que cambiaron pasan por el códec. Ambas
+        compresiones deben usar SHA-256 como checksum (con CRC32 o Adler-32
+        una colisión copiaría otro bloque, ver incremental.py) y la
+        compresión falla si no es así; con la política de verificación 'off'
+        los checksums se calculan igual, porque son los que se comparan.
+        Combinado con la división por contenido (HU27), una inserción solo
+        invalida los bloques que la rodean. Los bloques reutilizados quedan
+        en compression_stats['incremental'].
+        
+        Args:
+            base_file: Ruta del .pz anterior, o None para desactivar
+        """
+        self.incremental_base = base_file
+    
+    def get_incremental_base(self) -> str:
+        """
+        HU28: Obtiene la ruta del .pz anterior (None si está desactivado)
+        """
+        return self.incremental_base
+    
+    def get_checksum_algorithm(self) -> str:
+        """
+        HU18: Obtiene el algoritmo de checksum actual
+        """
+        return self.checksum_algorithm
+    
+    def set_streaming_mode(self, enabled: bool = True, queue_depth: int = None):
+        """
+        HU09: Activa o desactiva la compresión en streaming
+        HU15: El mismo modo aplica a la descompresión
+        
+        En modo streaming el archivo no se carga completo: un hilo lector, los
+        hilos compresores (o descompresores) y un escritor ordenado se comunican
+        por colas acotadas, por lo que la memoria máxima es del orden de
+        (hilos + queue_depth) × tamaño de bloque.
+        
+        Args:
+            enabled: True para usar el pipeline en streaming
+            queue_depth: Bloques que pueden esperar en cola además de los que
+                están siendo comprimidos
+        """
+        if queue_depth is not None:
+            if not isinstance(queue_depth, int) or queue_depth <= 0:
+                raise ValueError("La profundidad de cola debe ser un entero positivo")
+            self.stream_queue_depth = queue_depth
+        self.streaming_enabled = enabled
+    
+    def set_direct_output(self, enabled: bool = True):
+        """
+        HU16: Activa o desactiva la escritura directa al archivo .pz
+        
+        Con escritura directa cada bloque se agrega al archivo final en cuanto
+        termina de comprimirse y el índice se escribe al final. Sin ella, los
+        bloques pasan por TemporaryBlockStorage y se ensamblan al terminar.
+        """
+        self.direct_output = enabled
+    
+    def set_checkpoint_dir(self, checkpoint_dir: str = None, sync_policy: str = JournalSyncPolicy.BATCH):
+        """
+        HU29: Configura un directorio de checkpoint para compresiones reanudables
+        
+        Los bloques se guardan en ese directorio con TemporaryBlockStorage
+        (siempre con almacenamiento temporal: se ignoran el modo streaming y
+        la escritura directa) y, si la compresión falla o se cancela, el
+        directorio se conserva. Al volver a comprimir con el mismo directorio,
+        los bloques ya guardados se validan (checksum de los datos comprimidos
+        y de los datos originales, releídos de la entrada) y solo se
+        comprimen los que faltan o no son válidos. Al terminar con éxito el
+        directorio se elimina. El resultado de la validación queda en
+        compression_stats['resume'].
+        
+        Args:
+            checkpoint_dir: Directorio del trabajo, o None para usar uno temporal
+            sync_policy: Sincronización a disco del journal (JournalSyncPolicy)
+        """
+        self.checkpoint_sync_policy = JournalSyncPolicy.validate(sync_policy)
+        self.checkpoint_dir = checkpoint_dir
+    
+    def get_checkpoint_dir(self) -> str:
+        """
+        HU29: Obtiene el directorio de checkpoint (None si no hay)
+        """
+        return self.checkpoint_dir
+    
+    def set_memory_mapping(self, enabled: bool = True):
+        """
+        HU13: Activa la lectura de bloques mediante un mapeo en memoria
+        
+        Los bloques se entregan a zlib y al checksum como memoryview del
+        archivo mapeado, evitando una copia completa de la entrada.
+        """
+        self.use_mmap = enabled
+        self.block_manager.use_mmap = enabled
+    
+    def set_executor_backend(self, backend: str):
+        """
+        HU10: Configura el backend de ejecución para compresión y descompresión
+        
+        Con ExecutorBackend.PROCESSES los códecs se ejecutan en un pool de
+        procesos, lo que permite escalar en varios núcleos también con
+        algoritmos escritos en Python puro (RLE) que no liberan el GIL.
+        """
+        self.executor_backend = ExecutorBackend.validate(backend)
+    
+    def get_executor_backend(self) -> str:
+        """
+        HU10: Obtiene el backend de ejecución actual
+        """
+        return self.executor_backend
+    
+    def set_worker_pool(self, worker_pool: WorkerPool = None):
+        """
+        HU30: Configura un pool de trabajadores compartido entre trabajos
+        
+        Con un WorkerPool, los trabajadores de compresión y descompresión son
+        tareas del pool (y el backend de procesos usa sus procesos) en lugar
+        de hilos y procesos creados y destruidos en cada trabajo. El número de
+        hilos de cada trabajo sigue indicando cuántos bloques procesa a la
+        vez, limitado por el tamaño del pool. Las etapas del pipeline en
+        streaming (HU09) se bloquean unas a otras y siguen usando hilos
+        propios, para que un pool ocupado por otros trabajos no las detenga.
+        
+        Args:
+            worker_pool: Pool compartido, o None para volver a trabajadores propios
+        """
+        self.worker_pool = worker_pool
+    
+    def get_worker_pool(self) -> WorkerPool:
+        """
+        HU30: Obtiene el pool compartido (None si el compresor usa trabajadores propios)
+        """
+        return self.worker_pool
+    
+    def _start_process_pool(self, num_workers: int):
+        """
+        HU10: Crea el pool de procesos si el backend lo requiere
+        HU30: Con un WorkerPool compartido se usan sus procesos
+        """
+        if self.executor_backend == ExecutorBackend.PROCESSES:
+            if self.worker_pool is not None:
+                self._process_pool = self.worker_pool.process_executor()
+            else:
+                self._process_pool = create_process_pool(num_workers)
+    
+    def _shutdown_process_pool(self):
+        """
+        HU10: Cierra el pool de procesos descartando trabajos pendientes
+        HU30: El pool de un WorkerPool compartido no se cierra; cada trabajo
+        cancela sus propias tareas pendientes
+        """
+        if self._process_pool is not None:
+            if self.worker_pool is None:
+                self._process_pool.shutdown(wait=True, cancel_futures=True)
+            self._process_pool = None
+    
+    def _start_workers(self, target, worker_args: list) -> list:
+        """
+        HU14: Lanza un trabajador por cada tupla de argumentos
+        HU30: Con un WorkerPool compartido cada trabajador es una tarea del pool
+        
+        Returns:
+            list: Hilos o futures, para _join_workers
+        """
+        if self.worker_pool is not None:
+            return [self.worker_pool.submit(target, *args) for args in worker_args]
+        
+        threads = [threading.Thread(target=target, args=args) for args in worker_args]
+        for thread in threads:
+            thread.start()
+        return threads
+    
+    def _join_workers(self, workers: list):
+        """
+        HU14: Espera a que terminen los trabajadores de _start_workers
+        HU30: Las tareas que el pool todavía no empezó se cancelan: el
+        trabajo ya terminó o se canceló y no tienen bloques que procesar
+        """
+        for worker in workers:
+            if isinstance(worker, threading.Thread):
+                worker.join()
+            elif not worker.cancel():
+                worker.result()
+    
+    @contextmanager
+    def _timed_phase(self, stats: dict, phase: str):
+        """
+        HU19: Acumula en stats['phase_times'] los segundos que tarda una fase
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            phase_times = stats.setdefault('phase_times', {})
+            phase_times[phase] = phase_times.get(phase, 0.0) + time.perf_counter() - started
+    
     def _handle_error(self, error: Exception, error_type: ErrorType, context: str = "", show_dialog: bool = False):
         """
         HU07: Método auxiliar para manejar errores de forma centralizada
@@ -93,37 +500,126 @@ class ParallelCompressor:
         """Comprime un archivo usando múltiples hilos (4 hilos por defecto)"""
         return self.compress_file_with_threads(input_file, output_file, 4, progress_callback)
     
+    def resume_compression(self, checkpoint_dir, num_threads=4, progress_callback=None):
+        """
+        HU29: Reanuda una compresión interrumpida a partir de su directorio de checkpoint
+        
+        Las rutas de entrada y salida, el tamaño de bloque, la estrategia de
+        división, el algoritmo de checksum y el diccionario compartido se
+        toman del checkpoint, de modo que los bloques planificados coinciden
+        con los guardados. El resto de la configuración (códec, backend,
+        verificación) es la de este compresor.
+        
+        Raises:
+            FileNotFoundError: Si el directorio no tiene un checkpoint
+            ValueError: Si el checkpoint no llegó a registrar el trabajo
+        """
+        storage = TemporaryBlockStorage.recover(checkpoint_dir, sync_policy=self.checkpoint_sync_policy)
+        file_info, job_info = storage.get_file_info(), storage.get_job_info()
+        if not file_info or not job_info:
+            raise ValueError(f"El checkpoint {checkpoint_dir} no tiene un trabajo registrado")
+        
+        self.set_checksum_algorithm(job_info['checksum_algorithm'])
+        self.set_block_size(job_info['block_size'])
+        self.set_chunking_strategy(job_info['chunking'])
+        if job_info.get('dictionary'):
+            self.set_shared_dictionary(True, self.shared_dictionary_size or DEFAULT_DICTIONARY_SIZE)
+        self.set_checkpoint_dir(checkpoint_dir, self.checkpoint_sync_policy)
+        return self.compress_file_with_threads(file_info['input_file'], file_info['output_file'],
+                                               num_threads, progress_callback)
+    
     def compress_file_with_threads(self, input_file, output_file, num_threads, progress_callback=None):
-        """Comprime un archivo usando el número especificado de hilos"""
+        """
+        Comprime un archivo usando el número especificado de hilos
+        
+        HU31: Si input_file es un directorio, se comprime en un .pz de varios
+        miembros (ver archive.py)
+        """
         try:
             self.is_compressing = True
             self.cancel_requested = False
+            self._worker_error = None
+            is_directory = os.path.isdir(input_file)
+            if is_directory and self.checkpoint_dir is not None:
+                raise ValueError("Los checkpoints no admiten la compresión de directorios")
+            self.compression_stats['phase_times'] = {}
+            self.compression_stats['stored_blocks'] = 0
+            self.compression_stats['verified_blocks'] = 0
+            if self.adaptive_selector is not None:
+                self.compression_stats['adaptive'] = AdaptiveCodecSelector.new_statistics()
+            else:
+                self.compression_stats.pop('adaptive', None)
+            self.compression_stats.pop('incremental', None)
+            self.compression_stats.pop('resume', None)
+            self._incremental_base = self._open_incremental_base(output_file)
+            # HU29: El checkpoint se abre antes del diccionario: una reanudación usa el del primer intento
+            self.temp_storage = self._open_checkpoint()
+            self._dictionary = self._build_shared_dictionary(input_file)
+            if self._incremental_base is not None:
+                self._incremental_base.use_dictionary(self._dictionary)
+            self.compression_stats['dictionary_size'] = len(self._dictionary) if self._dictionary else 0
+            self.compression_stats['dictionary_blocks'] = 0
+            self._dedup_table = DedupTable() if self.dedup_enabled else None
+            self.compression_stats.pop('dedup', None)
+            self.compression_stats.pop('members', None)
+            
+            # HU31: Los bloques de un directorio se reparten entre los hilos (o el pool) de trabajo
+            if is_directory:
+                success = self._compress_directory(input_file, output_file, num_threads, progress_callback)
+                self.is_compressing = False
+                return success
+            
+            self._start_process_pool(num_threads)
+            
+            # HU09: El modo streaming no usa almacenamiento temporal ni carga el archivo completo
+            if self.streaming_enabled and self.temp_storage is None:
+                with self._timed_phase(self.compression_stats, 'pipeline'):
+                    success = self._compress_file_streaming(input_file, output_file, num_threads, progress_callback)
+                self.is_compressing = False
+                return success
+            
+            # HU16: Los bloques se escriben directamente en el archivo final
+            if self.direct_output and self.temp_storage is None:
+                success = self._compress_file_direct(input_file, output_file, num_threads, progress_callback)
+                self.is_compressing = False
+                return success
             
             # HU05: Inicializar almacenamiento temporal
-            self.temp_storage = TemporaryBlockStorage()
+            if self.temp_storage is None:
+                self.temp_storage = TemporaryBlockStorage()
             
             # Obtener configuración desde el callback
             if progress_callback:
                 progress_callback("Iniciando compresión...", 0, "🚀 Iniciando")
             
             # HU04: Usar FileBlockManager para división mejorada en bloques
-            blocks = self._split_file_into_blocks_improved(input_file, progress_callback)
+            with self._timed_phase(self.compression_stats, 'split'):
+                blocks = self._split_file_into_blocks_improved(input_file, progress_callback)
             if self.cancel_requested:
                 return False
             
             # HU05: Configurar información del archivo en almacenamiento temporal
             self.temp_storage.set_file_info(input_file, output_file, len(blocks))
             
+            # HU29: Solo se comprimen los bloques que no están guardados en el checkpoint
+            if self.checkpoint_dir is not None:
+                blocks = self._resume_pending_blocks(blocks, num_threads, progress_callback)
+                if self.cancel_requested:
+                    return False
+            
             # Comprimir bloques en paralelo con distribución mejorada
-            compressed_blocks = self._compress_blocks_parallel_improved(blocks, num_threads, progress_callback)
+            with self._timed_phase(self.compression_stats, 'compress'):
+                compressed_blocks = self._compress_blocks_parallel_improved(blocks, num_threads, progress_callback)
             if self.cancel_requested:
                 return False
             
             # HU05: Escribir archivo comprimido con ensamblaje de bloques temporales
-            success = self._write_compressed_file_from_storage(input_file, output_file, progress_callback)
+            with self._timed_phase(self.compression_stats, 'assemble'):
+                success = self._write_compressed_file_from_storage(input_file, output_file, progress_callback)
             
             # HU05: Limpiar almacenamiento temporal
-            if self.temp_storage:
+            # HU29: Un checkpoint solo se elimina si el archivo final quedó completo
+            if self.temp_storage and (success or self.checkpoint_dir is None):
                 self.temp_storage.cleanup()
                 self.temp_storage = None
             
@@ -134,11 +630,114 @@ class ParallelCompressor:
             # HU07: Manejo centralizado de errores
             self._handle_error(e, ErrorType.COMPRESSION, "Compresión de archivo", show_dialog=False)
             # HU05: Limpiar almacenamiento temporal en caso de error
-            if self.temp_storage:
+            if self.temp_storage and self.checkpoint_dir is None:
                 self.temp_storage.cleanup()
                 self.temp_storage = None
             self.is_compressing = False
             raise e
+        finally:
+            # HU26: Aciertos de la tabla de deduplicación
+            if self._dedup_table is not None:
+                self.compression_stats['dedup'] = self._dedup_table.get_statistics()
+                self._dedup_table = None
+            # HU28: Bloques reutilizados del .pz anterior
+            if self._incremental_base is not None:
+                self.compression_stats['incremental'] = self._incremental_base.get_statistics()
+                self._incremental_base.close()
+                self._incremental_base = None
+            # HU29: Un checkpoint interrumpido queda compactado para reanudarlo después
+            if self.temp_storage is not None and self.checkpoint_dir is not None:
+                self.temp_storage.compact()
+                self.temp_storage = None
+            self._shutdown_process_pool()
+            # HU13: Cerrar el mapeo del archivo de entrada
+            self.block_manager.release_mapping()
+    
+    def _compress_file_direct(self, input_file, output_file, num_threads, progress_callback=None):
+        """
+        HU16: Compresión con escritura directa al archivo .pz
+        
+        Los hilos comprimen y agregan cada bloque al archivo final en cuanto
+        terminan; no hay archivos temporales ni una fase de ensamblaje.
+        """
+        if progress_callback:
+            progress_callback("Iniciando compresión...", 0, "🚀 Iniciando")
+        
+        with self._timed_phase(self.compression_stats, 'split'):
+            blocks = self._split_file_into_blocks_improved(input_file, progress_callback)
+        if self.cancel_requested:
+            return False
+        
+        header_info = self._build_header_info(
+            input_file, sum(block['size'] for block in blocks), len(blocks)
+        )
+        return self._write_blocks_direct(blocks, header_info, output_file, num_threads, progress_callback)
+    
+    def _write_blocks_direct(self, blocks, header_info, output_file, num_threads, progress_callback=None):
+        """
+        HU16: Comprime los bloques y los escribe en el .pz a medida que terminan
+        """
+        self._block_writer = PzBlockWriter(output_file, header_info)
+        
+        try:
+            # HU16: Incluye la escritura de cada bloque en el archivo final
+            with self._timed_phase(self.compression_stats, 'compress'):
+                self._compress_blocks_parallel_improved(blocks, num_threads, progress_callback)
+            # HU31: Un bloque de directorio que no pudo leerse aborta el trabajo
+            if self._worker_error is not None:
+                raise self._worker_error
+            if self.cancel_requested:
+                self._block_writer.abort()
+                return False
+            
+            if progress_callback:
+                progress_callback("Escribiendo índice de bloques...", 95, "💾 Escritura final")
+            
+            # HU12: Índice de bloques al final del archivo
+            with self._timed_phase(self.compression_stats, 'finalize'):
+                self._block_writer.close()
+        except Exception:
+            self._block_writer.abort()
+            raise
+        finally:
+            self._block_writer = None
+        
+        if progress_callback:
+            progress_callback("Archivo comprimido exitosamente", 100, "✅ Completado")
+        
+        return True
+    
+    def _compress_directory(self, input_dir, output_file, num_threads, progress_callback=None):
+        """
+        HU31: Comprime todos los archivos de un directorio en un único .pz
+        
+        Los bloques de todos los archivos (los chicos empaquetados juntos, los
+        grandes divididos) se planifican de una vez y se comprimen en los
+        mismos trabajadores, escribiéndose directamente en el archivo final.
+        Los hilos leen las partes de cada bloque al comprimirlo; el backend de
+        procesos y el modo streaming no se usan con directorios.
+        """
+        if progress_callback:
+            progress_callback("Recorriendo directorio...", 0, "🚀 Iniciando")
+        
+        with self._timed_phase(self.compression_stats, 'split'):
+            members = scan_directory(input_dir, exclude=[output_file])
+            blocks, members_info = plan_member_blocks(members, self.block_manager.block_size)
+        self.compression_stats['members'] = {
+            'files': len(members),
+            'bytes': members_info['table_offset'],
+            'blocks': len(blocks),
+            'shared_blocks': sum(1 for block in blocks if len(block.get('pieces', ())) > 1)
+        }
+        if progress_callback:
+            progress_callback(f"Directorio planificado: {len(members)} archivos en {len(blocks)} bloques",
+                              15, "✅ División completa")
+        
+        header_info = self._build_header_info(
+            os.path.normpath(input_dir), sum(block['size'] for block in blocks), len(blocks)
+        )
+        header_info['members'] = members_info
+        return self._write_blocks_direct(blocks, header_info, output_file, num_threads, progress_callback)
     
     def _split_file_into_blocks_improved(self, file_path, progress_callback=None):
         """
@@ -150,10 +749,14 @@ class ParallelCompressor:
                 progress_callback("Analizando archivo para división...", 2, "📊 Análisis")
             
             # Usar FileBlockManager para división robusta
-            blocks = self.block_manager.split_file_into_blocks(
-                file_path, 
-                lambda msg, prog, phase: self._forward_progress(progress_callback, msg, 2 + prog * 0.13, phase)
-            )
+            if self._process_pool is not None:
+                # HU10: Los procesos leen sus propios bloques, solo se planifican los rangos
+                blocks = self.block_manager.plan_blocks(file_path)
+            else:
+                blocks = self.block_manager.split_file_into_blocks(
+                    file_path, 
+                    lambda msg, prog, phase: self._forward_progress(progress_callback, msg, 2 + prog * 0.13, phase)
+                )
             
             # Guardar estadísticas de división
             self.compression_stats['block_stats'] = self.block_manager.get_statistics()
@@ -190,26 +793,22 @@ class ParallelCompressor:
                 self.cancel_requested = True
                 return []
         
-        compressed_blocks = [None] * len(blocks)
-        threads = []
+        # HU10: Backend de procesos
+        if self._process_pool is not None:
+            return self._compress_blocks_with_processes(blocks, progress_callback)
+        
+        compressed_blocks = self._new_result_array(blocks)
         progress_queue = Queue()
         
-        # HU04: Usar distribución inteligente de bloques
-        distribution = self.block_manager.get_block_distribution_for_threads(num_threads)
+        # HU14: Los hilos toman bloques de una cola compartida; sus estadísticas
+        # solo cuentan los hilos que realmente se inician
+        num_workers = min(num_threads, len(blocks))
+        scheduler = DynamicBlockScheduler(blocks, max(1, num_workers))
         
-        # Crear hilos con distribución optimizada
-        for thread_id, block_ids in enumerate(distribution):
-            if not block_ids:  # Saltar hilos sin bloques asignados
-                continue
-                
-            thread_blocks = [blocks[block_id] for block_id in block_ids]
-            
-            thread = threading.Thread(
-                target=self._compress_thread_worker_improved,
-                args=(thread_blocks, compressed_blocks, progress_queue, thread_id)
-            )
-            threads.append(thread)
-            thread.start()
+        threads = self._start_workers(self._compress_thread_worker_improved, [
+            (scheduler.iter_blocks(thread_id), compressed_blocks, progress_queue, thread_id)
+            for thread_id in range(num_workers)
+        ])
         
         # Monitorear progreso
         completed_blocks = 0
@@ -237,8 +836,10 @@ class ParallelCompressor:
                 continue
         
         # Esperar a que terminen todos los hilos
-        for thread in threads:
-            thread.join()
+        self._join_workers(threads)
+        
+        scheduler.finish()
+        self.compression_stats['scheduler'] = scheduler.get_statistics()
         
         if self.cancel_requested:
             return []
@@ -248,6 +849,13 @@ class ParallelCompressor:
         
         return compressed_blocks
     
+    def _new_result_array(self, blocks):
+        """
+        HU05: Lista de resultados indexada por ID de bloque
+        HU29: Al reanudar solo se comprimen algunos bloques y los IDs no son consecutivos
+        """
+        return [None] * (max(block['id'] for block in blocks) + 1 if blocks else 0)
+    
     def _compress_thread_worker_improved(self, blocks, result_array, progress_queue, thread_id):
         """
         HU05: Worker mejorado para comprimir bloques en un hilo
@@ -259,206 +867,883 @@ class ParallelCompressor:
                 
             try:
                 # HU05: Comprimir bloque usando el algoritmo configurado (zlib por defecto)
-                original_data = block['data']
+                compressed_data, compression_ratio = self._compress_block(block)
                 
-                if self.compression_algorithm == CompressionAlgorithm.ZLIB:
-                    compressed_data = zlib.compress(original_data, level=6)
-                else:
-                    # RLE como alternativa (implementación simple)
-                    compressed_data = self._compress_rle(original_data)
-                
-                # Calcular métricas de compresión
-                compression_ratio = (len(compressed_data) / len(original_data)) * 100
-                
-                # Validar integridad de compresión
-                try:
-                    if self.compression_algorithm == CompressionAlgorithm.ZLIB:
-                        decompressed_test = zlib.decompress(compressed_data)
-                    else:
-                        decompressed_test = self._decompress_rle(compressed_data)
-                        
-                    if decompressed_test != original_data:
-                        raise ValueError("Error de integridad en compresión")
-                except Exception as e:
-                    # Si falla la compresión, usar datos originales
-                    compressed_data = original_data
-                    compression_ratio = 100.0
-                
-                # HU05: Almacenar bloque comprimido en almacenamiento temporal
-                if self.temp_storage:
-                    block_path = self.temp_storage.store_compressed_block(
-                        block['id'], 
-                        compressed_data,
-                        block['size'],
-                        compression_ratio,
-                        thread_id,
-                        block['checksum']
-                    )
-                
-                # Mantener compatibilidad con result_array
-                result_array[block['id']] = {
-                    'id': block['id'],
-                    'compressed_data': compressed_data,
-                    'original_size': block['size'],
-                    'compressed_size': len(compressed_data),
-                    'compression_ratio': compression_ratio,
-                    'start_offset': block['start_offset'],
-                    'end_offset': block['end_offset'],
-                    'original_checksum': block['checksum'],
-                    'thread_id': thread_id
-                }
-                
-                # Reportar progreso con métricas
-                progress_queue.put({
-                    'block_id': block['id'],
-                    'thread_id': thread_id,
-                    'compressed_size': len(compressed_data),
-                    'original_size': block['size'],
-                    'compression_ratio': compression_ratio
-                })
-                
-                # Simular tiempo de procesamiento realista
-                time.sleep(0.005)
+                # HU05: Almacenar bloque comprimido y reportar progreso con métricas
+                progress_queue.put(
+                    self._record_compressed_block(block, compressed_data, compression_ratio, thread_id, result_array)
+                )
+                # HU31: Un bloque de directorio suelta sus datos apenas se escribe
+                if 'pieces' in block:
+                    del block['data']
                 
             except Exception as e:
                 # HU07: Manejo centralizado de errores
                 self._handle_error(e, ErrorType.COMPRESSION, f"Compresión de bloque {block['id']}", show_dialog=False)
                 print(f"Error comprimiendo bloque {block['id']}: {e}")
+                # HU31: Sin los datos del bloque no hay copia sin comprimir posible
+                if 'data' not in block:
+                    self._worker_error = e
+                    self.cancel_requested = True
+                    break
                 if not self.cancel_requested:
                     # En caso de error, guardar bloque sin comprimir
-                    result_array[block['id']] = {
-                        'id': block['id'],
-                        'compressed_data': block['data'],
-                        'original_size': block['size'],
-                        'compressed_size': block['size'],
-                        'compression_ratio': 100.0,
-                        'start_offset': block['start_offset'],
-                        'end_offset': block['end_offset'],
-                        'original_checksum': block['checksum'],
-                        'thread_id': thread_id,
-                        'error': str(e)
-                    }
-                    progress_queue.put({
-                        'block_id': block['id'],
-                        'thread_id': thread_id,
-                        'compressed_size': block['size'],
-                        'original_size': block['size'],
-                        'compression_ratio': 100.0
-                    })
+                    if block.get('checksum') is None:
+                        block['checksum'] = block_checksum(block['data'], self.checksum_algorithm)
+                    block['stored'] = True
+                    progress_queue.put(self._record_compressed_block(
+                        block, bytes(block['data']), 100.0, thread_id, result_array, error=str(e)
+                    ))
     
-    def _compress_rle(self, data: bytes) -> bytes:
+    def _record_compressed_block(self, block, compressed_data, compression_ratio, thread_id, result_array, error=None):
+        """
+        HU05: Almacena un bloque comprimido en el almacenamiento temporal y en result_array
+        HU16: Con escritura directa el bloque va al archivo final y result_array
+        solo conserva sus metadatos
+        HU23: Los bloques guardados sin comprimir llevan BLOCK_FLAG_STORED
+        HU26: Los bloques duplicados se registran como referencia, sin datos
+        
+        Returns:
+            dict: Información de progreso del bloque
+        """
+        codec_id = self._block_codec_id(block)
+        flags = self._block_flags(block)
+        duplicate_of = block.get('duplicate_of')
+        if duplicate_of is not None and self._block_writer is not None:
+            self._block_writer.write_reference(block['id'], block['start_offset'], block['size'], duplicate_of)
+        elif self._block_writer is not None:
+            self._block_writer.write_block(
+                block['id'],
+                block['start_offset'],
+                block['size'],
+                compressed_data,
+                block['checksum'],
+                flags=flags,
+                codec_id=codec_id
+            )
+        elif self.temp_storage:
+            self.temp_storage.store_compressed_block(
+                block['id'], 
+                compressed_data,
+                block['size'],
+                compression_ratio,
+                thread_id,
+                block['checksum'],
+                codec_id,
+                flags,
+                duplicate_of
+            )
+        
+        # Mantener compatibilidad con result_array
+        result_array[block['id']] = {
+            'id': block['id'],
+            'compressed_data': compressed_data if self._block_writer is None else None,
+            'original_size': block['size'],
+            'compressed_size': len(compressed_data),
+            'compression_ratio': compression_ratio,
+            'start_offset': block['start_offset'],
+            'end_offset': block['end_offset'],
+            'original_checksum': block['checksum'],
+            'codec_id': codec_id,
+            'flags': flags,
+            'duplicate_of': duplicate_of,
+            'thread_id': thread_id
+        }
+        if error is not None:
+            result_array[block['id']]['error'] = error
+        
+        return {
+            'block_id': block['id'],
+            'thread_id': thread_id,
+            'compressed_size': len(compressed_data),
+            'original_size': block['size'],
+            'compression_ratio': compression_ratio
+        }
+    
+    def _block_codec_id(self, block) -> int:
+        """
+        HU21: ID del códec con que se comprimió un bloque, para el índice del .pz
+        """
+        return get_codec(block.get('codec', self.compression_algorithm)).codec_id
+    
+    def _block_flags(self, block) -> int:
+        """
+        HU23: Flags del índice del .pz para un bloque
+        HU24: Los bloques sin checksum (política 'off') llevan BLOCK_FLAG_NO_CHECKSUM
+        HU25: Los comprimidos con el diccionario compartido, BLOCK_FLAG_DICTIONARY
         """
-        HU05: Implementación simple de RLE (Run-Length Encoding)
-        Como alternativa a zlib
+        flags = BLOCK_FLAG_STORED if block.get('stored') else 0
+        if block.get('checksum') is None:
+            flags |= BLOCK_FLAG_NO_CHECKSUM
+        if block.get('dictionary'):
+            flags |= BLOCK_FLAG_DICTIONARY
+        return flags
+    
+    def _compress_blocks_with_processes(self, blocks, progress_callback=None):
+        """
+        HU10: Comprime los bloques en el pool de procesos
+        
+        Cada trabajo solo recibe (ruta, offset, tamaño); el proceso lee el bloque
+        del disco y devuelve únicamente los datos comprimidos.
+        """
+        compressed_blocks = self._new_result_array(blocks)
+        
+        # HU26: Los duplicados se reconocen antes de enviar trabajos y solo se comprimen los originales
+        if self._dedup_table is not None:
+            digests = list(self._process_pool.map(
+                hash_file_range, *zip(*((block['file_path'], block['start_offset'], block['size']) for block in blocks))
+            )) if blocks else []
+            unique_blocks = []
+            for block, digest in zip(blocks, digests):
+                if self._claim_duplicate(block, digest) is None:
+                    unique_blocks.append(block)
+                else:
+                    self._record_compressed_block(block, b'', 0.0, None, compressed_blocks)
+            blocks = unique_blocks
+        
+        # HU28: Los checksums se calculan en el pool; los bloques sin cambios se copian del .pz anterior
+        if self._incremental_base is not None:
+            checksums = list(self._process_pool.map(
+                checksum_file_range,
+                *zip(*((block['file_path'], block['start_offset'], block['size'], self.checksum_algorithm)
+                       for block in blocks))
+            )) if blocks else []
+            changed_blocks = []
+            for block, checksum in zip(blocks, checksums):
+                block['checksum'] = checksum
+                reused = self._reuse_from_base(block)
+                if reused is None:
+                    changed_blocks.append(block)
+                else:
+                    self._record_compressed_block(block, *reused, None, compressed_blocks)
+            blocks = changed_blocks
+        
+        futures = {self._submit_range_compression(block): block for block in blocks}
+        
+        pending = set(futures)
+        completed_blocks = 0
+        total_blocks = len(blocks)
+        
+        while pending and not self.cancel_requested:
+            done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                block = futures[future]
+                try:
+                    compressed_data, compression_ratio, worker_id = self._range_compression_result(
+                        block, future.result()
+                    )
+                    progress_info = self._record_compressed_block(
+                        block, compressed_data, compression_ratio, worker_id, compressed_blocks
+                    )
+                except Exception as e:
+                    # HU07: En caso de error, guardar bloque sin comprimir
+                    self._handle_error(e, ErrorType.COMPRESSION, f"Compresión de bloque {block['id']}", show_dialog=False)
+                    original_data = read_file_range(block['file_path'], block['start_offset'], block['size'])
+                    block['checksum'] = block_checksum(original_data, self.checksum_algorithm)
+                    block['stored'] = True
+                    progress_info = self._record_compressed_block(
+                        block, original_data, 100.0, None, compressed_blocks, error=str(e)
+                    )
+                
+                completed_blocks += 1
+                
+                # Progreso de compresión (20% a 80%)
+                if progress_callback:
+                    status = f"Comprimiendo bloque {progress_info['block_id']} (proceso {progress_info['thread_id']}) - {progress_info['compression_ratio']:.1f}% ratio"
+                    if not progress_callback(status, 20 + (completed_blocks / total_blocks) * 60, "🗜️ Compresión paralela"):
+                        self.cancel_requested = True
+                        break
+        
+        if self.cancel_requested:
+            for future in pending:
+                future.cancel()
+            return []
+        
+        if progress_callback:
+            progress_callback("Compresión de bloques completada", 80, "✅ Compresión terminada")
+        
+        return compressed_blocks
+    
+    def _compress_block(self, block):
         """
-        if not data:
-            return b''
+        HU10: Comprime un bloque en el hilo actual o, con el backend de procesos,
+        delegándolo al pool
         
-        compressed = []
-        current_byte = data[0]
-        count = 1
+        HU26: Un bloque duplicado no se comprime: queda con 'duplicate_of'
+        y se devuelven datos vacíos
+        HU28: Un bloque sin cambios respecto del .pz anterior se copia de él
         
-        for i in range(1, len(data)):
-            if data[i] == current_byte and count < 255:
-                count += 1
+        Returns:
+            tuple: (datos_comprimidos, ratio_de_compresión)
+        """
+        # HU31: Los bloques de un directorio se leen recién al comprimirlos
+        if 'pieces' in block and 'data' not in block:
+            block['data'] = read_file_pieces(block['pieces'])
+        
+        if self._dedup_table is not None and self._claim_duplicate(block) is not None:
+            return b'', 0.0
+        
+        if self._incremental_base is not None:
+            reused = self._reuse_from_base(block)
+            if reused is not None:
+                return reused
+        
+        if self._process_pool is not None:
+            compressed_data, compression_ratio, _ = self._range_compression_result(
+                block, self._submit_range_compression(block).result()
+            )
+            return compressed_data, compression_ratio
+        
+        # HU13/HU18: El checksum se calcula aquí, una vez y en paralelo, sobre los datos del bloque
+        # HU24: Con la política 'off' el bloque queda sin checksum
+        if block.get('checksum') is None:
+            block['checksum'] = (None if self.verification_policy == VerificationPolicy.OFF
+                                 else block_checksum(block['data'], self.checksum_algorithm))
+        
+        return self._apply_encoding(block, self._compress_block_data(block['data'], self._should_verify(block)))
+    
+    def _claim_duplicate(self, block, digest: bytes = None):
+        """
+        HU26: Busca el contenido del bloque en la tabla de deduplicación
+        
+        Sin digest, el hash se calcula sobre los datos del bloque o, si el
+        bloque es solo un rango, en el pool de procesos.
+        
+        Returns:
+            int: ID del bloque original (también en block['duplicate_of']), o
+            None si es la primera aparición
+        """
+        if digest is None:
+            if 'data' in block:
+                digest = content_digest(block['data'])
             else:
-                compressed.extend([count, current_byte])
-                current_byte = data[i]
-                count = 1
+                digest = self._process_pool.submit(
+                    hash_file_range, block['file_path'], block['start_offset'], block['size']
+                ).result()
+        
+        owner = self._dedup_table.claim(digest, block['id'], block['size'])
+        if owner is not None:
+            block['duplicate_of'] = owner
+        return owner
+    
+    def _open_incremental_base(self, output_file):
+        """
+        HU28: Abre el .pz anterior configurado con set_incremental_base
         
-        # Agregar último run
-        compressed.extend([count, current_byte])
+        Raises:
+            ValueError: Si el .pz anterior es el archivo de salida, si el
+            checksum no es criptográfico o si el .pz anterior usa otro
+        """
+        if self.incremental_base is None:
+            return None
+        if self.checksum_algorithm not in INCREMENTAL_CHECKSUMS:
+            raise ValueError(f"La recompresión incremental requiere checksums {'/'.join(INCREMENTAL_CHECKSUMS)}; "
+                             f"con {self.checksum_algorithm} una colisión reutilizaría un bloque equivocado")
+        if os.path.realpath(self.incremental_base) == os.path.realpath(output_file):
+            raise ValueError("El .pz anterior no puede ser el archivo de salida")
         
-        return bytes(compressed)
+        base = IncrementalBase(self.incremental_base)
+        if base.checksum_algorithm != self.checksum_algorithm:
+            base.close()
+            raise ValueError(f"El .pz anterior usa checksums {base.checksum_algorithm}; "
+                             f"la compresión está configurada con {self.checksum_algorithm}")
+        return base
+    
+    def _open_checkpoint(self):
+        """
+        HU29: Reabre el almacenamiento del directorio de checkpoint o lo crea si no existe
+        
+        Returns:
+            TemporaryBlockStorage, o None si no hay directorio de checkpoint
+        """
+        if self.checkpoint_dir is None:
+            return None
+        try:
+            return TemporaryBlockStorage.recover(self.checkpoint_dir, sync_policy=self.checkpoint_sync_policy)
+        except FileNotFoundError:
+            return TemporaryBlockStorage(self.checkpoint_dir, sync_policy=self.checkpoint_sync_policy)
+    
+    def _resume_pending_blocks(self, blocks, num_threads, progress_callback=None):
+        """
+        HU29: Valida los bloques guardados en el checkpoint y devuelve los que faltan
+        
+        Los bloques guardados se validan en paralelo. Los inválidos se
+        descartan del almacenamiento y vuelven a comprimirse junto con los
+        que faltan.
+        
+        Returns:
+            list: Bloques que todavía hay que comprimir
+        """
+        job_info = self.temp_storage.get_job_info()
+        stored = {block_info['id']: block_info for block_info in self.temp_storage.get_stored_blocks()}
+        planned = {block['id']: block for block in blocks}
+        
+        # Checksums de otro algoritmo no pueden compararse: se recomprime todo
+        candidates = []
+        if job_info.get('checksum_algorithm') == self.checksum_algorithm:
+            candidates = [(planned[block_id], block_info) for block_id, block_info in stored.items()
+                          if block_id in planned]
+        
+        with self._timed_phase(self.compression_stats, 'resume'):
+            with ThreadPoolExecutor(max_workers=max(1, num_threads)) as executor:
+                results = list(executor.map(lambda pair: self._checkpoint_block_is_valid(*pair), candidates))
+        
+        valid_ids = {block['id'] for (block, _), valid in zip(candidates, results) if valid}
+        self.temp_storage.discard_blocks(sorted(set(stored) - valid_ids))
+        self.temp_storage.set_job_info({
+            'checksum_algorithm': self.checksum_algorithm,
+            'block_size': self.block_manager.block_size,
+            'chunking': self.block_manager.chunking,
+            'dictionary': dictionary_to_header(self._dictionary) if self._dictionary else None
+        })
+        
+        pending = [block for block in blocks if block['id'] not in valid_ids]
+        self.compression_stats['resume'] = {
+            'checkpoint_dir': self.checkpoint_dir,
+            'resumed_blocks': len(valid_ids),
+            'resumed_bytes': sum(planned[block_id]['size'] for block_id in valid_ids),
+            'discarded_blocks': len(stored) - len(valid_ids),
+            'pending_blocks': len(pending)
+        }
+        
+        if progress_callback and stored:
+            status = f"Reanudando: {len(valid_ids)}/{len(blocks)} bloques recuperados del checkpoint"
+            if not progress_callback(status, 18, "♻️ Reanudación"):
+                self.cancel_requested = True
+        
+        return pending
+    
+    def _checkpoint_block_is_valid(self, block, block_info) -> bool:
+        """
+        HU29: Indica si un bloque guardado en el checkpoint puede usarse tal cual
+        
+        Se exige el mismo tamaño original, que el archivo del bloque coincida
+        con su checksum de datos comprimidos y que el checksum de los datos
+        originales coincida con el de la entrada actual. Los bloques sin
+        checksum (duplicados de HU26 o política 'off') no pueden validarse, y
+        los comprimidos con diccionario solo sirven si hay diccionario.
+        """
+        if block_info.get('duplicate_of') is not None or block_info.get('original_checksum') is None:
+            return False
+        if block_info['original_size'] != block['size']:
+            return False
+        if block_info.get('flags', 0) & BLOCK_FLAG_DICTIONARY and self._dictionary is None:
+            return False
+        if self.temp_storage.validate_block(block_info) is not None:
+            return False
+        
+        if 'data' in block:
+            data = block['data']
+        else:
+            data = read_file_range(block['file_path'], block['start_offset'], block['size'])
+        return block_checksum(data, self.checksum_algorithm) == block_info['original_checksum']
+    
+    def _reuse_from_base(self, block):
+        """
+        HU28: Busca el bloque en el .pz anterior por tamaño y checksum
+        
+        Sin checksum, se calcula sobre los datos del bloque o, si el bloque es
+        solo un rango, en el pool de procesos. Con un acierto, el bloque toma
+        el códec y los flags del bloque anterior.
+        
+        Returns:
+            tuple: (datos_comprimidos, ratio_de_compresión), o None si el bloque cambió
+        """
+        if block.get('checksum') is None:
+            if 'data' in block:
+                block['checksum'] = block_checksum(block['data'], self.checksum_algorithm)
+            else:
+                block['checksum'] = self._process_pool.submit(
+                    checksum_file_range, block['file_path'], block['start_offset'], block['size'],
+                    self.checksum_algorithm
+                ).result()
+        
+        reused = self._incremental_base.reuse(block['size'], block['checksum'])
+        if reused is None:
+            return None
+        
+        compressed_data, entry = reused
+        block['codec'] = get_codec_by_id(entry['codec_id']).name
+        block['stored'] = bool(entry['flags'] & BLOCK_FLAG_STORED)
+        block['dictionary'] = bool(entry['flags'] & BLOCK_FLAG_DICTIONARY)
+        with self._stats_lock:
+            if block['stored']:
+                self.compression_stats['stored_blocks'] = self.compression_stats.get('stored_blocks', 0) + 1
+            if block['dictionary']:
+                self.compression_stats['dictionary_blocks'] = self.compression_stats.get('dictionary_blocks', 0) + 1
+        return compressed_data, (len(compressed_data) / block['size']) * 100
+    
+    def _submit_range_compression(self, block):
+        """
+        HU10: Envía al pool de procesos la compresión de un bloque descrito por su rango
+        HU22/HU23: El proceso también muestrea el bloque para elegir la estrategia
+        HU28: En modo incremental el checksum se calcula aun con la política 'off'
+        """
+        selector, adaptive = self._encoding_selector()
+        checksum_algorithm = self.checksum_algorithm
+        if self.verification_policy == VerificationPolicy.OFF and self._incremental_base is None:
+            checksum_algorithm = None
+        return self._process_pool.submit(
+            encode_file_range, block['file_path'], block['start_offset'],
+            block['size'], self.compression_algorithm, self.compression_level,
+            checksum_algorithm, selector, adaptive, self._should_verify(block), self._dictionary
+        )
+    
+    def _range_compression_result(self, block, result):
+        """
+        HU10: Desempaqueta el resultado de _submit_range_compression
+        
+        Returns:
+            tuple: (datos_comprimidos, ratio_de_compresión, pid_del_trabajador)
+        """
+        block['checksum'] = result['checksum']
+        compressed_data, compression_ratio = self._apply_encoding(block, result)
+        return compressed_data, compression_ratio, result['worker_id']
+    
+    def _encoding_selector(self):
+        """
+        HU22/HU23: Selector con que se muestrea cada bloque antes de comprimirlo
+        
+        Returns:
+            tuple: (selector o None, True si el selector también elige códec y nivel)
+        """
+        if self.adaptive_selector is not None:
+            return self.adaptive_selector, True
+        return self.incompressible_selector, False
+    
+    def _build_shared_dictionary(self, input_file):
+        """
+        HU25: Arma el diccionario compartido si está activado y el códec lo admite
+        """
+        if self.shared_dictionary_size is None or not get_codec(self.compression_algorithm).supports_dictionary:
+            return None
+        # HU31: Los directorios se comprimen sin diccionario compartido
+        if os.path.isdir(input_file):
+            return None
+        # HU29: Una reanudación usa el diccionario con que se comprimieron los bloques guardados
+        if self.temp_storage is not None and self.temp_storage.get_job_info().get('dictionary'):
+            return dictionary_from_header(self.temp_storage.get_job_info())
+        # HU28: Con el mismo diccionario, los bloques del .pz anterior que lo usan siguen siendo reutilizables
+        if self._incremental_base is not None and self._incremental_base.dictionary is not None:
+            return self._incremental_base.dictionary
+        return build_dictionary(input_file, self.shared_dictionary_size)
+    
+    def _should_verify(self, block) -> bool:
+        """
+        HU24: Indica si el bloque se verifica con ida y vuelta según la política
+        """
+        if self.verification_policy == VerificationPolicy.FULL:
+            return True
+        if self.verification_policy != VerificationPolicy.SAMPLED:
+            return False
+        if self.verification_rate is not None:
+            return self._verification_random.random() < self.verification_rate
+        return block['id'] % self.verification_interval == 0
+    
+    def _apply_encoding(self, block, encoded):
+        """
+        HU22/HU23: Asigna al bloque el códec y el modo de almacenamiento de
+        encode_block y acumula la decisión en las estadísticas
+        
+        Returns:
+            tuple: (datos_comprimidos, ratio_de_compresión)
+        """
+        block['codec'] = encoded['codec']
+        block['stored'] = encoded['stored']
+        block['dictionary'] = encoded['dictionary']
+        with self._stats_lock:
+            if encoded['stored']:
+                self.compression_stats['stored_blocks'] = self.compression_stats.get('stored_blocks', 0) + 1
+            if encoded['verified']:
+                self.compression_stats['verified_blocks'] = self.compression_stats.get('verified_blocks', 0) + 1
+            if encoded['dictionary']:
+                self.compression_stats['dictionary_blocks'] = self.compression_stats.get('dictionary_blocks', 0) + 1
+            if encoded['decision'] is not None:
+                AdaptiveCodecSelector.record(self.compression_stats['adaptive'], encoded['decision'], block['size'])
+        return encoded['data'], encoded['compression_ratio']
+    
+    def _compress_block_data(self, original_data: bytes, verify: bool = True):
+        """
+        HU05: Comprime los datos de un bloque con el algoritmo configurado
+        y valida la integridad del resultado
+        HU22/HU23: Antes se muestrea el bloque; los incompresibles no se comprimen
+        HU24: La validación de ida y vuelta solo se hace con verify=True
+        
+        Returns:
+            dict: Resultado de encode_block
+        """
+        selector, adaptive = self._encoding_selector()
+        return encode_block(original_data, self.compression_algorithm, self.compression_level,
+                            selector, adaptive, verify, self._dictionary)
+    
+    def _compress_rle(self, data: bytes) -> bytes:
+        """
+        HU05: Compresión RLE (Run-Length Encoding) como alternativa a zlib
+        HU11: Delegada en la implementación vectorizada de RLECompressor
+        """
+        return RLECompressor.compress(data)
+    
+    def _decompress_rle(self, data: bytes) -> bytes:
+        """
+        HU05/HU08: Descompresión RLE
+        HU11: Delegada en la implementación vectorizada de RLECompressor
+        """
+        return RLECompressor.decompress(data)
+    
+    def _write_compressed_file_from_storage(self, input_file, output_file, progress_callback=None):
+        """
+        HU05/HU08: Escribe el archivo comprimido ensamblando bloques desde almacenamiento temporal
+        Los bloques se ensamblan en orden y se incluyen metadatos en el encabezado
+        """
+        if progress_callback:
+            if not progress_callback("Ensamblando archivo desde almacenamiento temporal...", 85, "🔧 Ensamblaje"):
+                self.cancel_requested = True
+                return False
+        
+        try:
+            if not self.temp_storage:
+                raise ValueError("No hay almacenamiento temporal inicializado")
+            
+            # HU05: Obtener metadata ordenada de bloques
+            ordered_blocks_metadata = self.temp_storage.get_ordered_blocks_metadata()
+            
+            with open(output_file, 'wb') as f:
+                # HU05/HU08: Escribir encabezado con metadatos completos
+                original_size = sum(block['original_size'] for block in ordered_blocks_metadata)
+                header_info = self._build_header_info(input_file, original_size, len(ordered_blocks_metadata))
+                self._write_header(f, header_info)
+                
+                # HU05: Escribir datos comprimidos en orden
+                index_entries = []
+                original_offset = 0
+                for i, block_meta in enumerate(ordered_blocks_metadata):
+                    if self.cancel_requested:
+                        return False
+                    
+                    # HU26: Los duplicados solo agregan una referencia al índice
+                    if block_meta.get('duplicate_of') is not None:
+                        index_entries.append({
+                            'original_offset': original_offset,
+                            'original_size': block_meta['original_size'],
+                            'duplicate_of': block_meta['duplicate_of']
+                        })
+                        original_offset += block_meta['original_size']
+                        continue
+                    
+                    # Recuperar datos del bloque desde almacenamiento temporal
+                    block_data = self.temp_storage.retrieve_block_data(block_meta['id'])
+                    
+                    # HU12: Registrar la posición del bloque para el índice
+                    index_entries.append(self._index_entry(
+                        f.tell(), original_offset, len(block_data),
+                        block_meta['original_size'], block_meta['original_checksum'],
+                        block_meta.get('codec_id', LEGACY_CODEC_ID), block_meta.get('flags', 0)
+                    ))
+                    original_offset += block_meta['original_size']
+                    f.write(block_data)
+                    
+                    # Progreso de escritura (85% a 98%)
+                    write_progress = 85 + (i / len(ordered_blocks_metadata)) * 13
+                    if progress_callback:
+                        if not progress_callback(f"Escribiendo bloque {i+1}/{len(ordered_blocks_metadata)}", 
+                                               write_progress, "💾 Escritura final"):
+                            self.cancel_requested = True
+                            return False
+                
+                # HU12: Índice de bloques al final del archivo
+                write_index(f, resolve_duplicate_entries(index_entries), self.checksum_algorithm)
+            
+            if progress_callback:
+                progress_callback("Archivo comprimido exitosamente", 100, "✅ Completado")
+            
+            return True
+            
+        except Exception as e:
+            # HU07: Manejo centralizado de errores
+            self._handle_error(e, ErrorType.FILE_WRITE, "Ensamblaje de archivo final", show_dialog=False)
+            print(f"Error ensamblando archivo: {e}")
+            return False
+    
+    def _compress_file_streaming(self, input_file, output_file, num_threads, progress_callback=None):
+        """
+        HU09: Compresión en streaming con memoria acotada
+        
+        Etapas conectadas por colas acotadas:
+        lector (un hilo) -> compresores (num_threads hilos) -> escritor ordenado (hilo llamador).
+        Un semáforo limita los bloques leídos y aún no escritos a
+        num_threads + queue_depth, independiente del tamaño del archivo.
+        """
+        if progress_callback:
+            progress_callback("Analizando archivo para streaming...", 2, "📊 Análisis")
+        
+        analysis = self.block_manager.analyze_file(input_file)
+        self.compression_stats['block_analysis'] = analysis
+        total_blocks = analysis['total_blocks']
+        num_threads = max(1, min(num_threads, total_blocks))
+        window = num_threads + self.stream_queue_depth
+        
+        work_queue = Queue(maxsize=self.stream_queue_depth)
+        result_queue = Queue(maxsize=window)
+        slots = threading.Semaphore(window)
+        abort = threading.Event()
+        state = {'in_flight': 0, 'max_in_flight': 0, 'error': None}
+        state_lock = threading.Lock()
+        
+        reader = threading.Thread(
+            target=self._stream_reader_stage,
+            args=(input_file, work_queue, slots, num_threads, abort, state, state_lock)
+        )
+        workers = [
+            threading.Thread(
+                target=self._stream_compress_stage,
+                args=(work_queue, result_queue, abort, thread_id)
+            )
+            for thread_id in range(num_threads)
+        ]
+        
+        reader.start()
+        for worker in workers:
+            worker.start()
+        
+        try:
+            success = self._stream_writer_stage(
+                input_file, output_file, analysis, result_queue, slots,
+                abort, state, state_lock, progress_callback
+            )
+        finally:
+            abort.set()
+            reader.join()
+            for worker in workers:
+                worker.join()
+        
+        self.compression_stats['streaming'] = {
+            'queue_depth': self.stream_queue_depth,
+            'window_blocks': window,
+            'max_in_flight_blocks': state['max_in_flight'],
+            'max_buffered_bytes': state['max_in_flight'] * analysis['max_block_size']
+        }
+        
+        return success
+    
+    def _stream_should_stop(self, abort: threading.Event) -> bool:
+        """HU09: Indica si las etapas del pipeline deben detenerse"""
+        return self.cancel_requested or abort.is_set()
+    
+    def _stream_put(self, queue: Queue, item, abort: threading.Event) -> bool:
+        """
+        HU09: Inserta en una cola acotada sin bloquear indefinidamente
+        Retorna False si el pipeline se detuvo antes de poder insertar
+        """
+        while not self._stream_should_stop(abort):
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+    
+    def _stream_reader_stage(self, input_file, work_queue, slots, num_workers, abort, state, state_lock):
+        """
+        HU09: Etapa lectora - lee bloques solo cuando hay espacio en la ventana
+        """
+        try:
+            if self._process_pool is not None:
+                # HU10: Con procesos solo circulan los rangos de cada bloque
+                blocks = self.block_manager.plan_blocks(input_file)
+            else:
+                blocks = self.block_manager.iter_file_blocks(input_file)
+            
+            for block in blocks:
+                # Esperar a que el escritor libere un lugar en la ventana
+                while not slots.acquire(timeout=0.1):
+                    if self._stream_should_stop(abort):
+                        return
+                
+                with state_lock:
+                    state['in_flight'] += 1
+                    state['max_in_flight'] = max(state['max_in_flight'], state['in_flight'])
+                
+                if not self._stream_put(work_queue, block, abort):
+                    return
+                
+        except Exception as e:
+            # HU07: Manejo centralizado de errores
+            self._handle_error(e, ErrorType.FILE_READ, "Lectura en streaming", show_dialog=False)
+            state['error'] = e
+            abort.set()
+            return
+        
+        # Señal de fin para cada compresor
+        for _ in range(num_workers):
+            if not self._stream_put(work_queue, None, abort):
+                return
+    
+    def _stream_compress_stage(self, work_queue, result_queue, abort, thread_id):
+        """
+        HU09: Etapa compresora - comprime bloques y los entrega al escritor
+        """
+        while not self._stream_should_stop(abort):
+            try:
+                block = work_queue.get(timeout=0.1)
+            except Empty:
+                continue
+            
+            if block is None:
+                return
+            
+            try:
+                compressed_data, compression_ratio = self._compress_block(block)
+            except Exception as e:
+                # HU07: En caso de error, guardar bloque sin comprimir
+                self._handle_error(e, ErrorType.COMPRESSION, f"Compresión de bloque {block['id']}", show_dialog=False)
+                if 'data' in block:
+                    compressed_data = block['data']
+                else:
+                    compressed_data = read_file_range(block['file_path'], block['start_offset'], block['size'])
+                if block.get('checksum') is None:
+                    block['checksum'] = block_checksum(compressed_data, self.checksum_algorithm)
+                block['stored'] = True
+                compression_ratio = 100.0
+            
+            result = {
+                'id': block['id'],
+                'compressed_data': compressed_data,
+                'original_size': block['size'],
+                'checksum': block['checksum'],
+                'codec_id': self._block_codec_id(block),
+                'flags': self._block_flags(block),
+                'duplicate_of': block.get('duplicate_of'),
+                'compression_ratio': compression_ratio,
+                'thread_id': thread_id
+            }
+            if not self._stream_put(result_queue, result, abort):
+                return
     
-    def _decompress_rle(self, data: bytes) -> bytes:
+    def _stream_writer_stage(self, input_file, output_file, analysis, result_queue, slots,
+                             abort, state, state_lock, progress_callback=None):
         """
-        HU05: Descompresión RLE para validación
+        HU09: Etapa escritora - escribe los bloques en orden a medida que llegan
+        HU12: El índice de bloques se escribe al final, con los offsets ya conocidos
         """
-        if not data or len(data) % 2 != 0:
-            return b''
+        total_blocks = analysis['total_blocks']
+        pending = {}
+        index_entries = []
+        original_offset = 0
+        next_block = 0
         
-        decompressed = []
-        for i in range(0, len(data), 2):
-            count = data[i]
-            byte_value = data[i + 1]
-            decompressed.extend([byte_value] * count)
-        
-        return bytes(decompressed)
-    
-    def _write_compressed_file_from_storage(self, input_file, output_file, progress_callback=None):
-        """
-        HU05/HU08: Escribe el archivo comprimido ensamblando bloques desde almacenamiento temporal
-        Los bloques se ensamblan en orden y se incluyen metadatos en el encabezado
-        """
         if progress_callback:
-            if not progress_callback("Ensamblando archivo desde almacenamiento temporal...", 85, "🔧 Ensamblaje"):
+            if not progress_callback("Iniciando compresión en streaming...", 5, "🗜️ Compresión"):
                 self.cancel_requested = True
                 return False
         
+        # HU09: Si se cancela o falla, no queda un .pz truncado y sin índice que parezca válido
+        completed = False
         try:
-            if not self.temp_storage:
-                raise ValueError("No hay almacenamiento temporal inicializado")
-            
-            # HU05: Obtener metadata ordenada de bloques
-            ordered_blocks_metadata = self.temp_storage.get_ordered_blocks_metadata()
-            
             with open(output_file, 'wb') as f:
-                # HU05/HU08: Escribir encabezado con metadatos completos
-                original_filename = os.path.basename(input_file) if input_file else "unknown"
-                original_size = sum(block['original_size'] for block in ordered_blocks_metadata)
-                
-                header_info = {
-                    'format': 'PARZIP_V1',
-                    'original_filename': original_filename,  # HU08: Campo requerido para descompresión
-                    'original_size': original_size,  # HU08: Campo requerido para descompresión
-                    'block_count': len(ordered_blocks_metadata),  # HU08: Campo requerido para descompresión
-                    'total_blocks': len(ordered_blocks_metadata),  # Compatibilidad
-                    'compression_algorithm': self.compression_algorithm.value if hasattr(self.compression_algorithm, 'value') else str(self.compression_algorithm),  # HU08: Campo requerido
-                    'block_order': [block['id'] for block in ordered_blocks_metadata]
-                }
+                header_info = self._build_header_info(input_file, analysis['file_size'], total_blocks)
+                self._write_header(f, header_info)
                 
-                header_json = json.dumps(header_info).encode('utf-8')
-                header_size = len(header_json)
-                
-                # Escribir tamaño del encabezado (4 bytes) y luego el encabezado
-                f.write(header_size.to_bytes(4, byteorder='little'))
-                f.write(header_json)
-                
-                # HU05: Escribir metadatos de cada bloque en orden
-                for block_meta in ordered_blocks_metadata:
-                    # Escribir tamaño del bloque comprimido (4 bytes)
-                    f.write(block_meta['compressed_size'].to_bytes(4, byteorder='little'))
-                    # Escribir tamaño original (4 bytes)
-                    f.write(block_meta['original_size'].to_bytes(4, byteorder='little'))
-                
-                # HU05: Escribir datos comprimidos en orden
-                for i, block_meta in enumerate(ordered_blocks_metadata):
+                while next_block < total_blocks:
+                    if state['error'] is not None:
+                        raise state['error']
                     if self.cancel_requested:
                         return False
                     
-                    # Recuperar datos del bloque desde almacenamiento temporal
-                    block_data = self.temp_storage.retrieve_block_data(block_meta['id'])
-                    f.write(block_data)
+                    try:
+                        result = result_queue.get(timeout=0.1)
+                    except Empty:
+                        continue
+                    pending[result['id']] = result
                     
-                    # Progreso de escritura (85% a 98%)
-                    write_progress = 85 + (i / len(ordered_blocks_metadata)) * 13
-                    if progress_callback:
-                        if not progress_callback(f"Escribiendo bloque {i+1}/{len(ordered_blocks_metadata)}", 
-                                               write_progress, "💾 Escritura final"):
-                            self.cancel_requested = True
-                            return False
-            
-            if progress_callback:
-                progress_callback("Archivo comprimido exitosamente", 100, "✅ Completado")
-            
-            return True
-            
-        except Exception as e:
-            # HU07: Manejo centralizado de errores
-            self._handle_error(e, ErrorType.FILE_WRITE, "Ensamblaje de archivo final", show_dialog=False)
-            print(f"Error ensamblando archivo: {e}")
-            return False
+                    # Escribir todos los bloques consecutivos disponibles
+                    while next_block in pending:
+                        result = pending.pop(next_block)
+                        if result['duplicate_of'] is not None:
+                            # HU26: Referencia a un bloque que puede no haberse escrito aún
+                            index_entries.append({
+                                'original_offset': original_offset,
+                                'original_size': result['original_size'],
+                                'duplicate_of': result['duplicate_of']
+                            })
+                        else:
+                            index_entries.append(self._index_entry(
+                                f.tell(), original_offset, len(result['compressed_data']),
+                                result['original_size'], result['checksum'], result['codec_id'], result['flags']
+                            ))
+                            f.write(result['compressed_data'])
+                        original_offset += result['original_size']
+                        next_block += 1
+                        
+                        with state_lock:
+                            state['in_flight'] -= 1
+                        slots.release()
+                        
+                        # Progreso de compresión y escritura (5% a 98%)
+                        if progress_callback:
+                            status = f"Comprimiendo bloque {result['id']} (hilo {result['thread_id']}) - {result['compression_ratio']:.1f}% ratio"
+                            if not progress_callback(status, 5 + (next_block / total_blocks) * 93, "🗜️ Compresión en streaming"):
+                                self.cancel_requested = True
+                                return False
+                
+                # HU12: Índice de bloques al final del archivo
+                write_index(f, resolve_duplicate_entries(index_entries), self.checksum_algorithm)
+            completed = True
+        finally:
+            if not completed and os.path.exists(output_file):
+                os.remove(output_file)
+        
+        if progress_callback:
+            progress_callback("Archivo comprimido exitosamente", 100, "✅ Completado")
+        
+        return True
+    
+    def _build_header_info(self, input_file, original_size: int, block_count: int) -> dict:
+        """
+        HU05/HU08: Construye el encabezado JSON del archivo .pz
+        
+        HU12: El orden de los bloques lo fija el índice; el encabezado no
+        lista sus IDs, así su tamaño no crece con la cantidad de bloques.
+        """
+        original_filename = os.path.basename(input_file) if input_file else "unknown"
+        
+        header_info = {
+            'format': FORMAT_V2,  # HU12: Formato con índice de bloques
+            'original_filename': original_filename,  # HU08: Campo requerido para descompresión
+            'original_size': original_size,  # HU08: Campo requerido para descompresión
+            'block_count': block_count,  # HU08: Campo requerido para descompresión
+            'total_blocks': block_count,  # Compatibilidad
+            'compression_algorithm': self.compression_algorithm.value if hasattr(self.compression_algorithm, 'value') else str(self.compression_algorithm),  # HU08: Campo requerido
+            'checksum_algorithm': self.checksum_algorithm  # HU12/HU18: Checksum de cada entrada del índice
+        }
+        # HU25: El diccionario compartido se guarda una sola vez, en el encabezado
+        if self._dictionary:
+            header_info['dictionary'] = dictionary_to_header(self._dictionary)
+        return header_info
+    
+    def _write_header(self, f, header_info: dict):
+        """
+        HU05: Escribe el tamaño del encabezado (4 bytes) y luego el encabezado JSON
+        """
+        write_header(f, header_info)
+    
+    def _index_entry(self, data_offset: int, original_offset: int, compressed_size: int,
+                     original_size: int, checksum: int, codec_id: int = LEGACY_CODEC_ID,
+                     flags: int = 0) -> dict:
+        """
+        HU12: Crea una entrada del índice de bloques
+        HU21: Incluye el ID del códec del bloque
+        HU23: Incluye los flags del bloque (BLOCK_FLAG_STORED)
+        """
+        return {
+            'data_offset': data_offset,
+            'original_offset': original_offset,
+            'compressed_size': compressed_size,
+            'original_size': original_size,
+            'checksum': checksum,
+            'flags': flags,
+            'codec_id': codec_id
+        }
     
     def _write_compressed_file(self, compressed_blocks, output_file, progress_callback=None):
         """Escribe el archivo comprimido"""
@@ -534,6 +1819,7 @@ class ParallelCompressor:
         try:
             self.is_decompressing = True
             self.cancel_requested = False
+            self.decompression_stats['phase_times'] = {}
             
             if progress_callback:
                 progress_callback("Iniciando descompresión...", 0, "🚀 Inicializando")
@@ -548,26 +1834,51 @@ class ParallelCompressor:
             # Leer información del archivo comprimido
             file_info = self._read_compressed_file_header(input_file, progress_callback)
             
-            if progress_callback:
-                progress_callback("Leyendo bloques comprimidos...", 10, "📖 Lectura")
-            
-            # Leer bloques comprimidos
-            compressed_blocks = self._read_compressed_blocks(input_file, file_info, progress_callback)
-            
-            if progress_callback:
-                progress_callback("Descomprimiendo bloques en paralelo...", 25, "🔄 Descompresión")
+            # HU15: En streaming los bloques se leen, descomprimen y escriben sin cargar el archivo
+            if self.streaming_enabled:
+                with self._timed_phase(self.decompression_stats, 'pipeline'):
+                    return self._decompress_file_streaming(input_file, output_file, file_info, num_threads, progress_callback)
             
-            # Descomprimir bloques en paralelo
-            if num_threads is None:
-                num_threads = min(4, len(compressed_blocks), os.cpu_count() or 1)
+            if self.executor_backend == ExecutorBackend.PROCESSES:
+                # HU10: Solo se lee la tabla de bloques; cada proceso lee sus datos
+                block_table = self._read_block_table(input_file, file_info)
+                if num_threads is None:
+                    num_threads = min(4, len(block_table), os.cpu_count() or 1)
+                
+                if progress_callback:
+                    progress_callback("Descomprimiendo bloques en procesos...", 25, "🔄 Descompresión")
+                
+                with self._timed_phase(self.decompression_stats, 'decompress'):
+                    decompressed_blocks = self._decompress_blocks_with_processes(
+                        input_file, block_table, num_threads, progress_callback
+                    )
+            else:
+                if progress_callback:
+                    progress_callback("Leyendo bloques comprimidos...", 10, "📖 Lectura")
+                
+                # Leer bloques comprimidos
+                with self._timed_phase(self.decompression_stats, 'read'):
+                    compressed_blocks = self._read_compressed_blocks(input_file, file_info, progress_callback)
+                
+                if progress_callback:
+                    progress_callback("Descomprimiendo bloques en paralelo...", 25, "🔄 Descompresión")
+                
+                # Descomprimir bloques en paralelo
+                if num_threads is None:
+                    num_threads = min(4, len(compressed_blocks), os.cpu_count() or 1)
+                
+                with self._timed_phase(self.decompression_stats, 'decompress'):
+                    decompressed_blocks = self._decompress_blocks_parallel(compressed_blocks, num_threads, progress_callback)
             
-            decompressed_blocks = self._decompress_blocks_parallel(compressed_blocks, num_threads, progress_callback)
+            if decompressed_blocks is None:
+                return False
             
             if progress_callback:
                 progress_callback("Ensamblando archivo final...", 85, "🔧 Ensamblaje")
             
             # Ensamblar archivo final
-            success = self._write_decompressed_file(decompressed_blocks, output_file, file_info, progress_callback)
+            with self._timed_phase(self.decompression_stats, 'write'):
+                success = self._write_decompressed_file(decompressed_blocks, output_file, file_info, progress_callback)
             
             if success and progress_callback:
                 original_size = file_info.get('original_size', 0)
@@ -591,22 +1902,8 @@ class ParallelCompressor:
         """
         try:
             with open(file_path, 'rb') as f:
-                # Leer tamaño del encabezado (4 bytes)
-                header_size_bytes = f.read(4)
-                if len(header_size_bytes) < 4:
-                    raise ValueError("Archivo comprimido inválido: encabezado incompleto")
-                
-                header_size = int.from_bytes(header_size_bytes, byteorder='little')
-                
-                if header_size <= 0 or header_size > 1024 * 1024:  # Máximo 1MB para el header
-                    raise ValueError("Archivo comprimido inválido: tamaño de encabezado incorrecto")
-                
-                # Leer y deserializar encabezado
-                header_json = f.read(header_size)
-                if len(header_json) < header_size:
-                    raise ValueError("Archivo comprimido inválido: encabezado truncado")
-                
-                header_info = json.loads(header_json.decode('utf-8'))
+                # Leer y deserializar encabezado (máximo 1MB)
+                header_info = read_header(f)
                 
                 # Validar estructura del encabezado
                 required_fields = ['original_filename', 'original_size', 'block_count', 'compression_algorithm']
@@ -616,8 +1913,6 @@ class ParallelCompressor:
                 
                 return header_info
                 
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Archivo comprimido inválido: error en JSON del encabezado - {str(e)}")
         except Exception as e:
             # HU07: Manejo centralizado de errores
             self._handle_error(e, ErrorType.FILE_READ, "Lectura de encabezado de archivo comprimido", show_dialog=False)
@@ -631,41 +1926,21 @@ class ParallelCompressor:
             compressed_blocks = []
             
             with open(file_path, 'rb') as f:
-                # Saltar encabezado
-                header_size_bytes = f.read(4)
-                header_size = int.from_bytes(header_size_bytes, byteorder='little')
-                f.read(header_size)  # Saltar JSON del encabezado
-                
-                block_count = file_info['block_count']
-                
-                # Leer metadatos de bloques
-                block_metadata = []
-                for i in range(block_count):
-                    # Leer tamaño comprimido (4 bytes)
-                    compressed_size_bytes = f.read(4)
-                    if len(compressed_size_bytes) < 4:
-                        raise ValueError(f"Archivo comprimido inválido: metadatos de bloque {i} incompletos")
-                    
-                    compressed_size = int.from_bytes(compressed_size_bytes, byteorder='little')
-                    
-                    # Leer tamaño original (4 bytes)
-                    original_size_bytes = f.read(4)
-                    if len(original_size_bytes) < 4:
-                        raise ValueError(f"Archivo comprimido inválido: metadatos de bloque {i} incompletos")
-                    
-                    original_size = int.from_bytes(original_size_bytes, byteorder='little')
-                    
-                    block_metadata.append({
-                        'id': i,
-                        'compressed_size': compressed_size,
-                        'original_size': original_size
-                    })
+                block_metadata = self._read_block_metadata(f)
                 
                 # Leer datos comprimidos de cada bloque
                 for i, meta in enumerate(block_metadata):
                     if self.cancel_requested:
                         break
                     
+                    # HU26: Los duplicados comparten los datos del original, que ya se leyeron
+                    if meta['flags'] & BLOCK_FLAG_DUPLICATE:
+                        compressed_blocks.append(dict(meta, compressed_data=None))
+                        continue
+                    
+                    # HU12: Ubicar cada bloque por su offset en el índice
+                    if f.tell() != meta['data_offset']:
+                        f.seek(meta['data_offset'])
                     compressed_data = f.read(meta['compressed_size'])
                     if len(compressed_data) < meta['compressed_size']:
                         raise ValueError(f"Archivo comprimido inválido: datos de bloque {i} incompletos")
@@ -673,8 +1948,14 @@ class ParallelCompressor:
                     compressed_blocks.append({
                         'id': meta['id'],
                         'compressed_data': compressed_data,
+                        'data_offset': meta['data_offset'],
                         'compressed_size': meta['compressed_size'],
-                        'original_size': meta['original_size']
+                        'original_size': meta['original_size'],
+                        'checksum': meta['checksum'],
+                        'checksum_algorithm': meta['checksum_algorithm'],
+                        'codec_id': meta['codec_id'],
+                        'flags': meta['flags'],
+                        'dictionary': meta['dictionary']
                     })
                     
                     # Progreso de lectura (10% a 25%)
@@ -692,6 +1973,148 @@ class ParallelCompressor:
             self._handle_error(e, ErrorType.FILE_READ, "Lectura de bloques comprimidos", show_dialog=False)
             raise
     
+    def _read_block_metadata(self, f) -> list:
+        """
+        HU08: Lee el encabezado y el índice de bloques de un archivo .pz abierto
+        HU12: Soporta PARZIP_V1 (tabla de tamaños) y PARZIP_V2 (índice al final)
+        
+        Cada entrada incluye 'data_offset', la posición absoluta de sus datos.
+        """
+        f.seek(0)
+        header_info = read_header(f)
+        entries = read_index(f, header_info)
+        
+        # HU18: Cada bloque lleva el algoritmo con el que se verifica su checksum
+        # HU25: y el diccionario compartido del encabezado (None si no hay)
+        checksum_algorithm = header_info.get('checksum_algorithm', ChecksumAlgorithm.CRC32)
+        dictionary = dictionary_from_header(header_info)
+        for entry in entries:
+            entry['checksum_algorithm'] = checksum_algorithm
+            entry['dictionary'] = dictionary
+        return entries
+    
+    def _split_duplicate_blocks(self, blocks: list):
+        """
+        HU26: Separa los bloques duplicados de los que deben descomprimirse
+        
+        Un duplicado apunta a los mismos datos que su original, que se ubica
+        por data_offset.
+        
+        Returns:
+            tuple: (bloques a descomprimir, {ID del duplicado: ID del original})
+        """
+        owners = {}
+        for block in blocks:
+            if not block['flags'] & BLOCK_FLAG_DUPLICATE:
+                owners.setdefault(block['data_offset'], block['id'])
+        
+        unique_blocks = []
+        duplicates = {}
+        for block in blocks:
+            owner = owners.get(block['data_offset']) if block['flags'] & BLOCK_FLAG_DUPLICATE else None
+            if owner is None:
+                unique_blocks.append(block)
+            else:
+                duplicates[block['id']] = owner
+        return unique_blocks, duplicates
+    
+    def _fill_duplicate_blocks(self, decompressed_blocks: list, duplicates: dict):
+        """
+        HU26: Completa los duplicados con el resultado de su bloque original
+        """
+        for block_id, owner in duplicates.items():
+            result = decompressed_blocks[owner]
+            decompressed_blocks[block_id] = dict(result, id=block_id) if result is not None else None
+        self.decompression_stats['duplicate_blocks'] = len(duplicates)
+    
+    def _read_block_table(self, file_path: str, file_info: dict) -> list:
+        """
+        HU10: Lee únicamente la tabla de bloques de un archivo .pz
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                return self._read_block_metadata(f)
+        except Exception as e:
+            # HU07: Manejo centralizado de errores
+            self._handle_error(e, ErrorType.FILE_READ, "Lectura de tabla de bloques", show_dialog=False)
+            raise
+    
+    def _decompress_blocks_with_processes(self, file_path: str, block_table: list, num_workers: int, progress_callback=None):
+        """
+        HU10: Descomprime bloques en un pool de procesos
+        
+        Cada trabajo recibe la ruta del .pz y la posición del bloque, de modo
+        que los datos comprimidos no se copian entre procesos.
+        """
+        decompressed_blocks = [None] * len(block_table)
+        block_table, duplicates = self._split_duplicate_blocks(block_table)
+        self._start_process_pool(num_workers)
+        
+        try:
+            futures = {
+                self._process_pool.submit(
+                    decompress_file_range, file_path, meta['data_offset'],
+                    meta['compressed_size'], meta['original_size'],
+                    meta['id'], meta['checksum'], meta['checksum_algorithm'], meta['codec_id'],
+                    meta['flags'], meta['dictionary']
+                ): meta
+                for meta in block_table
+            }
+            
+            pending = set(futures)
+            completed_blocks = 0
+            total_blocks = len(block_table)
+            
+            while pending and not self.cancel_requested:
+                done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    meta = futures[future]
+                    try:
+                        # HU18: Tamaño y checksum ya se verificaron dentro del proceso
+                        decompressed_data, worker_id = future.result()
+                        
+                        decompressed_blocks[meta['id']] = {
+                            'id': meta['id'],
+                            'data': decompressed_data,
+                            'original_size': meta['original_size'],
+                            'thread_id': worker_id
+                        }
+                    except Exception as e:
+                        # HU07: Manejo centralizado de errores
+                        self._handle_error(e, ErrorType.DECOMPRESSION, f"Descompresión de bloque {meta['id']}", show_dialog=False)
+                        decompressed_blocks[meta['id']] = {
+                            'id': meta['id'],
+                            'data': None,
+                            'error': str(e),
+                            'thread_id': None
+                        }
+                        worker_id = '?'
+                    
+                    completed_blocks += 1
+                    
+                    # Progreso de descompresión (25% a 85%)
+                    if progress_callback:
+                        if not progress_callback(
+                            f"Descomprimiendo bloque {completed_blocks}/{total_blocks}",
+                            25 + (completed_blocks / total_blocks) * 60,
+                            f"🔄 Proceso {worker_id}"
+                        ):
+                            self.cancel_requested = True
+                            break
+            
+            if self.cancel_requested:
+                # HU30: Solo se cancelan las tareas de este trabajo
+                for future in pending:
+                    future.cancel()
+                return None
+            
+            self._fill_duplicate_blocks(decompressed_blocks, duplicates)
+            return decompressed_blocks
+            
+        finally:
+            self._shutdown_process_pool()
+    
     def _decompress_blocks_parallel(self, compressed_blocks: list, num_threads: int, progress_callback=None):
         """
         HU08: Descomprime bloques en paralelo usando múltiples hilos
@@ -699,34 +2122,19 @@ class ParallelCompressor:
         try:
             # Inicializar array de resultados
             decompressed_blocks = [None] * len(compressed_blocks)
+            # HU26: Cada contenido repetido se descomprime una sola vez
+            compressed_blocks, duplicates = self._split_duplicate_blocks(compressed_blocks)
             
             # Cola para reportar progreso
             progress_queue = Queue()
             
-            # Dividir bloques entre hilos
-            blocks_per_thread = len(compressed_blocks) // num_threads
-            remainder = len(compressed_blocks) % num_threads
-            
-            threads = []
-            start_idx = 0
-            
-            for thread_id in range(num_threads):
-                # Calcular cantidad de bloques para este hilo
-                thread_blocks = blocks_per_thread + (1 if thread_id < remainder else 0)
-                end_idx = start_idx + thread_blocks
-                
-                if thread_blocks > 0:
-                    thread_blocks_list = compressed_blocks[start_idx:end_idx]
-                    
-                    # Crear y ejecutar hilo
-                    thread = threading.Thread(
-                        target=self._decompress_thread_worker,
-                        args=(thread_blocks_list, decompressed_blocks, start_idx, progress_queue, thread_id)
-                    )
-                    threads.append(thread)
-                    thread.start()
-                
-                start_idx = end_idx
+            # HU14: Los hilos toman bloques de una cola compartida
+            num_workers = min(num_threads, len(compressed_blocks))
+            scheduler = DynamicBlockScheduler(compressed_blocks, max(1, num_workers))
+            threads = self._start_workers(self._decompress_thread_worker, [
+                (scheduler.iter_blocks(thread_id), decompressed_blocks, progress_queue, thread_id)
+                for thread_id in range(num_workers)
+            ])
             
             # Monitorear progreso
             completed_blocks = 0
@@ -754,12 +2162,15 @@ class ParallelCompressor:
                     pass
             
             # Esperar a que terminen todos los hilos
-            for thread in threads:
-                thread.join()
+            self._join_workers(threads)
+            
+            scheduler.finish()
+            self.decompression_stats['scheduler'] = scheduler.get_statistics()
             
             if self.cancel_requested:
                 return None
             
+            self._fill_duplicate_blocks(decompressed_blocks, duplicates)
             return decompressed_blocks
             
         except Exception as e:
@@ -767,36 +2178,21 @@ class ParallelCompressor:
             self._handle_error(e, ErrorType.DECOMPRESSION, "Descompresión paralela de bloques", show_dialog=False)
             raise
     
-    def _decompress_thread_worker(self, compressed_blocks: list, result_array: list, start_idx: int, progress_queue: Queue, thread_id: int):
+    def _decompress_thread_worker(self, compressed_blocks, result_array: list, progress_queue: Queue, thread_id: int):
         """
         HU08: Worker que descomprime bloques en un hilo
+        HU14: Los bloques llegan de la cola compartida y se ubican por su ID
         """
-        for i, block in enumerate(compressed_blocks):
+        for block in compressed_blocks:
             if self.cancel_requested:
                 break
             
             try:
-                # Descomprimir datos según el algoritmo usado
-                compressed_data = block['compressed_data']
-                
-                # Por ahora asumimos zlib, pero podríamos detectar el algoritmo del header
-                if len(compressed_data) == block['original_size']:
-                    # Bloque no estaba comprimido (posible error durante compresión)
-                    decompressed_data = compressed_data
-                else:
-                    # Intentar descompresión zlib
-                    try:
-                        decompressed_data = zlib.decompress(compressed_data)
-                    except zlib.error:
-                        # Si falla zlib, intentar RLE
-                        decompressed_data = self._decompress_rle(compressed_data)
-                
-                # Verificar tamaño
-                if len(decompressed_data) != block['original_size']:
-                    raise ValueError(f"Tamaño descomprimido incorrecto para bloque {block['id']}")
+                # Descomprimir datos y verificar tamaño y checksum (HU18)
+                decompressed_data = self._decompress_block(block)
                 
                 # Almacenar resultado
-                result_array[start_idx + i] = {
+                result_array[block['id']] = {
                     'id': block['id'],
                     'data': decompressed_data,
                     'original_size': block['original_size'],
@@ -816,36 +2212,245 @@ class ParallelCompressor:
                 print(f"Error descomprimiendo bloque {block['id']}: {e}")
                 
                 # En caso de error, marcar bloque como fallido
-                result_array[start_idx + i] = {
+                result_array[block['id']] = {
                     'id': block['id'],
                     'data': None,
                     'error': str(e),
                     'thread_id': thread_id
                 }
+                progress_queue.put({
+                    'block_id': block['id'],
+                    'thread_id': thread_id,
+                    'decompressed_size': 0
+                })
+    
+    def _decompress_file_streaming(self, input_file: str, output_file: str, file_info: dict,
+                                   num_threads: int = None, progress_callback=None):
+        """
+        HU15: Descompresión en streaming con memoria acotada
+        
+        Etapas conectadas por colas acotadas:
+        lector (un hilo) -> descompresores (num_threads hilos) -> escritor ordenado (hilo llamador).
+        Cada bloque se escribe en cuanto todos los anteriores están escritos, y un
+        semáforo limita los bloques leídos y aún no escritos a num_threads + queue_depth.
+        """
+        block_table = self._read_block_table(input_file, file_info)
+        total_blocks = len(block_table)
+        if num_threads is None:
+            num_threads = min(4, total_blocks, os.cpu_count() or 1)
+        num_threads = max(1, min(num_threads, total_blocks))
+        window = num_threads + self.stream_queue_depth
+        
+        work_queue = Queue(maxsize=self.stream_queue_depth)
+        result_queue = Queue(maxsize=window)
+        slots = threading.Semaphore(window)
+        abort = threading.Event()
+        state = {'in_flight': 0, 'max_in_flight': 0, 'error': None}
+        state_lock = threading.Lock()
+        
+        # HU10: Con procesos cada trabajador lee sus propios datos comprimidos
+        if self.executor_backend == ExecutorBackend.PROCESSES:
+            self._start_process_pool(num_threads)
+        
+        reader = threading.Thread(
+            target=self._stream_block_reader_stage,
+            args=(input_file, block_table, work_queue, slots, num_threads, abort, state, state_lock)
+        )
+        workers = [
+            threading.Thread(
+                target=self._stream_decompress_stage,
+                args=(work_queue, result_queue, abort, thread_id)
+            )
+            for thread_id in range(num_threads)
+        ]
+        
+        reader.start()
+        for worker in workers:
+            worker.start()
+        
+        try:
+            success = self._stream_decompressed_writer_stage(
+                output_file, file_info, total_blocks, result_queue, slots,
+                abort, state, state_lock, progress_callback
+            )
+        finally:
+            abort.set()
+            reader.join()
+            for worker in workers:
+                worker.join()
+            self._shutdown_process_pool()
+        
+        largest_block = max((meta['original_size'] for meta in block_table), default=0)
+        self.decompression_stats['streaming'] = {
+            'queue_depth': self.stream_queue_depth,
+            'window_blocks': window,
+            'max_in_flight_blocks': state['max_in_flight'],
+            'max_buffered_bytes': state['max_in_flight'] * largest_block
+        }
+        
+        return success
     
-    def _decompress_rle(self, compressed_data: bytes) -> bytes:
+    def _stream_block_reader_stage(self, input_file, block_table, work_queue, slots, num_workers,
+                                   abort, state, state_lock):
         """
-        HU08: Descomprime datos usando Run-Length Encoding (RLE)
+        HU15: Etapa lectora - lee bloques comprimidos solo cuando hay espacio en la ventana
         """
         try:
-            decompressed = bytearray()
-            i = 0
+            with open(input_file, 'rb') as f:
+                for meta in block_table:
+                    # Esperar a que el escritor libere un lugar en la ventana
+                    while not slots.acquire(timeout=0.1):
+                        if self._stream_should_stop(abort):
+                            return
+                    
+                    with state_lock:
+                        state['in_flight'] += 1
+                        state['max_in_flight'] = max(state['max_in_flight'], state['in_flight'])
+                    
+                    block = dict(meta, file_path=input_file)
+                    if self._process_pool is None:
+                        if f.tell() != meta['data_offset']:
+                            f.seek(meta['data_offset'])
+                        block['compressed_data'] = f.read(meta['compressed_size'])
+                        if len(block['compressed_data']) < meta['compressed_size']:
+                            raise ValueError(f"Archivo comprimido inválido: datos de bloque {meta['id']} incompletos")
+                    
+                    if not self._stream_put(work_queue, block, abort):
+                        return
+                    
+        except Exception as e:
+            # HU07: Manejo centralizado de errores
+            self._handle_error(e, ErrorType.FILE_READ, "Lectura de bloques comprimidos en streaming", show_dialog=False)
+            state['error'] = e
+            abort.set()
+            return
+        
+        # Señal de fin para cada descompresor
+        for _ in range(num_workers):
+            if not self._stream_put(work_queue, None, abort):
+                return
+    
+    def _stream_decompress_stage(self, work_queue, result_queue, abort, thread_id):
+        """
+        HU15: Etapa descompresora - descomprime bloques y los entrega al escritor
+        """
+        while not self._stream_should_stop(abort):
+            try:
+                block = work_queue.get(timeout=0.1)
+            except Empty:
+                continue
             
-            while i < len(compressed_data):
-                if i + 1 >= len(compressed_data):
-                    break
-                
-                count = compressed_data[i]
-                value = compressed_data[i + 1]
-                
-                # Añadir bytes descomprimidos
-                decompressed.extend([value] * count)
-                i += 2
+            if block is None:
+                return
             
-            return bytes(decompressed)
+            result = {'id': block['id'], 'thread_id': thread_id, 'data': None}
+            try:
+                result['data'] = self._decompress_block(block)
+            except Exception as e:
+                # HU07: Manejo centralizado de errores
+                self._handle_error(e, ErrorType.DECOMPRESSION, f"Descompresión de bloque {block['id']}", show_dialog=False)
+                result['data'] = None
+                result['error'] = str(e)
             
-        except Exception as e:
-            raise ValueError(f"Error en descompresión RLE: {str(e)}")
+            if not self._stream_put(result_queue, result, abort):
+                return
+    
+    def _decompress_block(self, block) -> bytes:
+        """
+        HU15: Descomprime un bloque en el hilo actual o, con el backend de
+        procesos, delegándolo al pool
+        HU18: El bloque se verifica contra su tamaño y checksum en el mismo trabajador
+        
+        Raises:
+            ValueError: Si el bloque no coincide con el índice
+        """
+        if self._process_pool is not None:
+            decompressed_data, _ = self._process_pool.submit(
+                decompress_file_range, block['file_path'], block['data_offset'],
+                block['compressed_size'], block['original_size'],
+                block['id'], block.get('checksum'), block.get('checksum_algorithm', ChecksumAlgorithm.CRC32),
+                block.get('codec_id', LEGACY_CODEC_ID), block.get('flags', 0), block.get('dictionary')
+            ).result()
+            return decompressed_data
+        
+        # HU21: El códec sale del índice, sin probar zlib y luego RLE
+        # HU23: Los bloques guardados sin comprimir pasan sin copia
+        decompressed_data = decompress_payload(block['compressed_data'], block['original_size'],
+                                               block.get('codec_id', LEGACY_CODEC_ID), block.get('flags', 0),
+                                               block.get('dictionary'))
+        return verify_block(decompressed_data, block['id'], block['original_size'], block.get('checksum'),
+                            block.get('checksum_algorithm', ChecksumAlgorithm.CRC32))
+    
+    def _stream_decompressed_writer_stage(self, output_file, file_info, total_blocks, result_queue, slots,
+                                          abort, state, state_lock, progress_callback=None):
+        """
+        HU15: Etapa escritora - escribe cada bloque en cuanto los anteriores están escritos
+        """
+        pending = {}
+        next_block = 0
+        
+        if progress_callback:
+            if not progress_callback("Descomprimiendo en streaming...", 10, "🔄 Descompresión"):
+                self.cancel_requested = True
+                return False
+        
+        # Crear directorio de destino si no existe
+        output_dir = os.path.dirname(output_file)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        
+        # HU15: Si se cancela o un bloque falla, no queda un archivo truncado que parezca completo
+        completed = False
+        try:
+            with open(output_file, 'wb') as f:
+                while next_block < total_blocks:
+                    if state['error'] is not None:
+                        raise state['error']
+                    if self.cancel_requested:
+                        return False
+                    
+                    try:
+                        result = result_queue.get(timeout=0.1)
+                    except Empty:
+                        continue
+                    if result['data'] is None:
+                        raise ValueError(f"Error en bloque {result['id']}: {result.get('error', 'Desconocido')}")
+                    pending[result['id']] = result
+                    
+                    # Escribir todos los bloques consecutivos disponibles
+                    while next_block in pending:
+                        result = pending.pop(next_block)
+                        f.write(result['data'])
+                        next_block += 1
+                        
+                        with state_lock:
+                            state['in_flight'] -= 1
+                        slots.release()
+                        
+                        # Progreso de descompresión y escritura (10% a 98%)
+                        if progress_callback:
+                            if not progress_callback(
+                                f"Descomprimiendo bloque {next_block}/{total_blocks}",
+                                10 + (next_block / total_blocks) * 88,
+                                f"🔄 Hilo {result['thread_id']}"
+                            ):
+                                self.cancel_requested = True
+                                return False
+            
+            # Verificar tamaño final
+            actual_size = os.path.getsize(output_file)
+            expected_size = file_info.get('original_size', 0)
+            if actual_size != expected_size:
+                raise ValueError(f"Tamaño del archivo descomprimido incorrecto: {actual_size} vs {expected_size} esperados")
+            completed = True
+        finally:
+            if not completed and os.path.exists(output_file):
+                os.remove(output_file)
+        
+        if progress_callback:
+            progress_callback("Descompresión completada exitosamente", 100, "✅ Completado")
+        
+        return True
     
     def _write_decompressed_file(self, decompressed_blocks: list, output_file: str, file_info: dict, progress_callback=None):
         """
@@ -916,12 +2521,38 @@ class ParallelCompressor:
         # Usar worker mejorado
         self._compress_thread_worker_improved(blocks, result_array, progress_queue, thread_id)
     
+    def read_range(self, input_file: str, offset: int, size: int) -> bytes:
+        """
+        HU12: Lee un rango de bytes del archivo original sin descomprimir el archivo completo
+        
+        Solo se leen y descomprimen los bloques que cubren el rango, ubicados
+        mediante el índice de bloques del archivo .pz.
+        
+        Args:
+            input_file: Ruta del archivo .pz
+            offset: Posición inicial dentro del archivo original
+            size: Cantidad de bytes a leer
+        """
+        try:
+            with PzArchive(input_file) as archive:
+                return archive.read_range(offset, size)
+        except Exception as e:
+            # HU07: Manejo centralizado de errores
+            self._handle_error(e, ErrorType.DECOMPRESSION, "Lectura de rango de archivo comprimido", show_dialog=False)
+            raise
+    
     def get_compression_statistics(self):
         """
         HU04: Obtiene estadísticas detalladas de la compresión
         """
         return self.compression_stats
     
+    def get_decompression_statistics(self):
+        """
+        HU14: Obtiene estadísticas de la última descompresión (uso por hilo)
+        """
+        return self.decompression_stats
+    
     def analyze_file_for_compression(self, file_path):
         """
         HU04: Analiza un archivo para determinar la estrategia de compresión óptima
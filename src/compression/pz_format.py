@@ -0,0 +1,524 @@
+"""
+HU12: Formato .pz con índice de bloques para acceso aleatorio
+
+Estructura PARZIP_V2:
+    [4 bytes: tamaño del encabezado][encabezado JSON]
+    [datos comprimidos de cada bloque]
+    [índice: una entrada INDEX_ENTRY por bloque]
+    [cola: offset del índice, cantidad de entradas y firma 'PZIX']
+
+Cada entrada del índice guarda dónde empiezan los datos comprimidos del
+bloque, su offset dentro del archivo original, ambos tamaños y un checksum
+de los datos originales. Así, leer un rango del archivo original solo
+requiere descomprimir los bloques que lo cubren.
+
+HU18: El algoritmo de checksum se indica en el encabezado
+('checksum_algorithm', CRC32 por defecto). Los checksums de más de 4 bytes
+(SHA-256) se guardan completos en una tabla ubicada justo antes del índice;
+la entrada del índice conserva sus 32 bits menos significativos.
+
+HU21: Cada entrada guarda el ID del códec con que se comprimió su bloque
+(ver codecs.py), de modo que un archivo puede mezclar códecs.
+
+HU23: El bit BLOCK_FLAG_STORED de 'flags' marca los bloques guardados sin
+comprimir; se leen tal cual, sin deducirlo del tamaño del bloque.
+
+HU24: El bit BLOCK_FLAG_NO_CHECKSUM marca los bloques escritos sin checksum;
+al leerlos su checksum es None, como en PARZIP_V1.
+
+HU25: Los bloques con BLOCK_FLAG_DICTIONARY se comprimieron con el
+diccionario guardado en el encabezado ('dictionary', ver dictionary.py).
+
+HU33: Un encabezado escrito con espacio reservado (el JSON se completa con
+espacios hasta ese tamaño) puede reescribirse al cerrar, cuando ya se
+conocen el tamaño original y la cantidad de bloques.
+
+HU26: Un bloque idéntico a otro no guarda datos propios: su entrada apunta
+a los datos del original (mismo data_offset, tamaño comprimido, códec y
+checksum) y lleva BLOCK_FLAG_DUPLICATE. Un lector que ignore el flag
+descomprime los mismos datos y obtiene el mismo resultado.
+
+Los archivos PARZIP_V1 (tabla de tamaños sin offsets) siguen siendo
+legibles: su índice se reconstruye a partir de la tabla.
+"""
+
+import bisect
+import json
+import os
+import struct
+import threading
+from typing import List, Dict, Any
+
+from .checksums import ChecksumAlgorithm
+from .codecs import BLOCK_FLAG_DUPLICATE, BLOCK_FLAG_NO_CHECKSUM, LEGACY_CODEC_ID
+from .dictionary import dictionary_from_header
+from .executor_backend import decompress_payload
+
+
+FORMAT_V1 = 'PARZIP_V1'
+FORMAT_V2 = 'PARZIP_V2'
+
+# Tamaño máximo aceptado para el encabezado JSON
+MAX_HEADER_SIZE = 1024 * 1024
+
+# data_offset, original_offset, compressed_size, original_size, checksum, flags, codec_id
+# HU21: codec_id ocupa un byte que antes era relleno (0 en archivos anteriores)
+INDEX_ENTRY = struct.Struct('<QQIIIBB2x')
+
+# index_offset, entry_count, firma
+TRAILER = struct.Struct('<QQ4s')
+INDEX_MAGIC = b'PZIX'
+
+
+def block_checksum(data: bytes, algorithm: str = ChecksumAlgorithm.CRC32) -> int:
+    """
+    Checksum determinista de un bloque (CRC32 por defecto)
+
+    A diferencia de hash(), el resultado es el mismo en cualquier proceso
+    y puede verificarse después de escribir el archivo.
+    """
+    return ChecksumAlgorithm.compute(data, algorithm)
+
+
+def write_header(f, header_info: Dict[str, Any], reserve: int = 0) -> None:
+    """
+    Escribe el tamaño del encabezado (4 bytes) y luego el encabezado JSON
+
+    Args:
+        reserve: HU33: Tamaño fijo del encabezado; el JSON se completa con espacios
+
+    Raises:
+        ValueError: Si el JSON no entra en el espacio reservado o supera
+        MAX_HEADER_SIZE (los lectores no podrían abrir el archivo)
+    """
+    header_json = json.dumps(header_info).encode('utf-8')
+    if max(len(header_json), reserve) > MAX_HEADER_SIZE:
+        raise ValueError(f"El encabezado ocupa {len(header_json)} bytes; el máximo es {MAX_HEADER_SIZE}")
+    if reserve:
+        if len(header_json) > reserve:
+            raise ValueError(f"El encabezado ocupa {len(header_json)} bytes y solo hay {reserve} reservados")
+        header_json = header_json.ljust(reserve, b' ')
+    f.write(len(header_json).to_bytes(4, byteorder='little'))
+    f.write(header_json)
+
+
+def read_header(f) -> Dict[str, Any]:
+    """
+    Lee el encabezado JSON desde el inicio del archivo
+
+    Deja el archivo posicionado justo después del encabezado.
+
+    Raises:
+        ValueError: Si el encabezado está incompleto o es inválido
+    """
+    header_size_bytes = f.read(4)
+    if len(header_size_bytes) < 4:
+        raise ValueError("Archivo comprimido inválido: encabezado incompleto")
+
+    header_size = int.from_bytes(header_size_bytes, byteorder='little')
+    if header_size <= 0 or header_size > MAX_HEADER_SIZE:
+        raise ValueError("Archivo comprimido inválido: tamaño de encabezado incorrecto")
+
+    header_json = f.read(header_size)
+    if len(header_json) < header_size:
+        raise ValueError("Archivo comprimido inválido: encabezado truncado")
+
+    try:
+        return json.loads(header_json.decode('utf-8'))
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise ValueError(f"Archivo comprimido inválido: error en JSON del encabezado - {str(e)}")
+
+
+def write_index(f, entries: List[Dict[str, Any]],
+                checksum_algorithm: str = ChecksumAlgorithm.CRC32) -> None:
+    """
+    Escribe el índice de bloques y la cola en la posición actual del archivo
+
+    Args:
+        f: Archivo abierto en modo binario, posicionado tras el último bloque
+        entries: Entradas ordenadas por ID de bloque
+        checksum_algorithm: Algoritmo de los checksums (debe coincidir con el encabezado)
+    """
+    # HU18: Tabla de checksums completos para algoritmos de más de 4 bytes
+    digest_size = ChecksumAlgorithm.digest_size(checksum_algorithm)
+    if digest_size > 4:
+        f.write(b''.join(
+            (entry['checksum'] or 0).to_bytes(digest_size, byteorder='big') for entry in entries
+        ))
+
+    index_offset = f.tell()
+    f.write(b''.join(
+        INDEX_ENTRY.pack(
+            entry['data_offset'],
+            entry['original_offset'],
+            entry['compressed_size'],
+            entry['original_size'],
+            (entry['checksum'] or 0) & 0xFFFFFFFF,
+            entry.get('flags', 0),
+            entry.get('codec_id', LEGACY_CODEC_ID)
+        )
+        for entry in entries
+    ))
+    f.write(TRAILER.pack(index_offset, len(entries), INDEX_MAGIC))
+
+
+def resolve_duplicate_entries(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    HU26: Completa las entradas de bloques duplicados antes de escribir el índice
+
+    Una entrada con 'duplicate_of' (ID del bloque original, que es su
+    posición en entries) toma los datos del original y se marca con
+    BLOCK_FLAG_DUPLICATE; conserva su propio offset y tamaño original.
+    """
+    for entry in entries:
+        target_id = entry.pop('duplicate_of', None)
+        if target_id is None:
+            continue
+        target = entries[target_id]
+        if 'duplicate_of' in target or target['original_size'] != entry['original_size']:
+            raise ValueError(f"Referencia de bloque duplicado inválida: {target_id}")
+        entry.update(
+            data_offset=target['data_offset'],
+            compressed_size=target['compressed_size'],
+            checksum=target['checksum'],
+            flags=target.get('flags', 0) | BLOCK_FLAG_DUPLICATE,
+            codec_id=target.get('codec_id', LEGACY_CODEC_ID)
+        )
+    return entries
+
+
+def read_index(f, header: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Lee el índice de bloques de un archivo .pz
+
+    Args:
+        f: Archivo abierto posicionado justo después del encabezado
+        header: Encabezado ya leído con read_header
+
+    Returns:
+        Lista de entradas con id, data_offset, original_offset, tamaños y checksum
+        (checksum es None en archivos PARZIP_V1 y en bloques sin checksum)
+    """
+    if header.get('format') == FORMAT_V2:
+        return _read_index_v2(f, header.get('checksum_algorithm', ChecksumAlgorithm.CRC32))
+    return _read_index_v1(f, header['block_count'])
+
+
+def _read_index_v2(f, checksum_algorithm: str = ChecksumAlgorithm.CRC32) -> List[Dict[str, Any]]:
+    """Lee el índice ubicado al final de un archivo PARZIP_V2"""
+    f.seek(0, 2)
+    file_size = f.tell()
+    if file_size < TRAILER.size:
+        raise ValueError("Archivo comprimido inválido: falta el índice de bloques")
+
+    f.seek(file_size - TRAILER.size)
+    index_offset, entry_count, magic = TRAILER.unpack(f.read(TRAILER.size))
+    if magic != INDEX_MAGIC:
+        raise ValueError("Archivo comprimido inválido: firma del índice incorrecta")
+    if index_offset + entry_count * INDEX_ENTRY.size != file_size - TRAILER.size:
+        raise ValueError("Archivo comprimido inválido: índice de bloques truncado")
+
+    f.seek(index_offset)
+    raw_index = f.read(entry_count * INDEX_ENTRY.size)
+
+    entries = []
+    for block_id, fields in enumerate(INDEX_ENTRY.iter_unpack(raw_index)):
+        data_offset, original_offset, compressed_size, original_size, checksum, flags, codec_id = fields
+        entries.append({
+            'id': block_id,
+            'data_offset': data_offset,
+            'original_offset': original_offset,
+            'compressed_size': compressed_size,
+            'original_size': original_size,
+            'checksum': checksum,
+            'flags': flags,
+            'codec_id': codec_id
+        })
+
+    # HU18: Reemplazar los 32 bits del índice por los checksums completos
+    digest_size = ChecksumAlgorithm.digest_size(checksum_algorithm)
+    if digest_size > 4:
+        table_size = entry_count * digest_size
+        if index_offset < table_size:
+            raise ValueError("Archivo comprimido inválido: tabla de checksums truncada")
+        f.seek(index_offset - table_size)
+        raw_table = f.read(table_size)
+        for i, entry in enumerate(entries):
+            digest = raw_table[i * digest_size:(i + 1) * digest_size]
+            entry['checksum'] = int.from_bytes(digest, byteorder='big')
+
+    # HU24: Bloques escritos sin checksum
+    for entry in entries:
+        if entry['flags'] & BLOCK_FLAG_NO_CHECKSUM:
+            entry['checksum'] = None
+
+    return entries
+
+
+def _read_index_v1(f, block_count: int) -> List[Dict[str, Any]]:
+    """Reconstruye el índice a partir de la tabla de tamaños de PARZIP_V1"""
+    entries = []
+    for i in range(block_count):
+        # Tamaño comprimido (4 bytes) y tamaño original (4 bytes)
+        raw_entry = f.read(8)
+        if len(raw_entry) < 8:
+            raise ValueError(f"Archivo comprimido inválido: metadatos de bloque {i} incompletos")
+
+        entries.append({
+            'id': i,
+            'compressed_size': int.from_bytes(raw_entry[:4], byteorder='little'),
+            'original_size': int.from_bytes(raw_entry[4:], byteorder='little'),
+            'checksum': None,
+            'flags': 0,
+            'codec_id': LEGACY_CODEC_ID
+        })
+
+    data_offset = f.tell()
+    original_offset = 0
+    for entry in entries:
+        entry['data_offset'] = data_offset
+        entry['original_offset'] = original_offset
+        data_offset += entry['compressed_size']
+        original_offset += entry['original_size']
+
+    return entries
+
+
+class PzArchive:
+    """
+    HU12: Lector de archivos .pz con acceso aleatorio por rango de bytes
+
+    Solo lee el encabezado y el índice al abrir; los bloques se leen y
+    descomprimen bajo demanda.
+    """
+
+    def __init__(self, file_path: str):
+        """
+        Abre un archivo .pz y carga su índice
+
+        Args:
+            file_path: Ruta del archivo .pz
+        """
+        self.file_path = file_path
+        self._file = open(file_path, 'rb')
+        # HU28: seek + read de un bloque es atómico entre hilos
+        self._lock = threading.Lock()
+        try:
+            self.header = read_header(self._file)
+            self.blocks = read_index(self._file, self.header)
+        except Exception:
+            self._file.close()
+            raise
+
+        self.checksum_algorithm = self.header.get('checksum_algorithm', ChecksumAlgorithm.CRC32)
+        self.dictionary = dictionary_from_header(self.header)
+        self._original_offsets = [block['original_offset'] for block in self.blocks]
+        self.original_size = sum(block['original_size'] for block in self.blocks)
+
+    def close(self) -> None:
+        """Cierra el archivo subyacente"""
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def find_blocks(self, offset: int, size: int) -> List[Dict[str, Any]]:
+        """
+        Obtiene las entradas de los bloques que cubren [offset, offset + size)
+        """
+        if size <= 0 or offset >= self.original_size:
+            return []
+
+        first = bisect.bisect_right(self._original_offsets, offset) - 1
+        last = bisect.bisect_right(self._original_offsets, offset + size - 1) - 1
+        return self.blocks[max(first, 0):last + 1]
+
+    def read_block(self, block_id: int, verify: bool = True) -> bytes:
+        """
+        Lee y descomprime un único bloque
+
+        Raises:
+            ValueError: Si el bloque no coincide con su tamaño o checksum
+        """
+        block = self.blocks[block_id]
+        compressed_data = self.read_compressed(block_id)
+        data = decompress_payload(compressed_data, block['original_size'], block['codec_id'], block['flags'],
+                                  self.dictionary)
+        if len(data) != block['original_size']:
+            raise ValueError(f"Tamaño descomprimido incorrecto para bloque {block_id}")
+        if verify and not ChecksumAlgorithm.verify(data, block['checksum'], self.checksum_algorithm):
+            raise ValueError(f"Checksum incorrecto en bloque {block_id}")
+
+        return data
+
+    def read_compressed(self, block_id: int) -> bytes:
+        """
+        HU28: Lee los datos comprimidos de un bloque tal como están en el archivo
+
+        Raises:
+            ValueError: Si el archivo termina antes que los datos del bloque
+        """
+        block = self.blocks[block_id]
+        with self._lock:
+            self._file.seek(block['data_offset'])
+            compressed_data = self._file.read(block['compressed_size'])
+        if len(compressed_data) < block['compressed_size']:
+            raise ValueError(f"Archivo comprimido inválido: datos de bloque {block_id} incompletos")
+        return compressed_data
+
+    def read_range(self, offset: int, size: int) -> bytes:
+        """
+        Lee size bytes del archivo original a partir de offset
+
+        Solo se descomprimen los bloques que cubren el rango solicitado.
+        El resultado es más corto si el rango excede el final del archivo.
+        """
+        if offset < 0 or size < 0:
+            raise ValueError("El offset y el tamaño deben ser no negativos")
+
+        parts = []
+        end = offset + size
+        for block in self.find_blocks(offset, size):
+            data = self.read_block(block['id'])
+            start = max(offset - block['original_offset'], 0)
+            stop = min(end - block['original_offset'], block['original_size'])
+            parts.append(data[start:stop])
+
+        return b''.join(parts)
+
+
+class PzBlockWriter:
+    """
+    HU16: Escritor directo de bloques hacia el archivo .pz final
+
+    Los bloques se agregan al archivo en el orden en que terminan de
+    comprimirse, sin pasar por archivos temporales. Como el índice guarda
+    la posición de cada bloque, el orden físico no necesita coincidir con
+    el orden de los IDs. Es seguro llamar a write_block desde varios hilos.
+    HU26: write_reference registra un bloque duplicado sin escribir datos.
+    HU33: Con header_reserve, close puede completar el encabezado.
+    """
+
+    def __init__(self, file_path: str, header_info: Dict[str, Any], header_reserve: int = 0):
+        """
+        Crea el archivo .pz y escribe el encabezado
+
+        Args:
+            file_path: Ruta del archivo .pz a crear
+            header_info: Encabezado JSON (incluye block_count)
+            header_reserve: HU33: Bytes reservados para reescribir el encabezado al cerrar
+        """
+        self.file_path = file_path
+        self.header_info = dict(header_info)
+        self.header_reserve = header_reserve
+        self.block_count = header_info['block_count']
+        self.checksum_algorithm = header_info.get('checksum_algorithm', ChecksumAlgorithm.CRC32)
+        self._entries: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._file = open(file_path, 'wb')
+        try:
+            write_header(self._file, header_info, header_reserve)
+        except Exception:
+            self.abort()
+            raise
+
+    def write_block(self, block_id: int, original_offset: int, original_size: int,
+                    data: bytes, checksum: int, flags: int = 0,
+                    codec_id: int = LEGACY_CODEC_ID) -> int:
+        """
+        Agrega los datos comprimidos de un bloque al final del archivo
+
+        Returns:
+            Offset del archivo donde quedaron los datos
+
+        Raises:
+            ValueError: Si el bloque ya fue escrito
+        """
+        with self._lock:
+            if block_id in self._entries:
+                raise ValueError(f"El bloque {block_id} ya fue escrito")
+
+            data_offset = self._file.tell()
+            self._file.write(data)
+            self._entries[block_id] = {
+                'data_offset': data_offset,
+                'original_offset': original_offset,
+                'compressed_size': len(data),
+                'original_size': original_size,
+                'checksum': checksum,
+                'flags': flags,
+                'codec_id': codec_id
+            }
+
+        return data_offset
+
+    def write_reference(self, block_id: int, original_offset: int, original_size: int,
+                        duplicate_of: int) -> None:
+        """
+        HU26: Registra un bloque idéntico a duplicate_of, que puede escribirse después
+
+        Raises:
+            ValueError: Si el bloque ya fue escrito
+        """
+        with self._lock:
+            if block_id in self._entries:
+                raise ValueError(f"El bloque {block_id} ya fue escrito")
+            self._entries[block_id] = {
+                'original_offset': original_offset,
+                'original_size': original_size,
+                'duplicate_of': duplicate_of
+            }
+
+    @property
+    def blocks_written(self) -> int:
+        """Cantidad de bloques escritos hasta ahora"""
+        return len(self._entries)
+
+    def close(self, header_updates: Dict[str, Any] = None) -> None:
+        """
+        Escribe el índice ordenado por ID de bloque y cierra el archivo
+
+        Args:
+            header_updates: HU33: Campos a cambiar en el encabezado reservado
+                (p. ej. block_count y original_size)
+
+        Raises:
+            ValueError: Si falta algún bloque o el encabezado no puede
+            reescribirse (el archivo se elimina)
+        """
+        with self._lock:
+            if header_updates:
+                if not self.header_reserve:
+                    self.abort()
+                    raise ValueError("El encabezado no tiene espacio reservado para actualizarse")
+                self.header_info.update(header_updates)
+                self.block_count = self.header_info['block_count']
+            missing = [i for i in range(self.block_count) if i not in self._entries]
+            if missing:
+                self.abort()
+                raise ValueError(f"Faltan {len(missing)} bloques por escribir (primero: {missing[0]})")
+
+            try:
+                entries = resolve_duplicate_entries([self._entries[i] for i in range(self.block_count)])
+            except ValueError:
+                self.abort()
+                raise
+            try:
+                write_index(self._file, entries, self.checksum_algorithm)
+                if header_updates:
+                    self._file.seek(0)
+                    write_header(self._file, self.header_info, self.header_reserve)
+            except Exception:
+                self.abort()
+                raise
+            self._file.close()
+
+    def abort(self) -> None:
+        """Cierra el archivo y elimina el resultado parcial"""
+        if not self._file.closed:
+            self._file.close()
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
@@ -0,0 +1,553 @@
+"""
+HU32: Acceso a archivos .pz como objetos archivo
+
+PzReader permite leer y posicionarse (read/seek/tell) en el contenido
+original de un .pz como en un archivo común, sin descomprimirlo antes a
+disco. Cada posición se traduce a un bloque mediante el índice del .pz
+(ver pz_format.py) y solo se descomprimen los bloques que se leen.
+
+Los bloques descomprimidos se guardan en una caché LRU acotada por bytes:
+al superar el presupuesto se descartan los usados hace más tiempo. Para
+lecturas secuenciales, PzReader puede descomprimir por adelantado los N
+bloques siguientes en hilos de fondo (propios o de un WorkerPool, HU30).
+
+HU33: PzWriter es la contraparte de escritura: recibe write() de cualquier
+tamaño, corta bloques del tamaño configurado y los comprime en segundo
+plano mientras el productor sigue escribiendo. Cada bloque se agrega al .pz
+en cuanto termina (PzBlockWriter, HU16) y close() escribe el índice y
+completa el encabezado. Como mucho max_pending bloques esperan o están en
+compresión: si los trabajadores se atrasan, write() se bloquea hasta que se
+libere un lugar, así la memoria no crece con la velocidad del productor.
+"""
+
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
+
+from .checksums import VerificationPolicy
+from .codecs import BLOCK_FLAG_NO_CHECKSUM, BLOCK_FLAG_STORED, get_codec
+from .executor_backend import encode_block
+from .parallel_compressor import ParallelCompressor
+from .pz_format import FORMAT_V2, PzArchive, PzBlockWriter, block_checksum
+from .worker_pool import WorkerPool
+
+
+class PzReader(io.BufferedIOBase):
+    """
+    HU32: Lectura con acceso aleatorio del contenido original de un .pz
+
+    Es un io.BufferedIOBase de solo lectura: admite read, read1, readinto,
+    peek, readline, iteración por líneas, seek y tell, y puede envolverse
+    en io.TextIOWrapper.
+    """
+
+    DEFAULT_CACHE_SIZE = 32 * 1024 * 1024
+
+    def __init__(self, file_path: str, cache_size: int = DEFAULT_CACHE_SIZE, prefetch: int = 0,
+                 worker_pool: WorkerPool = None, verify: bool = True):
+        """
+        Args:
+            file_path: Ruta del archivo .pz
+            cache_size: Bytes de bloques descomprimidos que se conservan (0 = sin caché)
+            prefetch: Bloques siguientes a descomprimir en segundo plano en lecturas
+                secuenciales (quedan en la caché, así que requieren cache_size > 0)
+            worker_pool: HU30: Pool donde corre el prefetch (por defecto, hilos propios)
+            verify: Verificar el checksum de cada bloque al descomprimirlo
+
+        Raises:
+            ValueError: Si cache_size o prefetch son negativos, o el .pz es inválido
+        """
+        self._archive = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[int, bytes]" = OrderedDict()
+        self._cache_bytes = 0
+        # Bloque de la posición actual: las lecturas chicas dentro de él no pasan por la caché
+        self._current: tuple = (None, b'')
+        if not isinstance(cache_size, int) or cache_size < 0:
+            raise ValueError("El tamaño de la caché debe ser un entero no negativo")
+        if not isinstance(prefetch, int) or prefetch < 0:
+            raise ValueError("La cantidad de bloques a anticipar debe ser un entero no negativo")
+
+        self._archive = PzArchive(file_path)
+        self.name = file_path
+        self.cache_size = cache_size
+        self.prefetch = prefetch
+        self.verify = verify
+        self._worker_pool = worker_pool
+        self._position = 0
+        self._stats = {'hits': 0, 'misses': 0, 'prefetched': 0, 'prefetch_waits': 0, 'evictions': 0}
+
+    @property
+    def size(self) -> int:
+        """Tamaño del contenido original"""
+        return self._archive.original_size
+
+    @property
+    def header(self) -> dict:
+        """Encabezado JSON del .pz"""
+        return self._archive.header
+
+    def readable(self) -> bool:
+        self._check_open()
+        return True
+
+    def seekable(self) -> bool:
+        self._check_open()
+        return True
+
+    def writable(self) -> bool:
+        return False
+
+    def _check_open(self):
+        if self.closed:
+            raise ValueError("Operación sobre un PzReader cerrado")
+
+    def tell(self) -> int:
+        self._check_open()
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """
+        Cambia la posición de lectura; puede quedar después del final (las
+        lecturas devuelven b'')
+
+        Raises:
+            ValueError: Si la posición resultante es negativa o whence es inválido
+        """
+        self._check_open()
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"whence inválido: {whence}")
+        if position < 0:
+            raise ValueError(f"Posición negativa: {position}")
+        self._position = position
+        return position
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        """Lee hasta size bytes (todo lo que queda si size es None o negativo)"""
+        self._check_open()
+        remaining = self.size - self._position
+        if size is None or size < 0 or size > remaining:
+            size = max(remaining, 0)
+        parts = []
+        while size > 0:
+            chunk = self.read1(size)
+            parts.append(chunk)
+            size -= len(chunk)
+        return b''.join(parts)
+
+    def read1(self, size: int = -1) -> bytes:
+        """Lee hasta size bytes descomprimiendo como mucho un bloque"""
+        if size == 0:
+            return b''
+        chunk = self.peek(size)
+        self._position += len(chunk)
+        return chunk
+
+    def peek(self, size: int = 0) -> bytes:
+        """
+        Datos desde la posición actual hasta el final de su bloque, sin avanzar
+
+        Con size positivo se devuelven como mucho size bytes.
+        """
+        self._check_open()
+        blocks = self._archive.find_blocks(self._position, 1)
+        if not blocks:
+            return b''
+        block = blocks[0]
+        data = self._get_block(block['id'])
+        start = self._position - block['original_offset']
+        stop = block['original_size'] if size is None or size <= 0 else min(start + size, block['original_size'])
+        return data[start:stop]
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def readinto1(self, buffer) -> int:
+        data = self.read1(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def _get_block(self, block_id: int) -> bytes:
+        """Datos descomprimidos de un bloque, de la caché, del prefetch o del archivo"""
+        last_id, data = self._current
+        if last_id == block_id:
+            return data
+        sequential = last_id is None or block_id == last_id + 1
+        with self._lock:
+            data = self._cache.get(block_id)
+            if data is not None:
+                self._cache.move_to_end(block_id)
+                self._stats['hits'] += 1
+            future = self._pending.get(block_id)
+
+        if data is None:
+            if future is not None:
+                with self._lock:
+                    self._stats['prefetch_waits'] += 1
+                data = future.result()
+            else:
+                data = self._archive.read_block(block_id, self.verify)
+                with self._lock:
+                    self._stats['misses'] += 1
+                    self._store(block_id, data)
+
+        self._current = (block_id, data)
+        if self.prefetch and sequential:
+            self._schedule_prefetch(block_id)
+        return data
+
+    def _store(self, block_id: int, data: bytes) -> None:
+        """Guarda un bloque en la caché y descarta los menos usados (con el lock tomado)"""
+        if len(data) > self.cache_size or block_id in self._cache:
+            return
+        self._cache[block_id] = data
+        self._cache_bytes += len(data)
+        while self._cache_bytes > self.cache_size:
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_bytes -= len(evicted)
+            self._stats['evictions'] += 1
+
+    def _schedule_prefetch(self, block_id: int) -> None:
+        """Envía a segundo plano los bloques siguientes que no estén en caché ni en curso"""
+        last = min(block_id + self.prefetch, len(self._archive.blocks) - 1)
+        with self._lock:
+            for next_id in range(block_id + 1, last + 1):
+                if next_id in self._cache or next_id in self._pending:
+                    continue
+                self._pending[next_id] = self._submit(self._prefetch_block, next_id)
+
+    def _submit(self, fn, *args) -> Future:
+        if self._worker_pool is not None:
+            return self._worker_pool.submit(fn, *args)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.prefetch, thread_name_prefix="pzreader")
+        return self._executor.submit(fn, *args)
+
+    def _prefetch_block(self, block_id: int) -> bytes:
+        try:
+            data = self._archive.read_block(block_id, self.verify)
+            with self._lock:
+                self._stats['prefetched'] += 1
+                self._store(block_id, data)
+            return data
+        finally:
+            with self._lock:
+                self._pending.pop(block_id, None)
+
+    def get_cache_statistics(self) -> dict:
+        """
+        Aciertos de la caché, bloques leídos en primer plano (misses), bloques
+        anticipados, esperas a un prefetch en curso y bloques descartados
+        """
+        with self._lock:
+            return dict(self._stats, cached_blocks=len(self._cache), cached_bytes=self._cache_bytes)
+
+    def close(self) -> None:
+        """Cancela el prefetch pendiente, espera el que está en curso y cierra el .pz"""
+        if self.closed:
+            return
+        with self._lock:
+            pending = list(self._pending.values())
+        for future in pending:
+            future.cancel()
+        wait(pending)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._cache.clear()
+        self._cache_bytes = 0
+        self._current = (None, b'')
+        if self._archive is not None:
+            self._archive.close()
+        super().close()
+
+
+class PzWriter(io.BufferedIOBase):
+    """
+    HU33: Escritura incremental de un .pz desde datos generados al vuelo
+
+    Es un io.BufferedIOBase de solo escritura. La configuración (tamaño de
+    bloque, códec, nivel, checksum, verificación, selector adaptativo y
+    pool de trabajadores) se toma de un ParallelCompressor. La
+    deduplicación, el modo incremental, los checkpoints y el diccionario
+    compartido necesitan el archivo completo de antemano y no se aplican.
+
+    Al salir de un bloque with por una excepción el .pz parcial se elimina.
+    """
+
+    # Bytes reservados para el encabezado, que se completa al cerrar
+    HEADER_RESERVE = 4096
+
+    def __init__(self, file_path: str, compressor: ParallelCompressor = None, num_threads: int = None,
+                 max_pending: int = None, original_filename: str = None):
+        """
+        Args:
+            file_path: Ruta del archivo .pz a crear
+            compressor: ParallelCompressor con la configuración (por defecto, la estándar)
+            num_threads: Hilos de compresión propios si el compresor no tiene WorkerPool
+                (por defecto: núcleos de CPU)
+            max_pending: Bloques cortados que pueden esperar o estar en compresión
+                a la vez (por defecto: 2 por hilo)
+            original_filename: Nombre guardado en el encabezado (por defecto, el
+                del .pz sin la extensión)
+
+        Raises:
+            ValueError: Si num_threads o max_pending no son positivos
+        """
+        self._writer: Optional[PzBlockWriter] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if num_threads is not None and (not isinstance(num_threads, int) or num_threads <= 0):
+            raise ValueError("El número de hilos debe ser un entero positivo")
+        if max_pending is not None and (not isinstance(max_pending, int) or max_pending <= 0):
+            raise ValueError("La cantidad de bloques pendientes debe ser un entero positivo")
+
+        self.name = file_path
+        self.compressor = compressor or ParallelCompressor()
+        compressor = self.compressor
+        self.block_size = compressor.get_block_size()
+        self._worker_pool: Optional[WorkerPool] = compressor.get_worker_pool()
+        workers = self._worker_pool.max_workers if self._worker_pool is not None else (num_threads or os.cpu_count() or 1)
+        self.max_pending = max_pending or 2 * workers
+        if self._worker_pool is None:
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pzwriter")
+
+        self._buffer = bytearray()
+        self._position = 0
+        self._next_block_id = 0
+        self._futures: List[Future] = []
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._error: Optional[BaseException] = None
+        self._aborted = False
+        self._in_flight = 0
+        self._stats = {'blocks': 0, 'original_bytes': 0, 'compressed_bytes': 0, 'stored_blocks': 0,
+                       'verified_blocks': 0, 'max_pending_blocks': 0, 'producer_wait_time': 0.0}
+
+        if original_filename is None:
+            original_filename = os.path.basename(file_path)
+            if original_filename.endswith('.pz'):
+                original_filename = original_filename[:-3]
+        algorithm = compressor.get_compression_algorithm()
+        header_info = {
+            'format': FORMAT_V2,
+            'original_filename': original_filename,
+            'original_size': 0,
+            'block_count': 0,
+            'total_blocks': 0,
+            'compression_algorithm': algorithm.value if hasattr(algorithm, 'value') else str(algorithm),
+            'checksum_algorithm': compressor.get_checksum_algorithm()
+        }
+        try:
+            self._writer = PzBlockWriter(file_path, header_info, self.HEADER_RESERVE)
+        except Exception:
+            self._shutdown_executor()
+            raise
+
+    def readable(self) -> bool:
+        return False
+
+    def seekable(self) -> bool:
+        return False
+
+    def writable(self) -> bool:
+        self._check_open()
+        return True
+
+    def _check_open(self):
+        if self.closed:
+            raise ValueError("Operación sobre un PzWriter cerrado")
+
+    def _check_error(self):
+        """Propaga al productor el primer error de un trabajador"""
+        if self._error is not None:
+            raise self._error
+
+    def tell(self) -> int:
+        """Bytes originales recibidos hasta ahora"""
+        self._check_open()
+        return self._position
+
+    def write(self, data) -> int:
+        """
+        Agrega datos; cada bloque completo se envía a comprimir
+
+        Se bloquea mientras haya max_pending bloques sin terminar.
+
+        Returns:
+            Cantidad de bytes aceptados (siempre todos)
+        """
+        self._check_open()
+        self._check_error()
+        view = memoryview(data).cast('B')
+        size = len(view)
+        offset = 0
+        # Completar el bloque empezado en escrituras anteriores
+        if self._buffer:
+            offset = min(self.block_size - len(self._buffer), size)
+            self._buffer += view[:offset]
+            if len(self._buffer) == self.block_size:
+                self._submit_block(bytes(self._buffer))
+                self._buffer.clear()
+        # Los bloques completos se cortan directamente de los datos recibidos
+        while size - offset >= self.block_size:
+            self._submit_block(bytes(view[offset:offset + self.block_size]))
+            offset += self.block_size
+        self._buffer += view[offset:]
+        self._position += size
+        return size
+
+    def flush(self) -> None:
+        """
+        Los datos se cortan solo en bloques completos: flush no emite un
+        bloque parcial, solo informa un error pendiente de los trabajadores
+        """
+        if not self.closed and not self._aborted:
+            self._check_error()
+
+    def _submit_block(self, data: bytes) -> None:
+        """Espera un lugar libre (contrapresión) y envía el bloque a comprimir"""
+        started = time.perf_counter()
+        self._slots.acquire()
+        waited = time.perf_counter() - started
+        block = {'id': self._next_block_id, 'start_offset': self._next_block_id * self.block_size,
+                 'size': len(data), 'data': data}
+        self._next_block_id += 1
+        with self._lock:
+            self._in_flight += 1
+            self._stats['producer_wait_time'] += waited
+            self._stats['max_pending_blocks'] = max(self._stats['max_pending_blocks'], self._in_flight)
+        try:
+            if self._worker_pool is not None:
+                future = self._worker_pool.submit(self._compress_block, block)
+            else:
+                future = self._executor.submit(self._compress_block, block)
+        except Exception:
+            self._release_slot()
+            raise
+        self._futures.append(future)
+        # Los futuros terminados no se conservan: su resultado ya está en el .pz
+        if len(self._futures) > 2 * self.max_pending:
+            self._futures = [pending for pending in self._futures if not pending.done()]
+
+    def _release_slot(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def _compress_block(self, block) -> None:
+        """Comprime un bloque en un trabajador y lo agrega al .pz"""
+        try:
+            if self._error is not None or self._aborted:
+                return
+            compressor = self.compressor
+            checksum = None
+            if compressor.get_verification_policy() != VerificationPolicy.OFF:
+                checksum = block_checksum(block['data'], compressor.get_checksum_algorithm())
+            selector, adaptive = compressor._encoding_selector()
+            encoded = encode_block(block['data'], compressor.get_compression_algorithm(),
+                                   compressor.get_compression_level(), selector, adaptive,
+                                   compressor._should_verify(block))
+            flags = BLOCK_FLAG_STORED if encoded['stored'] else 0
+            if checksum is None:
+                flags |= BLOCK_FLAG_NO_CHECKSUM
+            self._writer.write_block(block['id'], block['start_offset'], block['size'], encoded['data'],
+                                     checksum, flags=flags, codec_id=get_codec(encoded['codec']).codec_id)
+            with self._lock:
+                self._stats['blocks'] += 1
+                self._stats['original_bytes'] += block['size']
+                self._stats['compressed_bytes'] += len(encoded['data'])
+                self._stats['stored_blocks'] += int(encoded['stored'])
+                self._stats['verified_blocks'] += int(encoded['verified'])
+        except Exception as e:
+            with self._lock:
+                if self._error is None:
+                    self._error = e
+        finally:
+            self._release_slot()
+
+    def get_statistics(self) -> dict:
+        """
+        Bloques escritos, bytes originales y comprimidos, bloques guardados sin
+        comprimir y verificados, máximo de bloques pendientes a la vez y tiempo
+        que el productor esperó por contrapresión
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def _wait_pending(self) -> None:
+        wait(self._futures)
+        self._futures = []
+
+    def _shutdown_executor(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def close(self) -> None:
+        """
+        Comprime lo que queda en el búfer como último bloque, espera a los
+        trabajadores, escribe el índice y completa el encabezado
+
+        Raises:
+            Exception: El error de un trabajador (el .pz parcial se elimina)
+        """
+        if self.closed:
+            return
+        if self._writer is None:
+            super().close()
+            return
+        try:
+            if self._error is None and self._buffer:
+                self._submit_block(bytes(self._buffer))
+                self._buffer.clear()
+            self._wait_pending()
+            self._check_error()
+            block_count = self._next_block_id
+            self._writer.close({'original_size': self._position, 'block_count': block_count,
+                                'total_blocks': block_count})
+        except BaseException:
+            self._writer.abort()
+            raise
+        finally:
+            self._shutdown_executor()
+            self._buffer = bytearray()
+            super().close()
+
+    def abort(self) -> None:
+        """Descarta lo escrito: espera a los trabajadores y elimina el .pz parcial"""
+        if self.closed:
+            return
+        if self._writer is None:
+            super().close()
+            return
+        # Los bloques que aún no empezaron no se comprimen; flush() ya no informa errores
+        self._aborted = True
+        for future in self._futures:
+            # Un bloque cancelado antes de empezar no llega a liberar su lugar
+            if future.cancel():
+                self._release_slot()
+        self._wait_pending()
+        self._shutdown_executor()
+        self._writer.abort()
+        self._buffer = bytearray()
+        super().close()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
@@ -0,0 +1,94 @@
+"""
+HU14: Planificador dinámico de bloques
+En lugar de asignar a cada hilo un rango fijo de bloques antes de empezar,
+los hilos toman el siguiente bloque pendiente de una cola compartida.
+Un hilo que recibe bloques lentos (datos incompresibles) simplemente toma
+menos bloques, y los demás absorben el resto del trabajo.
+"""
+
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List
+
+
+class DynamicBlockScheduler:
+    """
+    HU14: Cola compartida de bloques con estadísticas de uso por trabajador
+    """
+
+    def __init__(self, blocks: Iterable[Dict[str, Any]], num_workers: int):
+        """
+        Args:
+            blocks: Bloques a procesar, en el orden en que deben despacharse
+            num_workers: Número de trabajadores que consumirán la cola
+        """
+        if num_workers <= 0:
+            raise ValueError("El número de hilos debe ser positivo")
+
+        self._pending = deque(blocks)
+        self.num_workers = num_workers
+        self.worker_stats = [
+            {'worker_id': worker_id, 'blocks': 0, 'bytes': 0, 'busy_time': 0.0}
+            for worker_id in range(num_workers)
+        ]
+        self._start_time = time.perf_counter()
+        self._end_time = None
+
+    def iter_blocks(self, worker_id: int) -> Iterator[Dict[str, Any]]:
+        """
+        Entrega bloques al trabajador hasta vaciar la cola compartida
+
+        El tiempo entre que se entrega un bloque y se pide el siguiente se
+        contabiliza como tiempo ocupado del trabajador.
+        """
+        stats = self.worker_stats[worker_id]
+
+        while True:
+            try:
+                block = self._pending.popleft()
+            except IndexError:
+                return
+
+            started = time.perf_counter()
+            yield block
+
+            stats['busy_time'] += time.perf_counter() - started
+            stats['blocks'] += 1
+            stats['bytes'] += block.get('size', block.get('original_size', 0))
+
+    def finish(self) -> None:
+        """Marca el fin del trabajo (después de esperar a todos los trabajadores)"""
+        self._end_time = time.perf_counter()
+
+    def remaining(self) -> int:
+        """Número de bloques aún no despachados"""
+        return len(self._pending)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Obtiene estadísticas de utilización por trabajador
+
+        Returns:
+            Diccionario con la lista de trabajadores (bloques, bytes, tiempo
+            ocupado y porcentaje de utilización) y el desbalance de carga
+            (tiempo ocupado máximo / promedio; 1.0 es un reparto perfecto)
+        """
+        end_time = self._end_time or time.perf_counter()
+        wall_time = max(end_time - self._start_time, 1e-9)
+
+        workers: List[Dict[str, Any]] = []
+        for stats in self.worker_stats:
+            worker = dict(stats)
+            worker['utilization'] = min(stats['busy_time'] / wall_time * 100, 100.0)
+            workers.append(worker)
+
+        busy_times = [worker['busy_time'] for worker in workers]
+        average_busy = sum(busy_times) / len(busy_times)
+
+        return {
+            'strategy': 'dynamic_queue',
+            'num_workers': self.num_workers,
+            'wall_time': wall_time,
+            'workers': workers,
+            'load_imbalance': (max(busy_times) / average_busy) if average_busy > 0 else 1.0
+        }
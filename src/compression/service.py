@@ -0,0 +1,232 @@
+"""
+HU30: Servicio de compresión con un pool de trabajadores persistente
+
+CompressionService es dueño de un WorkerPool (ver worker_pool.py) y crea
+compresores que lo comparten, de modo que muchos trabajos seguidos o
+simultáneos (miles de archivos chicos, la GUI comprimiendo uno tras otro)
+no crean ni destruyen hilos y procesos en cada uno.
+
+Los trabajos enviados con submit_compression/submit_decompression corren
+en hilos coordinadores propios del servicio (como mucho max_jobs a la vez),
+separados de los trabajadores del pool: un coordinador espera a sus
+trabajadores, así que no puede ocupar un lugar en el mismo pool.
+"""
+
+import threading
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Callable, Optional, Set
+
+from .parallel_compressor import ParallelCompressor
+from .pz_io import PzReader, PzWriter
+from .worker_pool import WorkerPool
+
+
+class CompressionJob:
+    """
+    HU30: Compresión o descompresión enviada a CompressionService
+
+    Cada trabajo usa su propio ParallelCompressor; cancelarlo no afecta a los
+    demás trabajos que comparten el pool.
+    """
+
+    COMPRESS = "compress"
+    DECOMPRESS = "decompress"
+
+    def __init__(self, compressor: ParallelCompressor, operation: str, input_file: str, output_file: str,
+                 num_threads: int, progress_callback: Callable = None):
+        self.compressor = compressor
+        self.operation = operation
+        self.input_file = input_file
+        self.output_file = output_file
+        self.num_threads = num_threads
+        self._progress_callback = progress_callback
+        self._cancel_event = threading.Event()
+        self._future: Optional[Future] = None
+
+    def _run(self) -> bool:
+        """Ejecuta el trabajo en el hilo coordinador"""
+        if self._cancel_event.is_set():
+            return False
+        try:
+            if self.operation == self.COMPRESS:
+                return self.compressor.compress_file_with_threads(
+                    self.input_file, self.output_file, self.num_threads, self._progress
+                )
+            return self.compressor.decompress_file_with_threads(
+                self.input_file, self.output_file, self.num_threads, self._progress
+            )
+        except Exception:
+            # Cancelar durante la división en bloques interrumpe la lectura con un error
+            if self._cancel_event.is_set():
+                return False
+            raise
+
+    def _progress(self, message: str, progress: float, phase: str) -> bool:
+        """
+        Reenvía el progreso al callback del usuario; devuelve False (cancelar)
+        si el trabajo se canceló, aunque haya sido antes de que el compresor
+        reiniciara su estado
+        """
+        if self._cancel_event.is_set():
+            return False
+        if self._progress_callback is None:
+            return True
+        return self._progress_callback(message, progress, phase)
+
+    def cancel(self) -> None:
+        """Cancela este trabajo (si todavía no empezó, no llega a ejecutarse)"""
+        self._cancel_event.set()
+        if self._future is not None and self._future.cancel():
+            return
+        if self.operation == self.COMPRESS:
+            self.compressor.stop_compression()
+        else:
+            self.compressor.stop_decompression()
+
+    def is_cancelled(self) -> bool:
+        """Indica si se pidió cancelar el trabajo"""
+        return self._cancel_event.is_set()
+
+    def done(self) -> bool:
+        """Indica si el trabajo terminó, falló o se canceló"""
+        return self._future.done()
+
+    def result(self, timeout: float = None) -> bool:
+        """
+        Espera el resultado del trabajo
+
+        Returns:
+            bool: True si terminó con éxito; False si falló o se canceló
+
+        Raises:
+            Exception: La excepción con que terminó el trabajo
+        """
+        try:
+            return self._future.result(timeout)
+        except CancelledError:
+            return False
+
+
+class CompressionService:
+    """
+    HU30: Crea compresores que comparten un WorkerPool y ejecuta trabajos
+    """
+
+    DEFAULT_MAX_JOBS = 4
+
+    def __init__(self, max_workers: int = None, max_jobs: int = None, error_handler=None):
+        """
+        Args:
+            max_workers: Hilos y procesos del pool (por defecto: núcleos de CPU)
+            max_jobs: Trabajos enviados que corren a la vez; el resto espera
+            error_handler: HU07: ErrorHandler para los compresores creados
+        """
+        if max_jobs is not None and (not isinstance(max_jobs, int) or max_jobs <= 0):
+            raise ValueError("El número de trabajos simultáneos debe ser un entero positivo")
+        self.pool = WorkerPool(max_workers)
+        self.max_jobs = max_jobs or self.DEFAULT_MAX_JOBS
+        self.error_handler = error_handler
+        self._jobs_executor: Optional[ThreadPoolExecutor] = None
+        self._jobs: Set[CompressionJob] = set()
+        self._lock = threading.Lock()
+
+    def create_compressor(self, block_size: int = None) -> ParallelCompressor:
+        """Crea un ParallelCompressor que usa el pool del servicio"""
+        compressor = ParallelCompressor(block_size, error_handler=self.error_handler)
+        compressor.set_worker_pool(self.pool)
+        return compressor
+
+    def compress(self, input_file: str, output_file: str, compressor: ParallelCompressor = None,
+                 num_threads: int = None, progress_callback: Callable = None) -> bool:
+        """Comprime un archivo en el hilo actual usando el pool del servicio"""
+        compressor = self._prepare(compressor)
+        return compressor.compress_file_with_threads(input_file, output_file,
+                                                     num_threads or self.pool.max_workers, progress_callback)
+
+    def decompress(self, input_file: str, output_file: str, compressor: ParallelCompressor = None,
+                   num_threads: int = None, progress_callback: Callable = None) -> bool:
+        """Descomprime un archivo .pz en el hilo actual usando el pool del servicio"""
+        compressor = self._prepare(compressor)
+        return compressor.decompress_file_with_threads(input_file, output_file,
+                                                       num_threads or self.pool.max_workers, progress_callback)
+
+    def open_writer(self, output_file: str, compressor: ParallelCompressor = None,
+                    max_pending: int = None) -> PzWriter:
+        """HU33: Abre un PzWriter que comprime sus bloques en el pool del servicio"""
+        return PzWriter(output_file, self._prepare(compressor), max_pending=max_pending)
+
+    def open_reader(self, input_file: str, cache_size: int = PzReader.DEFAULT_CACHE_SIZE,
+                    prefetch: int = 0) -> PzReader:
+        """HU32: Abre un PzReader que anticipa bloques en el pool del servicio"""
+        return PzReader(input_file, cache_size, prefetch, worker_pool=self.pool)
+
+    def submit_compression(self, input_file: str, output_file: str, compressor: ParallelCompressor = None,
+                           num_threads: int = None, progress_callback: Callable = None) -> CompressionJob:
+        """
+        Envía una compresión para ejecutarla en segundo plano
+
+        Args:
+            compressor: Compresor ya configurado (códec, nivel, etc.); uno por
+                trabajo, ya que guarda el estado de la ejecución
+        """
+        return self._submit(CompressionJob.COMPRESS, input_file, output_file, compressor,
+                            num_threads, progress_callback)
+
+    def submit_decompression(self, input_file: str, output_file: str, compressor: ParallelCompressor = None,
+                             num_threads: int = None, progress_callback: Callable = None) -> CompressionJob:
+        """Envía una descompresión para ejecutarla en segundo plano"""
+        return self._submit(CompressionJob.DECOMPRESS, input_file, output_file, compressor,
+                            num_threads, progress_callback)
+
+    def _prepare(self, compressor: Optional[ParallelCompressor]) -> ParallelCompressor:
+        """Compresor del trabajo, conectado al pool del servicio"""
+        if compressor is None:
+            return self.create_compressor()
+        compressor.set_worker_pool(self.pool)
+        return compressor
+
+    def _submit(self, operation, input_file, output_file, compressor, num_threads, progress_callback):
+        job = CompressionJob(self._prepare(compressor), operation, input_file, output_file,
+                             num_threads or self.pool.max_workers, progress_callback)
+        with self._lock:
+            if self.pool.is_closed():
+                raise RuntimeError("El servicio de compresión está cerrado")
+            if self._jobs_executor is None:
+                self._jobs_executor = ThreadPoolExecutor(max_workers=self.max_jobs, thread_name_prefix="parcomp-job")
+            self._jobs.add(job)
+            job._future = self._jobs_executor.submit(job._run)
+        job._future.add_done_callback(lambda _: self._forget(job))
+        return job
+
+    def _forget(self, job: CompressionJob) -> None:
+        with self._lock:
+            self._jobs.discard(job)
+
+    def active_jobs(self) -> int:
+        """Trabajos enviados que todavía no terminaron"""
+        with self._lock:
+            return len(self._jobs)
+
+    def shutdown(self, wait: bool = True, cancel_jobs: bool = False) -> None:
+        """
+        Cierra el servicio y su pool
+
+        Args:
+            wait: Esperar a que terminen los trabajos en curso
+            cancel_jobs: Cancelar los trabajos enviados que no terminaron
+        """
+        with self._lock:
+            jobs = list(self._jobs)
+            jobs_executor, self._jobs_executor = self._jobs_executor, None
+        if cancel_jobs:
+            for job in jobs:
+                job.cancel()
+        if jobs_executor is not None:
+            jobs_executor.shutdown(wait=wait)
+        self.pool.shutdown(wait=wait, cancel_pending=cancel_jobs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
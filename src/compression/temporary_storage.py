@@ -8,45 +8,145 @@ import os
 import tempfile
 import json
 import threading
-import zlib
-import hashlib
 import time
+import re
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
+from .checksums import ChecksumAlgorithm
+
+# HU11: NumPy es opcional, acelera RLE pero no es requerido
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class JournalSyncPolicy:
+    """
+    HU17: Políticas de sincronización a disco del journal de metadatos
+    """
+    NEVER = "never"    # Solo flush: sobrevive a la caída del proceso
+    BATCH = "batch"    # fsync cada sync_interval registros
+    ALWAYS = "always"  # fsync después de cada registro
+    
+    @staticmethod
+    def validate(policy: str) -> str:
+        """
+        Valida el nombre de la política
+
+        Raises:
+            ValueError: Si la política no está soportada
+        """
+        if policy not in (JournalSyncPolicy.NEVER, JournalSyncPolicy.BATCH, JournalSyncPolicy.ALWAYS):
+            raise ValueError(f"Política de sincronización no soportada: {policy}")
+        return policy
+
 
 class TemporaryBlockStorage:
     """
     HU05: Gestiona el almacenamiento temporal de bloques comprimidos
     Cada hilo comprime un bloque y lo almacena temporalmente para luego
     ensamblar el archivo final con todos los bloques en orden.
+    
+    HU17: Los metadatos se guardan como una instantánea (metadata.json) más
+    un journal de solo anexado (journal.log) con un registro JSON compacto por
+    cambio. Registrar un bloque cuesta lo mismo sin importar cuántos haya.
+    El journal se compacta en la instantánea cuando tiene al menos
+    compact_interval registros y tantos como bloques hay en la instantánea:
+    los intervalos crecen en forma geométrica y reescribir la instantánea
+    cuesta O(1) amortizado por bloque.
     """
     
-    def __init__(self, temp_dir: Optional[str] = None):
+    # HU17: Registros mínimos del journal entre compactaciones (0 = solo al limpiar)
+    DEFAULT_COMPACT_INTERVAL = 1000
+    DEFAULT_SYNC_INTERVAL = 64
+    
+    def __init__(self, temp_dir: Optional[str] = None,
+                 sync_policy: str = JournalSyncPolicy.NEVER,
+                 compact_interval: int = DEFAULT_COMPACT_INTERVAL,
+                 sync_interval: int = DEFAULT_SYNC_INTERVAL,
+                 checksum_algorithm: str = ChecksumAlgorithm.CRC32):
         """
         Inicializa el almacenamiento temporal
         
         Args:
             temp_dir: Directorio temporal personalizado. Si es None, usa el sistema.
-        """
-        self.temp_dir = temp_dir or tempfile.mkdtemp(prefix="parcomp_")
+            sync_policy: Cuándo hacer fsync del journal (JournalSyncPolicy)
+            compact_interval: Registros mínimos del journal antes de compactar
+            sync_interval: Registros entre fsync con la política BATCH
+            checksum_algorithm: Checksum de los bloques comprimidos (HU18)
+        """
+        self._init_state(temp_dir or tempfile.mkdtemp(prefix="parcomp_"),
+                         sync_policy, compact_interval, sync_interval)
+        self.metadata["checksum_algorithm"] = ChecksumAlgorithm.validate(checksum_algorithm)
+        
+        # Crear estructura de directorios
+        os.makedirs(self.blocks_dir, exist_ok=True)
+        self._save_metadata()
+    
+    def _init_state(self, temp_dir: str, sync_policy: str, compact_interval: int, sync_interval: int):
+        """Inicializa rutas, configuración del journal y metadatos vacíos"""
+        self.temp_dir = temp_dir
         self.metadata_file = os.path.join(self.temp_dir, "metadata.json")
+        self.journal_file = os.path.join(self.temp_dir, "journal.log")
         self.blocks_dir = os.path.join(self.temp_dir, "blocks")
         self.lock = threading.Lock()
+        self.sync_policy = JournalSyncPolicy.validate(sync_policy)
+        self.compact_interval = compact_interval
+        self.sync_interval = max(1, sync_interval)
         self.metadata = {
             "file_info": {},
             "blocks": {},
             "compression_algorithm": "zlib",
             "format_version": "1.0"
         }
+        self._journal = None
+        self._journal_records = 0
+        self._snapshot_records = 0
+        self._unsynced_records = 0
+    
+    @classmethod
+    def recover(cls, temp_dir: str,
+                sync_policy: str = JournalSyncPolicy.NEVER,
+                compact_interval: int = DEFAULT_COMPACT_INTERVAL,
+                sync_interval: int = DEFAULT_SYNC_INTERVAL) -> 'TemporaryBlockStorage':
+        """
+        HU17: Reabre un almacenamiento existente reconstruyendo sus metadatos
         
-        # Crear estructura de directorios
-        os.makedirs(self.blocks_dir, exist_ok=True)
-        self._save_metadata()
+        Carga la instantánea y reaplica el journal. Un último registro
+        incompleto (caída a mitad de escritura) se descarta. Los metadatos
+        recuperados se compactan en una nueva instantánea.
+        
+        Raises:
+            FileNotFoundError: Si el directorio no tiene metadatos
+        """
+        storage = cls.__new__(cls)
+        storage._init_state(temp_dir, sync_policy, compact_interval, sync_interval)
+        
+        if not os.path.exists(storage.metadata_file):
+            raise FileNotFoundError(f"No hay metadatos de almacenamiento temporal en {temp_dir}")
+        
+        with open(storage.metadata_file, 'r') as f:
+            storage.metadata = json.load(f)
+        
+        if os.path.exists(storage.journal_file):
+            with open(storage.journal_file, 'r') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    storage._apply_record(record)
+        
+        os.makedirs(storage.blocks_dir, exist_ok=True)
+        storage._save_metadata()
+        return storage
     
     def store_compressed_block(self, block_id: int, compressed_data: bytes, 
                              original_size: int, compression_ratio: float,
-                             thread_id: int, checksum: str) -> str:
+                             thread_id: int, checksum: str, codec_id: int = 0,
+                             flags: int = 0, duplicate_of: int = None) -> str:
         """
         HU05: Almacena un bloque comprimido en el almacenamiento temporal
         
@@ -57,6 +157,10 @@ class TemporaryBlockStorage:
             compression_ratio: Ratio de compresión alcanzado
             thread_id: ID del hilo que procesó el bloque
             checksum: Checksum del bloque original para validación
+            codec_id: HU21: ID del códec usado (0 = sin códec registrado)
+            flags: HU23: Flags del índice del .pz (BLOCK_FLAG_STORED)
+            duplicate_of: HU26: ID del bloque idéntico cuyos datos se reutilizan
+                (el bloque se guarda vacío)
             
         Returns:
             str: Ruta del archivo temporal donde se almacenó el bloque
@@ -68,21 +172,26 @@ class TemporaryBlockStorage:
         with open(block_path, 'wb') as f:
             f.write(compressed_data)
         
-        # Actualizar metadata de forma thread-safe
+        block_info = {
+            "id": block_id,
+            "filename": block_filename,
+            "path": block_path,
+            "original_size": original_size,
+            "compressed_size": len(compressed_data),
+            "compression_ratio": compression_ratio,
+            "thread_id": thread_id,
+            "original_checksum": checksum,
+            "compressed_checksum": self._calculate_checksum(compressed_data),
+            "codec_id": codec_id,
+            "flags": flags,
+            "status": "completed"
+        }
+        if duplicate_of is not None:
+            block_info["duplicate_of"] = duplicate_of
+        
+        # HU17: Un registro compacto en el journal, sin reescribir todos los metadatos
         with self.lock:
-            self.metadata["blocks"][str(block_id)] = {
-                "id": block_id,
-                "filename": block_filename,
-                "path": block_path,
-                "original_size": original_size,
-                "compressed_size": len(compressed_data),
-                "compression_ratio": compression_ratio,
-                "thread_id": thread_id,
-                "original_checksum": checksum,
-                "compressed_checksum": self._calculate_checksum(compressed_data),
-                "status": "completed"
-            }
-            self._save_metadata()
+            self._append_record({"op": "block", "block": block_info})
         
         return block_path
     
@@ -115,30 +224,52 @@ class TemporaryBlockStorage:
         blocks = self.get_stored_blocks()
         
         for block_info in blocks:
-            block_path = block_info["path"]
-            
-            # Verificar que el archivo existe
-            if not os.path.exists(block_path):
-                errors.append(f"Bloque {block_info['id']}: archivo no encontrado")
-                continue
-            
-            # Verificar tamaño del archivo
-            actual_size = os.path.getsize(block_path)
-            expected_size = block_info["compressed_size"]
-            if actual_size != expected_size:
-                errors.append(f"Bloque {block_info['id']}: tamaño incorrecto")
-                continue
-            
-            # Verificar checksum del archivo comprimido
-            with open(block_path, 'rb') as f:
-                data = f.read()
-                actual_checksum = self._calculate_checksum(data)
-                expected_checksum = block_info["compressed_checksum"]
-                if actual_checksum != expected_checksum:
-                    errors.append(f"Bloque {block_info['id']}: checksum incorrecto")
+            error = self.validate_block(block_info)
+            if error is not None:
+                errors.append(f"Bloque {block_info['id']}: {error}")
         
         return len(errors) == 0, errors
     
+    def validate_block(self, block_info: Dict[str, Any]) -> Optional[str]:
+        """
+        HU05: Valida el archivo de un bloque almacenado contra sus metadatos
+        HU29: Usado también al reanudar un trabajo interrumpido
+        
+        Returns:
+            str: Descripción del problema, o None si el bloque es válido
+        """
+        block_path = block_info["path"]
+        
+        # Verificar que el archivo existe
+        if not os.path.exists(block_path):
+            return "archivo no encontrado"
+        
+        # Verificar tamaño del archivo
+        if os.path.getsize(block_path) != block_info["compressed_size"]:
+            return "tamaño incorrecto"
+        
+        # Verificar checksum del archivo comprimido
+        with open(block_path, 'rb') as f:
+            if self._calculate_checksum(f.read()) != block_info["compressed_checksum"]:
+                return "checksum incorrecto"
+        
+        return None
+    
+    def discard_blocks(self, block_ids: List[int]):
+        """
+        HU29: Quita bloques de los metadatos y borra sus archivos
+        (bloques inválidos de un trabajo interrumpido)
+        """
+        with self.lock:
+            paths = [self.metadata["blocks"][str(block_id)]["path"] for block_id in block_ids
+                     if str(block_id) in self.metadata["blocks"]]
+            if block_ids:
+                self._append_record({"op": "discard", "ids": list(block_ids)})
+        
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+    
     def assemble_final_file(self, output_path: str, 
                           progress_callback=None) -> bool:
         """
@@ -232,20 +363,90 @@ class TemporaryBlockStorage:
         
         return header
     
-    def _calculate_checksum(self, data: bytes) -> str:
-        """Calcula checksum SHA-256 para validación"""
-        return hashlib.sha256(data).hexdigest()
+    def _calculate_checksum(self, data: bytes) -> int:
+        """
+        Calcula el checksum de un bloque comprimido para validación
+        HU18: Usa el algoritmo configurado (CRC32 por defecto) en lugar de SHA-256
+        """
+        return ChecksumAlgorithm.compute(data, self.metadata.get("checksum_algorithm", ChecksumAlgorithm.CRC32))
     
     def _save_metadata(self):
-        """Guarda metadatos en archivo JSON"""
-        with open(self.metadata_file, 'w') as f:
-            json.dump(self.metadata, f, indent=2)
+        """
+        Guarda metadatos en archivo JSON
+        HU17: Escribe la instantánea de forma atómica y vacía el journal
+        """
+        temp_file = self.metadata_file + ".tmp"
+        with open(temp_file, 'w') as f:
+            json.dump(self.metadata, f, separators=(',', ':'))
+            f.flush()
+            if self.sync_policy != JournalSyncPolicy.NEVER:
+                os.fsync(f.fileno())
+        os.replace(temp_file, self.metadata_file)
+        
+        # Los registros ya están en la instantánea
+        self._close_journal()
+        with open(self.journal_file, 'w'):
+            pass
+        self._journal_records = 0
+        self._snapshot_records = len(self.metadata["blocks"])
+    
+    def _apply_record(self, record: Dict[str, Any]):
+        """HU17: Aplica un registro del journal a los metadatos en memoria"""
+        if record["op"] == "block":
+            self.metadata["blocks"][str(record["block"]["id"])] = record["block"]
+        elif record["op"] == "file_info":
+            self.metadata["file_info"] = record["file_info"]
+        elif record["op"] == "discard":
+            for block_id in record["ids"]:
+                self.metadata["blocks"].pop(str(block_id), None)
+        elif record["op"] == "job":
+            self.metadata["job"] = record["job"]
+    
+    def _append_record(self, record: Dict[str, Any]):
+        """
+        HU17: Agrega un registro al journal y lo aplica en memoria
+        Debe llamarse con self.lock tomado.
+        """
+        if self._journal is None:
+            self._journal = open(self.journal_file, 'a')
+        
+        self._journal.write(json.dumps(record, separators=(',', ':')) + "\n")
+        self._journal.flush()
+        self._apply_record(record)
+        self._journal_records += 1
+        self._unsynced_records += 1
+        
+        if self.sync_policy == JournalSyncPolicy.ALWAYS or (
+                self.sync_policy == JournalSyncPolicy.BATCH and self._unsynced_records >= self.sync_interval):
+            os.fsync(self._journal.fileno())
+            self._unsynced_records = 0
+        
+        # Compactación geométrica: el journal debe igualar a la instantánea antes de reescribirla
+        if self.compact_interval and self._journal_records >= max(self.compact_interval, self._snapshot_records):
+            self._save_metadata()
+    
+    def _close_journal(self):
+        """HU17: Cierra el archivo del journal si está abierto"""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+            self._unsynced_records = 0
+    
+    def compact(self):
+        """
+        HU17: Compacta el journal en la instantánea de metadatos
+        """
+        with self.lock:
+            self._save_metadata()
     
     def cleanup(self):
         """
         HU05: Limpia archivos temporales después del ensamblaje
         """
         try:
+            with self.lock:
+                self._close_journal()
+            
             # Eliminar archivos de bloques
             for filename in os.listdir(self.blocks_dir):
                 file_path = os.path.join(self.blocks_dir, filename)
@@ -255,9 +456,10 @@ class TemporaryBlockStorage:
             # Eliminar directorio de bloques
             os.rmdir(self.blocks_dir)
             
-            # Eliminar archivo de metadatos
-            if os.path.exists(self.metadata_file):
-                os.remove(self.metadata_file)
+            # Eliminar archivo de metadatos y journal
+            for path in (self.metadata_file, self.journal_file):
+                if os.path.exists(path):
+                    os.remove(path)
             
             # Eliminar directorio temporal principal
             os.rmdir(self.temp_dir)
@@ -292,13 +494,12 @@ class TemporaryBlockStorage:
         HU05: Configura la información del archivo para el almacenamiento temporal
         """
         with self.lock:
-            self.metadata["file_info"] = {
+            self._append_record({"op": "file_info", "file_info": {
                 "input_file": input_file,
                 "output_file": output_file,
                 "total_blocks": total_blocks,
                 "timestamp": time.time()
-            }
-            self._save_metadata()
+            }})
     
     def get_file_info(self) -> Dict[str, Any]:
         """
@@ -307,6 +508,21 @@ class TemporaryBlockStorage:
         with self.lock:
             return self.metadata["file_info"].copy()
     
+    def set_job_info(self, job_info: Dict[str, Any]):
+        """
+        HU29: Guarda la configuración con que se comprimieron los bloques
+        (necesaria para reanudar el trabajo con los mismos parámetros)
+        """
+        with self.lock:
+            self._append_record({"op": "job", "job": job_info})
+    
+    def get_job_info(self) -> Dict[str, Any]:
+        """
+        HU29: Obtiene la configuración guardada con set_job_info ({} si no hay)
+        """
+        with self.lock:
+            return dict(self.metadata.get("job", {}))
+    
     def retrieve_block_data(self, block_id: int) -> bytes:
         """
         HU05: Recupera los datos comprimidos de un bloque específico
@@ -339,8 +555,23 @@ class RLECompressor:
     """
     HU05: Implementación de compresión RLE (Run-Length Encoding)
     Alternativa a zlib para casos específicos
+    
+    HU11: Formato de salida: pares (cantidad, byte) con rachas de máximo 255.
+    Con NumPy las rachas se detectan con diferencias entre arreglos y se
+    decodifican con repeat; sin NumPy se usa una búsqueda de rachas con
+    expresiones regulares, que también evita recorrer byte a byte en Python.
     """
     
+    MAX_RUN = 255
+    
+    # Una racha es un byte seguido de sus repeticiones
+    _RUN_PATTERN = re.compile(rb'(.)\1*', re.DOTALL)
+    
+    @staticmethod
+    def is_vectorized() -> bool:
+        """HU22: Indica si RLE usa NumPy (sin NumPy es más lento que zlib)"""
+        return np is not None
+    
     @staticmethod
     def compress(data: bytes) -> bytes:
         """
@@ -355,22 +586,9 @@ class RLECompressor:
         if not data:
             return b''
         
-        compressed = bytearray()
-        i = 0
-        while i < len(data):
-            current_byte = data[i]
-            count = 1
-            
-            # Contar bytes consecutivos iguales (máximo 255)
-            while i + count < len(data) and data[i + count] == current_byte and count < 255:
-                count += 1
-            
-            # Escribir count y byte
-            compressed.append(count)
-            compressed.append(current_byte)
-            i += count
-        
-        return bytes(compressed)
+        if np is not None:
+            return RLECompressor._compress_numpy(data)
+        return RLECompressor._compress_python(data)
     
     @staticmethod
     def decompress(data: bytes) -> bytes:
@@ -386,57 +604,116 @@ class RLECompressor:
         if not data or len(data) % 2 != 0:
             return b''
         
-        decompressed = bytearray()
-        for i in range(0, len(data), 2):
-            count = data[i]
-            byte_value = data[i + 1]
-            decompressed.extend([byte_value] * count)
+        if np is not None:
+            return RLECompressor._decompress_numpy(data)
+        return RLECompressor._decompress_python(data)
+    
+    @staticmethod
+    def _compress_numpy(data: bytes) -> bytes:
+        """HU11: Codificación vectorizada con NumPy"""
+        arr = np.frombuffer(data, dtype=np.uint8)
+        
+        # Inicio de cada racha: posición 0 y donde el byte cambia
+        starts = np.concatenate(([0], np.flatnonzero(arr[1:] != arr[:-1]) + 1))
+        lengths = np.diff(np.append(starts, arr.size))
+        values = arr[starts]
+        
+        # Rachas mayores a 255 se parten en trozos de 255 más un resto
+        chunks = (lengths + RLECompressor.MAX_RUN - 1) // RLECompressor.MAX_RUN
+        counts = np.full(int(chunks.sum()), RLECompressor.MAX_RUN, dtype=np.uint8)
+        counts[np.cumsum(chunks) - 1] = lengths - RLECompressor.MAX_RUN * (chunks - 1)
+        
+        output = np.empty(counts.size * 2, dtype=np.uint8)
+        output[0::2] = counts
+        output[1::2] = np.repeat(values, chunks)
+        return output.tobytes()
+    
+    @staticmethod
+    def _decompress_numpy(data: bytes) -> bytes:
+        """HU11: Decodificación vectorizada con NumPy"""
+        pairs = np.frombuffer(data, dtype=np.uint8)
+        return np.repeat(pairs[1::2], pairs[0::2]).tobytes()
+    
+    @staticmethod
+    def _compress_python(data: bytes) -> bytes:
+        """HU11: Codificación sin NumPy, una iteración por racha en lugar de por byte"""
+        compressed = bytearray()
+        max_run = RLECompressor.MAX_RUN
+        
+        for match in RLECompressor._RUN_PATTERN.finditer(data):
+            byte_value = data[match.start()]
+            length = match.end() - match.start()
+            
+            full_runs, remainder = divmod(length, max_run)
+            if full_runs:
+                compressed += bytes((max_run, byte_value)) * full_runs
+            if remainder:
+                compressed.append(remainder)
+                compressed.append(byte_value)
         
-        return bytes(decompressed)
+        return bytes(compressed)
+    
+    @staticmethod
+    def _decompress_python(data: bytes) -> bytes:
+        """HU11: Decodificación sin NumPy"""
+        return b''.join(bytes((value,)) * count for count, value in zip(data[0::2], data[1::2]))
 
 
 class CompressionAlgorithm:
     """
     HU05: Enumeración de algoritmos de compresión disponibles
+    HU21: Las implementaciones viven en el registro de códecs (codecs.py)
     """
     ZLIB = "zlib"
     RLE = "rle"
+    BZ2 = "bz2"
+    LZMA = "lzma"
+    GZIP = "gzip"
+    
+    @staticmethod
+    def validate(algorithm: str) -> str:
+        """
+        HU21: Valida que el algoritmo esté registrado
+        
+        Raises:
+            ValueError: Si el algoritmo no está soportado
+        """
+        from .codecs import get_codec
+        return get_codec(algorithm).name
     
     @staticmethod
-    def compress(data: bytes, algorithm: str = ZLIB, level: int = 6) -> bytes:
+    def compress(data: bytes, algorithm: str = ZLIB, level: int = None, dictionary: bytes = None) -> bytes:
         """
         Comprime datos usando el algoritmo especificado
         
         Args:
             data: Datos a comprimir
-            algorithm: Algoritmo a usar (zlib o rle)
-            level: Nivel de compresión (solo para zlib)
+            algorithm: Nombre de un códec registrado
+            level: Nivel de compresión (None = el por defecto del códec)
+            dictionary: HU25: Diccionario predefinido (solo códecs que lo admiten)
             
         Returns:
             bytes: Datos comprimidos
         """
-        if algorithm == CompressionAlgorithm.ZLIB:
-            return zlib.compress(data, level)
-        elif algorithm == CompressionAlgorithm.RLE:
-            return RLECompressor.compress(data)
-        else:
-            raise ValueError(f"Algoritmo de compresión no soportado: {algorithm}")
+        from .codecs import get_codec
+        if dictionary is not None:
+            return get_codec(algorithm).compress_with_dictionary(data, dictionary, level)
+        return get_codec(algorithm).compress(data, level)
     
     @staticmethod
-    def decompress(data: bytes, algorithm: str = ZLIB) -> bytes:
+    def decompress(data: bytes, algorithm: str = ZLIB, dictionary: bytes = None) -> bytes:
         """
         Descomprime datos usando el algoritmo especificado
         
         Args:
             data: Datos comprimidos
             algorithm: Algoritmo usado para comprimir
+            dictionary: HU25: Diccionario usado al comprimir, si hubo
             
         Returns:
             bytes: Datos originales
         """
-        if algorithm == CompressionAlgorithm.ZLIB:
-            return zlib.decompress(data)
-        elif algorithm == CompressionAlgorithm.RLE:
-            return RLECompressor.decompress(data)
-        else:
-            raise ValueError(f"Algoritmo de compresión no soportado: {algorithm}")
+        from .codecs import get_codec
+        if dictionary is not None:
+            return get_codec(algorithm).decompress_with_dictionary(data, dictionary)
+        return get_codec(algorithm).decompress(data)
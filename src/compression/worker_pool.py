@@ -0,0 +1,98 @@
+"""
+HU30: Pool de trabajadores persistente compartido entre trabajos
+
+Cada compresión o descompresión creaba sus propios hilos (y, con el
+backend de procesos, su propio pool de procesos) y los destruía al
+terminar. Con miles de archivos chicos, crear y cerrar trabajadores cuesta
+más que comprimir. Un WorkerPool mantiene los trabajadores vivos entre
+trabajos: los hilos y los procesos se crean recién cuando un trabajo los
+necesita y se reutilizan en los siguientes.
+
+Varios trabajos pueden usar el pool a la vez. Cancelar un trabajo
+(ParallelCompressor.stop_compression) solo detiene sus propias tareas: los
+bucles de trabajo de ese compresor terminan y sus tareas pendientes en el
+pool de procesos se cancelan, sin cerrar el pool.
+"""
+
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from .executor_backend import create_process_pool
+
+
+class WorkerPool:
+    """
+    HU30: Hilos y procesos de trabajo reutilizables entre trabajos
+
+    Es seguro para usar desde varios hilos. Los ejecutores se crean de forma
+    perezosa en el primer uso; después de shutdown no aceptan más tareas.
+    """
+
+    def __init__(self, max_workers: int = None):
+        """
+        Args:
+            max_workers: Máximo de hilos y de procesos (por defecto: núcleos de CPU)
+        """
+        if max_workers is not None and (not isinstance(max_workers, int) or max_workers <= 0):
+            raise ValueError("El tamaño del pool debe ser un entero positivo")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _check_open(self):
+        if self._closed:
+            raise RuntimeError("El pool de trabajadores está cerrado")
+
+    def thread_executor(self) -> ThreadPoolExecutor:
+        """Ejecutor de hilos del pool, creado en el primer uso"""
+        with self._lock:
+            self._check_open()
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="parcomp")
+            return self._threads
+
+    def process_executor(self) -> ProcessPoolExecutor:
+        """Ejecutor de procesos del pool, creado en el primer uso"""
+        with self._lock:
+            self._check_open()
+            if self._processes is None:
+                self._processes = create_process_pool(self.max_workers)
+            return self._processes
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Ejecuta fn(*args, **kwargs) en un hilo del pool"""
+        return self.thread_executor().submit(fn, *args, **kwargs)
+
+    def is_started(self) -> bool:
+        """Indica si ya se creó algún ejecutor"""
+        with self._lock:
+            return self._threads is not None or self._processes is not None
+
+    def is_closed(self) -> bool:
+        """Indica si el pool ya se cerró"""
+        return self._closed
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False) -> None:
+        """
+        Cierra el pool
+
+        Args:
+            wait: Esperar a que terminen las tareas en curso
+            cancel_pending: Descartar las tareas que todavía no empezaron
+        """
+        with self._lock:
+            self._closed = True
+            executors = [executor for executor in (self._threads, self._processes) if executor is not None]
+            self._threads = self._processes = None
+        for executor in executors:
+            executor.shutdown(wait=wait, cancel_futures=cancel_pending)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
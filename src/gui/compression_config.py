@@ -6,6 +6,8 @@ HU02: Configuración de parámetros de compresión
 import tkinter as tk
 from tkinter import ttk
 
+from compression.codecs import available_codecs
+
 
 class CompressionConfigFrame(ttk.Frame):
     """Frame para configurar parámetros de compresión"""
@@ -43,7 +45,7 @@ class CompressionConfigFrame(ttk.Frame):
         # Algoritmo de compresión
         ttk.Label(self, text="Algoritmo:").grid(row=3, column=0, sticky=tk.W, pady=5)
         algo_combo = ttk.Combobox(self, textvariable=self.compression_algorithm, 
-                                 values=["zlib", "gzip", "bz2"], 
+                                 values=available_codecs(),  # HU21: Códecs registrados
                                  state="readonly", width=10)
         algo_combo.grid(row=3, column=1, sticky=tk.W, padx=(10, 0), pady=5)
         
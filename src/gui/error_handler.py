@@ -8,30 +8,11 @@ from tkinter import messagebox
 import traceback
 import logging
 from datetime import datetime
-from enum import Enum
 from typing import Optional, Callable
 import os
 
-
-class ErrorType(Enum):
-    """Tipos de errores que puede manejar la aplicación"""
-    FILE_READ = "Lectura de archivo"
-    FILE_WRITE = "Escritura de archivo"
-    COMPRESSION = "Compresión"
-    DECOMPRESSION = "Descompresión"
-    PERMISSION = "Permisos"
-    VALIDATION = "Validación"
-    NETWORK = "Red"
-    MEMORY = "Memoria"
-    UNKNOWN = "Error desconocido"
-
-
-class ErrorSeverity(Enum):
-    """Niveles de severidad de errores"""
-    INFO = "info"
-    WARNING = "warning"
-    ERROR = "error"
-    CRITICAL = "critical"
+# HU20: Los tipos de error viven en el paquete de compresión (sin tkinter)
+from compression.errors import ErrorType, ErrorSeverity
 
 
 class ErrorHandler:
@@ -14,7 +14,8 @@ from datetime import datetime
 
 # Importar módulos para HU03
 from gui.progress_dialog import ProgressDialog
-from compression.parallel_compressor import ParallelCompressor
+# HU30: Pool de trabajadores compartido por todas las compresiones de la ventana
+from compression.service import CompressionService
 # HU07: Importar sistema de manejo de errores
 from gui.error_handler import ErrorHandler, ErrorType, ErrorSeverity, handle_error
 
@@ -38,6 +39,10 @@ class MainWindow:
         # HU07: Inicializar manejador de errores centralizado
         self.error_handler = ErrorHandler(self.root, enable_logging=True)
         
+        # HU30: Los hilos de trabajo se crean una vez y se reutilizan en cada compresión
+        self.compression_service = CompressionService(max_workers=self.max_threads,
+                                                      error_handler=self.error_handler)
+        
         self.setup_ui()
         
     def setup_ui(self):
@@ -183,6 +188,7 @@ class MainWindow:
         file_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Archivo", menu=file_menu)
         file_menu.add_command(label="Seleccionar archivo...", command=self.select_file)
+        file_menu.add_command(label="Seleccionar directorio...", command=self.select_directory)  # HU31
         file_menu.add_command(label="Elegir destino...", command=self.select_output_file)
         file_menu.add_separator()
         file_menu.add_command(label="Comprimir archivo", command=self.compress_file)
@@ -294,6 +300,44 @@ class MainWindow:
         except Exception as e:
             messagebox.showerror("Error", f"Error al seleccionar archivo: {str(e)}")
     
+    def select_directory(self):
+        """HU31: Abre el diálogo para seleccionar un directorio y comprimirlo en un único .pz"""
+        try:
+            dir_path = filedialog.askdirectory(title="Seleccionar directorio para comprimir")
+            if not dir_path:
+                return
+            if not os.access(dir_path, os.R_OK):
+                messagebox.showerror("Error", "El directorio seleccionado no se puede leer.")
+                return
+            
+            path = Path(dir_path)
+            files = [item for item in path.rglob('*') if item.is_file() and not item.is_symlink()]
+            total_size = sum(item.stat().st_size for item in files)
+            size_str = self.format_file_size(total_size)
+            
+            self.selected_file_path.set(dir_path)
+            self.name_label.config(text=path.name)
+            self.size_label.config(text=size_str)
+            self.location_label.config(text=str(path.parent))
+            self.status_label.config(text=f"✅ Directorio con {len(files)} archivos listo para comprimir",
+                                   foreground="green")
+            self.file_info = {
+                'path': dir_path,
+                'name': path.name,
+                'size': total_size,
+                'size_formatted': size_str,
+                'directory': str(path.parent),
+                'is_compressed': False,
+                'is_directory': True
+            }
+            
+            self.select_dest_button.config(state="normal")
+            self.suggest_output_filename(dir_path)
+            self.update_compression_button_state()
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al seleccionar directorio: {str(e)}")
+    
     def validate_file(self, file_path):
         """Valida que el archivo exista y sea accesible"""
         try:
@@ -397,8 +441,8 @@ class MainWindow:
             # Crear y mostrar diálogo de progreso
             progress_dialog = ProgressDialog(self.root, config)
             
-            # Crear instancia del compresor con error handler
-            compressor = ParallelCompressor(error_handler=self.error_handler)
+            # Crear instancia del compresor con error handler (HU30: sobre el pool compartido)
+            compressor = self.compression_service.create_compressor()
             
             # Crear función de compresión que usa la configuración
             def compress_with_config(input_file, output_file, progress_callback):
@@ -449,8 +493,8 @@ class MainWindow:
             # Crear y mostrar diálogo de progreso
             progress_dialog = ProgressDialog(self.root, config)
             
-            # Crear instancia del compresor con error handler
-            compressor = ParallelCompressor(error_handler=self.error_handler)
+            # Crear instancia del compresor con error handler (HU30: sobre el pool compartido)
+            compressor = self.compression_service.create_compressor()
             
             # Crear función de descompresión
             def decompress_with_config(input_file, output_file, progress_callback):
@@ -683,6 +727,8 @@ class MainWindow:
     def run(self):
         """Ejecuta la aplicación"""
         self.root.mainloop()
+        # HU30: Al cerrar la ventana se descartan las tareas pendientes del pool
+        self.compression_service.shutdown(wait=False, cancel_jobs=True)
     
     def show_error_history(self):
         """HU07: Muestra el historial detallado de errores"""
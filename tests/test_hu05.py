@@ -16,6 +16,7 @@ from pathlib import Path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
 
 from compression.parallel_compressor import ParallelCompressor
+from compression.pz_format import PzArchive
 from compression.temporary_storage import TemporaryBlockStorage, CompressionAlgorithm
 
 
@@ -141,10 +142,11 @@ class TestHU05ParallelCompression(unittest.TestCase):
             header_info = json.loads(header_data.decode('utf-8'))
             
             # Verificar estructura del encabezado
-            self.assertEqual(header_info['format'], 'PARZIP_V1')
+            self.assertEqual(header_info['format'], 'PARZIP_V2')
             self.assertGreater(header_info['total_blocks'], 0)
             self.assertEqual(header_info['compression_algorithm'], 'zlib')
-            self.assertIsInstance(header_info['block_order'], list)
+            self.assertEqual(header_info['block_count'], header_info['total_blocks'])
+            self.assertNotIn('block_order', header_info)
 
     def test_compression_with_rle(self):
         """HU05: Verifica compresión paralela usando RLE"""
@@ -178,17 +180,12 @@ class TestHU05ParallelCompression(unittest.TestCase):
         success = self.compressor.compress_file(self.test_file, self.compressed_file)
         self.assertTrue(success)
         
-        # Verificar que el archivo comprimido mantiene el orden
-        with open(self.compressed_file, 'rb') as f:
-            # Leer encabezado
-            header_size = int.from_bytes(f.read(4), byteorder='little')
-            header_data = f.read(header_size)
-            header_info = json.loads(header_data.decode('utf-8'))
-            
-            # Verificar que el orden de bloques es secuencial
-            block_order = header_info['block_order']
-            expected_order = list(range(len(block_order)))
-            self.assertEqual(block_order, expected_order)
+        # Verificar que el índice mantiene el orden (HU12: el encabezado ya no lista los bloques)
+        with PzArchive(self.compressed_file) as archive:
+            offsets = [block['original_offset'] for block in archive.blocks]
+            self.assertEqual([block['id'] for block in archive.blocks], list(range(len(offsets))))
+            self.assertEqual(offsets, sorted(offsets))
+            self.assertEqual(archive.read_range(0, len(test_content)), test_content)
 
     def test_temporary_storage_cleanup(self):
         """HU05: Verifica que el almacenamiento temporal se limpia después de la compresión"""
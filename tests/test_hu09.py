@@ -0,0 +1,104 @@
+"""
+Pruebas unitarias para HU09: Pipeline de compresión en streaming con memoria acotada
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import shutil
+from unittest import mock
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compression.block_manager import FileBlockManager
+from compression.parallel_compressor import ParallelCompressor
+
+
+class TestHU09StreamingCompression(unittest.TestCase):
+    """Pruebas para la compresión en streaming"""
+    
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.test_file = os.path.join(self.temp_dir, "test_file.bin")
+        self.compressed_file = os.path.join(self.temp_dir, "test_file.pz")
+        self.decompressed_file = os.path.join(self.temp_dir, "test_file_out.bin")
+        
+        # 20 bloques de 64KB con contenido variado
+        self.test_content = b"".join(
+            f"BLOQUE_{i:03d}_".encode() * 6000 + os.urandom(1024) for i in range(20)
+        )
+        with open(self.test_file, 'wb') as f:
+            f.write(self.test_content)
+        
+        self.compressor = ParallelCompressor(block_size=64 * 1024)
+    
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_iter_file_blocks_matches_split(self):
+        """HU09: La lectura incremental produce los mismos bloques que la división completa"""
+        manager = FileBlockManager(64 * 1024)
+        streamed = list(manager.iter_file_blocks(self.test_file))
+        split = FileBlockManager(64 * 1024).split_file_into_blocks(self.test_file)
+        
+        self.assertEqual(len(streamed), len(split))
+        for a, b in zip(streamed, split):
+            self.assertEqual(a['data'], b['data'])
+            self.assertEqual(a['start_offset'], b['start_offset'])
+        self.assertEqual(manager.blocks_info, [], "El modo incremental no debe retener bloques")
+    
+    def test_streaming_round_trip(self):
+        """HU09: Un archivo comprimido en streaming se descomprime de forma idéntica"""
+        self.compressor.set_streaming_mode(True, queue_depth=2)
+        
+        self.assertTrue(self.compressor.compress_file_with_threads(self.test_file, self.compressed_file, 4))
+        self.assertIsNone(self.compressor.temp_storage)
+        
+        self.assertTrue(self.compressor.decompress_file_with_threads(self.compressed_file, self.decompressed_file, 4))
+        with open(self.decompressed_file, 'rb') as f:
+            self.assertEqual(f.read(), self.test_content)
+    
+    def test_memory_window_is_bounded(self):
+        """HU09: Los bloques en vuelo nunca superan hilos + profundidad de cola"""
+        self.compressor.set_streaming_mode(True, queue_depth=1)
+        self.compressor.compress_file_with_threads(self.test_file, self.compressed_file, 2)
+        
+        stats = self.compressor.get_compression_statistics()['streaming']
+        self.assertEqual(stats['window_blocks'], 3)
+        self.assertLessEqual(stats['max_in_flight_blocks'], stats['window_blocks'])
+        self.assertGreater(stats['max_in_flight_blocks'], 0)
+    
+    def test_streaming_cancellation(self):
+        """HU09: La cancelación detiene el pipeline sin dejar hilos bloqueados"""
+        self.compressor.set_streaming_mode(True, queue_depth=1)
+        
+        def cancelling_callback(message, progress, phase):
+            return progress < 20
+        
+        result = self.compressor.compress_file_with_threads(
+            self.test_file, self.compressed_file, 2, cancelling_callback
+        )
+        self.assertFalse(result)
+        self.assertTrue(self.compressor.cancel_requested)
+        self.assertFalse(os.path.exists(self.compressed_file), "No debe quedar un .pz truncado")
+    
+    def test_streaming_error_removes_partial_output(self):
+        """HU09: Un error al escribir no deja un .pz truncado y sin índice"""
+        self.compressor.set_streaming_mode(True, queue_depth=1)
+        with mock.patch('compression.parallel_compressor.write_index', side_effect=IOError("disco lleno")):
+            with self.assertRaises(IOError):
+                self.compressor.compress_file_with_threads(self.test_file, self.compressed_file, 2)
+        self.assertFalse(os.path.exists(self.compressed_file))
+    
+    def test_invalid_queue_depth(self):
+        """HU09: Una profundidad de cola no positiva es rechazada"""
+        with self.assertRaises(ValueError):
+            self.compressor.set_streaming_mode(True, queue_depth=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
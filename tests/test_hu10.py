@@ -0,0 +1,93 @@
+"""
+Pruebas unitarias para HU10: Backend de ejecución con pool de procesos
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import shutil
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compression.parallel_compressor import ParallelCompressor
+from compression.codecs import get_codec
+from compression.executor_backend import ExecutorBackend, decompress_payload, encode_file_range
+from compression.temporary_storage import CompressionAlgorithm
+
+
+class TestHU10ProcessBackend(unittest.TestCase):
+    """Pruebas para la compresión y descompresión con procesos"""
+    
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.test_file = os.path.join(self.temp_dir, "test_file.bin")
+        self.compressed_file = os.path.join(self.temp_dir, "test_file.pz")
+        self.decompressed_file = os.path.join(self.temp_dir, "test_file_out.bin")
+        
+        # Contenido con rachas largas (favorable a RLE) en 4 bloques de 64KB
+        self.test_content = b"".join(bytes([i]) * 50000 + b"xyz" * 5000 for i in range(4))
+        with open(self.test_file, 'wb') as f:
+            f.write(self.test_content)
+        
+        self.compressor = ParallelCompressor(block_size=64 * 1024)
+        self.compressor.set_executor_backend(ExecutorBackend.PROCESSES)
+    
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _assert_round_trip(self):
+        self.assertTrue(self.compressor.compress_file_with_threads(self.test_file, self.compressed_file, 2))
+        self.assertTrue(self.compressor.decompress_file_with_threads(self.compressed_file, self.decompressed_file, 2))
+        with open(self.decompressed_file, 'rb') as f:
+            self.assertEqual(f.read(), self.test_content)
+    
+    def test_backend_selection(self):
+        """HU10: El backend es configurable y se validan valores desconocidos"""
+        self.assertEqual(self.compressor.get_executor_backend(), ExecutorBackend.PROCESSES)
+        with self.assertRaises(ValueError):
+            self.compressor.set_executor_backend("gpu")
+    
+    def test_process_round_trip_zlib(self):
+        """HU10: Ciclo completo con zlib en procesos"""
+        self._assert_round_trip()
+        self.assertIsNone(self.compressor._process_pool, "El pool debe cerrarse al terminar")
+    
+    def test_process_round_trip_rle(self):
+        """HU10: Ciclo completo con RLE en procesos"""
+        self.compressor.set_compression_algorithm(CompressionAlgorithm.RLE)
+        self._assert_round_trip()
+    
+    def test_process_backend_with_streaming(self):
+        """HU10: El pipeline en streaming delega la compresión al pool de procesos"""
+        self.compressor.set_streaming_mode(True, queue_depth=2)
+        self._assert_round_trip()
+    
+    def test_process_progress_and_cancel(self):
+        """HU10: El callback de progreso puede cancelar trabajos en procesos"""
+        updates = []
+        
+        def cancelling_callback(message, progress, phase):
+            updates.append(progress)
+            return progress < 30
+        
+        result = self.compressor.compress_file_with_threads(
+            self.test_file, self.compressed_file, 2, cancelling_callback
+        )
+        self.assertFalse(result)
+        self.assertTrue(updates)
+    
+    def test_encode_file_range_reads_only_its_block(self):
+        """HU10: El trabajo de proceso lee su propio rango del archivo"""
+        encoded = encode_file_range(self.test_file, 65536, 65536, CompressionAlgorithm.ZLIB)
+        self.assertEqual(decompress_payload(encoded['data'], 65536, get_codec(encoded['codec']).codec_id),
+                         self.test_content[65536:131072])
+        self.assertLess(encoded['compression_ratio'], 100.0)
+        self.assertEqual(encoded['worker_id'], os.getpid())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+"""
+Pruebas unitarias para HU11: Códec RLE vectorizado compatible con el formato existente
+"""
+
+import unittest
+import os
+import sys
+import random
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compression import temporary_storage
+from compression.temporary_storage import RLECompressor
+from compression.parallel_compressor import ParallelCompressor
+
+
+def reference_rle_compress(data: bytes) -> bytes:
+    """Implementación original byte a byte, usada como referencia del formato"""
+    if not data:
+        return b''
+    compressed = bytearray()
+    i = 0
+    while i < len(data):
+        current_byte = data[i]
+        count = 1
+        while i + count < len(data) and data[i + count] == current_byte and count < 255:
+            count += 1
+        compressed.append(count)
+        compressed.append(current_byte)
+        i += count
+    return bytes(compressed)
+
+
+class TestHU11RLECodec(unittest.TestCase):
+    """Pruebas de compatibilidad del formato RLE"""
+    
+    def setUp(self):
+        rng = random.Random(11)
+        self.samples = [
+            b"A",
+            b"AB" * 100,
+            b"\x00" * 255,
+            b"\x00" * 256,
+            b"\xff" * 1000 + b"\x00" * 511 + b"Z",
+            bytes(rng.randrange(256) for _ in range(5000)),
+            b"".join(bytes([rng.randrange(4)]) * rng.randrange(1, 700) for _ in range(200)),
+        ]
+    
+    def _check_implementation(self, compress, decompress):
+        for data in self.samples:
+            with self.subTest(size=len(data)):
+                encoded = compress(data)
+                self.assertEqual(encoded, reference_rle_compress(data), "El formato debe ser idéntico al original")
+                self.assertEqual(decompress(encoded), data)
+    
+    def test_python_fallback_matches_reference(self):
+        """HU11: La implementación sin NumPy produce el formato original"""
+        self._check_implementation(RLECompressor._compress_python, RLECompressor._decompress_python)
+    
+    @unittest.skipIf(temporary_storage.np is None, "NumPy no está instalado")
+    def test_numpy_matches_reference(self):
+        """HU11: La implementación con NumPy produce el formato original"""
+        self._check_implementation(RLECompressor._compress_numpy, RLECompressor._decompress_numpy)
+    
+    def test_decode_legacy_stream(self):
+        """HU11: Datos RLE generados por la implementación anterior siguen siendo legibles"""
+        legacy = reference_rle_compress(b"x" * 600 + b"yz")
+        self.assertEqual(RLECompressor.decompress(legacy), b"x" * 600 + b"yz")
+    
+    def test_compressor_uses_single_implementation(self):
+        """HU11: ParallelCompressor delega en RLECompressor"""
+        compressor = ParallelCompressor()
+        data = b"Q" * 300 + b"R"
+        self.assertEqual(compressor._compress_rle(data), RLECompressor.compress(data))
+        self.assertEqual(compressor._decompress_rle(RLECompressor.compress(data)), data)
+    
+    def test_invalid_and_empty_input(self):
+        """HU11: Entradas vacías o de longitud impar no producen datos"""
+        self.assertEqual(RLECompressor.compress(b""), b"")
+        self.assertEqual(RLECompressor.decompress(b""), b"")
+        self.assertEqual(RLECompressor.decompress(b"\x03"), b"")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+"""
+Pruebas unitarias para HU12: Índice de bloques en el formato .pz y lectura por rangos
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import json
+import zlib
+import shutil
+from unittest import mock
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compression.parallel_compressor import ParallelCompressor
+from compression.pz_format import PzArchive, FORMAT_V1, FORMAT_V2, MAX_HEADER_SIZE, write_header
+
+
+class TestHU12SeekableIndex(unittest.TestCase):
+    """Pruebas del índice de bloques y del lector por rangos"""
+    
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.test_file = os.path.join(self.temp_dir, "test_file.bin")
+        self.compressed_file = os.path.join(self.temp_dir, "test_file.pz")
+        
+        # 5 bloques de 64KB, el último incompleto
+        self.test_content = b"".join(f"linea {i:06d}\n".encode() for i in range(25000))
+        with open(self.test_file, 'wb') as f:
+            f.write(self.test_content)
+        
+        self.compressor = ParallelCompressor(block_size=64 * 1024)
+        self.assertTrue(self.compressor.compress_file_with_threads(self.test_file, self.compressed_file, 2))
+    
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_index_entries(self):
+        """HU12: El índice contiene offsets contiguos y checksums de cada bloque"""
+        with PzArchive(self.compressed_file) as archive:
+            self.assertEqual(archive.header['format'], FORMAT_V2)
+            self.assertEqual(archive.original_size, len(self.test_content))
+            
+            expected_offset = 0
+            for block in archive.blocks:
+                self.assertEqual(block['original_offset'], expected_offset)
+                chunk = self.test_content[expected_offset:expected_offset + block['original_size']]
+                self.assertEqual(block['checksum'], zlib.crc32(chunk))
+                expected_offset += block['original_size']
+    
+    def test_read_range_touches_only_covering_blocks(self):
+        """HU12: Leer 4KB dentro de un bloque descomprime solo ese bloque"""
+        with PzArchive(self.compressed_file) as archive:
+            with mock.patch.object(archive, 'read_block', wraps=archive.read_block) as read_block:
+                data = archive.read_range(70000, 4096)
+            
+            self.assertEqual(data, self.test_content[70000:74096])
+            self.assertEqual(read_block.call_count, 1)
+    
+    def test_read_range_across_blocks_and_past_end(self):
+        """HU12: Rangos que cruzan bloques o exceden el final se recortan correctamente"""
+        size = len(self.test_content)
+        self.assertEqual(self.compressor.read_range(self.compressed_file, 65000, 2000),
+                         self.test_content[65000:67000])
+        self.assertEqual(self.compressor.read_range(self.compressed_file, size - 10, 100),
+                         self.test_content[-10:])
+        self.assertEqual(self.compressor.read_range(self.compressed_file, size + 5, 10), b"")
+    
+    def test_corrupted_block_is_detected(self):
+        """HU12: Un bloque alterado falla la verificación de checksum"""
+        with PzArchive(self.compressed_file) as archive:
+            target = archive.blocks[1]
+        
+        # Reemplazar el bloque por otro stream zlib válido con distinto contenido
+        fake = zlib.compress(b"X" * target['original_size'])
+        self.assertLessEqual(len(fake), target['compressed_size'])
+        with open(self.compressed_file, 'r+b') as f:
+            f.seek(target['data_offset'])
+            f.write(fake + b"\x00" * (target['compressed_size'] - len(fake)))
+        
+        with PzArchive(self.compressed_file) as archive:
+            with self.assertRaises(ValueError):
+                archive.read_block(1)
+    
+    def test_legacy_v1_file_still_readable(self):
+        """HU12: Archivos PARZIP_V1 sin índice siguen siendo legibles"""
+        legacy_file = os.path.join(self.temp_dir, "legacy.pz")
+        blocks = [self.test_content[i:i + 65536] for i in range(0, len(self.test_content), 65536)]
+        compressed = [zlib.compress(block) for block in blocks]
+        header = json.dumps({
+            'format': FORMAT_V1,
+            'original_filename': 'test_file.bin',
+            'original_size': len(self.test_content),
+            'block_count': len(blocks),
+            'total_blocks': len(blocks),
+            'compression_algorithm': 'zlib',
+            'block_order': list(range(len(blocks)))
+        }).encode()
+        with open(legacy_file, 'wb') as f:
+            f.write(len(header).to_bytes(4, 'little') + header)
+            for block, data in zip(blocks, compressed):
+                f.write(len(data).to_bytes(4, 'little') + len(block).to_bytes(4, 'little'))
+            for data in compressed:
+                f.write(data)
+        
+        self.assertEqual(self.compressor.read_range(legacy_file, 100000, 50), self.test_content[100000:100050])
+        
+        output_file = os.path.join(self.temp_dir, "legacy_out.bin")
+        self.assertTrue(self.compressor.decompress_file_with_threads(legacy_file, output_file, 2))
+        with open(output_file, 'rb') as f:
+            self.assertEqual(f.read(), self.test_content)
+    
+    def test_header_size_does_not_grow_with_block_count(self):
+        """HU12: El encabezado V2 no lista los bloques y uno demasiado grande se rechaza al escribirlo"""
+        header = self.compressor._build_header_info(self.test_file, 200000 * 65536, 200000)
+        self.assertNotIn('block_order', header)
+        self.assertLess(len(json.dumps(header)), 1024)
+        
+        with open(os.path.join(self.temp_dir, "grande.pz"), 'wb') as f:
+            with self.assertRaises(ValueError):
+                write_header(f, {'relleno': 'x' * MAX_HEADER_SIZE})
+
+
+if __name__ == '__main__':
+    unittest.main()
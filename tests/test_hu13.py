@@ -0,0 +1,85 @@
+"""
+Pruebas unitarias para HU13: Lectura de bloques sin copias mediante mmap
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import zlib
+import shutil
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compression.block_manager import FileBlockManager
+from compression.parallel_compressor import ParallelCompressor
+from compression.pz_format import PzArchive
+
+
+class TestHU13MemoryMappedBlocks(unittest.TestCase):
+    """Pruebas para la división de bloques con mmap"""
+    
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.test_file = os.path.join(self.temp_dir, "test_file.bin")
+        self.compressed_file = os.path.join(self.temp_dir, "test_file.pz")
+        self.decompressed_file = os.path.join(self.temp_dir, "test_file_out.bin")
+        
+        self.test_content = os.urandom(30000) + b"texto repetido " * 20000
+        with open(self.test_file, 'wb') as f:
+            f.write(self.test_content)
+    
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_blocks_are_views_of_the_file(self):
+        """HU13: Los bloques son memoryview y reproducen el contenido exacto"""
+        manager = FileBlockManager(64 * 1024, use_mmap=True)
+        blocks = manager.split_file_into_blocks(self.test_file)
+        
+        self.assertTrue(all(isinstance(block['data'], memoryview) for block in blocks))
+        self.assertEqual(b"".join(bytes(block['data']) for block in blocks), self.test_content)
+        self.assertEqual(zlib.decompress(zlib.compress(blocks[0]['data'])), self.test_content[:65536])
+        
+        manager.release_mapping()
+        self.assertIsNone(manager._mapping)
+        self.assertEqual(manager.blocks_info, [])
+    
+    def test_mmap_round_trip(self):
+        """HU13: Compresión con mmap produce un archivo idéntico al modo tradicional"""
+        compressor = ParallelCompressor(block_size=64 * 1024)
+        compressor.set_memory_mapping(True)
+        
+        self.assertTrue(compressor.compress_file_with_threads(self.test_file, self.compressed_file, 3))
+        self.assertIsNone(compressor.block_manager._mapping, "El mapeo debe cerrarse al terminar")
+        
+        self.assertTrue(compressor.decompress_file_with_threads(self.compressed_file, self.decompressed_file, 3))
+        with open(self.decompressed_file, 'rb') as f:
+            self.assertEqual(f.read(), self.test_content)
+        
+        # Los checksums calculados por los hilos quedan en el índice
+        with PzArchive(self.compressed_file) as archive:
+            self.assertEqual(archive.blocks[0]['checksum'], zlib.crc32(self.test_content[:65536]))
+    
+    def test_mmap_with_streaming(self):
+        """HU13: El pipeline en streaming acepta bloques mapeados"""
+        compressor = ParallelCompressor(block_size=64 * 1024)
+        compressor.set_memory_mapping(True)
+        compressor.set_streaming_mode(True, queue_depth=1)
+        
+        self.assertTrue(compressor.compress_file_with_threads(self.test_file, self.compressed_file, 2))
+        self.assertEqual(compressor.read_range(self.compressed_file, 0, len(self.test_content)), self.test_content)
+    
+    def test_mmap_survives_block_size_change(self):
+        """HU13: Cambiar el tamaño de bloque conserva la configuración de mmap"""
+        compressor = ParallelCompressor()
+        compressor.set_memory_mapping(True)
+        compressor.set_block_size(128 * 1024)
+        self.assertTrue(compressor.block_manager.use_mmap)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+"""
+Pruebas unitarias para HU14: Planificador dinámico de bloques
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import shutil
+import threading
+import time
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compression.scheduler import DynamicBlockScheduler
+from compression.parallel_compressor import ParallelCompressor
+
+
+class TestHU14DynamicBlockScheduler(unittest.TestCase):
+    """Pruebas para la cola compartida de bloques"""
+
+    def _make_blocks(self, count):
+        return [{'id': i, 'size': 100} for i in range(count)]
+
+    def test_every_block_dispatched_once(self):
+        """HU14: Cada bloque se entrega exactamente a un trabajador"""
+        scheduler = DynamicBlockScheduler(self._make_blocks(50), 4)
+        seen = []
+        lock = threading.Lock()
+
+        def worker(worker_id):
+            for block in scheduler.iter_blocks(worker_id):
+                with lock:
+                    seen.append(block['id'])
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        scheduler.finish()
+
+        self.assertEqual(sorted(seen), list(range(50)))
+        self.assertEqual(scheduler.remaining(), 0)
+
+        stats = scheduler.get_statistics()
+        self.assertEqual(stats['strategy'], 'dynamic_queue')
+        self.assertEqual(sum(w['blocks'] for w in stats['workers']), 50)
+        self.assertEqual(sum(w['bytes'] for w in stats['workers']), 5000)
+
+    def test_slow_worker_takes_fewer_blocks(self):
+        """HU14: Un trabajador lento no retiene bloques que otros pueden procesar"""
+        scheduler = DynamicBlockScheduler(self._make_blocks(20), 2)
+
+        def worker(worker_id, delay):
+            for _ in scheduler.iter_blocks(worker_id):
+                time.sleep(delay)
+
+        slow = threading.Thread(target=worker, args=(0, 0.05))
+        fast = threading.Thread(target=worker, args=(1, 0.001))
+        slow.start()
+        fast.start()
+        slow.join()
+        fast.join()
+
+        workers = scheduler.get_statistics()['workers']
+        self.assertGreater(workers[1]['blocks'], workers[0]['blocks'])
+        self.assertGreater(workers[0]['busy_time'], 0)
+
+    def test_invalid_worker_count(self):
+        """HU14: El número de trabajadores debe ser positivo"""
+        with self.assertRaises(ValueError):
+            DynamicBlockScheduler([], 0)
+
+
+class TestHU14SchedulerIntegration(unittest.TestCase):
+    """Pruebas del planificador dentro del compresor"""
+
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.test_file = os.path.join(self.temp_dir, "test_file.bin")
+        self.compressed_file = os.path.join(self.temp_dir, "test_file.pz")
+        self.decompressed_file = os.path.join(self.temp_dir, "test_file_out.bin")
+
+        # Mezcla de bloques incompresibles y muy compresibles
+        self.test_content = (os.urandom(128 * 1024) + b"\x00" * 128 * 1024) * 4
+        with open(self.test_file, 'wb') as f:
+            f.write(self.test_content)
+
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_round_trip_reports_worker_utilization(self):
+        """HU14: Compresión y descompresión exponen el uso de cada hilo"""
+        compressor = ParallelCompressor()
+        compressor.set_block_size(64 * 1024)
+
+        self.assertTrue(compressor.compress_file_with_threads(
+            self.test_file, self.compressed_file, num_threads=3))
+
+        stats = compressor.get_compression_statistics()['scheduler']
+        self.assertEqual(stats['num_workers'], 3)
+        self.assertEqual(sum(w['blocks'] for w in stats['workers']), 16)
+        self.assertEqual(sum(w['bytes'] for w in stats['workers']), len(self.test_content))
+        for worker in stats['workers']:
+            self.assertGreaterEqual(worker['utilization'], 0)
+            self.assertLessEqual(worker['utilization'], 100)
+        self.assertGreaterEqual(stats['load_imbalance'], 1.0)
+
+        decompressor = ParallelCompressor()
+        self.assertTrue(decompressor.decompress_file_with_threads(
+            self.compressed_file, self.decompressed_file, num_threads=3))
+
+        with open(self.decompressed_file, 'rb') as f:
+            self.assertEqual(f.read(), self.test_content)
+
+        stats = decompressor.get_decompression_statistics()['scheduler']
+        self.assertEqual(sum(w['blocks'] for w in stats['workers']), 16)
+
+    def test_fewer_blocks_than_threads(self):
+        """HU14: Las estadísticas solo incluyen los hilos que se iniciaron"""
+        compressor = ParallelCompressor()
+        compressor.set_block_size(128 * 1024)
+        with open(self.test_file, 'wb') as f:
+            f.write(self.test_content[:256 * 1024])
+
+        self.assertTrue(compressor.compress_file_with_threads(
+            self.test_file, self.compressed_file, num_threads=8))
+        stats = compressor.get_compression_statistics()['scheduler']
+        self.assertEqual(stats['num_workers'], 2)
+        self.assertEqual(len(stats['workers']), 2)
+
+        decompressor = ParallelCompressor()
+        self.assertTrue(decompressor.decompress_file_with_threads(
+            self.compressed_file, self.decompressed_file, num_threads=8))
+        self.assertEqual(decompressor.get_decompression_statistics()['scheduler']['num_workers'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
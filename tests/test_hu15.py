@@ -0,0 +1,117 @@
+"""
+Pruebas unitarias para HU15: Descompresión en streaming con escritor ordenado
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import shutil
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compression.parallel_compressor import ParallelCompressor
+from compression.executor_backend import ExecutorBackend
+from compression.pz_format import PzArchive
+
+
+class TestHU15StreamingDecompression(unittest.TestCase):
+    """Pruebas para la descompresión en streaming"""
+
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.test_file = os.path.join(self.temp_dir, "test_file.bin")
+        self.compressed_file = os.path.join(self.temp_dir, "test_file.pz")
+        self.decompressed_file = os.path.join(self.temp_dir, "salida", "test_file_out.bin")
+
+        # 24 bloques de 64KB alternando datos aleatorios y repetitivos
+        self.test_content = b"".join(
+            os.urandom(64 * 1024) if i % 3 == 0 else f"BLOQUE_{i:03d}_".encode() * 6554
+            for i in range(24)
+        )
+        with open(self.test_file, 'wb') as f:
+            f.write(self.test_content)
+
+        # El archivo se comprime con el camino normal (no streaming)
+        ParallelCompressor(block_size=64 * 1024).compress_file_with_threads(
+            self.test_file, self.compressed_file, 4
+        )
+
+        self.decompressor = ParallelCompressor()
+        self.decompressor.set_streaming_mode(True, queue_depth=2)
+
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _read_output(self):
+        with open(self.decompressed_file, 'rb') as f:
+            return f.read()
+
+    def test_streaming_round_trip(self):
+        """HU15: La descompresión en streaming reproduce el archivo original"""
+        self.assertTrue(self.decompressor.decompress_file_with_threads(
+            self.compressed_file, self.decompressed_file, 4))
+        self.assertEqual(self._read_output(), self.test_content)
+
+    def test_in_flight_window_is_bounded(self):
+        """HU15: Los bloques en vuelo nunca superan hilos + profundidad de cola"""
+        self.decompressor.set_streaming_mode(True, queue_depth=1)
+        self.assertTrue(self.decompressor.decompress_file_with_threads(
+            self.compressed_file, self.decompressed_file, 2))
+
+        stats = self.decompressor.get_decompression_statistics()['streaming']
+        self.assertEqual(stats['window_blocks'], 3)
+        self.assertGreater(stats['max_in_flight_blocks'], 0)
+        self.assertLessEqual(stats['max_in_flight_blocks'], stats['window_blocks'])
+        self.assertLessEqual(stats['max_buffered_bytes'], 3 * 64 * 1024)
+
+    def test_streaming_with_processes(self):
+        """HU15: El streaming también funciona con el backend de procesos"""
+        self.decompressor.set_executor_backend(ExecutorBackend.PROCESSES)
+        self.assertTrue(self.decompressor.decompress_file_with_threads(
+            self.compressed_file, self.decompressed_file, 2))
+        self.assertEqual(self._read_output(), self.test_content)
+        self.assertIsNone(self.decompressor._process_pool)
+
+    def test_corrupted_block_fails(self):
+        """HU15: Un bloque corrupto hace fallar la descompresión"""
+        with open(self.compressed_file, 'r+b') as f:
+            # Dañar datos comprimidos justo después del encabezado
+            header_size = int.from_bytes(f.read(4), byteorder='little')
+            f.seek(4 + header_size + 64 * 1024 + 10)
+            f.write(b"\xff" * 64)
+
+        self.assertFalse(self.decompressor.decompress_file_with_threads(
+            self.compressed_file, self.decompressed_file, 2))
+
+    def test_corrupted_late_block_leaves_no_output(self):
+        """HU15: Si falla un bloque tardío no queda un archivo truncado con los bloques anteriores"""
+        with PzArchive(self.compressed_file) as archive:
+            target = archive.blocks[21]
+        with open(self.compressed_file, 'r+b') as f:
+            f.seek(target['data_offset'])
+            original = f.read(1)
+            f.seek(target['data_offset'])
+            f.write(bytes([original[0] ^ 0xFF]))
+
+        self.assertFalse(self.decompressor.decompress_file_with_threads(
+            self.compressed_file, self.decompressed_file, 2))
+        self.assertFalse(os.path.exists(self.decompressed_file))
+
+    def test_streaming_cancellation(self):
+        """HU15: La cancelación detiene el pipeline sin dejar hilos bloqueados"""
+        def cancelling_callback(message, progress, phase):
+            return progress < 30
+
+        self.assertFalse(self.decompressor.decompress_file_with_threads(
+            self.compressed_file, self.decompressed_file, 2, cancelling_callback))
+        self.assertTrue(self.decompressor.cancel_requested)
+        self.assertFalse(self.decompressor.is_decompressing)
+        self.assertFalse(os.path.exists(self.decompressed_file))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+Pruebas unitarias para HU16: Escritura directa al archivo .pz sin archivos temporales
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import shutil
+import zlib
+from unittest import mock
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compression.parallel_compressor import ParallelCompressor
+from compression.pz_format import FORMAT_V2, PzArchive, PzBlockWriter, block_checksum
+from compression.temporary_storage import TemporaryBlockStorage
+
+
+class TestHU16PzBlockWriter(unittest.TestCase):
+    """Pruebas para el escritor directo de bloques"""
+
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.output_file = os.path.join(self.temp_dir, "salida.pz")
+        self.chunks = [bytes([i]) * 1000 + os.urandom(100) for i in range(5)]
+        self.header = {
+            'format': FORMAT_V2,
+            'original_filename': 'datos.bin',
+            'original_size': sum(len(chunk) for chunk in self.chunks),
+            'block_count': len(self.chunks),
+            'compression_algorithm': 'zlib'
+        }
+
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self, writer, block_id):
+        chunk = self.chunks[block_id]
+        writer.write_block(block_id, block_id * len(chunk), len(chunk),
+                           zlib.compress(chunk), block_checksum(chunk))
+
+    def test_out_of_order_writes_are_indexed(self):
+        """HU16: Los bloques escritos en cualquier orden se leen en orden lógico"""
+        writer = PzBlockWriter(self.output_file, self.header)
+        for block_id in (3, 0, 4, 1, 2):
+            self._write(writer, block_id)
+        self.assertEqual(writer.blocks_written, 5)
+        writer.close()
+
+        with PzArchive(self.output_file) as archive:
+            self.assertEqual(archive.read_range(0, archive.original_size), b"".join(self.chunks))
+            offsets = [block['data_offset'] for block in archive.blocks]
+            self.assertNotEqual(offsets, sorted(offsets))
+
+    def test_missing_block_removes_output(self):
+        """HU16: Cerrar con bloques faltantes falla y elimina el archivo parcial"""
+        writer = PzBlockWriter(self.output_file, self.header)
+        self._write(writer, 0)
+
+        with self.assertRaises(ValueError):
+            writer.close()
+        self.assertFalse(os.path.exists(self.output_file))
+
+    def test_duplicate_block_rejected(self):
+        """HU16: Un bloque no puede escribirse dos veces"""
+        writer = PzBlockWriter(self.output_file, self.header)
+        self._write(writer, 1)
+        with self.assertRaises(ValueError):
+            self._write(writer, 1)
+        writer.abort()
+
+
+class TestHU16DirectCompression(unittest.TestCase):
+    """Pruebas de la compresión con escritura directa"""
+
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.test_file = os.path.join(self.temp_dir, "test_file.bin")
+        self.compressed_file = os.path.join(self.temp_dir, "test_file.pz")
+        self.decompressed_file = os.path.join(self.temp_dir, "test_file_out.bin")
+
+        self.test_content = b"".join(
+            f"BLOQUE_{i:03d}_".encode() * 6000 + os.urandom(2048) for i in range(12)
+        )
+        with open(self.test_file, 'wb') as f:
+            f.write(self.test_content)
+
+        self.compressor = ParallelCompressor(block_size=64 * 1024)
+
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_direct_output_is_default_and_skips_temp_storage(self):
+        """HU16: Por defecto no se crea almacenamiento temporal"""
+        self.assertTrue(self.compressor.direct_output)
+
+        with mock.patch('compression.parallel_compressor.TemporaryBlockStorage') as storage:
+            self.assertTrue(self.compressor.compress_file_with_threads(
+                self.test_file, self.compressed_file, 4))
+            storage.assert_not_called()
+
+        self.assertTrue(self.compressor.decompress_file_with_threads(
+            self.compressed_file, self.decompressed_file, 4))
+        with open(self.decompressed_file, 'rb') as f:
+            self.assertEqual(f.read(), self.test_content)
+
+    def test_temp_storage_mode_still_available(self):
+        """HU16: Desactivar la escritura directa usa el almacenamiento temporal"""
+        self.compressor.set_direct_output(False)
+
+        with mock.patch('compression.parallel_compressor.TemporaryBlockStorage',
+                        wraps=TemporaryBlockStorage) as storage:
+            self.assertTrue(self.compressor.compress_file_with_threads(
+                self.test_file, self.compressed_file, 4))
+            storage.assert_called_once()
+
+        with PzArchive(self.compressed_file) as archive:
+            self.assertEqual(archive.read_range(0, archive.original_size), self.test_content)
+
+    def test_cancellation_removes_partial_output(self):
+        """HU16: Cancelar durante la compresión no deja un .pz incompleto"""
+        def cancelling_callback(message, progress, phase):
+            return progress < 30
+
+        self.assertFalse(self.compressor.compress_file_with_threads(
+            self.test_file, self.compressed_file, 2, cancelling_callback))
+        self.assertFalse(os.path.exists(self.compressed_file))
+
+
+if __name__ == '__main__':
+    unittest.main()
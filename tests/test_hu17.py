@@ -0,0 +1,151 @@
+"""
+Pruebas unitarias para HU17: Journal de metadatos de solo anexado
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import shutil
+import json
+import threading
+from unittest import mock
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compression.temporary_storage import TemporaryBlockStorage, JournalSyncPolicy
+
+
+class TestHU17MetadataJournal(unittest.TestCase):
+    """Pruebas para el journal de TemporaryBlockStorage"""
+
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _store(self, storage, block_id):
+        data = f"bloque {block_id}".encode() * 10
+        storage.store_compressed_block(block_id, data, 1000, 50.0, 0, block_id)
+
+    def _read_snapshot(self, storage):
+        with open(storage.metadata_file, 'r') as f:
+            return json.load(f)
+
+    def test_blocks_append_to_journal_without_rewriting_snapshot(self):
+        """HU17: Cada bloque agrega una línea al journal y no reescribe metadata.json"""
+        storage = TemporaryBlockStorage(self.temp_dir)
+        snapshot = self._read_snapshot(storage)
+
+        for block_id in range(10):
+            self._store(storage, block_id)
+
+        self.assertEqual(self._read_snapshot(storage), snapshot)
+        with open(storage.journal_file, 'r') as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(len(records), 10)
+        self.assertEqual(records[3]['block']['id'], 3)
+        self.assertEqual(storage.get_block_count(), 10)
+
+    def test_recover_replays_journal(self):
+        """HU17: Un almacenamiento abandonado se reconstruye desde el journal"""
+        storage = TemporaryBlockStorage(self.temp_dir)
+        storage.set_file_info("entrada.bin", "salida.pz", 5)
+        for block_id in (0, 2, 4):
+            self._store(storage, block_id)
+        del storage  # Simula la caída del proceso sin limpieza
+
+        recovered = TemporaryBlockStorage.recover(self.temp_dir)
+        self.assertEqual([block['id'] for block in recovered.get_stored_blocks()], [0, 2, 4])
+        self.assertEqual(recovered.get_file_info()['total_blocks'], 5)
+        self.assertEqual(recovered.retrieve_block_data(2), "bloque 2".encode() * 10)
+
+        # La recuperación compacta el journal en la instantánea
+        self.assertEqual(len(self._read_snapshot(recovered)['blocks']), 3)
+        self.assertEqual(os.path.getsize(recovered.journal_file), 0)
+
+    def test_recover_ignores_truncated_record(self):
+        """HU17: Un registro incompleto al final del journal se descarta"""
+        storage = TemporaryBlockStorage(self.temp_dir)
+        self._store(storage, 0)
+        self._store(storage, 1)
+        storage._close_journal()
+
+        with open(storage.journal_file, 'a') as f:
+            f.write('{"op":"block","block":{"id":2,')
+
+        recovered = TemporaryBlockStorage.recover(self.temp_dir)
+        self.assertEqual(recovered.get_block_count(), 2)
+
+    def test_recover_without_metadata(self):
+        """HU17: Recuperar un directorio sin metadatos falla"""
+        with self.assertRaises(FileNotFoundError):
+            TemporaryBlockStorage.recover(self.temp_dir)
+
+    def test_periodic_compaction(self):
+        """HU17: Al llegar al intervalo el journal se compacta en la instantánea"""
+        storage = TemporaryBlockStorage(self.temp_dir, compact_interval=4)
+        for block_id in range(6):
+            self._store(storage, block_id)
+
+        self.assertEqual(len(self._read_snapshot(storage)['blocks']), 4)
+        with open(storage.journal_file, 'r') as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+        storage.compact()
+        self.assertEqual(len(self._read_snapshot(storage)['blocks']), 6)
+
+    def test_compaction_interval_grows_with_snapshot(self):
+        """HU17: Las compactaciones son logarítmicas en la cantidad de bloques"""
+        storage = TemporaryBlockStorage(self.temp_dir, compact_interval=4)
+        with mock.patch.object(storage, '_save_metadata', wraps=storage._save_metadata) as save:
+            for block_id in range(100):
+                self._store(storage, block_id)
+        # Se compacta con 4, 8, 16, 32 y 64 bloques
+        self.assertEqual(save.call_count, 5)
+        self.assertEqual(len(self._read_snapshot(storage)['blocks']), 64)
+        self.assertEqual(TemporaryBlockStorage.recover(self.temp_dir).get_block_count(), 100)
+
+    def test_sync_policies(self):
+        """HU17: La política de sincronización controla las llamadas a fsync"""
+        with self.assertRaises(ValueError):
+            TemporaryBlockStorage(self.temp_dir, sync_policy="siempre")
+
+        storage = TemporaryBlockStorage(self.temp_dir, sync_policy=JournalSyncPolicy.ALWAYS)
+        with mock.patch('compression.temporary_storage.os.fsync') as fsync:
+            self._store(storage, 0)
+            self._store(storage, 1)
+        self.assertEqual(fsync.call_count, 2)
+
+        storage = TemporaryBlockStorage(tempfile.mkdtemp(dir=self.temp_dir),
+                                        sync_policy=JournalSyncPolicy.BATCH, sync_interval=3)
+        with mock.patch('compression.temporary_storage.os.fsync') as fsync:
+            for block_id in range(7):
+                self._store(storage, block_id)
+        self.assertEqual(fsync.call_count, 2)
+
+    def test_concurrent_stores(self):
+        """HU17: Varios hilos pueden registrar bloques a la vez"""
+        storage = TemporaryBlockStorage(self.temp_dir, compact_interval=25)
+
+        def worker(start):
+            for block_id in range(start, 100, 4):
+                self._store(storage, block_id)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(storage.get_block_count(), 100)
+        recovered = TemporaryBlockStorage.recover(self.temp_dir)
+        self.assertEqual(recovered.get_block_count(), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
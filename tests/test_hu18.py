@@ -0,0 +1,143 @@
+"""
+Pruebas unitarias para HU18: Checksums de bloque intercambiables y verificados en paralelo
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import zlib
+import hashlib
+import shutil
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compression.checksums import ChecksumAlgorithm
+from compression.block_manager import FileBlockManager
+from compression.executor_backend import ExecutorBackend
+from compression.parallel_compressor import ParallelCompressor
+from compression.pz_format import PzArchive
+from compression.temporary_storage import TemporaryBlockStorage
+
+
+class TestHU18ChecksumAlgorithm(unittest.TestCase):
+    """Pruebas de los algoritmos de checksum"""
+
+    def test_known_values(self):
+        """HU18: Cada algoritmo coincide con su implementación de referencia"""
+        data = b"datos de prueba" * 100
+        self.assertEqual(ChecksumAlgorithm.compute(data), zlib.crc32(data))
+        self.assertEqual(ChecksumAlgorithm.compute(data, ChecksumAlgorithm.ADLER32), zlib.adler32(data))
+        self.assertEqual(ChecksumAlgorithm.compute(data, ChecksumAlgorithm.SHA256),
+                         int(hashlib.sha256(data).hexdigest(), 16))
+
+    def test_verify(self):
+        """HU18: verify acepta checksums ausentes y rechaza los incorrectos"""
+        data = b"abc"
+        self.assertTrue(ChecksumAlgorithm.verify(data, None))
+        self.assertTrue(ChecksumAlgorithm.verify(data, zlib.crc32(data)))
+        self.assertFalse(ChecksumAlgorithm.verify(data, zlib.crc32(data) ^ 1))
+
+    def test_invalid_algorithm(self):
+        """HU18: Un algoritmo desconocido es rechazado"""
+        with self.assertRaises(ValueError):
+            ChecksumAlgorithm.validate("md5")
+        with self.assertRaises(ValueError):
+            ParallelCompressor().set_checksum_algorithm("md5")
+
+
+class TestHU18ArchiveChecksums(unittest.TestCase):
+    """Pruebas de checksums guardados en el .pz y verificados al descomprimir"""
+
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.test_file = os.path.join(self.temp_dir, "test_file.bin")
+        self.compressed_file = os.path.join(self.temp_dir, "test_file.pz")
+        self.decompressed_file = os.path.join(self.temp_dir, "test_file_out.bin")
+
+        self.test_content = b"".join(f"registro {i:06d};".encode() for i in range(20000))
+        with open(self.test_file, 'wb') as f:
+            f.write(self.test_content)
+
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _compress(self, algorithm, **options):
+        compressor = ParallelCompressor(block_size=64 * 1024)
+        compressor.set_checksum_algorithm(algorithm)
+        if options.get('streaming'):
+            compressor.set_streaming_mode(True)
+        if options.get('processes'):
+            compressor.set_executor_backend(ExecutorBackend.PROCESSES)
+        self.assertTrue(compressor.compress_file_with_threads(self.test_file, self.compressed_file, 3))
+
+    def _decompress(self, **options):
+        decompressor = ParallelCompressor()
+        if options.get('streaming'):
+            decompressor.set_streaming_mode(True)
+        if options.get('processes'):
+            decompressor.set_executor_backend(ExecutorBackend.PROCESSES)
+        return decompressor.decompress_file_with_threads(self.compressed_file, self.decompressed_file, 3)
+
+    def _corrupt_block(self, block_id):
+        """Reemplaza un bloque por otro stream zlib válido de igual tamaño original"""
+        with PzArchive(self.compressed_file) as archive:
+            target = archive.blocks[block_id]
+
+        fake = zlib.compress(b"X" * target['original_size'])
+        with open(self.compressed_file, 'r+b') as f:
+            f.seek(target['data_offset'])
+            f.write(fake + b"\x00" * (target['compressed_size'] - len(fake)))
+
+    def test_checksums_stored_per_algorithm(self):
+        """HU18: El índice guarda el checksum completo con el algoritmo elegido"""
+        for algorithm in (ChecksumAlgorithm.CRC32, ChecksumAlgorithm.ADLER32, ChecksumAlgorithm.SHA256):
+            for options in ({}, {'streaming': True}):
+                with self.subTest(algorithm=algorithm, **options):
+                    self._compress(algorithm, **options)
+
+                    with PzArchive(self.compressed_file) as archive:
+                        self.assertEqual(archive.header['checksum_algorithm'], algorithm)
+                        for block in archive.blocks:
+                            start = block['original_offset']
+                            chunk = self.test_content[start:start + block['original_size']]
+                            self.assertEqual(block['checksum'], ChecksumAlgorithm.compute(chunk, algorithm))
+                        self.assertEqual(archive.read_range(0, archive.original_size), self.test_content)
+
+                    self.assertTrue(self._decompress(**options))
+                    with open(self.decompressed_file, 'rb') as f:
+                        self.assertEqual(f.read(), self.test_content)
+
+    def test_checksum_computed_in_worker_process(self):
+        """HU18: Con procesos el checksum SHA-256 viaja desde el trabajador"""
+        self._compress(ChecksumAlgorithm.SHA256, processes=True)
+        with PzArchive(self.compressed_file) as archive:
+            chunk = self.test_content[:64 * 1024]
+            self.assertEqual(archive.blocks[0]['checksum'], int(hashlib.sha256(chunk).hexdigest(), 16))
+
+    def test_corruption_detected_by_every_decompression_path(self):
+        """HU18: Los trabajadores de descompresión verifican el checksum"""
+        for options in ({}, {'streaming': True}, {'processes': True}):
+            with self.subTest(**options):
+                self._compress(ChecksumAlgorithm.ADLER32)
+                self._corrupt_block(1)
+                self.assertFalse(self._decompress(**options))
+
+    def test_blocks_carry_no_checksum_before_workers(self):
+        """HU18: La división en bloques no calcula checksums en el hilo lector"""
+        blocks = FileBlockManager(64 * 1024).split_file_into_blocks(self.test_file)
+        self.assertTrue(all(block['checksum'] is None for block in blocks))
+
+    def test_temporary_storage_uses_fast_checksum(self):
+        """HU18: El almacenamiento temporal usa CRC32 en lugar de SHA-256"""
+        storage = TemporaryBlockStorage(os.path.join(self.temp_dir, "tmp"))
+        storage.store_compressed_block(0, b"comprimido", 100, 10.0, 0, 123)
+        self.assertEqual(storage.get_stored_blocks()[0]['compressed_checksum'], zlib.crc32(b"comprimido"))
+        self.assertTrue(storage.validate_blocks_integrity()[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
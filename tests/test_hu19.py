@@ -0,0 +1,110 @@
+"""
+Pruebas unitarias para HU19: Suite de benchmarks de throughput y escalabilidad
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import inspect
+import shutil
+
+# Agregar el directorio raíz y src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from benchmarks import bench_compressor
+from compression.parallel_compressor import ParallelCompressor
+
+
+class TestHU19Benchmarks(unittest.TestCase):
+    """Pruebas para benchmarks/bench_compressor.py"""
+
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_generate_input(self):
+        """HU19: Cada tipo de entrada tiene el tamaño pedido y es reproducible"""
+        for kind in bench_compressor.INPUT_KINDS:
+            with self.subTest(kind=kind):
+                data = bench_compressor.generate_input(kind, 300000)
+                self.assertEqual(len(data), 300000)
+                self.assertEqual(data, bench_compressor.generate_input(kind, 300000))
+
+        self.assertEqual(bench_compressor.generate_input('zeros', 10), bytes(10))
+        with self.assertRaises(ValueError):
+            bench_compressor.generate_input('imagen', 10)
+
+    def test_parse_size(self):
+        """HU19: Los tamaños de bloque aceptan sufijos K y M"""
+        self.assertEqual(bench_compressor.parse_size("64K"), 64 * 1024)
+        self.assertEqual(bench_compressor.parse_size("1M"), 1024 * 1024)
+        self.assertEqual(bench_compressor.parse_size("4096"), 4096)
+
+    def test_run_suite_reports_metrics(self):
+        """HU19: Cada caso reporta MB/s, speedup, RSS y tiempos por fase"""
+        args = bench_compressor.parse_args([
+            '--size-mb', '0.5', '--threads', '1,2', '--block-sizes', '64K',
+            '--codecs', 'zlib', '--inputs', 'text,zeros', '--no-isolate'
+        ])
+        report = bench_compressor.run_suite(args, progress=lambda message: None)
+
+        results = report['results']
+        self.assertEqual(len(results), 2 * 2 * 2)  # entradas x hilos x operaciones
+        for result in results:
+            self.assertGreater(result['mb_per_s'], 0)
+            self.assertIsNotNone(result['speedup'])
+            self.assertIn('peak_rss_bytes', result)
+            self.assertTrue(result['phase_times'])
+            if result['threads'] == 1:
+                self.assertEqual(result['speedup'], 1.0)
+
+        compress = [r for r in results if r['operation'] == 'compress' and r['input'] == 'zeros'][0]
+        self.assertLess(compress['compression_ratio'], 5)
+        self.assertEqual(report['meta']['input_size'], args.size)
+
+    def test_compare_results_flags_regressions(self):
+        """HU19: Una caída de throughput mayor a la tolerancia es una regresión"""
+        case = {'operation': 'compress', 'input': 'text', 'codec': 'zlib', 'block_size': 65536,
+                'threads': 2, 'backend': 'threads', 'mode': 'direct'}
+        baseline = {'results': [dict(case, mb_per_s=100.0)]}
+
+        rows = bench_compressor.compare_results({'results': [dict(case, mb_per_s=95.0)]}, baseline, 10)
+        self.assertFalse(rows[0]['regression'])
+
+        rows = bench_compressor.compare_results({'results': [dict(case, mb_per_s=80.0)]}, baseline, 10)
+        self.assertTrue(rows[0]['regression'])
+        self.assertAlmostEqual(rows[0]['change_pct'], -20.0)
+
+        other = dict(case, threads=4, mb_per_s=1.0)
+        self.assertEqual(bench_compressor.compare_results({'results': [other]}, baseline), [])
+
+    def test_phase_times_in_statistics(self):
+        """HU19: El compresor acumula el tiempo de cada fase"""
+        source = os.path.join(self.temp_dir, "entrada.bin")
+        compressed = os.path.join(self.temp_dir, "entrada.pz")
+        restored = os.path.join(self.temp_dir, "salida.bin")
+        with open(source, 'wb') as f:
+            f.write(bench_compressor.generate_input('mixed', 512 * 1024))
+
+        compressor = ParallelCompressor(block_size=64 * 1024)
+        self.assertTrue(compressor.compress_file_with_threads(source, compressed, 2))
+        self.assertEqual(set(compressor.get_compression_statistics()['phase_times']),
+                         {'split', 'compress', 'finalize'})
+
+        self.assertTrue(compressor.decompress_file_with_threads(compressed, restored, 2))
+        self.assertIn('write', compressor.get_decompression_statistics()['phase_times'])
+
+    def test_no_artificial_sleep_in_workers(self):
+        """HU19: Los trabajadores de compresión no contienen pausas artificiales"""
+        source = inspect.getsource(ParallelCompressor._compress_thread_worker_improved)
+        self.assertNotIn('time.sleep', source)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+"""
+Pruebas unitarias para HU20: CLI sin GUI y paquete de compresión sin tkinter
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import io
+import json
+import shutil
+import subprocess
+from contextlib import redirect_stdout, redirect_stderr
+
+# Agregar el directorio src al path
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_DIR)
+
+from compression import cli
+from compression.parallel_compressor import ParallelCompressor
+from compression.pz_format import PzArchive
+
+
+class TestHU20HeadlessImport(unittest.TestCase):
+    """Pruebas de importación sin la GUI"""
+
+    def test_compression_package_does_not_load_gui(self):
+        """HU20: Importar el compresor y la CLI no carga tkinter ni el paquete gui"""
+        code = (
+            "import sys\n"
+            "import compression.parallel_compressor, compression.cli\n"
+            "loaded = [m for m in sys.modules if m.split('.')[0] in ('tkinter', '_tkinter', 'gui')]\n"
+            "print(loaded)\n"
+        )
+        env = dict(os.environ, PYTHONPATH=SRC_DIR)
+        result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "[]")
+
+    def test_error_types_shared_with_gui(self):
+        """HU20: gui.error_handler reexporta los tipos de error del paquete de compresión"""
+        from compression import errors
+        try:
+            from gui import error_handler
+        except ImportError:
+            self.skipTest("tkinter no disponible")
+        self.assertIs(error_handler.ErrorType, errors.ErrorType)
+        self.assertIs(error_handler.ErrorSeverity, errors.ErrorSeverity)
+
+
+class TestHU20CommandLine(unittest.TestCase):
+    """Pruebas de los subcomandos de la CLI"""
+
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.test_file = os.path.join(self.temp_dir, "datos.bin")
+        self.test_content = b"".join(f"linea {i % 500} de prueba\n".encode() for i in range(40000))
+        with open(self.test_file, 'wb') as f:
+            f.write(self.test_content)
+
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _run(self, *argv):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            code = cli.main(list(argv))
+        return code, stdout.getvalue(), stderr.getvalue()
+
+    def test_compress_decompress_roundtrip(self):
+        """HU20: compress y decompress con nombres de salida por defecto"""
+        code, out, _ = self._run("compress", self.test_file, "-t", "3", "-b", "64K", "-l", "9")
+        self.assertEqual(code, 0)
+        compressed = self.test_file + ".pz"
+        self.assertIn(compressed, out)
+
+        with PzArchive(compressed) as archive:
+            self.assertEqual(archive.blocks[0]['original_size'], 64 * 1024)
+
+        os.remove(self.test_file)
+        code, _, _ = self._run("decompress", compressed, "-q")
+        self.assertEqual(code, 0)
+        with open(self.test_file, 'rb') as f:
+            self.assertEqual(f.read(), self.test_content)
+
+    def test_refuses_to_overwrite_without_force(self):
+        """HU20: La salida existente solo se sobrescribe con --force"""
+        output = os.path.join(self.temp_dir, "salida.pz")
+        with open(output, 'wb') as f:
+            f.write(b"existente")
+
+        code, _, err = self._run("compress", self.test_file, "-o", output)
+        self.assertEqual(code, 1)
+        self.assertIn("--force", err)
+
+        code, _, _ = self._run("compress", self.test_file, "-o", output, "--force", "-q")
+        self.assertEqual(code, 0)
+
+    def test_codec_level_and_checksum_options(self):
+        """HU20: El códec, el nivel y el checksum se reflejan en el archivo"""
+        fast = os.path.join(self.temp_dir, "rapido.pz")
+        stored = os.path.join(self.temp_dir, "nivel0.pz")
+        rle = os.path.join(self.temp_dir, "rle.pz")
+        self.assertEqual(self._run("compress", self.test_file, "-o", fast, "-l", "1", "--checksum", "sha256", "-q")[0], 0)
+        self.assertEqual(self._run("compress", self.test_file, "-o", stored, "-l", "0", "-q")[0], 0)
+        self.assertEqual(self._run("compress", self.test_file, "-o", rle, "-c", "rle", "-q")[0], 0)
+
+        self.assertGreater(os.path.getsize(stored), len(self.test_content))
+        self.assertLess(os.path.getsize(fast), len(self.test_content))
+
+        info = cli.describe_archive(fast)
+        self.assertEqual(info['checksum_algorithm'], "sha256")
+        self.assertEqual(cli.describe_archive(rle)['compression_algorithm'], "rle")
+
+    def test_unwritable_output_reports_error(self):
+        """HU20: Una salida no escribible termina con código 1 y un mensaje, sin traza"""
+        code, _, err = self._run("compress", self.test_file, "-o", "/proc/nope/x.pz", "-q")
+        self.assertEqual(code, 1)
+        self.assertIn("Error:", err)
+
+        compressed = os.path.join(self.temp_dir, "datos.pz")
+        self.assertEqual(self._run("compress", self.test_file, "-o", compressed, "-q")[0], 0)
+        code, _, err = self._run("decompress", compressed, "-o", "/proc/nope/x.bin", "-q")
+        self.assertEqual(code, 1)
+        self.assertIn("Error:", err)
+
+    def test_invalid_arguments(self):
+        """HU20: Argumentos inválidos terminan con código 2"""
+        self.assertEqual(self._run("compress", self.test_file, "-l", "12", "-f")[0], 2)
+        self.assertEqual(self._run("compress", self.test_file, "-b", "1K", "-f")[0], 2)
+        with self.assertRaises(SystemExit) as context:
+            self._run("compress", self.test_file, "-c", "lz4")
+        self.assertEqual(context.exception.code, 2)
+        with self.assertRaises(ValueError):
+            ParallelCompressor().set_compression_level(10)
+
+    def test_verify_detects_corruption(self):
+        """HU20: verify descomprime en paralelo y reporta bloques corruptos"""
+        compressed = os.path.join(self.temp_dir, "datos.pz")
+        self._run("compress", self.test_file, "-o", compressed, "-b", "64K", "-q")
+        self.assertEqual(self._run("verify", compressed)[0], 0)
+
+        with PzArchive(compressed) as archive:
+            target = archive.blocks[2]
+        with open(compressed, 'r+b') as f:
+            f.seek(target['data_offset'] + target['compressed_size'] // 2)
+            f.write(b"\xff" * 16)
+
+        code, _, err = self._run("verify", compressed, "-t", "4")
+        self.assertEqual(code, 1)
+        self.assertIn("Bloque 2", err)
+
+    def test_inspect_json(self):
+        """HU20: inspect muestra encabezado e índice en JSON"""
+        compressed = os.path.join(self.temp_dir, "datos.pz")
+        self._run("compress", self.test_file, "-o", compressed, "-b", "64K", "-q")
+
+        code, out, _ = self._run("inspect", compressed, "--json", "--blocks")
+        self.assertEqual(code, 0)
+        info = json.loads(out)
+        self.assertEqual(info['original_size'], len(self.test_content))
+        self.assertEqual(info['block_count'], len(info['blocks']))
+        self.assertEqual(info['original_filename'], "datos.bin")
+
+        self.assertEqual(self._run("inspect", self.test_file)[0], 1)
+
+    def test_module_entry_point(self):
+        """HU20: python -m src.compression funciona desde la raíz del proyecto"""
+        root = os.path.join(SRC_DIR, '..')
+        result = subprocess.run([sys.executable, "-m", "src.compression", "compress", self.test_file,
+                                 "-q", "-t", "2"], cwd=root, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertTrue(os.path.exists(self.test_file + ".pz"))
+
+
+if __name__ == '__main__':
+    unittest.main()
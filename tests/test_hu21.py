@@ -0,0 +1,172 @@
+"""
+Pruebas unitarias para HU21: Registro de códecs (bz2, lzma, gzip) con ID por bloque
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import bz2
+import lzma
+import zlib
+import shutil
+from unittest import mock
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compression.codecs import (
+    Codec, LEGACY_CODEC_ID, available_codecs, get_codec, get_codec_by_id, register_codec
+)
+from compression.checksums import ChecksumAlgorithm
+from compression.executor_backend import ExecutorBackend, decompress_payload
+from compression.parallel_compressor import ParallelCompressor
+from compression.pz_format import FORMAT_V2, PzArchive, PzBlockWriter
+from compression.temporary_storage import CompressionAlgorithm
+
+
+class TestHU21CodecRegistry(unittest.TestCase):
+    """Pruebas del registro de códecs"""
+
+    def test_stdlib_codecs_registered(self):
+        """HU21: zlib, rle, bz2, lzma y gzip están registrados con IDs únicos"""
+        self.assertEqual(available_codecs(), ["zlib", "rle", "bz2", "lzma", "gzip"])
+        data = b"registro de prueba " * 2000
+        for name in available_codecs():
+            with self.subTest(codec=name):
+                codec = get_codec(name)
+                self.assertIs(get_codec_by_id(codec.codec_id), codec)
+                self.assertEqual(codec.decompress(codec.compress(data)), data)
+                self.assertEqual(CompressionAlgorithm.decompress(CompressionAlgorithm.compress(data, name), name), data)
+
+    def test_levels(self):
+        """HU21: Cada códec usa su nivel por defecto y ajusta niveles fuera de rango"""
+        data = bytes(range(256)) * 400
+        self.assertEqual(get_codec("bz2").resolve_level(0), 1)
+        self.assertEqual(get_codec("lzma").resolve_level(None), 6)
+        self.assertEqual(get_codec("rle").resolve_level(9), 0)
+        self.assertEqual(get_codec("bz2").compress(data, 3), bz2.compress(data, 3))
+        self.assertEqual(get_codec("lzma").decompress(get_codec("lzma").compress(data, 1)), data)
+        self.assertEqual(get_codec("zlib").compress(data), zlib.compress(data, 6))
+        # gzip no guarda la hora: la salida es reproducible
+        self.assertEqual(get_codec("gzip").compress(data, 9), get_codec("gzip").compress(data, 9))
+
+    def test_registration_errors(self):
+        """HU21: Nombres o IDs repetidos y códecs desconocidos son rechazados"""
+        class Duplicate(Codec):
+            name = "zlib"
+            codec_id = 200
+
+        class SameId(Codec):
+            name = "otro"
+            codec_id = 1
+
+        with self.assertRaises(ValueError):
+            register_codec(Duplicate())
+        with self.assertRaises(ValueError):
+            register_codec(SameId())
+        with self.assertRaises(ValueError):
+            get_codec("lz4")
+        with self.assertRaises(ValueError):
+            get_codec_by_id(250)
+        with self.assertRaises(ValueError):
+            ParallelCompressor().set_compression_algorithm("lz4")
+
+
+class TestHU21PerBlockCodecs(unittest.TestCase):
+    """Pruebas del ID de códec guardado en el índice del .pz"""
+
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.test_file = os.path.join(self.temp_dir, "datos.txt")
+        self.compressed_file = os.path.join(self.temp_dir, "datos.pz")
+        self.decompressed_file = os.path.join(self.temp_dir, "datos_out.txt")
+
+        self.test_content = b"".join(f"linea {i % 700} valor={i * 7}\n".encode() for i in range(30000))
+        with open(self.test_file, 'wb') as f:
+            f.write(self.test_content)
+
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _roundtrip(self, codec, **options):
+        compressor = ParallelCompressor(block_size=64 * 1024)
+        compressor.set_compression_algorithm(codec)
+        compressor.set_compression_level(options.get('level'))
+        compressor.set_streaming_mode(options.get('streaming', False))
+        compressor.set_direct_output(not options.get('temp', False))
+        if options.get('processes'):
+            compressor.set_executor_backend(ExecutorBackend.PROCESSES)
+        self.assertTrue(compressor.compress_file_with_threads(self.test_file, self.compressed_file, 3))
+        self.assertTrue(compressor.decompress_file_with_threads(self.compressed_file, self.decompressed_file, 3))
+        with open(self.decompressed_file, 'rb') as f:
+            self.assertEqual(f.read(), self.test_content)
+
+    def test_every_codec_on_every_path(self):
+        """HU21: Cada códec funciona en escritura directa, streaming, temporal y procesos"""
+        paths = ({}, {'streaming': True}, {'temp': True}, {'processes': True})
+        for codec in ("bz2", "lzma", "gzip"):
+            for options in paths:
+                with self.subTest(codec=codec, **options):
+                    self._roundtrip(codec, **options)
+                    with PzArchive(self.compressed_file) as archive:
+                        self.assertEqual(archive.header['compression_algorithm'], codec)
+                        self.assertTrue(all(block['codec_id'] == get_codec(codec).codec_id
+                                            for block in archive.blocks))
+
+    def test_decompression_dispatches_without_trial(self):
+        """HU21: Los bloques bz2 no se intentan descomprimir con zlib"""
+        self._roundtrip("bz2")
+        with mock.patch('compression.executor_backend.zlib.decompress',
+                        side_effect=AssertionError("zlib no debe usarse")):
+            decompressor = ParallelCompressor()
+            self.assertTrue(decompressor.decompress_file_with_threads(self.compressed_file, self.decompressed_file, 2))
+
+    def test_mixed_codecs_in_one_archive(self):
+        """HU21: Distintos bloques de un archivo pueden usar distintos códecs"""
+        chunks = [self.test_content[i:i + 65536] for i in range(0, len(self.test_content), 65536)]
+        names = available_codecs()
+        header = {
+            'format': FORMAT_V2, 'original_filename': "datos.txt", 'original_size': len(self.test_content),
+            'block_count': len(chunks), 'compression_algorithm': "zlib",
+            'checksum_algorithm': ChecksumAlgorithm.CRC32
+        }
+
+        writer = PzBlockWriter(self.compressed_file, header)
+        for block_id, chunk in enumerate(chunks):
+            codec = get_codec(names[block_id % len(names)])
+            writer.write_block(block_id, block_id * 65536, len(chunk), codec.compress(chunk),
+                               ChecksumAlgorithm.compute(chunk), codec_id=codec.codec_id)
+        writer.close()
+
+        with PzArchive(self.compressed_file) as archive:
+            self.assertEqual({block['codec_id'] for block in archive.blocks}, {1, 2, 3, 4, 5})
+            self.assertEqual(archive.read_range(0, archive.original_size), self.test_content)
+
+        for options in ({}, {'streaming': True}):
+            decompressor = ParallelCompressor()
+            decompressor.set_streaming_mode(options.get('streaming', False))
+            self.assertTrue(decompressor.decompress_file_with_threads(self.compressed_file, self.decompressed_file, 3))
+            with open(self.decompressed_file, 'rb') as f:
+                self.assertEqual(f.read(), self.test_content)
+
+    def test_legacy_blocks_still_guess_codec(self):
+        """HU21: Un bloque sin ID de códec (archivo anterior) se sigue deduciendo"""
+        data = b"abc" * 1000
+        self.assertEqual(decompress_payload(zlib.compress(data), len(data), LEGACY_CODEC_ID), data)
+        self.assertEqual(decompress_payload(CompressionAlgorithm.compress(data, "rle"), len(data)), data)
+        self.assertEqual(decompress_payload(lzma.compress(data), len(data), get_codec("lzma").codec_id), data)
+
+    def test_level_changes_output(self):
+        """HU21: El nivel configurado llega a los trabajadores"""
+        sizes = {}
+        for level in (0, 9):
+            self._roundtrip("zlib", level=level)
+            sizes[level] = os.path.getsize(self.compressed_file)
+        self.assertGreater(sizes[0], sizes[9])
+
+
+if __name__ == '__main__':
+    unittest.main()
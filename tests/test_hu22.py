@@ -0,0 +1,145 @@
+"""
+Pruebas unitarias para HU22: Selección adaptativa de códec y nivel por bloque
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import random
+import shutil
+import zlib
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compression.adaptive import AdaptiveCodecSelector, BlockStrategy
+from compression.codecs import get_codec
+from compression.executor_backend import ExecutorBackend
+from compression.parallel_compressor import ParallelCompressor
+from compression.pz_format import PzArchive
+
+
+BLOCK = 64 * 1024
+
+
+def text_block(seed=0):
+    rng = random.Random(seed)
+    words = [f"palabra{i}" for i in range(300)]
+    return ' '.join(rng.choice(words) for _ in range(BLOCK // 5)).encode()[:BLOCK]
+
+
+def random_block(seed=0):
+    return random.Random(seed).randbytes(BLOCK)
+
+
+def half_random_block(seed=0):
+    rng = random.Random(seed)
+    return bytes(b if i % 3 else 0 for i, b in enumerate(rng.randbytes(BLOCK)))
+
+
+class TestHU22Selector(unittest.TestCase):
+    """Pruebas de AdaptiveCodecSelector"""
+
+    def test_strategies(self):
+        """HU22: Cada tipo de contenido recibe la estrategia esperada"""
+        selector = AdaptiveCodecSelector(use_rle=True)
+        self.assertEqual(selector.choose(random_block())['strategy'], BlockStrategy.STORE)
+        self.assertEqual(selector.choose(bytes(BLOCK))['strategy'], BlockStrategy.RLE)
+        self.assertEqual(selector.choose(half_random_block())['strategy'], BlockStrategy.FAST)
+
+        decision = selector.choose(text_block())
+        self.assertEqual(decision['strategy'], BlockStrategy.HIGH)
+        self.assertEqual((decision['codec'], decision['level']), ("zlib", 9))
+
+    def test_levels_follow_configured_codec(self):
+        """HU22: Las estrategias fast y high usan el rango de niveles del códec"""
+        selector = AdaptiveCodecSelector(use_rle=False)
+        decision = selector.choose(bytes(BLOCK), "bz2")
+        self.assertEqual((decision['strategy'], decision['codec'], decision['level']), (BlockStrategy.HIGH, "bz2", 9))
+        decision = selector.choose(half_random_block(), "lzma")
+        self.assertEqual((decision['codec'], decision['level']), ("lzma", get_codec("lzma").resolve_level(1)))
+
+    def test_sample_spans_block(self):
+        """HU22: La muestra toma porciones del principio, el medio y el final"""
+        selector = AdaptiveCodecSelector()
+        data = bytes(range(256)) * (BLOCK // 256)
+        sample = selector.sample(data)
+        self.assertEqual(len(sample), selector.SAMPLE_SLICES * selector.SLICE_SIZE)
+        self.assertEqual(sample[-selector.SLICE_SIZE:], data[-selector.SLICE_SIZE:])
+        self.assertEqual(selector.sample(b"corto"), b"corto")
+
+    def test_invalid_thresholds(self):
+        """HU22: Los umbrales deben estar ordenados"""
+        with self.assertRaises(ValueError):
+            AdaptiveCodecSelector(store_threshold=30.0, high_threshold=40.0)
+
+
+class TestHU22AdaptiveCompression(unittest.TestCase):
+    """Pruebas del modo adaptativo en ParallelCompressor"""
+
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.test_file = os.path.join(self.temp_dir, "mixto.bin")
+        self.compressed_file = os.path.join(self.temp_dir, "mixto.pz")
+        self.decompressed_file = os.path.join(self.temp_dir, "mixto_out.bin")
+
+        # Bloques alineados: texto, aleatorio (ya comprimido), ceros, texto, aleatorio, ceros
+        self.test_content = b"".join([
+            text_block(1), random_block(2), bytes(BLOCK), text_block(3), random_block(4), bytes(BLOCK)
+        ])
+        with open(self.test_file, 'wb') as f:
+            f.write(self.test_content)
+
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _compress(self, **options):
+        compressor = ParallelCompressor(block_size=BLOCK)
+        compressor.set_adaptive_mode(True, AdaptiveCodecSelector(use_rle=True))
+        compressor.set_streaming_mode(options.get('streaming', False))
+        compressor.set_direct_output(not options.get('temp', False))
+        if options.get('processes'):
+            compressor.set_executor_backend(ExecutorBackend.PROCESSES)
+        self.assertTrue(compressor.compress_file_with_threads(self.test_file, self.compressed_file, 3))
+        return compressor.get_compression_statistics()['adaptive']
+
+    def test_decisions_in_statistics_and_archive(self):
+        """HU22: Las decisiones por bloque quedan en las estadísticas y en el índice"""
+        for options in ({}, {'streaming': True}, {'temp': True}, {'processes': True}):
+            with self.subTest(**options):
+                stats = self._compress(**options)
+                self.assertEqual(stats['decisions'], {'store': 2, 'fast': 0, 'high': 2, 'rle': 2})
+                self.assertEqual(stats['bytes']['store'], 2 * BLOCK)
+                self.assertGreater(stats['sampling_seconds'], 0)
+                self.assertGreater(stats['estimated_seconds_saved'], 0)
+
+                with PzArchive(self.compressed_file) as archive:
+                    stored = [block for block in archive.blocks if block['compressed_size'] == block['original_size']]
+                    self.assertEqual([block['id'] for block in stored], [1, 4])
+                    self.assertEqual(archive.blocks[2]['codec_id'], get_codec("rle").codec_id)
+                    self.assertEqual(archive.blocks[0]['codec_id'], get_codec("zlib").codec_id)
+
+                decompressor = ParallelCompressor()
+                self.assertTrue(decompressor.decompress_file_with_threads(self.compressed_file, self.decompressed_file, 3))
+                with open(self.decompressed_file, 'rb') as f:
+                    self.assertEqual(f.read(), self.test_content)
+
+    def test_high_level_used_for_compressible_blocks(self):
+        """HU22: Los bloques de texto se comprimen con el nivel máximo"""
+        self._compress()
+        with PzArchive(self.compressed_file) as archive:
+            block = archive.blocks[0]
+        self.assertEqual(block['compressed_size'], len(zlib.compress(text_block(1), 9)))
+
+    def test_disabled_by_default(self):
+        """HU22: Sin activar el modo adaptativo no hay estadísticas adaptativas"""
+        compressor = ParallelCompressor(block_size=BLOCK)
+        self.assertTrue(compressor.compress_file_with_threads(self.test_file, self.compressed_file, 2))
+        self.assertNotIn('adaptive', compressor.get_compression_statistics())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+"""
+Pruebas unitarias para HU23: Bloques guardados sin comprimir con flag explícito
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import random
+import zlib
+import shutil
+from unittest import mock
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compression.adaptive import AdaptiveCodecSelector, BlockStrategy
+from compression.checksums import ChecksumAlgorithm
+from compression.codecs import BLOCK_FLAG_STORED, LEGACY_CODEC_ID, get_codec
+from compression.executor_backend import ExecutorBackend, decompress_payload, encode_block
+from compression.parallel_compressor import ParallelCompressor
+from compression.pz_format import FORMAT_V2, PzArchive, PzBlockWriter
+
+
+class TestHU23EncodeBlock(unittest.TestCase):
+    """Pruebas de encode_block y decompress_payload"""
+
+    def test_incompressible_block_skips_compression(self):
+        """HU23: Un bloque aleatorio se detecta con la muestra y no se comprime completo"""
+        data = os.urandom(256 * 1024)
+        with mock.patch('compression.executor_backend.CompressionAlgorithm.compress',
+                        side_effect=AssertionError("no debe comprimirse")):
+            encoded = encode_block(data, "zlib", selector=AdaptiveCodecSelector())
+        self.assertTrue(encoded['stored'])
+        self.assertEqual(encoded['data'], data)
+        self.assertEqual(encoded['compression_ratio'], 100.0)
+        self.assertIsNone(encoded['decision'])
+
+    def test_compressible_block_is_compressed(self):
+        """HU23: Un bloque compresible pasa la muestra y se comprime"""
+        data = b"texto repetido " * 10000
+        encoded = encode_block(data, "zlib", selector=AdaptiveCodecSelector())
+        self.assertFalse(encoded['stored'])
+        self.assertEqual(zlib.decompress(encoded['data']), data)
+
+    def test_block_that_does_not_shrink_is_stored(self):
+        """HU23: Sin selector, un bloque que no se reduce se guarda sin comprimir"""
+        data = os.urandom(64 * 1024)
+        encoded = encode_block(data, "zlib")
+        self.assertTrue(encoded['stored'])
+        self.assertEqual(encoded['data'], data)
+
+    def test_stored_flag_passes_data_through(self):
+        """HU23: Con BLOCK_FLAG_STORED los datos se devuelven sin copia ni códec"""
+        data = memoryview(os.urandom(1024))
+        with mock.patch('compression.executor_backend.get_codec_by_id',
+                        side_effect=AssertionError("no debe usarse el códec")):
+            self.assertIs(decompress_payload(data, len(data), get_codec("zlib").codec_id, BLOCK_FLAG_STORED), data)
+
+    def test_compressed_block_with_original_size(self):
+        """HU23: Un bloque comprimido que ocupa lo mismo que el original ya no se confunde"""
+        payload = zlib.compress(os.urandom(4096), 1)
+        original = zlib.decompress(payload)
+        # Con el códec registrado y sin flag, el tamaño no decide
+        self.assertEqual(decompress_payload(payload, len(payload), get_codec("zlib").codec_id), original)
+        # Los bloques de archivos anteriores conservan la deducción por tamaño
+        self.assertEqual(decompress_payload(payload, len(payload), LEGACY_CODEC_ID), payload)
+
+
+class TestHU23StoredBlocks(unittest.TestCase):
+    """Pruebas del flag de bloque guardado en archivos .pz"""
+
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.test_file = os.path.join(self.temp_dir, "mixto.bin")
+        self.compressed_file = os.path.join(self.temp_dir, "mixto.pz")
+        self.decompressed_file = os.path.join(self.temp_dir, "mixto_out.bin")
+
+        # Bloques de 64KB alternando texto y datos aleatorios
+        text = b"".join(f"registro {i} estado=ok\n".encode() for i in range(4000))[:65536]
+        self.test_content = b"".join(text if i % 2 == 0 else os.urandom(65536) for i in range(8))
+        with open(self.test_file, 'wb') as f:
+            f.write(self.test_content)
+
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _compress(self, **options):
+        compressor = ParallelCompressor(block_size=64 * 1024)
+        compressor.set_streaming_mode(options.get('streaming', False))
+        compressor.set_direct_output(not options.get('temp', False))
+        compressor.set_adaptive_mode(options.get('adaptive', False))
+        if options.get('processes'):
+            compressor.set_executor_backend(ExecutorBackend.PROCESSES)
+        self.assertTrue(compressor.compress_file_with_threads(self.test_file, self.compressed_file, 3))
+        return compressor
+
+    def _assert_decompresses(self, **options):
+        decompressor = ParallelCompressor()
+        decompressor.set_streaming_mode(options.get('streaming', False))
+        if options.get('processes'):
+            decompressor.set_executor_backend(ExecutorBackend.PROCESSES)
+        self.assertTrue(decompressor.decompress_file_with_threads(self.compressed_file, self.decompressed_file, 3))
+        with open(self.decompressed_file, 'rb') as f:
+            self.assertEqual(f.read(), self.test_content)
+
+    def test_flag_on_every_path(self):
+        """HU23: Los bloques aleatorios llevan el flag en todos los caminos de escritura"""
+        paths = ({}, {'streaming': True}, {'temp': True}, {'processes': True}, {'adaptive': True})
+        for options in paths:
+            with self.subTest(**options):
+                compressor = self._compress(**options)
+                self.assertEqual(compressor.compression_stats['stored_blocks'], 4)
+                with PzArchive(self.compressed_file) as archive:
+                    stored = [bool(block['flags'] & BLOCK_FLAG_STORED) for block in archive.blocks]
+                    self.assertEqual(stored, [i % 2 == 1 for i in range(8)])
+                    self.assertEqual(archive.read_range(0, archive.original_size), self.test_content)
+                self._assert_decompresses(**options)
+
+    def test_stored_blocks_skip_full_compression(self):
+        """HU23: Los bloques incompresibles no pasan por compresión y verificación completas"""
+        calls = []
+        original_compress = get_codec("zlib").__class__.compress
+
+        def counting_compress(codec, data, level=None):
+            calls.append(len(data))
+            return original_compress(codec, data, level)
+
+        with mock.patch.object(get_codec("zlib").__class__, 'compress', counting_compress):
+            self._compress()
+        # Solo los 4 bloques de texto se comprimen completos; el resto son muestras
+        self.assertEqual(sum(1 for size in calls if size == 65536), 4)
+
+    def test_detection_can_be_disabled(self):
+        """HU23: Sin detección previa, los bloques que no se reducen igual llevan el flag"""
+        compressor = ParallelCompressor(block_size=64 * 1024)
+        compressor.set_incompressible_detection(False)
+        self.assertTrue(compressor.compress_file_with_threads(self.test_file, self.compressed_file, 2))
+        self.assertEqual(compressor.compression_stats['stored_blocks'], 4)
+        self._assert_decompresses()
+
+    def test_compressed_block_equal_to_original_size(self):
+        """HU23: Un bloque comprimido del mismo tamaño que el original se descomprime"""
+        # Ceros seguidos de datos aleatorios: buscar la longitud en que ambos tamaños coinciden
+        tail = random.Random(23).randbytes(1000)
+        for zeros in range(1, 200):
+            original = b"\0" * zeros + tail
+            payload = zlib.compress(original, 9)
+            if len(payload) == len(original):
+                break
+        else:
+            self.fail("No se encontró un bloque con ambos tamaños iguales")
+
+        header = {
+            'format': FORMAT_V2, 'original_filename': "igual.bin", 'original_size': len(original),
+            'block_count': 1, 'compression_algorithm': "zlib", 'checksum_algorithm': ChecksumAlgorithm.CRC32
+        }
+        writer = PzBlockWriter(self.compressed_file, header)
+        writer.write_block(0, 0, len(original), payload, ChecksumAlgorithm.compute(original),
+                           codec_id=get_codec("zlib").codec_id)
+        writer.close()
+
+        with PzArchive(self.compressed_file) as archive:
+            self.assertEqual(archive.read_range(0, len(original)), original)
+        decompressor = ParallelCompressor()
+        self.assertTrue(decompressor.decompress_file_with_threads(self.compressed_file, self.decompressed_file, 1))
+        with open(self.decompressed_file, 'rb') as f:
+            self.assertEqual(f.read(), original)
+
+    def test_adaptive_stats_match_flags(self):
+        """HU22/HU23: Las decisiones store del modo adaptativo coinciden con los flags"""
+        compressor = self._compress(adaptive=True)
+        self.assertEqual(compressor.compression_stats['adaptive']['decisions'][BlockStrategy.STORE], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+"""
+Pruebas unitarias para HU24: Política de verificación de bloques al comprimir
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import io
+import shutil
+from contextlib import redirect_stdout, redirect_stderr
+from unittest import mock
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compression import cli
+from compression.checksums import ChecksumAlgorithm, VerificationPolicy
+from compression.codecs import BLOCK_FLAG_NO_CHECKSUM
+from compression.executor_backend import ExecutorBackend, encode_block
+from compression.parallel_compressor import ParallelCompressor
+from compression.pz_format import PzArchive
+from compression.temporary_storage import CompressionAlgorithm
+
+
+class TestHU24VerificationPolicy(unittest.TestCase):
+    """Pruebas de la política de verificación"""
+
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.test_file = os.path.join(self.temp_dir, "datos.txt")
+        self.compressed_file = os.path.join(self.temp_dir, "datos.pz")
+        self.decompressed_file = os.path.join(self.temp_dir, "datos_out.txt")
+
+        # 32 bloques de 64KB
+        self.test_content = b"".join(f"fila {i} total={i * 3}\n".encode() for i in range(100000))[:32 * 65536]
+        with open(self.test_file, 'wb') as f:
+            f.write(self.test_content)
+
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _compress(self, policy, **options):
+        compressor = ParallelCompressor(block_size=64 * 1024)
+        compressor.set_verification_policy(policy, options.get('interval'), options.get('rate'))
+        compressor.set_streaming_mode(options.get('streaming', False))
+        if options.get('processes'):
+            compressor.set_executor_backend(ExecutorBackend.PROCESSES)
+        self.assertTrue(compressor.compress_file_with_threads(self.test_file, self.compressed_file, 3))
+        return compressor
+
+    def _assert_decompresses(self):
+        self.assertTrue(ParallelCompressor().decompress_file_with_threads(self.compressed_file,
+                                                                          self.decompressed_file, 3))
+        with open(self.decompressed_file, 'rb') as f:
+            self.assertEqual(f.read(), self.test_content)
+
+    def test_default_skips_round_trip(self):
+        """HU24: Por defecto no se descomprime cada bloque al comprimir"""
+        compressor = ParallelCompressor()
+        self.assertEqual(compressor.get_verification_policy(), VerificationPolicy.CHECKSUM)
+
+        with mock.patch('compression.executor_backend.CompressionAlgorithm.decompress',
+                        side_effect=AssertionError("no debe descomprimirse")):
+            compressor = self._compress(VerificationPolicy.CHECKSUM)
+        self.assertEqual(compressor.compression_stats['verified_blocks'], 0)
+
+        with PzArchive(self.compressed_file) as archive:
+            self.assertTrue(all(block['checksum'] is not None for block in archive.blocks))
+        self._assert_decompresses()
+
+    def test_full_verifies_every_block(self):
+        """HU24: Con 'full' cada bloque se verifica con ida y vuelta"""
+        for options in ({}, {'streaming': True}, {'processes': True}):
+            with self.subTest(**options):
+                compressor = self._compress(VerificationPolicy.FULL, **options)
+                self.assertEqual(compressor.compression_stats['verified_blocks'], 32)
+                self._assert_decompresses()
+
+    def test_sampled_by_interval_and_rate(self):
+        """HU24: Con 'sampled' se verifica uno de cada N bloques o una fracción"""
+        compressor = self._compress(VerificationPolicy.SAMPLED, interval=8)
+        self.assertEqual(compressor.compression_stats['verified_blocks'], 4)
+
+        compressor = self._compress(VerificationPolicy.SAMPLED)
+        self.assertEqual(compressor.compression_stats['verified_blocks'],
+                         32 // ParallelCompressor.DEFAULT_VERIFICATION_INTERVAL)
+
+        self.assertEqual(self._compress(VerificationPolicy.SAMPLED, rate=1.0).compression_stats['verified_blocks'], 32)
+        self.assertEqual(self._compress(VerificationPolicy.SAMPLED, rate=0.0).compression_stats['verified_blocks'], 0)
+        self._assert_decompresses()
+
+    def test_failed_verification_stores_block(self):
+        """HU24: Un bloque verificado que no coincide se guarda sin comprimir"""
+        data = b"contenido " * 5000
+        with mock.patch('compression.executor_backend.CompressionAlgorithm.decompress', return_value=b"otro"):
+            encoded = encode_block(data, CompressionAlgorithm.ZLIB, verify=True)
+            self.assertTrue(encoded['stored'])
+            self.assertEqual(encoded['data'], data)
+            unverified = encode_block(data, CompressionAlgorithm.ZLIB, verify=False)
+            self.assertFalse(unverified['stored'])
+            self.assertFalse(unverified['verified'])
+
+    def test_off_writes_blocks_without_checksum(self):
+        """HU24: Con 'off' los bloques se marcan sin checksum y se descomprimen igual"""
+        for options in ({}, {'processes': True}):
+            with self.subTest(**options):
+                with mock.patch('compression.parallel_compressor.block_checksum',
+                                side_effect=AssertionError("no debe calcularse")):
+                    self._compress(VerificationPolicy.OFF, **options)
+                with PzArchive(self.compressed_file) as archive:
+                    self.assertTrue(all(block['flags'] & BLOCK_FLAG_NO_CHECKSUM for block in archive.blocks))
+                    self.assertTrue(all(block['checksum'] is None for block in archive.blocks))
+                self._assert_decompresses()
+
+    def test_off_with_sha256(self):
+        """HU24: Los bloques sin checksum también funcionan con la tabla de SHA-256"""
+        compressor = ParallelCompressor(block_size=64 * 1024)
+        compressor.set_checksum_algorithm(ChecksumAlgorithm.SHA256)
+        compressor.set_verification_policy(VerificationPolicy.OFF)
+        self.assertTrue(compressor.compress_file_with_threads(self.test_file, self.compressed_file, 2))
+        with PzArchive(self.compressed_file) as archive:
+            self.assertEqual(archive.read_range(0, archive.original_size), self.test_content)
+
+    def test_invalid_settings(self):
+        """HU24: Políticas y parámetros inválidos son rechazados"""
+        compressor = ParallelCompressor()
+        with self.assertRaises(ValueError):
+            compressor.set_verification_policy("a veces")
+        with self.assertRaises(ValueError):
+            compressor.set_verification_policy(VerificationPolicy.SAMPLED, interval=0)
+        with self.assertRaises(ValueError):
+            compressor.set_verification_policy(VerificationPolicy.SAMPLED, rate=1.5)
+
+    def test_cli_option(self):
+        """HU24: La CLI acepta --verification y sus parámetros"""
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            code = cli.main(["compress", self.test_file, "-o", self.compressed_file, "-q",
+                             "--verification", "sampled", "--verify-every", "4"])
+            self.assertEqual(code, 0)
+            self.assertEqual(cli.main(["verify", self.compressed_file, "-q"]), 0)
+            code = cli.main(["compress", self.test_file, "-o", self.compressed_file, "-q", "-f",
+                             "--verification", "off"])
+            self.assertEqual(code, 0)
+            self.assertEqual(cli.main(["verify", self.compressed_file, "-q"]), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
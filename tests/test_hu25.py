@@ -0,0 +1,143 @@
+"""
+Pruebas unitarias para HU25: Diccionario compartido entre bloques
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import io
+import random
+import zlib
+import shutil
+from contextlib import redirect_stdout, redirect_stderr
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compression import cli
+from compression.codecs import BLOCK_FLAG_DICTIONARY, get_codec
+from compression.dictionary import (
+    MAX_DICTIONARY_SIZE, build_dictionary, dictionary_from_header, dictionary_to_header
+)
+from compression.executor_backend import ExecutorBackend, decompress_payload, encode_block
+from compression.parallel_compressor import ParallelCompressor
+from compression.pz_format import PzArchive
+
+
+class TestHU25Dictionary(unittest.TestCase):
+    """Pruebas del diccionario y del códec zlib con zdict"""
+
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.test_file = os.path.join(self.temp_dir, "registros.json")
+        self.compressed_file = os.path.join(self.temp_dir, "registros.pz")
+        self.decompressed_file = os.path.join(self.temp_dir, "registros_out.json")
+
+        # Registros JSON con un vocabulario grande que se repite en todo el archivo
+        rng = random.Random(25)
+        words = [''.join(rng.choice('abcdefghijklmnop') for _ in range(rng.randint(3, 9))) for _ in range(3000)]
+        self.test_content = "\n".join(
+            f'{{"id": {i}, "user": "{rng.choice(words)}", "tags": ["{rng.choice(words)}"]}}'
+            for i in range(40000)
+        ).encode()
+        with open(self.test_file, 'wb') as f:
+            f.write(self.test_content)
+
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_build_dictionary(self):
+        """HU25: El diccionario toma porciones de todo el archivo, hasta 32KB"""
+        dictionary = build_dictionary(self.test_file)
+        self.assertEqual(len(dictionary), MAX_DICTIONARY_SIZE)
+        self.assertTrue(dictionary.startswith(self.test_content[:MAX_DICTIONARY_SIZE // 8]))
+        self.assertIn(dictionary[-MAX_DICTIONARY_SIZE // 8:], self.test_content[-MAX_DICTIONARY_SIZE // 4:])
+        self.assertEqual(dictionary_from_header({'dictionary': dictionary_to_header(dictionary)}), dictionary)
+        self.assertIsNone(dictionary_from_header({}))
+
+        with self.assertRaises(ValueError):
+            build_dictionary(self.test_file, MAX_DICTIONARY_SIZE + 1)
+        with self.assertRaises(ValueError):
+            dictionary_from_header({'dictionary': "no es base64!"})
+
+    def test_block_needs_dictionary(self):
+        """HU25: Un bloque con BLOCK_FLAG_DICTIONARY solo se descomprime con el diccionario"""
+        dictionary = build_dictionary(self.test_file)
+        block = self.test_content[:65536]
+        encoded = encode_block(block, "zlib", dictionary=dictionary)
+        self.assertTrue(encoded['dictionary'])
+        self.assertLess(len(encoded['data']), len(zlib.compress(block)))
+
+        codec_id = get_codec("zlib").codec_id
+        self.assertEqual(decompress_payload(encoded['data'], len(block), codec_id,
+                                            BLOCK_FLAG_DICTIONARY, dictionary), block)
+        with self.assertRaises(ValueError):
+            decompress_payload(encoded['data'], len(block), codec_id, BLOCK_FLAG_DICTIONARY)
+
+    def test_codecs_without_dictionary_ignore_it(self):
+        """HU25: Los códecs sin soporte de diccionario comprimen como siempre"""
+        block = self.test_content[:65536]
+        encoded = encode_block(block, "bz2", dictionary=b"diccionario")
+        self.assertFalse(encoded['dictionary'])
+        with self.assertRaises(ValueError):
+            get_codec("bz2").compress_with_dictionary(block, b"diccionario")
+
+    def test_roundtrip_on_every_path(self):
+        """HU25: Escritura directa, streaming, temporal y procesos con diccionario"""
+        baseline = ParallelCompressor(block_size=64 * 1024)
+        self.assertTrue(baseline.compress_file_with_threads(self.test_file, self.compressed_file, 3))
+        baseline_size = os.path.getsize(self.compressed_file)
+
+        paths = ({}, {'streaming': True}, {'temp': True}, {'processes': True})
+        for options in paths:
+            with self.subTest(**options):
+                compressor = ParallelCompressor(block_size=64 * 1024)
+                compressor.set_shared_dictionary()
+                compressor.set_streaming_mode(options.get('streaming', False))
+                compressor.set_direct_output(not options.get('temp', False))
+                if options.get('processes'):
+                    compressor.set_executor_backend(ExecutorBackend.PROCESSES)
+                self.assertTrue(compressor.compress_file_with_threads(self.test_file, self.compressed_file, 3))
+                self.assertLess(os.path.getsize(self.compressed_file), baseline_size)
+
+                with PzArchive(self.compressed_file) as archive:
+                    self.assertIsNotNone(archive.dictionary)
+                    self.assertEqual(compressor.compression_stats['dictionary_blocks'], len(archive.blocks))
+                    self.assertTrue(all(block['flags'] & BLOCK_FLAG_DICTIONARY for block in archive.blocks))
+                    self.assertEqual(archive.read_range(100000, 5000), self.test_content[100000:105000])
+
+                for backend in (ExecutorBackend.THREADS, ExecutorBackend.PROCESSES):
+                    decompressor = ParallelCompressor()
+                    decompressor.set_streaming_mode(options.get('streaming', False))
+                    decompressor.set_executor_backend(backend)
+                    self.assertTrue(decompressor.decompress_file_with_threads(
+                        self.compressed_file, self.decompressed_file, 3))
+                    with open(self.decompressed_file, 'rb') as f:
+                        self.assertEqual(f.read(), self.test_content)
+
+    def test_disabled_for_codecs_without_support(self):
+        """HU25: Con un códec sin diccionario el encabezado no lo incluye"""
+        compressor = ParallelCompressor(block_size=64 * 1024)
+        compressor.set_compression_algorithm("lzma")
+        compressor.set_shared_dictionary()
+        self.assertTrue(compressor.compress_file_with_threads(self.test_file, self.compressed_file, 2))
+        with PzArchive(self.compressed_file) as archive:
+            self.assertNotIn('dictionary', archive.header)
+        with self.assertRaises(ValueError):
+            compressor.set_shared_dictionary(size=MAX_DICTIONARY_SIZE * 2)
+
+    def test_cli_option(self):
+        """HU25: compress --dictionary, verify e inspect"""
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            self.assertEqual(cli.main(["compress", self.test_file, "-o", self.compressed_file,
+                                       "-q", "--dictionary", "16K"]), 0)
+            self.assertEqual(cli.main(["verify", self.compressed_file, "-q"]), 0)
+        self.assertEqual(cli.describe_archive(self.compressed_file)['dictionary_size'], 16 * 1024)
+
+
+if __name__ == '__main__':
+    unittest.main()
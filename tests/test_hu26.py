@@ -0,0 +1,175 @@
+"""
+Pruebas unitarias para HU26: Deduplicación de bloques
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import io
+import random
+import shutil
+from contextlib import redirect_stdout, redirect_stderr
+from unittest import mock
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compression import cli
+from compression.checksums import ChecksumAlgorithm
+from compression.codecs import BLOCK_FLAG_DUPLICATE, BLOCK_FLAG_STORED
+from compression.dedup import DedupTable, content_digest
+from compression.executor_backend import ExecutorBackend, decompress_payload
+from compression.parallel_compressor import ParallelCompressor
+from compression.pz_format import FORMAT_V2, PzArchive, PzBlockWriter
+
+
+BLOCK = 64 * 1024
+
+
+class TestHU26DedupTable(unittest.TestCase):
+    """Pruebas de la tabla de hashes"""
+
+    def test_claim(self):
+        """HU26: El primer bloque con un contenido es el original; los demás lo referencian"""
+        table = DedupTable()
+        digest = content_digest(b"a" * 100)
+        self.assertIsNone(table.claim(digest, 3, 100))
+        self.assertEqual(table.claim(digest, 7, 100), 3)
+        self.assertEqual(table.claim(digest, 9, 100), 3)
+        self.assertIsNone(table.claim(content_digest(b"b" * 100), 4, 100))
+        self.assertEqual(table.get_statistics(),
+                         {'dedup_hits': 2, 'dedup_bytes_saved': 200, 'unique_blocks': 2})
+
+    def test_writer_resolves_references(self):
+        """HU26: PzBlockWriter acepta referencias a bloques escritos después"""
+        header = {'format': FORMAT_V2, 'original_filename': "x", 'original_size': 30,
+                  'block_count': 3, 'compression_algorithm': "zlib", 'checksum_algorithm': ChecksumAlgorithm.CRC32}
+        path = os.path.join(tempfile.mkdtemp(), "ref.pz")
+        self.addCleanup(shutil.rmtree, os.path.dirname(path), ignore_errors=True)
+
+        writer = PzBlockWriter(path, header)
+        writer.write_reference(0, 0, 10, 2)
+        writer.write_block(1, 10, 10, b"b" * 10, ChecksumAlgorithm.compute(b"b" * 10), flags=BLOCK_FLAG_STORED)
+        writer.write_block(2, 20, 10, b"a" * 10, ChecksumAlgorithm.compute(b"a" * 10), flags=BLOCK_FLAG_STORED)
+        writer.close()
+
+        with PzArchive(path) as archive:
+            self.assertEqual(archive.read_range(0, 30), b"a" * 10 + b"b" * 10 + b"a" * 10)
+            first, _, last = archive.blocks
+            self.assertEqual(first['data_offset'], last['data_offset'])
+            self.assertEqual(first['flags'], BLOCK_FLAG_STORED | BLOCK_FLAG_DUPLICATE)
+
+    def test_invalid_reference(self):
+        """HU26: Una referencia a otro duplicado o a un bloque de otro tamaño se rechaza"""
+        header = {'format': FORMAT_V2, 'original_filename': "x", 'original_size': 15,
+                  'block_count': 2, 'compression_algorithm': "zlib", 'checksum_algorithm': ChecksumAlgorithm.CRC32}
+        path = os.path.join(tempfile.mkdtemp(), "ref.pz")
+        self.addCleanup(shutil.rmtree, os.path.dirname(path), ignore_errors=True)
+
+        writer = PzBlockWriter(path, header)
+        writer.write_block(0, 0, 10, b"a" * 10, ChecksumAlgorithm.compute(b"a" * 10), flags=BLOCK_FLAG_STORED)
+        writer.write_reference(1, 10, 5, 0)
+        with self.assertRaises(ValueError):
+            writer.close()
+        self.assertFalse(os.path.exists(path))
+
+
+class TestHU26Deduplication(unittest.TestCase):
+    """Pruebas de compresión y descompresión con bloques repetidos"""
+
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.test_file = os.path.join(self.temp_dir, "backup.bin")
+        self.compressed_file = os.path.join(self.temp_dir, "backup.pz")
+        self.decompressed_file = os.path.join(self.temp_dir, "backup_out.bin")
+
+        # Tres bloques distintos repetidos: a b a c b a a c + un resto corto
+        rng = random.Random(26)
+        text = [b"".join(f"linea {rng.random()}\n".encode() for _ in range(5000))[:BLOCK] for _ in range(2)]
+        unique = {'a': text[0], 'b': text[1], 'c': rng.randbytes(BLOCK)}
+        self.pattern = "abacbaac"
+        self.test_content = b"".join(unique[name] for name in self.pattern) + b"resto"
+        with open(self.test_file, 'wb') as f:
+            f.write(self.test_content)
+
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _compress(self, dedup=True, **options):
+        compressor = ParallelCompressor(block_size=BLOCK)
+        compressor.set_deduplication(dedup)
+        compressor.set_streaming_mode(options.get('streaming', False))
+        compressor.set_direct_output(not options.get('temp', False))
+        if options.get('processes'):
+            compressor.set_executor_backend(ExecutorBackend.PROCESSES)
+        self.assertTrue(compressor.compress_file_with_threads(self.test_file, self.compressed_file, 3))
+        return compressor
+
+    def test_roundtrip_on_every_path(self):
+        """HU26: Escritura directa, streaming, temporal y procesos con bloques repetidos"""
+        self._compress(dedup=False)
+        baseline_size = os.path.getsize(self.compressed_file)
+
+        paths = ({}, {'streaming': True}, {'temp': True}, {'processes': True},
+                 {'streaming': True, 'processes': True})
+        for options in paths:
+            with self.subTest(**options):
+                compressor = self._compress(**options)
+                stats = compressor.get_compression_statistics()['dedup']
+                self.assertEqual(stats['dedup_hits'], 5)
+                self.assertEqual(stats['dedup_bytes_saved'], 5 * BLOCK)
+                self.assertEqual(stats['unique_blocks'], 4)
+                self.assertLess(os.path.getsize(self.compressed_file), baseline_size - BLOCK)
+
+                with PzArchive(self.compressed_file) as archive:
+                    duplicates = [bool(block['flags'] & BLOCK_FLAG_DUPLICATE) for block in archive.blocks]
+                    self.assertEqual(duplicates.count(True), 5)
+                    self.assertEqual(len({block['data_offset'] for block in archive.blocks}), 4)
+                    self.assertEqual(archive.read_range(BLOCK - 100, 3 * BLOCK),
+                                     self.test_content[BLOCK - 100:4 * BLOCK - 100])
+
+                for backend in (ExecutorBackend.THREADS, ExecutorBackend.PROCESSES):
+                    for streaming in (False, True):
+                        decompressor = ParallelCompressor()
+                        decompressor.set_executor_backend(backend)
+                        decompressor.set_streaming_mode(streaming)
+                        self.assertTrue(decompressor.decompress_file_with_threads(
+                            self.compressed_file, self.decompressed_file, 3))
+                        with open(self.decompressed_file, 'rb') as f:
+                            self.assertEqual(f.read(), self.test_content)
+
+    def test_duplicates_compressed_once(self):
+        """HU26: Solo la primera aparición de cada contenido se comprime"""
+        compressor = self._compress()
+        # Los datos aleatorios 'c' y el resto corto no se reducen
+        self.assertEqual(compressor.compression_stats['stored_blocks'], 2)
+
+        decompressor = ParallelCompressor()
+        with mock.patch('compression.parallel_compressor.decompress_payload', wraps=decompress_payload) as calls:
+            self.assertTrue(decompressor.decompress_file_with_threads(self.compressed_file, self.decompressed_file, 2))
+        self.assertEqual(calls.call_count, 4)
+        self.assertEqual(decompressor.get_decompression_statistics()['duplicate_blocks'], 5)
+
+    def test_disabled_by_default(self):
+        """HU26: Sin activarla no hay referencias ni estadísticas de deduplicación"""
+        compressor = ParallelCompressor(block_size=BLOCK)
+        self.assertTrue(compressor.compress_file_with_threads(self.test_file, self.compressed_file, 2))
+        self.assertNotIn('dedup', compressor.get_compression_statistics())
+        with PzArchive(self.compressed_file) as archive:
+            self.assertFalse(any(block['flags'] & BLOCK_FLAG_DUPLICATE for block in archive.blocks))
+
+    def test_cli_option(self):
+        """HU26: compress --dedup, verify e inspect"""
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            self.assertEqual(cli.main(["compress", self.test_file, "-o", self.compressed_file,
+                                       "-q", "-b", "64K", "--dedup"]), 0)
+            self.assertEqual(cli.main(["verify", self.compressed_file, "-q"]), 0)
+        self.assertEqual(cli.describe_archive(self.compressed_file)['duplicate_blocks'], 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
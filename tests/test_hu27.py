@@ -0,0 +1,252 @@
+"""
+Pruebas unitarias para HU27: División en bloques definida por el contenido
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import io
+import random
+import hashlib
+import shutil
+from contextlib import redirect_stdout, redirect_stderr
+from unittest import mock
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compression import cli
+from compression.block_manager import FileBlockManager
+from compression import chunking
+from compression.chunking import ChunkingStrategy, ContentDefinedChunker, window_hash
+from compression.executor_backend import ExecutorBackend
+from compression.parallel_compressor import ParallelCompressor
+from compression.pz_format import PzArchive
+
+
+BLOCK = 64 * 1024
+
+
+def _generate(size, seed):
+    """Texto con vocabulario aleatorio mezclado con tramos binarios"""
+    rng = random.Random(seed)
+    words = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(2, 9))) for _ in range(800)]
+    parts = []
+    while sum(len(part) for part in parts) < size:
+        parts.append(' '.join(rng.choices(words, k=5000)).encode())
+        parts.append(rng.randbytes(rng.randint(1000, 50000)))
+    return b''.join(parts)[:size]
+
+
+def _chunk_digests(data, ranges):
+    return [hashlib.sha256(data[offset:offset + size]).digest() for offset, size in ranges]
+
+
+class TestHU27Chunker(unittest.TestCase):
+    """Pruebas del hash rodante"""
+
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.test_file = os.path.join(self.temp_dir, "datos.bin")
+        self.test_content = _generate(3 * 1024 * 1024, 27)
+        with open(self.test_file, 'wb') as f:
+            f.write(self.test_content)
+
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self, name, content):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+
+    def test_sizes_within_bounds(self):
+        """HU27: Los bloques cubren el archivo y respetan mínimo y máximo"""
+        chunker = ContentDefinedChunker.for_block_size(BLOCK, FileBlockManager.MIN_BLOCK_SIZE,
+                                                       FileBlockManager.MAX_BLOCK_SIZE)
+        self.assertEqual((chunker.min_size, chunker.avg_size, chunker.max_size), (BLOCK, BLOCK, 4 * BLOCK))
+
+        ranges = chunker.boundaries(self.test_file)
+        offset = 0
+        for start, size in ranges:
+            self.assertEqual(start, offset)
+            offset += size
+        self.assertEqual(offset, len(self.test_content))
+        self.assertTrue(all(BLOCK <= size <= 4 * BLOCK for _, size in ranges[:-1]))
+        # Tamaños variables: no todos los cortes caen en el máximo
+        self.assertGreater(len({size for _, size in ranges}), len(ranges) // 2)
+
+    def test_independent_of_read_size(self):
+        """HU27: Los límites no dependen de cómo se lee el archivo"""
+        chunker = ContentDefinedChunker(BLOCK, 2 * BLOCK, 8 * BLOCK)
+        expected = chunker.boundaries(self.test_file)
+        with mock.patch('compression.chunking.READ_SIZE', 100003):
+            self.assertEqual(chunker.boundaries(self.test_file), expected)
+
+    def test_boundaries_resynchronize_after_insertion(self):
+        """HU27: Tras insertar bytes al principio, casi todos los bloques se conservan"""
+        chunker = ContentDefinedChunker(BLOCK, 2 * BLOCK, 8 * BLOCK)
+        edited = self.test_content[:1000] + b"insertado" + self.test_content[1000:]
+        original = _chunk_digests(self.test_content, chunker.boundaries(self.test_file))
+        changed = _chunk_digests(edited, chunker.boundaries(self._write("editado.bin", edited)))
+        self.assertGreaterEqual(len(set(original) & set(changed)), len(original) - 2)
+
+        # Con bloques fijos, ningún bloque posterior a la inserción coincide
+        fixed = [(offset, BLOCK) for offset in range(0, len(self.test_content), BLOCK)]
+        self.assertLessEqual(len(set(_chunk_digests(self.test_content, fixed)) & set(_chunk_digests(edited, fixed))), 1)
+
+    def test_low_entropy_text(self):
+        """HU27: Código fuente y registros repetitivos se cortan por contenido, no en el máximo"""
+        rng = random.Random(9)
+        source = b"".join(
+            f"    def metodo_{i}(self, valor):\n        if valor > {i}:\n            return self.datos[{i % 7}]\n\n".encode()
+            for i in range(40000))
+        logs = b"".join(f"2026-10-17 INFO worker-{i % 8} bloque {i} ok\n".encode()
+                        for i in range(120000))
+        chunker = ContentDefinedChunker.for_block_size(BLOCK, FileBlockManager.MIN_BLOCK_SIZE,
+                                                       FileBlockManager.MAX_BLOCK_SIZE)
+        for name, content in (("fuente.py", source), ("registro.log", logs)):
+            with self.subTest(name=name):
+                ranges = chunker.boundaries(self._write(name, content))
+                forced = sum(1 for _, size in ranges[:-1] if size == chunker.max_size)
+                self.assertLessEqual(forced, len(ranges) // 20)
+                self.assertLess(len(content) / len(ranges), 2 * BLOCK)
+
+                # Tras una inserción los límites se resincronizan también en texto repetitivo
+                position = rng.randrange(len(content) // 2)
+                edited = content[:position] + b"# insertado\n" + content[position:]
+                original = _chunk_digests(content, ranges)
+                changed = _chunk_digests(edited, chunker.boundaries(self._write("editado_" + name, edited)))
+                self.assertGreaterEqual(len(set(original) & set(changed)), len(original) - 3)
+
+    def test_window_hash_paths_agree(self):
+        """HU27: El hash de ventana da lo mismo con y sin NumPy, y no depende de cómo se parte el archivo"""
+        data = self.test_content[:300000]
+        expected = chunking._window_hash_python(data)
+        if chunking.np is not None:
+            self.assertEqual(chunking._window_hash_numpy(data), expected)
+        with mock.patch.object(chunking, 'np', None):
+            self.assertEqual(window_hash(data[:1000]) + window_hash(data[1000:], data[:1000]), expected)
+
+        chunker = ContentDefinedChunker(BLOCK, 2 * BLOCK, 8 * BLOCK)
+        expected = chunker.boundaries(self.test_file)
+        with mock.patch.object(chunking, 'np', None):
+            self.assertEqual(chunker.boundaries(self.test_file), expected)
+
+    def test_small_and_uniform_files(self):
+        """HU27: Archivos menores que el mínimo y sin patrón de corte"""
+        chunker = ContentDefinedChunker(BLOCK, 2 * BLOCK, 4 * BLOCK)
+        self.assertEqual(chunker.boundaries(self._write("chico.bin", b"x" * 1000)), [(0, 1000)])
+        self.assertEqual(chunker.boundaries(self._write("ceros.bin", bytes(9 * BLOCK))),
+                         [(0, 4 * BLOCK), (4 * BLOCK, 4 * BLOCK), (8 * BLOCK, BLOCK)])
+        with self.assertRaises(ValueError):
+            ContentDefinedChunker(2 * BLOCK, BLOCK, 4 * BLOCK)
+        with self.assertRaises(ValueError):
+            ChunkingStrategy.validate("rabin")
+
+
+class TestHU27Pipeline(unittest.TestCase):
+    """Pruebas de bloques variables en FileBlockManager y ParallelCompressor"""
+
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.test_file = os.path.join(self.temp_dir, "datos.bin")
+        self.compressed_file = os.path.join(self.temp_dir, "datos.pz")
+        self.decompressed_file = os.path.join(self.temp_dir, "datos_out.bin")
+        self.test_content = _generate(2 * 1024 * 1024, 127)
+        with open(self.test_file, 'wb') as f:
+            f.write(self.test_content)
+
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_block_manager_modes_agree(self):
+        """HU27: split, iter, plan y mmap producen los mismos bloques variables"""
+        manager = FileBlockManager(BLOCK, chunking=ChunkingStrategy.CONTENT_DEFINED)
+        analysis = manager.analyze_file(self.test_file)
+        ranges = [(block['start_offset'], block['size']) for block in manager.split_file_into_blocks(self.test_file)]
+        self.assertEqual(len(ranges), analysis['total_blocks'])
+        self.assertEqual(analysis['max_block_size'], max(size for _, size in ranges))
+        self.assertEqual([(block['start_offset'], block['size']) for block in manager.iter_file_blocks(self.test_file)],
+                         ranges)
+        self.assertEqual([(block['start_offset'], block['size']) for block in manager.plan_blocks(self.test_file)],
+                         ranges)
+        self.assertEqual(manager.get_statistics()['chunking'], ChunkingStrategy.CONTENT_DEFINED)
+
+        mapped = FileBlockManager(BLOCK, use_mmap=True, chunking=ChunkingStrategy.CONTENT_DEFINED)
+        blocks = mapped.split_file_into_blocks(self.test_file)
+        self.assertEqual([(block['start_offset'], block['size']) for block in blocks], ranges)
+        self.assertEqual(b"".join(bytes(block['data']) for block in blocks), self.test_content)
+        mapped.release_mapping()
+
+    def test_roundtrip_on_every_path(self):
+        """HU27: Escritura directa, streaming, temporal y procesos con bloques variables"""
+        paths = ({}, {'streaming': True}, {'temp': True}, {'processes': True}, {'mmap': True})
+        for options in paths:
+            with self.subTest(**options):
+                compressor = ParallelCompressor(block_size=BLOCK)
+                compressor.set_chunking_strategy(ChunkingStrategy.CONTENT_DEFINED)
+                compressor.set_streaming_mode(options.get('streaming', False))
+                compressor.set_direct_output(not options.get('temp', False))
+                compressor.set_memory_mapping(options.get('mmap', False))
+                if options.get('processes'):
+                    compressor.set_executor_backend(ExecutorBackend.PROCESSES)
+                self.assertTrue(compressor.compress_file_with_threads(self.test_file, self.compressed_file, 3))
+
+                with PzArchive(self.compressed_file) as archive:
+                    sizes = [block['original_size'] for block in archive.blocks]
+                    self.assertGreater(len(set(sizes)), 2)
+                    self.assertEqual(archive.read_range(300000, 400000), self.test_content[300000:700000])
+
+                decompressor = ParallelCompressor()
+                decompressor.set_streaming_mode(options.get('streaming', False))
+                self.assertTrue(decompressor.decompress_file_with_threads(self.compressed_file, self.decompressed_file, 3))
+                with open(self.decompressed_file, 'rb') as f:
+                    self.assertEqual(f.read(), self.test_content)
+
+    def test_setting_survives_block_size_change(self):
+        """HU27: La estrategia se conserva al cambiar el tamaño de bloque"""
+        compressor = ParallelCompressor()
+        compressor.set_chunking_strategy(ChunkingStrategy.CONTENT_DEFINED)
+        compressor.set_block_size(2 * BLOCK)
+        self.assertEqual(compressor.get_chunking_strategy(), ChunkingStrategy.CONTENT_DEFINED)
+        with self.assertRaises(ValueError):
+            compressor.set_chunking_strategy("variable")
+
+    def test_dedup_finds_shifted_copy(self):
+        """HU26/HU27: Una copia desplazada del contenido se deduplica"""
+        shifted = self.test_content + b"version 2" + self.test_content
+        with open(self.test_file, 'wb') as f:
+            f.write(shifted)
+
+        stats = {}
+        for strategy in ChunkingStrategy.ALL:
+            compressor = ParallelCompressor(block_size=BLOCK)
+            compressor.set_chunking_strategy(strategy)
+            compressor.set_deduplication()
+            self.assertTrue(compressor.compress_file_with_threads(self.test_file, self.compressed_file, 2))
+            stats[strategy] = compressor.get_compression_statistics()['dedup']
+        self.assertEqual(stats[ChunkingStrategy.FIXED]['dedup_hits'], 0)
+        self.assertGreater(stats[ChunkingStrategy.CONTENT_DEFINED]['dedup_bytes_saved'], len(self.test_content) // 2)
+
+        self.assertTrue(ParallelCompressor().decompress_file_with_threads(self.compressed_file, self.decompressed_file, 2))
+        with open(self.decompressed_file, 'rb') as f:
+            self.assertEqual(f.read(), shifted)
+
+    def test_cli_option(self):
+        """HU27: compress --chunking content"""
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            self.assertEqual(cli.main(["compress", self.test_file, "-o", self.compressed_file,
+                                       "-q", "-b", "64K", "--chunking", "content"]), 0)
+            self.assertEqual(cli.main(["verify", self.compressed_file, "-q"]), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+"""
+Pruebas unitarias para HU28: Recompresión incremental contra un .pz anterior
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import io
+import random
+import shutil
+from contextlib import redirect_stdout, redirect_stderr
+from unittest import mock
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compression import cli
+from compression.checksums import ChecksumAlgorithm, VerificationPolicy
+from compression.chunking import ChunkingStrategy
+from compression.codecs import BLOCK_FLAG_DICTIONARY
+from compression.executor_backend import ExecutorBackend, encode_block
+from compression.parallel_compressor import ParallelCompressor
+from compression.pz_format import PzArchive
+
+
+BLOCK = 64 * 1024
+
+
+def _generate(size, seed):
+    """Líneas de texto variadas: cada bloque comprime distinto"""
+    rng = random.Random(seed)
+    return b"".join(f"registro {i} valor {rng.random()}\n".encode() for i in range(size // 20))[:size]
+
+
+class TestHU28Incremental(unittest.TestCase):
+    """Pruebas de reutilización de bloques del .pz anterior"""
+
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.test_file = os.path.join(self.temp_dir, "datos.bin")
+        self.base_file = os.path.join(self.temp_dir, "datos_v1.pz")
+        self.compressed_file = os.path.join(self.temp_dir, "datos_v2.pz")
+        self.decompressed_file = os.path.join(self.temp_dir, "datos_out.bin")
+
+        # 16 bloques; la versión nueva cambia unos bytes en los bloques 3 y 10
+        self.original = _generate(16 * BLOCK, 28)
+        edited = bytearray(self.original)
+        edited[3 * BLOCK + 100:3 * BLOCK + 110] = b"modificado"
+        edited[10 * BLOCK + 5] ^= 0xFF
+        self.edited = bytes(edited)
+
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write_input(self, content):
+        with open(self.test_file, 'wb') as f:
+            f.write(content)
+
+    def _compressor(self, **options):
+        compressor = ParallelCompressor(block_size=BLOCK)
+        compressor.set_checksum_algorithm(options.get('checksum', ChecksumAlgorithm.SHA256))
+        compressor.set_streaming_mode(options.get('streaming', False))
+        compressor.set_direct_output(not options.get('temp', False))
+        if options.get('processes'):
+            compressor.set_executor_backend(ExecutorBackend.PROCESSES)
+        if options.get('cdc'):
+            compressor.set_chunking_strategy(ChunkingStrategy.CONTENT_DEFINED)
+        if options.get('dictionary'):
+            compressor.set_shared_dictionary()
+        if options.get('verification'):
+            compressor.set_verification_policy(options['verification'])
+        return compressor
+
+    def _compress_base(self, content=None, **options):
+        self._write_input(self.original if content is None else content)
+        self.assertTrue(self._compressor(**options).compress_file_with_threads(self.test_file, self.base_file, 2))
+
+    def _compress_incremental(self, content=None, **options):
+        self._write_input(self.edited if content is None else content)
+        compressor = self._compressor(**options)
+        compressor.set_incremental_base(self.base_file)
+        self.assertTrue(compressor.compress_file_with_threads(self.test_file, self.compressed_file, 3))
+        return compressor.get_compression_statistics()['incremental']
+
+    def _assert_roundtrip(self, content):
+        self.assertTrue(ParallelCompressor().decompress_file_with_threads(
+            self.compressed_file, self.decompressed_file, 2))
+        with open(self.decompressed_file, 'rb') as f:
+            self.assertEqual(f.read(), content)
+
+    def test_reuses_unchanged_blocks_on_every_path(self):
+        """HU28: Escritura directa, streaming, temporal y procesos solo comprimen los bloques modificados"""
+        paths = ({}, {'streaming': True}, {'temp': True}, {'processes': True},
+                 {'streaming': True, 'processes': True})
+        for options in paths:
+            with self.subTest(**options):
+                self._compress_base(**options)
+                with mock.patch('compression.parallel_compressor.encode_block', wraps=encode_block) as calls:
+                    stats = self._compress_incremental(**options)
+                self.assertEqual(stats['reused_blocks'], 14)
+                self.assertEqual(stats['reused_bytes'], 14 * BLOCK)
+                if not options.get('processes'):
+                    self.assertEqual(calls.call_count, 2)
+                self._assert_roundtrip(self.edited)
+
+    def test_reused_data_is_copied_verbatim(self):
+        """HU28: Los bloques sin cambios se copian byte a byte del .pz anterior"""
+        self._compress_base()
+        self._compress_incremental()
+        with PzArchive(self.base_file) as base, PzArchive(self.compressed_file) as archive:
+            for block_id in range(16):
+                same = base.read_compressed(block_id) == archive.read_compressed(block_id)
+                self.assertEqual(same, block_id not in (3, 10))
+
+    def test_content_defined_chunking_survives_insertion(self):
+        """HU27/HU28: Con división por contenido una inserción solo invalida los bloques vecinos"""
+        original = _generate(24 * BLOCK, 128) + random.Random(1).randbytes(8 * BLOCK)
+        inserted = original[:5000] + b"linea insertada\n" + original[5000:]
+        self._compress_base(original, cdc=True)
+        stats = self._compress_incremental(inserted, cdc=True)
+
+        with PzArchive(self.compressed_file) as archive:
+            total = len(archive.blocks)
+        self.assertGreaterEqual(stats['reused_blocks'], total - 2)
+        self._assert_roundtrip(inserted)
+
+        # Con bloques fijos la inserción desplaza todos los bloques posteriores
+        self._compress_base(original)
+        self.assertLessEqual(self._compress_incremental(inserted)['reused_blocks'], 1)
+
+    def test_dictionary_blocks_reused(self):
+        """HU25/HU28: Se reutiliza el diccionario del .pz anterior y con él sus bloques"""
+        self._compress_base(dictionary=True)
+        stats = self._compress_incremental(dictionary=True)
+        self.assertEqual(stats['reused_blocks'], 14)
+        with PzArchive(self.base_file) as base, PzArchive(self.compressed_file) as archive:
+            self.assertEqual(archive.dictionary, base.dictionary)
+            self.assertTrue(all(block['flags'] & BLOCK_FLAG_DICTIONARY for block in archive.blocks))
+        self._assert_roundtrip(self.edited)
+
+        # Sin diccionario en la compresión nueva, los bloques con diccionario no sirven
+        self.assertEqual(self._compress_incremental()['reused_blocks'], 0)
+        self._assert_roundtrip(self.edited)
+
+    def test_checksums_computed_with_verification_off(self):
+        """HU24/HU28: Con la política 'off' los checksums se calculan igual para comparar"""
+        self._compress_base()
+        for processes in (False, True):
+            with self.subTest(processes=processes):
+                stats = self._compress_incremental(verification=VerificationPolicy.OFF, processes=processes)
+                self.assertEqual(stats['reused_blocks'], 14)
+                with PzArchive(self.compressed_file) as archive:
+                    self.assertTrue(all(block['checksum'] is not None for block in archive.blocks))
+
+    def test_invalid_base(self):
+        """HU28: Otro algoritmo de checksum, uno no criptográfico o el mismo archivo de salida se rechazan"""
+        self._compress_base(checksum=ChecksumAlgorithm.CRC32)
+        self._write_input(self.edited)
+        compressor = self._compressor()
+        compressor.set_incremental_base(self.base_file)
+        with self.assertRaises(ValueError):
+            compressor.compress_file_with_threads(self.test_file, self.compressed_file, 2)
+        for checksum in (ChecksumAlgorithm.CRC32, ChecksumAlgorithm.ADLER32):
+            weak = self._compressor(checksum=checksum)
+            weak.set_incremental_base(self.base_file)
+            with self.assertRaises(ValueError):
+                weak.compress_file_with_threads(self.test_file, self.compressed_file, 2)
+            self.assertFalse(os.path.exists(self.compressed_file))
+        with self.assertRaises(ValueError):
+            compressor.compress_file_with_threads(self.test_file, self.base_file, 2)
+        self.assertTrue(os.path.exists(self.base_file))
+        self.assertNotIn('incremental', compressor.get_compression_statistics())
+
+    def test_cli_option(self):
+        """HU28: compress --incremental"""
+        self._compress_base()
+        self._write_input(self.edited)
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            self.assertEqual(cli.main(["compress", self.test_file, "-o", self.compressed_file, "-b", "64K",
+                                       "--checksum", ChecksumAlgorithm.SHA256, "--incremental", self.base_file]), 0)
+            self.assertEqual(cli.main(["verify", self.compressed_file, "-q"]), 0)
+            self.assertEqual(cli.main(["compress", self.test_file, "-o", self.compressed_file, "-f", "-q",
+                                       "--incremental", self.base_file]), 1)
+        self.assertIn("14 bloques", stdout.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,211 @@
+"""
+Pruebas unitarias para HU29: Compresiones reanudables desde un checkpoint
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import io
+import random
+import shutil
+from contextlib import redirect_stdout, redirect_stderr
+from unittest import mock
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compression import cli
+from compression.checksums import ChecksumAlgorithm
+from compression.chunking import ChunkingStrategy
+from compression.executor_backend import ExecutorBackend, encode_block
+from compression.parallel_compressor import ParallelCompressor
+from compression.temporary_storage import TemporaryBlockStorage
+
+
+BLOCK = 64 * 1024
+TOTAL_BLOCKS = 12
+
+
+def _generate(size, seed):
+    rng = random.Random(seed)
+    return b"".join(f"evento {i} {rng.random()}\n".encode() for i in range(size // 16))[:size]
+
+
+class TestHU29Storage(unittest.TestCase):
+    """Pruebas de las operaciones de TemporaryBlockStorage usadas al reanudar"""
+
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_discard_and_job_info_survive_recover(self):
+        """HU29: Los descartes y la configuración del trabajo quedan en el journal"""
+        storage = TemporaryBlockStorage(self.temp_dir)
+        for block_id in range(4):
+            storage.store_compressed_block(block_id, b"datos" * 10, 100, 50.0, 0, block_id)
+        storage.set_job_info({'checksum_algorithm': ChecksumAlgorithm.CRC32})
+        removed = storage.get_stored_blocks()[1]['path']
+        storage.discard_blocks([1, 3])
+        self.assertFalse(os.path.exists(removed))
+        del storage  # Simula la caída del proceso sin limpieza
+
+        recovered = TemporaryBlockStorage.recover(self.temp_dir)
+        self.assertEqual([block['id'] for block in recovered.get_stored_blocks()], [0, 2])
+        self.assertEqual(recovered.get_job_info(), {'checksum_algorithm': ChecksumAlgorithm.CRC32})
+        self.assertIsNone(recovered.validate_block(recovered.get_stored_blocks()[0]))
+
+
+class TestHU29Resume(unittest.TestCase):
+    """Pruebas de interrupción y reanudación de la compresión"""
+
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.checkpoint_dir = os.path.join(self.temp_dir, "trabajo")
+        self.test_file = os.path.join(self.temp_dir, "datos.bin")
+        self.compressed_file = os.path.join(self.temp_dir, "datos.pz")
+        self.decompressed_file = os.path.join(self.temp_dir, "datos_out.bin")
+        self.test_content = _generate(TOTAL_BLOCKS * BLOCK, 29)
+        with open(self.test_file, 'wb') as f:
+            f.write(self.test_content)
+
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _compressor(self, processes=False):
+        compressor = ParallelCompressor(block_size=BLOCK)
+        compressor.set_checkpoint_dir(self.checkpoint_dir)
+        if processes:
+            compressor.set_executor_backend(ExecutorBackend.PROCESSES)
+        return compressor
+
+    def _interrupt(self, compressor, after_blocks=5):
+        """Cancela la compresión después de after_blocks bloques y devuelve los IDs guardados"""
+        reported = []
+
+        def callback(message, progress, phase):
+            if phase == "🗜️ Compresión paralela":
+                reported.append(message)
+            return len(reported) < after_blocks
+
+        self.assertFalse(compressor.compress_file_with_threads(self.test_file, self.compressed_file, 2, callback))
+        self.assertFalse(os.path.exists(self.compressed_file))
+        stored = TemporaryBlockStorage.recover(self.checkpoint_dir).get_stored_blocks()
+        self.assertGreaterEqual(len(stored), after_blocks)
+        return stored
+
+    def _assert_roundtrip(self):
+        self.assertTrue(ParallelCompressor().decompress_file_with_threads(
+            self.compressed_file, self.decompressed_file, 2))
+        with open(self.decompressed_file, 'rb') as f:
+            self.assertEqual(f.read(), self.test_content)
+
+    def test_resume_compresses_only_missing_blocks(self):
+        """HU29: Al reanudar solo se comprimen los bloques que faltan, con hilos y con procesos"""
+        for processes in (False, True):
+            with self.subTest(processes=processes):
+                stored = self._interrupt(self._compressor(processes))
+                messages = []
+
+                compressor = self._compressor(processes)
+                with mock.patch('compression.parallel_compressor.encode_block', wraps=encode_block) as calls:
+                    self.assertTrue(compressor.compress_file_with_threads(
+                        self.test_file, self.compressed_file, 2, lambda *args: messages.append(args) or True))
+
+                stats = compressor.get_compression_statistics()['resume']
+                self.assertEqual(stats['resumed_blocks'], len(stored))
+                self.assertEqual(stats['resumed_bytes'], len(stored) * BLOCK)
+                self.assertEqual(stats['pending_blocks'], TOTAL_BLOCKS - len(stored))
+                self.assertEqual(stats['discarded_blocks'], 0)
+                if not processes:
+                    self.assertEqual(calls.call_count, TOTAL_BLOCKS - len(stored))
+                self.assertIn("♻️ Reanudación", [phase for _, _, phase in messages])
+
+                # Terminado el trabajo, el checkpoint se elimina
+                self.assertFalse(os.path.exists(self.checkpoint_dir))
+                self._assert_roundtrip()
+                os.remove(self.compressed_file)
+
+    def test_invalid_blocks_are_recompressed(self):
+        """HU29: Un bloque corrupto y uno cuya entrada cambió se descartan y se vuelven a comprimir"""
+        stored = self._interrupt(self._compressor())
+        corrupt, changed = stored[0], stored[1]
+
+        with open(corrupt['path'], 'r+b') as f:
+            first = f.read(1)
+            f.seek(0)
+            f.write(bytes([first[0] ^ 0xFF]))
+        content = bytearray(self.test_content)
+        content[changed['id'] * BLOCK + 10] ^= 0xFF
+        self.test_content = bytes(content)
+        with open(self.test_file, 'wb') as f:
+            f.write(self.test_content)
+
+        compressor = self._compressor()
+        self.assertTrue(compressor.compress_file_with_threads(self.test_file, self.compressed_file, 2))
+        stats = compressor.get_compression_statistics()['resume']
+        self.assertEqual(stats['resumed_blocks'], len(stored) - 2)
+        self.assertEqual(stats['discarded_blocks'], 2)
+        self._assert_roundtrip()
+
+    def test_other_checksum_algorithm_discards_everything(self):
+        """HU18/HU29: Con otro algoritmo de checksum los bloques guardados no pueden validarse"""
+        stored = self._interrupt(self._compressor())
+        compressor = self._compressor()
+        compressor.set_checksum_algorithm(ChecksumAlgorithm.SHA256)
+        self.assertTrue(compressor.compress_file_with_threads(self.test_file, self.compressed_file, 2))
+        stats = compressor.get_compression_statistics()['resume']
+        self.assertEqual((stats['resumed_blocks'], stats['discarded_blocks']), (0, len(stored)))
+        self._assert_roundtrip()
+
+    def test_resume_from_checkpoint_only(self):
+        """HU29: resume_compression toma rutas y parámetros del checkpoint"""
+        compressor = self._compressor()
+        compressor.set_chunking_strategy(ChunkingStrategy.CONTENT_DEFINED)
+        compressor.set_shared_dictionary()
+        compressor.set_checksum_algorithm(ChecksumAlgorithm.SHA256)
+        stored = self._interrupt(compressor, after_blocks=2)
+
+        resumed = ParallelCompressor()
+        self.assertTrue(resumed.resume_compression(self.checkpoint_dir, 2))
+        self.assertEqual(resumed.get_block_size(), BLOCK)
+        self.assertEqual(resumed.get_chunking_strategy(), ChunkingStrategy.CONTENT_DEFINED)
+        self.assertEqual(resumed.get_checksum_algorithm(), ChecksumAlgorithm.SHA256)
+        self.assertEqual(resumed.get_compression_statistics()['resume']['resumed_blocks'], len(stored))
+        self._assert_roundtrip()
+
+        with self.assertRaises(FileNotFoundError):
+            ParallelCompressor().resume_compression(self.checkpoint_dir)
+
+    def test_checkpoint_kept_on_error(self):
+        """HU29: Si la compresión falla, el checkpoint se conserva"""
+        compressor = self._compressor()
+        with mock.patch.object(compressor, '_write_compressed_file_from_storage', side_effect=OSError("disco lleno")):
+            with self.assertRaises(OSError):
+                compressor.compress_file_with_threads(self.test_file, self.compressed_file, 2)
+        self.assertEqual(TemporaryBlockStorage.recover(self.checkpoint_dir).get_block_count(), TOTAL_BLOCKS)
+
+        compressor = self._compressor()
+        self.assertTrue(compressor.compress_file_with_threads(self.test_file, self.compressed_file, 2))
+        self.assertEqual(compressor.get_compression_statistics()['resume']['pending_blocks'], 0)
+        self._assert_roundtrip()
+
+    def test_cli_option(self):
+        """HU29: compress --checkpoint"""
+        self._interrupt(self._compressor())
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            self.assertEqual(cli.main(["compress", self.test_file, "-o", self.compressed_file, "-q",
+                                       "-b", "64K", "--checkpoint", self.checkpoint_dir]), 0)
+        self.assertFalse(os.path.exists(self.checkpoint_dir))
+        self._assert_roundtrip()
+
+
+if __name__ == '__main__':
+    unittest.main()
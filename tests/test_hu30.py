@@ -0,0 +1,166 @@
+"""
+Pruebas unitarias para HU30: Pool de trabajadores persistente compartido entre trabajos
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import random
+import shutil
+import threading
+from unittest import mock
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compression.executor_backend import ExecutorBackend, create_process_pool
+from compression.parallel_compressor import ParallelCompressor
+from compression.service import CompressionService
+from compression.worker_pool import WorkerPool
+
+
+BLOCK = 64 * 1024
+
+
+class TestHU30WorkerPool(unittest.TestCase):
+    """Pruebas del pool de trabajadores"""
+
+    def test_lazy_start_and_shutdown(self):
+        """HU30: Los ejecutores se crean en el primer uso y no aceptan tareas después de cerrar"""
+        pool = WorkerPool(3)
+        self.assertFalse(pool.is_started())
+        self.assertEqual(pool.submit(lambda x: x * 2, 21).result(), 42)
+        self.assertTrue(pool.is_started())
+        self.assertIs(pool.thread_executor(), pool.thread_executor())
+
+        pool.shutdown()
+        self.assertTrue(pool.is_closed())
+        with self.assertRaises(RuntimeError):
+            pool.submit(print)
+
+    def test_invalid_size(self):
+        """HU30: El tamaño del pool y de la cola de trabajos deben ser positivos"""
+        with self.assertRaises(ValueError):
+            WorkerPool(0)
+        with self.assertRaises(ValueError):
+            CompressionService(max_jobs=0)
+
+
+class TestHU30CompressionService(unittest.TestCase):
+    """Pruebas de trabajos que comparten el pool"""
+
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.temp_dir = tempfile.mkdtemp()
+        rng = random.Random(30)
+        self.files = []
+        for i in range(4):
+            path = os.path.join(self.temp_dir, f"archivo_{i}.txt")
+            with open(path, 'wb') as f:
+                f.write(b"".join(f"linea {j} {rng.random()}\n".encode() for j in range(30000)))
+            self.files.append(path)
+        self.service = CompressionService(max_workers=2)
+
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        self.service.shutdown(cancel_jobs=True)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _assert_roundtrip(self, original, compressed):
+        restored = compressed + ".out"
+        self.assertTrue(self.service.decompress(compressed, restored))
+        with open(original, 'rb') as f, open(restored, 'rb') as g:
+            self.assertEqual(f.read(), g.read())
+
+    def test_workers_reused_across_jobs(self):
+        """HU30: Varios trabajos seguidos no crean hilos nuevos"""
+        worker_threads = set()
+        original = ParallelCompressor._compress_block
+
+        def record(compressor, block):
+            worker_threads.add(threading.current_thread())
+            return original(compressor, block)
+
+        with mock.patch.object(ParallelCompressor, '_compress_block', record):
+            for path in self.files:
+                compressor = self.service.create_compressor(BLOCK)
+                compressor.set_direct_output(path != self.files[0])
+                self.assertTrue(self.service.compress(path, path + ".pz", compressor, num_threads=4))
+                self._assert_roundtrip(path, path + ".pz")
+
+        self.assertLessEqual(len(worker_threads), 2)
+        self.assertTrue(all(thread.name.startswith("parcomp") for thread in worker_threads))
+
+    def test_process_pool_reused(self):
+        """HU10/HU30: El backend de procesos usa siempre el mismo pool de procesos"""
+        with mock.patch('compression.worker_pool.create_process_pool', wraps=create_process_pool) as created:
+            for path in self.files[:2]:
+                compressor = self.service.create_compressor(BLOCK)
+                compressor.set_executor_backend(ExecutorBackend.PROCESSES)
+                self.assertTrue(self.service.compress(path, path + ".pz", compressor))
+                decompressor = self.service.create_compressor()
+                decompressor.set_executor_backend(ExecutorBackend.PROCESSES)
+                self.assertTrue(self.service.decompress(path + ".pz", path + ".out", decompressor))
+                with open(path, 'rb') as f, open(path + ".out", 'rb') as g:
+                    self.assertEqual(f.read(), g.read())
+        self.assertEqual(created.call_count, 1)
+
+    def test_cancel_one_job_keeps_others(self):
+        """HU30: Cancelar un trabajo no detiene a los demás que comparten el pool"""
+        jobs = []
+        submitted = threading.Event()
+
+        def cancel_on_progress(message, progress, phase):
+            submitted.wait(30)
+            jobs[0].cancel()
+            return True
+
+        jobs.append(self.service.submit_compression(self.files[0], self.files[0] + ".pz",
+                                                    self.service.create_compressor(BLOCK),
+                                                    progress_callback=cancel_on_progress))
+        jobs.extend(self.service.submit_compression(path, path + ".pz", self.service.create_compressor(BLOCK))
+                    for path in self.files[1:])
+        submitted.set()
+
+        self.assertFalse(jobs[0].result(timeout=60))
+        self.assertTrue(jobs[0].is_cancelled())
+        self.assertFalse(os.path.exists(self.files[0] + ".pz"))
+        for job, path in zip(jobs[1:], self.files[1:]):
+            self.assertTrue(job.result(timeout=60))
+            self._assert_roundtrip(path, path + ".pz")
+        self.assertEqual(self.service.active_jobs(), 0)
+
+    def test_cancel_before_start(self):
+        """HU30: Un trabajo cancelado mientras espera su turno no llega a ejecutarse"""
+        service = CompressionService(max_workers=1, max_jobs=1)
+        self.addCleanup(service.shutdown)
+        release = threading.Event()
+        first = service.submit_compression(self.files[0], self.files[0] + ".pz",
+                                           progress_callback=lambda *args: release.wait(30))
+        second = service.submit_compression(self.files[1], self.files[1] + ".pz")
+        second.cancel()
+        release.set()
+
+        self.assertTrue(first.result(timeout=60))
+        self.assertFalse(second.result(timeout=60))
+        self.assertFalse(os.path.exists(self.files[1] + ".pz"))
+
+    def test_streaming_with_shared_pool(self):
+        """HU09/HU30: El pipeline en streaming funciona con un compresor del servicio"""
+        compressor = self.service.create_compressor(BLOCK)
+        compressor.set_streaming_mode()
+        self.assertTrue(self.service.compress(self.files[0], self.files[0] + ".pz", compressor))
+        self._assert_roundtrip(self.files[0], self.files[0] + ".pz")
+
+    def test_shutdown(self):
+        """HU30: Cerrado el servicio no se aceptan trabajos nuevos"""
+        self.assertTrue(self.service.submit_compression(self.files[0], self.files[0] + ".pz").result(timeout=60))
+        self.service.shutdown()
+        self.assertTrue(self.service.pool.is_closed())
+        with self.assertRaises(RuntimeError):
+            self.service.submit_compression(self.files[1], self.files[1] + ".pz")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,237 @@
+"""
+Pruebas unitarias para HU31: Compresión de directorios en un .pz de varios miembros
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import io
+import random
+import shutil
+from contextlib import redirect_stdout, redirect_stderr
+from unittest import mock
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compression import cli
+from compression.archive import MemberArchive, _safe_member_path, plan_member_blocks, scan_directory
+from compression.checksums import ChecksumAlgorithm
+from compression.parallel_compressor import ParallelCompressor
+from compression.pz_format import PzArchive
+from compression.service import CompressionService
+
+
+BLOCK = 64 * 1024
+
+
+def _text(rng, size):
+    return b"".join(f"fila {i} {rng.random()}\n".encode() for i in range(size // 20 + 1))[:size]
+
+
+class TestHU31Planning(unittest.TestCase):
+    """Pruebas de la planificación de bloques de un directorio"""
+
+    def test_small_files_packed_and_large_files_split(self):
+        """HU31: Los archivos chicos comparten bloque; los grandes empiezan bloque propio"""
+        members = [
+            {'name': 'a', 'path': 'a', 'size': 100, 'mtime': 0, 'mode': 0o644},
+            {'name': 'b', 'path': 'b', 'size': 0, 'mtime': 0, 'mode': 0o644},
+            {'name': 'c', 'path': 'c', 'size': 200, 'mtime': 0, 'mode': 0o644},
+            {'name': 'grande', 'path': 'grande', 'size': 2500, 'mtime': 0, 'mode': 0o644},
+            {'name': 'd', 'path': 'd', 'size': 900, 'mtime': 0, 'mode': 0o644},
+            {'name': 'e', 'path': 'e', 'size': 300, 'mtime': 0, 'mode': 0o644},
+        ]
+        blocks, info = plan_member_blocks(members, 1000)
+
+        data_blocks = [block for block in blocks if 'pieces' in block]
+        self.assertEqual([block['pieces'] for block in data_blocks], [
+            [('a', 0, 100), ('c', 0, 200)],
+            [('grande', 0, 1000)], [('grande', 1000, 1000)], [('grande', 2000, 500)],
+            [('d', 0, 900)],
+            [('e', 0, 300)],
+        ])
+        self.assertEqual([member['offset'] for member in members], [0, 100, 100, 300, 2800, 3700])
+        self.assertEqual(info['table_offset'], 4000)
+        self.assertEqual(info['count'], 6)
+
+        # Los bloques cubren el contenido de forma contigua y la tabla va al final
+        offset = 0
+        for block_id, block in enumerate(blocks):
+            self.assertEqual((block['id'], block['start_offset']), (block_id, offset))
+            offset += block['size']
+        self.assertEqual(offset, info['table_offset'] + info['table_size'])
+
+    def test_unsafe_member_names_rejected(self):
+        """HU31: Un nombre de miembro no puede escribir fuera del directorio de destino"""
+        for name in ('../fuera.txt', '/etc/passwd', 'a/../../b', 'a//b', ''):
+            with self.assertRaises(ValueError):
+                _safe_member_path('/tmp/destino', name)
+        self.assertEqual(_safe_member_path('/tmp/destino', 'a/b.txt'), os.path.join('/tmp/destino', 'a', 'b.txt'))
+
+
+class TestHU31DirectoryArchive(unittest.TestCase):
+    """Pruebas de compresión y extracción de directorios"""
+
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.source_dir = os.path.join(self.temp_dir, "proyecto")
+        self.compressed_file = os.path.join(self.temp_dir, "proyecto.pz")
+        self.output_dir = os.path.join(self.temp_dir, "restaurado")
+
+        rng = random.Random(31)
+        self.files = {f"docs/nota_{i:02d}.txt": _text(rng, rng.randint(0, 4000)) for i in range(40)}
+        self.files["datos/grande.csv"] = _text(rng, 3 * BLOCK + 1234)
+        self.files["datos/exacto.bin"] = rng.randbytes(BLOCK)
+        self.files["vacio.txt"] = b""
+        self.files["raiz.txt"] = b"hola\n" * 50
+        for name, content in self.files.items():
+            path = os.path.join(self.source_dir, *name.split('/'))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(content)
+        os.chmod(os.path.join(self.source_dir, "raiz.txt"), 0o600)
+        os.utime(os.path.join(self.source_dir, "raiz.txt"), (1_600_000_000, 1_600_000_000))
+
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _compress(self, compressor=None):
+        compressor = compressor or ParallelCompressor(block_size=BLOCK)
+        self.assertTrue(compressor.compress_file_with_threads(self.source_dir, self.compressed_file, 3))
+        return compressor
+
+    def _assert_extracted(self, names=None):
+        for name in names or self.files:
+            with open(os.path.join(self.output_dir, *name.split('/')), 'rb') as f:
+                self.assertEqual(f.read(), self.files[name], name)
+
+    def test_roundtrip_with_metadata(self):
+        """HU31: Se restauran todos los archivos con su contenido, fecha y permisos"""
+        compressor = self._compress()
+        stats = compressor.get_compression_statistics()['members']
+        self.assertEqual(stats['files'], len(self.files))
+        self.assertEqual(stats['bytes'], sum(len(content) for content in self.files.values()))
+        self.assertGreater(stats['shared_blocks'], 0)
+
+        with MemberArchive(self.compressed_file) as archive:
+            self.assertEqual(sorted(member['name'] for member in archive.list_members()), sorted(self.files))
+            archive.extract_all(self.output_dir)
+        self._assert_extracted()
+
+        restored = os.stat(os.path.join(self.output_dir, "raiz.txt"))
+        self.assertEqual(restored.st_mode & 0o777, 0o600)
+        self.assertEqual(int(restored.st_mtime), 1_600_000_000)
+
+    def test_single_member_reads_only_its_blocks(self):
+        """HU31: Extraer un miembro solo descomprime los bloques que lo cubren"""
+        self._compress()
+        with MemberArchive(self.compressed_file) as archive:
+            member = archive.get_member("datos/grande.csv")
+            expected = {block['id'] for block in archive.archive.find_blocks(member['offset'], member['size'])}
+            with mock.patch.object(PzArchive, 'read_block', autospec=True,
+                                   side_effect=PzArchive.read_block) as read_block:
+                archive.extract_member("datos/grande.csv", self.output_dir)
+            self.assertEqual({call.args[1] for call in read_block.call_args_list}, expected)
+            self.assertEqual(len(expected), 4)
+            self.assertEqual(archive.read_member("raiz.txt"), self.files["raiz.txt"])
+            with self.assertRaises(KeyError):
+                archive.read_member("no/existe.txt")
+        self._assert_extracted(["datos/grande.csv"])
+
+    def test_plain_decompression_yields_concatenation(self):
+        """HU31: Un lector que ignore los miembros obtiene el contenido concatenado"""
+        self._compress()
+        restored = os.path.join(self.temp_dir, "concatenado.bin")
+        self.assertTrue(ParallelCompressor().decompress_file_with_threads(self.compressed_file, restored, 2))
+        names = [member['name'] for member in scan_directory(self.source_dir)]
+        with open(restored, 'rb') as f:
+            self.assertTrue(f.read().startswith(b"".join(self.files[name] for name in names)))
+
+    def test_shared_worker_pool_and_dedup(self):
+        """HU26/HU30/HU31: Los bloques de todos los archivos corren en el pool del servicio y se deduplican"""
+        duplicate = os.path.join(self.source_dir, "copia", "grande.csv")
+        os.makedirs(os.path.dirname(duplicate))
+        shutil.copy(os.path.join(self.source_dir, "datos", "grande.csv"), duplicate)
+        self.files["copia/grande.csv"] = self.files["datos/grande.csv"]
+
+        with CompressionService(max_workers=2) as service:
+            compressor = service.create_compressor(BLOCK)
+            compressor.set_deduplication()
+            self.assertTrue(service.compress(self.source_dir, self.compressed_file, compressor, num_threads=4))
+        self.assertGreaterEqual(compressor.get_compression_statistics()['dedup']['dedup_hits'], 3)
+
+        with MemberArchive(self.compressed_file) as archive:
+            archive.extract_all(self.output_dir)
+        self._assert_extracted()
+
+    def test_incremental_directory_backup(self):
+        """HU28/HU31: Un respaldo nuevo del directorio reutiliza los bloques de archivos sin cambios"""
+        base_file = os.path.join(self.temp_dir, "base.pz")
+        compressor = ParallelCompressor(block_size=BLOCK)
+        compressor.set_checksum_algorithm(ChecksumAlgorithm.SHA256)
+        self.assertTrue(compressor.compress_file_with_threads(self.source_dir, base_file, 2))
+
+        self.files["raiz.txt"] = b"cambiado\n"
+        with open(os.path.join(self.source_dir, "raiz.txt"), 'wb') as f:
+            f.write(self.files["raiz.txt"])
+
+        compressor = ParallelCompressor(block_size=BLOCK)
+        compressor.set_checksum_algorithm(ChecksumAlgorithm.SHA256)
+        compressor.set_incremental_base(base_file)
+        self._compress(compressor)
+        # Los cuatro bloques propios de los archivos grandes no cambian de lugar
+        self.assertGreaterEqual(compressor.get_compression_statistics()['incremental']['reused_blocks'], 4)
+
+        with MemberArchive(self.compressed_file) as archive:
+            archive.extract_all(self.output_dir)
+        self._assert_extracted()
+
+    def test_output_inside_directory_and_errors(self):
+        """HU31: El .pz de salida no se incluye a sí mismo; un error de lectura aborta sin dejar salida"""
+        inside = os.path.join(self.source_dir, "respaldo.pz")
+        with open(inside, 'wb') as f:
+            f.write(b"anterior")
+        self.assertTrue(ParallelCompressor(block_size=BLOCK).compress_file_with_threads(self.source_dir, inside, 2))
+        with MemberArchive(inside) as archive:
+            self.assertNotIn("respaldo.pz", [member['name'] for member in archive.list_members()])
+
+        compressor = ParallelCompressor(block_size=BLOCK)
+        with mock.patch('compression.parallel_compressor.read_file_pieces', side_effect=IOError("archivo borrado")):
+            with self.assertRaises(IOError):
+                compressor.compress_file_with_threads(self.source_dir, self.compressed_file, 2)
+        self.assertFalse(os.path.exists(self.compressed_file))
+
+        compressor.set_checkpoint_dir(os.path.join(self.temp_dir, "checkpoint"))
+        with self.assertRaises(ValueError):
+            compressor.compress_file_with_threads(self.source_dir, self.compressed_file, 2)
+
+        # Un .pz de un solo archivo no tiene tabla de miembros
+        single = os.path.join(self.source_dir, "raiz.txt")
+        self.assertTrue(ParallelCompressor().compress_file_with_threads(single, self.compressed_file, 2))
+        with self.assertRaises(ValueError):
+            MemberArchive(self.compressed_file)
+
+    def test_cli(self):
+        """HU31: compress con un directorio, extract --list y extract de un miembro"""
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            self.assertEqual(cli.main(["compress", self.source_dir + os.sep, "-b", "64K"]), 0)
+            self.assertEqual(cli.main(["extract", self.compressed_file, "--list"]), 0)
+            self.assertEqual(cli.main(["extract", self.compressed_file, "docs/nota_07.txt",
+                                       "-o", self.output_dir, "-q"]), 0)
+            self.assertEqual(cli.main(["extract", self.compressed_file, "no/existe.txt",
+                                       "-o", self.output_dir]), 1)
+            self.assertEqual(cli.main(["inspect", self.compressed_file, "--json"]), 0)
+        self.assertIn(f"({len(self.files)} archivos)", stdout.getvalue())
+        self.assertIn("datos/grande.csv", stdout.getvalue())
+        self.assertIn(f'"member_count": {len(self.files)}', stdout.getvalue())
+        self._assert_extracted(["docs/nota_07.txt"])
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, "raiz.txt")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+"""
+Pruebas unitarias para HU32: Lectura de archivos .pz como objetos archivo con acceso aleatorio
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import io
+import random
+import shutil
+from unittest import mock
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compression.parallel_compressor import ParallelCompressor
+from compression.pz_format import PzArchive
+from compression.pz_io import PzReader
+from compression.worker_pool import WorkerPool
+
+
+BLOCK = 64 * 1024
+TOTAL_BLOCKS = 10
+
+
+class TestHU32PzReader(unittest.TestCase):
+    """Pruebas de PzReader"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Un .pz de 10 bloques y medio compartido por todas las pruebas"""
+        cls.temp_dir = tempfile.mkdtemp()
+        rng = random.Random(32)
+        cls.content = b"".join(f"linea {i:06d} {rng.random()}\n".encode()
+                               for i in range(TOTAL_BLOCKS * BLOCK // 30))[:TOTAL_BLOCKS * BLOCK + BLOCK // 2]
+        source = os.path.join(cls.temp_dir, "datos.txt")
+        with open(source, 'wb') as f:
+            f.write(cls.content)
+        cls.compressed_file = os.path.join(cls.temp_dir, "datos.pz")
+        assert ParallelCompressor(block_size=BLOCK).compress_file_with_threads(source, cls.compressed_file, 2)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Limpieza al terminar las pruebas"""
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
+
+    def _reader(self, **options):
+        reader = PzReader(self.compressed_file, **options)
+        self.addCleanup(reader.close)
+        return reader
+
+    def test_read_and_seek_like_a_file(self):
+        """HU32: read, seek y tell se comportan como en un archivo común"""
+        reader = self._reader()
+        self.assertEqual(reader.size, len(self.content))
+        self.assertTrue(reader.readable() and reader.seekable())
+        self.assertFalse(reader.writable())
+        self.assertEqual(reader.read(), self.content)
+        self.assertEqual(reader.read(10), b"")
+
+        self.assertEqual(reader.seek(BLOCK - 5), BLOCK - 5)
+        self.assertEqual(reader.read(10), self.content[BLOCK - 5:BLOCK + 5])
+        self.assertEqual(reader.seek(-20, io.SEEK_CUR), BLOCK - 15)
+        self.assertEqual(reader.tell(), BLOCK - 15)
+        reader.seek(-7, io.SEEK_END)
+        self.assertEqual(reader.read(100), self.content[-7:])
+        reader.seek(len(self.content) + 100)
+        self.assertEqual(reader.read(), b"")
+        with self.assertRaises(ValueError):
+            reader.seek(-1)
+
+        buffer = bytearray(BLOCK * 2)
+        reader.seek(100)
+        self.assertEqual(reader.readinto(buffer), len(buffer))
+        self.assertEqual(bytes(buffer), self.content[100:100 + len(buffer)])
+        self.assertEqual(len(reader.read1()), BLOCK - (100 + len(buffer)) % BLOCK)
+
+    def test_random_reads(self):
+        """HU32: Lecturas en posiciones al azar devuelven los mismos bytes que el original"""
+        reader = self._reader(cache_size=3 * BLOCK)
+        rng = random.Random(5)
+        for _ in range(200):
+            offset = rng.randrange(len(self.content))
+            size = rng.randrange(3 * BLOCK)
+            reader.seek(offset)
+            self.assertEqual(reader.read(size), self.content[offset:offset + size])
+
+    def test_lru_cache_budget(self):
+        """HU32: La caché respeta su presupuesto en bytes y descarta el bloque usado hace más tiempo"""
+        reader = self._reader(cache_size=2 * BLOCK)
+        with mock.patch.object(PzArchive, 'read_block', autospec=True,
+                               side_effect=PzArchive.read_block) as read_block:
+            for block_id in (0, 1, 0, 2, 0, 1):
+                reader.seek(block_id * BLOCK + 10)
+                self.assertEqual(reader.read(5), self.content[block_id * BLOCK + 10:block_id * BLOCK + 15])
+
+        # 0 y 1 se leen; 0 está en caché; 2 descarta a 1; 0 sigue en caché; 1 se vuelve a leer
+        self.assertEqual([call.args[1] for call in read_block.call_args_list], [0, 1, 2, 1])
+        stats = reader.get_cache_statistics()
+        self.assertEqual((stats['hits'], stats['misses'], stats['evictions']), (2, 4, 2))
+        self.assertLessEqual(stats['cached_bytes'], 2 * BLOCK)
+
+        # Sin caché, las lecturas dentro del mismo bloque no lo descomprimen de nuevo
+        reader = self._reader(cache_size=0)
+        with mock.patch.object(PzArchive, 'read_block', autospec=True,
+                               side_effect=PzArchive.read_block) as read_block:
+            for _ in range(100):
+                reader.read(100)
+        self.assertEqual(read_block.call_count, 1)
+        self.assertEqual(reader.get_cache_statistics()['cached_bytes'], 0)
+
+    def test_prefetch_sequential_scan(self):
+        """HU32: Una lectura secuencial anticipa los bloques siguientes sin descomprimir nada dos veces"""
+        for pool in (None, WorkerPool(2)):
+            with self.subTest(worker_pool=pool is not None):
+                reader = self._reader(prefetch=3, worker_pool=pool)
+                with mock.patch.object(PzArchive, 'read_block', autospec=True,
+                                       side_effect=PzArchive.read_block) as read_block:
+                    chunks = []
+                    while True:
+                        chunk = reader.read(8192)
+                        if not chunk:
+                            break
+                        chunks.append(chunk)
+                    reader.close()
+                self.assertEqual(b"".join(chunks), self.content)
+                self.assertEqual(sorted(call.args[1] for call in read_block.call_args_list),
+                                 list(range(TOTAL_BLOCKS + 1)))
+                stats = reader.get_cache_statistics()
+                self.assertGreater(stats['prefetched'], 0)
+                self.assertEqual(stats['misses'] + stats['prefetched'], TOTAL_BLOCKS + 1)
+                if pool is not None:
+                    pool.shutdown()
+
+    def test_text_wrapper_and_lines(self):
+        """HU32: PzReader puede envolverse en TextIOWrapper y recorrerse por líneas"""
+        reader = self._reader()
+        lines = self.content.decode().splitlines(keepends=True)
+        text = io.TextIOWrapper(reader, encoding='utf-8')
+        self.assertEqual(text.readline(), lines[0])
+        text.seek(0)
+        self.assertEqual(sum(1 for _ in text), len(lines))
+        text.close()
+        self.assertTrue(reader.closed)
+        with self.assertRaises(ValueError):
+            reader.read(1)
+
+    def test_corrupt_block_and_invalid_options(self):
+        """HU32: Un bloque corrupto falla al leerlo, también si llega por prefetch"""
+        corrupt = os.path.join(self.temp_dir, "corrupto.pz")
+        shutil.copy(self.compressed_file, corrupt)
+        with PzArchive(corrupt) as archive:
+            target = archive.blocks[2]
+        with open(corrupt, 'r+b') as f:
+            f.seek(target['data_offset'] + target['compressed_size'] // 2)
+            f.write(b"\x00\xff\x00\xff")
+
+        for prefetch in (0, 2):
+            with self.subTest(prefetch=prefetch):
+                with PzReader(corrupt, prefetch=prefetch) as reader:
+                    self.assertEqual(reader.read(2 * BLOCK), self.content[:2 * BLOCK])
+                    with self.assertRaises(Exception):
+                        reader.read(BLOCK)
+
+        with self.assertRaises(ValueError):
+            PzReader(self.compressed_file, cache_size=-1)
+        with self.assertRaises(ValueError):
+            PzReader(self.compressed_file, prefetch=-2)
+
+
+if __name__ == '__main__':
+    unittest.main()
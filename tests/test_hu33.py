@@ -0,0 +1,223 @@
+"""
+Pruebas unitarias para HU33: Escritura incremental de archivos .pz como objetos archivo
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import io
+import random
+import shutil
+import threading
+import time
+from unittest import mock
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compression.checksums import ChecksumAlgorithm, VerificationPolicy
+from compression.codecs import BLOCK_FLAG_NO_CHECKSUM, get_codec
+from compression.executor_backend import encode_block
+from compression.parallel_compressor import ParallelCompressor
+from compression.pz_format import FORMAT_V2, PzArchive, PzBlockWriter
+from compression.pz_io import PzReader, PzWriter
+from compression.service import CompressionService
+
+
+BLOCK = 64 * 1024
+
+
+def _generate(size, seed):
+    rng = random.Random(seed)
+    return b"".join(f"registro {i} {rng.random()}\n".encode() for i in range(size // 20 + 1))[:size]
+
+
+class TestHU33PzWriter(unittest.TestCase):
+    """Pruebas de PzWriter"""
+
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.compressed_file = os.path.join(self.temp_dir, "salida.pz")
+        self.content = _generate(9 * BLOCK + 777, 33)
+
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _compressor(self):
+        return ParallelCompressor(block_size=BLOCK)
+
+    def _assert_roundtrip(self, content):
+        restored = os.path.join(self.temp_dir, "salida.bin")
+        self.assertTrue(ParallelCompressor().decompress_file_with_threads(self.compressed_file, restored, 2))
+        with open(restored, 'rb') as f:
+            self.assertEqual(f.read(), content)
+
+    def test_arbitrary_writes_roundtrip(self):
+        """HU33: Escrituras de cualquier tamaño producen bloques del tamaño configurado"""
+        rng = random.Random(1)
+        with PzWriter(self.compressed_file, self._compressor(), num_threads=2) as writer:
+            self.assertTrue(writer.writable())
+            offset = 0
+            while offset < len(self.content):
+                size = rng.choice((1, 17, 1000, BLOCK - 1, 3 * BLOCK + 5))
+                self.assertEqual(writer.write(self.content[offset:offset + size]), len(self.content[offset:offset + size]))
+                offset += size
+            writer.write(memoryview(b""))
+            self.assertEqual(writer.tell(), len(self.content))
+        self.assertTrue(writer.closed)
+
+        with PzArchive(self.compressed_file) as archive:
+            self.assertEqual(archive.header['original_size'], len(self.content))
+            self.assertEqual(archive.header['block_count'], 10)
+            self.assertEqual(archive.header['original_filename'], "salida")
+            self.assertEqual([block['original_size'] for block in archive.blocks], [BLOCK] * 9 + [777])
+        self._assert_roundtrip(self.content)
+        with PzReader(self.compressed_file) as reader:
+            reader.seek(5 * BLOCK - 3)
+            self.assertEqual(reader.read(6), self.content[5 * BLOCK - 3:5 * BLOCK + 3])
+
+    def test_blocks_compressed_while_producer_writes(self):
+        """HU33: Los bloques completos se comprimen y escriben antes de close()"""
+        writer = PzWriter(self.compressed_file, self._compressor(), num_threads=2)
+        self.addCleanup(writer.close)
+        writer.write(self.content[:4 * BLOCK + 10])
+        deadline = time.monotonic() + 10
+        while writer.get_statistics()['blocks'] < 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(writer.get_statistics()['blocks'], 4)
+        self.assertGreater(os.path.getsize(self.compressed_file), PzWriter.HEADER_RESERVE)
+
+        writer.write(self.content[4 * BLOCK + 10:])
+        writer.close()
+        stats = writer.get_statistics()
+        self.assertEqual(stats['original_bytes'], len(self.content))
+        self.assertLess(stats['compressed_bytes'], stats['original_bytes'])
+        self._assert_roundtrip(self.content)
+
+    def test_back_pressure_bounds_pending_blocks(self):
+        """HU33: Si los trabajadores se atrasan, write() espera y los bloques pendientes no pasan del límite"""
+        release = threading.Event()
+
+        def slow_encode(*args, **kwargs):
+            release.wait(10)
+            return encode_block(*args, **kwargs)
+
+        with mock.patch('compression.pz_io.encode_block', side_effect=slow_encode):
+            writer = PzWriter(self.compressed_file, self._compressor(), num_threads=1, max_pending=2)
+            producer = threading.Thread(target=writer.write, args=(self.content,))
+            producer.start()
+            producer.join(0.3)
+            # Con los trabajadores detenidos el productor queda bloqueado tras cortar dos bloques
+            self.assertTrue(producer.is_alive())
+            release.set()
+            producer.join(10)
+            writer.close()
+
+        stats = writer.get_statistics()
+        self.assertEqual(stats['max_pending_blocks'], 2)
+        self.assertGreater(stats['producer_wait_time'], 0.2)
+        self._assert_roundtrip(self.content)
+
+    def test_configuration_from_compressor_and_shared_pool(self):
+        """HU18/HU21/HU24/HU30/HU33: Códec, checksum y verificación del compresor; bloques en el pool del servicio"""
+        with CompressionService(max_workers=2) as service:
+            compressor = service.create_compressor(BLOCK)
+            compressor.set_compression_algorithm("bz2")
+            compressor.set_checksum_algorithm(ChecksumAlgorithm.SHA256)
+            worker_threads = set()
+
+            def record(*args, **kwargs):
+                worker_threads.add(threading.current_thread().name)
+                return encode_block(*args, **kwargs)
+
+            with mock.patch('compression.pz_io.encode_block', side_effect=record):
+                with service.open_writer(self.compressed_file, compressor) as writer:
+                    writer.write(self.content)
+            self.assertTrue(all(name.startswith("parcomp") for name in worker_threads))
+
+        with PzArchive(self.compressed_file) as archive:
+            self.assertEqual(archive.checksum_algorithm, ChecksumAlgorithm.SHA256)
+            self.assertTrue(all(block['codec_id'] == get_codec("bz2").codec_id for block in archive.blocks))
+        self._assert_roundtrip(self.content)
+
+        compressor = self._compressor()
+        compressor.set_verification_policy(VerificationPolicy.OFF)
+        with PzWriter(self.compressed_file, compressor) as writer:
+            writer.write(self.content)
+        with PzArchive(self.compressed_file) as archive:
+            self.assertTrue(all(block['flags'] & BLOCK_FLAG_NO_CHECKSUM for block in archive.blocks))
+        self._assert_roundtrip(self.content)
+
+    def test_text_and_empty_output(self):
+        """HU33: PzWriter admite TextIOWrapper y un .pz sin datos es válido"""
+        lines = [f"evento {i}\n" for i in range(20000)]
+        with io.TextIOWrapper(PzWriter(self.compressed_file, self._compressor()), encoding='utf-8') as text:
+            text.writelines(lines)
+        self._assert_roundtrip("".join(lines).encode())
+
+        PzWriter(self.compressed_file).close()
+        with PzReader(self.compressed_file) as reader:
+            self.assertEqual((reader.size, reader.read()), (0, b""))
+
+    def test_errors_discard_partial_output(self):
+        """HU33: Un error de un trabajador o dentro del with elimina el .pz parcial"""
+        with mock.patch('compression.pz_io.encode_block', side_effect=MemoryError("sin memoria")):
+            writer = PzWriter(self.compressed_file, self._compressor())
+            writer.write(self.content[:2 * BLOCK])
+            with self.assertRaises(MemoryError):
+                writer.close()
+        self.assertFalse(os.path.exists(self.compressed_file))
+        with self.assertRaises(ValueError):
+            writer.write(b"x")
+
+        with self.assertRaisesRegex(RuntimeError, "el productor falló"):
+            with PzWriter(self.compressed_file, self._compressor()) as writer:
+                writer.write(self.content)
+                raise RuntimeError("el productor falló")
+        self.assertFalse(os.path.exists(self.compressed_file))
+
+        with self.assertRaises(ValueError):
+            PzWriter(self.compressed_file, max_pending=0)
+
+    def test_abort_releases_pending_slots(self):
+        """HU33: abort() devuelve los lugares de los bloques cancelados antes de empezar"""
+        release = threading.Event()
+
+        def slow_encode(*args, **kwargs):
+            release.wait(10)
+            return encode_block(*args, **kwargs)
+
+        with mock.patch('compression.pz_io.encode_block', side_effect=slow_encode):
+            writer = PzWriter(self.compressed_file, self._compressor(), num_threads=1, max_pending=3)
+            writer.write(self.content[:3 * BLOCK])
+            threading.Timer(0.2, release.set).start()
+            writer.abort()
+
+        self.assertFalse(os.path.exists(self.compressed_file))
+        self.assertEqual(writer._in_flight, 0)
+        # Los tres lugares están libres otra vez
+        for _ in range(3):
+            self.assertTrue(writer._slots.acquire(blocking=False))
+        self.assertFalse(writer._slots.acquire(blocking=False))
+
+    def test_block_writer_header_reserve(self):
+        """HU33: PzBlockWriter reescribe el encabezado reservado al cerrar"""
+        writer = PzBlockWriter(self.compressed_file, {'format': FORMAT_V2, 'block_count': 0, 'original_size': 0},
+                               header_reserve=256)
+        writer.write_block(0, 0, 3, b"abc", None, flags=BLOCK_FLAG_NO_CHECKSUM)
+        writer.close({'block_count': 1, 'original_size': 3})
+        with PzArchive(self.compressed_file) as archive:
+            self.assertEqual(archive.header['block_count'], 1)
+            self.assertEqual(archive.blocks[0]['data_offset'], 4 + 256)
+
+        writer = PzBlockWriter(self.compressed_file, {'format': FORMAT_V2, 'block_count': 0})
+        with self.assertRaises(ValueError):
+            writer.close({'block_count': 0})
+        self.assertFalse(os.path.exists(self.compressed_file))
+
+
+if __name__ == '__main__':
+    unittest.main()